@@ -9,7 +9,7 @@ from pathlib import Path
 os.chdir(Path(__file__).parent)
 
 # Now import from app
-from app import app, get_db
+from app import app, get_db, _invalidate_categories
 from flask import jsonify
 
 # Create app context
@@ -60,6 +60,7 @@ with app.app_context():
     try:
         cursor.execute(sql, data)
         conn.commit()
+        _invalidate_categories()
         print("✅ Categories inserted!")
     except Exception as e:
         print(f"❌ Insert failed: {e}")
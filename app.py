@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, jsonify, make_response, Response, stream_with_context, g, has_request_context
 from werkzeug.utils import secure_filename
 from functools import wraps
 from datetime import datetime, date
@@ -6,15 +6,62 @@ import os
 import json
 import time
 import secrets
+import hmac
 import shutil
 import html
 import requests
+import tempfile
+import threading
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from decimal import Decimal
 from urllib.parse import quote_plus
 import psycopg2.extras
 from utils.otp_service import OTPService
+from utils.product_search import ProductSearch, ensure_product_search
+from utils.search_suggest import (
+    MAX_SUGGESTIONS, SuggestionIndex, load_categories_change, load_db_suggestions, load_product_change,
+    load_store_change,
+)
+from utils.lookup_cache import LookupCache, build_shared_store
+from utils.access_cache import AccessStateCache
+from utils.page_cache import PageCacheSet, product_scope, brand_scope, HOME_SCOPE, BRANDS_SCOPE
+from utils.category_tree import CategoryTree, load_category_rows
+from utils.psgc_dataset import load_psgc_dataset
+from utils.product_stats import ensure_product_stats_table, refresh_product_review_stats, sync_order_product_stats, rebuild_product_stats
+from utils.order_placement import normalize_order_lines, insert_order_items, add_sales_counts
+from utils.order_history import ensure_order_history_index, load_order_history, count_orders_by_status
+from utils.seller_sales import (
+    ensure_seller_sales_tables, sync_order_sales_rollup, rebuild_seller_sales, load_seller_sales_summary,
+    load_seller_daily_revenue, load_seller_top_products, count_repeat_customers,
+)
+from utils.service_areas import ensure_address_area_keys, compile_service_area, fetch_available_orders
+from utils.shipments import ensure_shipments_order_unique, ensure_order_shipment
+from utils.rider_metrics import (
+    ensure_rider_metrics_tables, record_rider_transaction, record_rider_rating, rebuild_rider_metrics,
+    load_rider_earnings, load_rider_rating_summary, load_rider_daily_history,
+)
+from utils.commission_ledger import (
+    ensure_commission_withdrawal_tables, ensure_commission_ledger_table, record_order_commission,
+    catch_up_commission_ledger_on_start, start_commission_ledger_sync, load_commission_items, load_order_claims,
+    load_unclaimed_order_commissions,
+)
+from utils.stock_reservations import (
+    ensure_stock_reservations_table, reserve_stock, commit_order_reservations,
+    release_order_reservations, start_reservation_sweeper
+)
+from utils.seller_events import SellerEventHub, notify_sql
+from utils.image_derivatives import ImagePipeline, ensure_image_derivatives_table
+from utils.request_db import RequestConnection, RequestConnectionStats, transaction_cursor
+from utils.query_profiler import QueryProfiler
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, timed
+from utils.static_assets import (
+    IMMUTABLE_CACHE_CONTROL, SOURCE_EXTENSIONS as STATIC_SOURCE_EXTENSIONS, StaticAssets, choose_encoding,
+)
+from utils.email_outbox import (
+    EmailOutbox, SMTPSettings, SMTPSession, ensure_email_outbox_table, set_default_outbox,
+    build_message as build_email_message
+)
 from models import db, User, Category, Seller, Product, ProductImage, ProductVariant, Inventory, Address, Order, OrderItem, Rider, Shipment, Review, OTP, SellerNotification
 
 
@@ -60,17 +107,31 @@ else:
 
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
 app.config['SQLALCHEMY_ECHO'] = os.getenv('SQLALCHEMY_ECHO', 'false').lower() == 'true'
+# Per worker process. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW + SELLER_EVENTS_MAX_WAITERS = GUNICORN_THREADS
+# (see the seller events section) so no request thread waits on pool_timeout for a connection.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '3') or 3)
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '5') or 0)
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    'pool_size': 3,
+    'pool_size': DB_POOL_SIZE,
     'pool_recycle': 600,
     'pool_pre_ping': True,
-    'max_overflow': 5,
+    'max_overflow': DB_MAX_OVERFLOW,
     'connect_args': {
         'connect_timeout': 15,
         'application_name': 'var-n-ecommerce'
     }
 }
 
+# Maintenance scripts import this module for its helpers. They set APP_STARTUP_TASKS=off before
+# importing it to skip the startup migrations and every background thread (sweepers, ledger sync,
+# outbox workers, seller events, suggestion index) that a web process starts.
+APP_STARTUP_TASKS = os.getenv('APP_STARTUP_TASKS', 'true').strip().lower() not in ('false', '0', 'no', 'off')
+
+# Raw SQL in a request shares one pooled connection (get_db() leases it; teardown returns it).
+# DB_CHECKOUT_HEADER adds X-DB-Checkouts: <checkouts>; leases=<get_db() calls> to responses.
+DB_CHECKOUT_HEADER = os.getenv('DB_CHECKOUT_HEADER', 'false').strip().lower() == 'true'
+request_db_stats = RequestConnectionStats()
+
 # Initialize SQLAlchemy
 db.init_app(app)
 
@@ -80,13 +141,204 @@ db.init_app(app)
 # and avoid CORS issues.
 PSGC_API_BASE_URL = os.getenv('PSGC_API_BASE_URL', 'https://psgc.gitlab.io/api').rstrip('/')
 PSGC_CACHE_TTL_SECONDS = int(os.getenv('PSGC_CACHE_TTL_SECONDS', '21600') or 21600)  # 6h default
-_PSGC_CACHE = {}
+PSGC_CACHE_MAX_ENTRIES = int(os.getenv('PSGC_CACHE_MAX_ENTRIES', '4096') or 4096)
+# Expired PSGC lists keep being served for this long while a background refresh runs.
+PSGC_CACHE_STALE_SECONDS = int(os.getenv('PSGC_CACHE_STALE_SECONDS', '604800') or 604800)  # 7d default
+
+# Shared SQLite tier so every gunicorn worker on the host reuses one warm cache.
+# Set LOOKUP_CACHE_PATH=off to keep caches purely in-process.
+LOOKUP_CACHE_PATH = os.getenv('LOOKUP_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'varon_lookup_cache.sqlite3'))
+_LOOKUP_SHARED_STORE = build_shared_store(LOOKUP_CACHE_PATH)
+
+_PSGC_CACHE = LookupCache(
+    'psgc',
+    ttl_seconds=PSGC_CACHE_TTL_SECONDS,
+    max_entries=PSGC_CACHE_MAX_ENTRIES,
+    stale_seconds=PSGC_CACHE_STALE_SECONDS,
+    shared_store=_LOOKUP_SHARED_STORE,
+)
+
+# Offline PSGC snapshot built by scripts/import_psgc_snapshot.py. When present it answers
+# every PSGC list and validation in memory; the live API is only consulted for codes the
+# snapshot does not know (disable with PSGC_LIVE_FALLBACK=false).
+PSGC_DATASET_PATH = os.getenv('PSGC_DATASET_PATH', os.path.join(BASE_DIR, 'data', 'psgc_snapshot.json.gz'))
+PSGC_LIVE_FALLBACK = os.getenv('PSGC_LIVE_FALLBACK', 'true').strip().lower() == 'true'
+PSGC_DATASET = load_psgc_dataset(PSGC_DATASET_PATH)
+if PSGC_DATASET is not None:
+    print(f"[PSGC] Loaded offline dataset ({len(PSGC_DATASET.nodes)} areas, generated {PSGC_DATASET.generated_at})")
 
 
 # --- PSGC → Postal Code helpers ---
 # PSGC API does not include postal codes. We resolve postal codes via a local mapping table.
 POSTAL_CODE_CACHE_TTL_SECONDS = int(os.getenv('POSTAL_CODE_CACHE_TTL_SECONDS', '21600') or 21600)  # 6h default
-_POSTAL_CODE_CACHE = {}
+POSTAL_CODE_CACHE_MAX_ENTRIES = int(os.getenv('POSTAL_CODE_CACHE_MAX_ENTRIES', '8192') or 8192)
+_POSTAL_CODE_CACHE = LookupCache(
+    'postal',
+    ttl_seconds=POSTAL_CODE_CACHE_TTL_SECONDS,
+    max_entries=POSTAL_CODE_CACHE_MAX_ENTRIES,
+    stale_seconds=POSTAL_CODE_CACHE_TTL_SECONDS,
+    shared_store=_LOOKUP_SHARED_STORE,
+    # Background refreshes run on their own thread, outside any request.
+    refresh_context=lambda: app.app_context(),
+)
+
+
+# --- Checkout stock reservations ---
+# Stock is held when an order is placed and committed when the seller confirms it.
+# Holds still unconfirmed after the TTL go back to stock via a background sweep
+# (STOCK_RESERVATION_SWEEP_SECONDS=0 disables it; run scripts/release_expired_reservations.py from cron instead).
+STOCK_RESERVATION_TTL_SECONDS = int(os.getenv('STOCK_RESERVATION_TTL_SECONDS', '172800') or 172800)  # 48h default
+STOCK_RESERVATION_SWEEP_SECONDS = int(os.getenv('STOCK_RESERVATION_SWEEP_SECONDS', '300') or 0)
+
+
+# --- Commission ledger ---
+# Delivery/completion writes an order's admin_commission_ledger rows in the same transaction.
+# A background catch-up re-inserts anything missed by orders finalized in the last lookback window
+# (COMMISSION_LEDGER_SYNC_SECONDS=0 disables it; run scripts/sync_commission_ledger.py from cron instead).
+# The first startup after upgrading scans every order once (see COMMISSION_LEDGER_VERSION); with
+# APP_STARTUP_TASKS off, run scripts/sync_commission_ledger.py --all once as the migration step.
+COMMISSION_LEDGER_SYNC_SECONDS = int(os.getenv('COMMISSION_LEDGER_SYNC_SECONDS', '900') or 0)
+COMMISSION_LEDGER_LOOKBACK_SECONDS = int(os.getenv('COMMISSION_LEDGER_LOOKBACK_SECONDS', '172800') or 172800)  # 48h default
+
+
+# --- Outbound email ---
+# Handlers queue mail on the email_outbox table; workers deliver it over a reused SMTP connection.
+# EMAIL_OUTBOX_WORKERS=0 keeps web processes from delivering (run scripts/email_worker.py instead);
+# EMAIL_OUTBOX_ENABLED=false falls back to sending inline from the request.
+EMAIL_OUTBOX_ENABLED = os.getenv('EMAIL_OUTBOX_ENABLED', 'true').strip().lower() not in ('false', '0', 'no')
+EMAIL_OUTBOX_WORKERS = int(os.getenv('EMAIL_OUTBOX_WORKERS', '1') or 0)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50') or 50)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '6') or 6)  # ~30s..16min backoff
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', '5') or 5)
+
+
+# --- Seller dashboard push (Server-Sent Events / long-poll over LISTEN/NOTIFY) ---
+# Needs a threaded or async server (see Procfile); SELLER_EVENTS_ENABLED=false makes dashboards poll again.
+SELLER_EVENTS_ENABLED = os.getenv('SELLER_EVENTS_ENABLED', 'true').strip().lower() not in ('false', '0', 'no')
+SELLER_EVENTS_HEARTBEAT_SECONDS = int(os.getenv('SELLER_EVENTS_HEARTBEAT_SECONDS', '20') or 20)
+SELLER_EVENTS_STREAM_SECONDS = int(os.getenv('SELLER_EVENTS_STREAM_SECONDS', '1800') or 1800)  # browser reconnects after this
+SELLER_EVENTS_LONG_POLL_SECONDS = int(os.getenv('SELLER_EVENTS_LONG_POLL_SECONDS', '25') or 25)
+# A stream holds a gunicorn thread for up to SELLER_EVENTS_STREAM_SECONDS but hands its pooled
+# connection back before waiting. Every other thread may need a connection, so by default streams
+# and long-polls get only the threads the pool can't serve; beyond that they get a 503 and the
+# dashboard polls. GUNICORN_THREADS must match the Procfile's --threads.
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '16') or 16)
+SELLER_EVENTS_MAX_WAITERS = int(
+    os.getenv('SELLER_EVENTS_MAX_WAITERS', '') or max(GUNICORN_THREADS - DB_POOL_SIZE - DB_MAX_OVERFLOW, 0)
+)
+
+
+# --- Account access gate ---
+# Per-user account status / session_version rows read by before_request. Writes that change
+# them call _invalidate_user_access(), which reaches every worker through the shared lookup store.
+ACCESS_STATE_CACHE_SECONDS = int(os.getenv('ACCESS_STATE_CACHE_SECONDS', '30') or 0)  # 0 disables the cache
+ACCESS_STATE_CACHE_MAX_ENTRIES = int(os.getenv('ACCESS_STATE_CACHE_MAX_ENTRIES', '10000') or 10000)
+access_state_cache = AccessStateCache(
+    ttl_seconds=ACCESS_STATE_CACHE_SECONDS,
+    max_entries=ACCESS_STATE_CACHE_MAX_ENTRIES,
+    shared_store=_LOOKUP_SHARED_STORE,
+) if ACCESS_STATE_CACHE_SECONDS > 0 else None
+
+
+# --- Storefront page cache ---
+# Home, product and brand pages: query results are shared by every viewer, and anonymous
+# viewers get the rendered HTML. Writes call _invalidate_product_pages/_invalidate_brand_pages.
+PAGE_CACHE_SECONDS = int(os.getenv('PAGE_CACHE_SECONDS', '60') or 0)  # 0 disables; bounds unhooked changes (sold counts)
+PAGE_CACHE_MAX_PAGES = int(os.getenv('PAGE_CACHE_MAX_PAGES', '256') or 256)  # rendered HTML, ~100-200KB each
+PAGE_CACHE_MAX_FRAGMENTS = int(os.getenv('PAGE_CACHE_MAX_FRAGMENTS', '4096') or 4096)
+page_caches = PageCacheSet(
+    ttl_seconds=PAGE_CACHE_SECONDS,
+    fragment_entries=PAGE_CACHE_MAX_FRAGMENTS,
+    response_entries=PAGE_CACHE_MAX_PAGES,
+    shared_store=_LOOKUP_SHARED_STORE,
+) if PAGE_CACHE_SECONDS > 0 else None
+
+
+# --- Category tree ---
+# Every worker keeps the categories table in memory. Code that edits categories calls
+# _invalidate_categories(); run scripts/refresh_category_tree.py after editing them in SQL.
+CATEGORY_TREE_SECONDS = int(os.getenv('CATEGORY_TREE_SECONDS', '600') or 600)  # bounds edits nobody announced
+category_tree = CategoryTree(ttl_seconds=CATEGORY_TREE_SECONDS, shared_store=_LOOKUP_SHARED_STORE)
+
+
+# --- Product search ---
+# Ranked tsvector search behind /api/products?search=. Typo tolerance needs pg_trgm, which the
+# startup migration creates when it can; PRODUCT_SEARCH_TYPO_TOLERANCE=false turns it off.
+PRODUCT_SEARCH_TYPO_TOLERANCE = os.getenv('PRODUCT_SEARCH_TYPO_TOLERANCE', 'true').strip().lower() not in ('false', '0', 'no')
+product_search = ProductSearch(trigram=None if PRODUCT_SEARCH_TYPO_TOLERANCE else False)
+
+
+# --- Search suggestions ---
+# /api/search/suggest answers from a per-worker prefix index of product, store, brand and
+# category names. Handlers publish approvals, edits and archives to it; a background rebuild
+# every SEARCH_SUGGEST_REBUILD_SECONDS refreshes sales counts. 0 leaves suggestions to the DB.
+SEARCH_SUGGEST_REBUILD_SECONDS = int(os.getenv('SEARCH_SUGGEST_REBUILD_SECONDS', '900') or 0)
+suggestion_index = SuggestionIndex(
+    rebuild_seconds=SEARCH_SUGGEST_REBUILD_SECONDS, shared_store=_LOOKUP_SHARED_STORE
+)
+
+
+# --- Image derivatives ---
+# Uploads are resized to thumb/card/detail WebP (and AVIF where Pillow can encode it) by a
+# background pool; templates serve them through image_sources(). IMAGE_DERIVATIVE_WORKERS=0
+# keeps web processes from resizing (run scripts/build_image_derivatives.py instead).
+IMAGE_DERIVATIVE_WORKERS = int(os.getenv('IMAGE_DERIVATIVE_WORKERS', '2') or 0)
+
+
+# --- Static assets ---
+# static/css and static/js are copied under content-hashed names (plus .gz/.br) into
+# static/dist and served from /assets/ with a one-year immutable Cache-Control; templates
+# link them with static_url(). Hashes are taken at startup, so set STATIC_ASSET_HASHING=false
+# while editing CSS/JS without restarting. STATIC_ASSET_BUILD_ON_START=false reads the
+# manifest written by scripts/build_static_assets.py instead (read-only deploys).
+STATIC_ASSET_HASHING = os.getenv('STATIC_ASSET_HASHING', 'true').strip().lower() not in ('false', '0', 'no')
+STATIC_ASSET_BUILD_ON_START = os.getenv('STATIC_ASSET_BUILD_ON_START', 'true').strip().lower() not in ('false', '0', 'no')
+
+
+# --- Query profiler ---
+# Opt-in timing of every statement run through get_db() cursors. Profiled responses carry
+# Server-Timing; slow statements are logged as [SLOW SQL] (some with EXPLAIN plans); and
+# /admin/query-profile lists the worst routes and repeated (N+1) statements per worker.
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'false').strip().lower() == 'true'
+QUERY_PROFILER_SAMPLE = float(os.getenv('QUERY_PROFILER_SAMPLE', '1.0') or 1.0)  # fraction of requests profiled
+QUERY_PROFILER_SLOW_MS = float(os.getenv('QUERY_PROFILER_SLOW_MS', '200') or 200)
+QUERY_PROFILER_EXPLAIN_SAMPLE = float(os.getenv('QUERY_PROFILER_EXPLAIN_SAMPLE', '0.1') or 0)  # slow statements explained
+QUERY_PROFILER_N_PLUS_ONE = int(os.getenv('QUERY_PROFILER_N_PLUS_ONE', '5') or 5)  # repeats in one request to flag
+query_profiler = QueryProfiler(
+    enabled=QUERY_PROFILER_ENABLED,
+    sample_rate=QUERY_PROFILER_SAMPLE,
+    slow_ms=QUERY_PROFILER_SLOW_MS,
+    explain_sample=QUERY_PROFILER_EXPLAIN_SAMPLE,
+    n_plus_one_threshold=QUERY_PROFILER_N_PLUS_ONE,
+)
+
+
+# --- Metrics ---
+# Prometheus text format on /metrics, merged across gunicorn workers through per-worker files
+# in METRICS_DIR (METRICS_DIR=off reports only the worker that answers). Scrapers send
+# "Authorization: Bearer $METRICS_TOKEN"; a logged-in admin can open it in a browser.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '').strip()
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'varon_metrics'))
+METRICS_FLUSH_SECONDS = int(os.getenv('METRICS_FLUSH_SECONDS', '15') or 15)
+metrics = MetricsRegistry('varon', None if METRICS_DIR == 'off' else METRICS_DIR, METRICS_FLUSH_SECONDS)
+metrics.counter('http_requests_total', 'Requests by endpoint, method and status code.')
+metrics.counter('http_request_exceptions_total', 'Requests that ended in an unhandled exception.')
+metrics.histogram('http_request_duration_seconds', 'Time to build the response, by endpoint and method.')
+metrics.histogram('db_checkout_seconds', 'Time per pool checkout attempt in get_db().',
+                  buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 15.0))
+metrics.counter('db_checkout_retries_total', 'get_db() checkout attempts that failed and were retried.')
+metrics.counter('db_checkout_failures_total', 'get_db() calls that gave up after every retry.')
+metrics.counter('db_checkout_backoff_seconds_total', 'Seconds get_db() slept between checkout retries.')
+metrics.gauge('db_pool_size', 'Configured pool_size, summed over workers.')
+metrics.gauge('db_pool_checked_out', 'Pooled connections currently in use.')
+metrics.gauge('db_pool_checked_in', 'Idle pooled connections.')
+metrics.gauge('db_pool_overflow', 'Connections open beyond pool_size (negative while the pool is not full).')
+metrics.counter('db_request_events_total', 'Request connection events (checkouts, leases, nested leases, unclosed leases, teardown outcomes).')
+metrics.histogram('outbound_http_seconds', 'Outbound HTTP calls by service and outcome.')
+metrics.histogram('smtp_send_seconds', 'SMTP sends (including connecting) by outcome.')
+metrics.counter('cache_hits_total', 'Cache hits by cache; hit ratio = hits / (hits + misses).')
+metrics.counter('cache_misses_total', 'Cache misses (loads) by cache.')
+metrics.counter('background_events_total', 'Background pool counters (email outbox, image derivatives, seller events).')
 
 
 # --- Buyer approval helpers ---
@@ -115,26 +367,15 @@ def get_current_buyer_approval_status() -> str:
     if not user_id:
         return 'approved'
 
-    conn = get_db()
-    if not conn:
+    # Same cached row the account gate just read, so this is normally free.
+    row = _get_user_access_row(int(user_id))
+    if row is None:
         return 'approved'
-
-    try:
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cursor.execute('SELECT buyer_approval_status FROM users WHERE id = %s', (user_id,))
-        row = cursor.fetchone() or {}
-        cursor.close()
-        conn.close()
-        status = _normalize_buyer_approval_status(row.get('buyer_approval_status'))
+    status = _normalize_buyer_approval_status(row.get('buyer_approval_status'))
+    if status != cached:
         session['buyer_approval_status'] = status
         session.modified = True
-        return status
-    except Exception:
-        try:
-            conn.close()
-        except Exception:
-            pass
-        return 'approved'
+    return status
 
 
 def buyer_approval_required(view_func):
@@ -171,41 +412,15 @@ def buyer_approval_required_api():
     return jsonify({'success': False, 'error': message, 'approval_status': status}), 403
 
 
-def _postal_cache_get(cache_key: str):
-    cached = _POSTAL_CODE_CACHE.get(cache_key)
-    if not cached:
-        return None
-    expires_at, payload = cached
-    if expires_at < time.time():
-        _POSTAL_CODE_CACHE.pop(cache_key, None)
-        return None
-    return payload
-
-
-def _postal_cache_set(cache_key: str, payload):
-    _POSTAL_CODE_CACHE[cache_key] = (time.time() + POSTAL_CODE_CACHE_TTL_SECONDS, payload)
+def _query_postal_code(city_code: str, barangay_code: str):
+    """Resolve a postal code from the mapping table; None means "nothing cacheable".
 
-
-def lookup_postal_code(psgc_city_code: str, psgc_barangay_code: str = '') -> str:
-    """Return postal code for the PSGC selection.
-
-    Prefers barangay-level mapping when available. Falls back to city-level mapping
-    only when it is unambiguous.
+    Inside a request this reads on the request's own connection; the cache's
+    background refresh supplies the app context it needs otherwise.
     """
-    city_code = (psgc_city_code or '').strip()
-    barangay_code = (psgc_barangay_code or '').strip()
-
-    if not city_code and not barangay_code:
-        return ''
-
-    cache_key = f"postal:{city_code}:{barangay_code}"
-    cached = _postal_cache_get(cache_key)
-    if cached is not None:
-        return cached
-
     conn = get_db()
     if not conn:
-        return ''
+        return None
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -216,9 +431,7 @@ def lookup_postal_code(psgc_city_code: str, psgc_barangay_code: str = '') -> str
             )
             row = cursor.fetchone()
             if row and (row.get('postal_code') or '').strip():
-                postal = (row.get('postal_code') or '').strip()
-                _postal_cache_set(cache_key, postal)
-                return postal
+                return (row.get('postal_code') or '').strip()
 
         if city_code:
             cursor.execute(
@@ -229,15 +442,12 @@ def lookup_postal_code(psgc_city_code: str, psgc_barangay_code: str = '') -> str
             distinct = [str(r.get('postal_code') or '').strip() for r in rows if str(r.get('postal_code') or '').strip()]
             distinct = sorted(set(distinct))
             if len(distinct) == 1:
-                _postal_cache_set(cache_key, distinct[0])
                 return distinct[0]
-            if len(distinct) > 1:
-                return ''
 
-        return ''
+        return None
     except (psycopg2.Error, Exception) as err:
         # Most common cause: mapping table not created yet.
-        return ''
+        return None
     finally:
         try:
             cursor.close()
@@ -246,37 +456,46 @@ def lookup_postal_code(psgc_city_code: str, psgc_barangay_code: str = '') -> str
         conn.close()
 
 
-def _psgc_cache_get(cache_key: str):
-    cached = _PSGC_CACHE.get(cache_key)
-    if not cached:
-        return None
-    expires_at, payload = cached
-    if expires_at < time.time():
-        _PSGC_CACHE.pop(cache_key, None)
-        return None
-    return payload
+def lookup_postal_code(psgc_city_code: str, psgc_barangay_code: str = '') -> str:
+    """Return postal code for the PSGC selection.
+
+    Prefers barangay-level mapping when available. Falls back to city-level mapping
+    only when it is unambiguous.
+    """
+    city_code = (psgc_city_code or '').strip()
+    barangay_code = (psgc_barangay_code or '').strip()
 
+    if not city_code and not barangay_code:
+        return ''
 
-def _psgc_cache_set(cache_key: str, payload):
-    _PSGC_CACHE[cache_key] = (time.time() + PSGC_CACHE_TTL_SECONDS, payload)
+    cache_key = f"postal:{city_code}:{barangay_code}"
+    postal = _POSTAL_CODE_CACHE.get_or_load(cache_key, lambda: _query_postal_code(city_code, barangay_code))
+    return postal or ''
 
 
 def _psgc_fetch_list(path: str):
     """Fetch a PSGC JSON list endpoint and return the decoded array."""
     path = path.lstrip('/')
+    if PSGC_DATASET is not None:
+        items = PSGC_DATASET.list_for_path(path)
+        if items is not None:
+            return items
+    if not PSGC_LIVE_FALLBACK:
+        raise ValueError('PSGC area not found.')
+
     cache_key = f"psgc:{path}"
-    cached = _psgc_cache_get(cache_key)
-    if cached is not None:
-        return cached
 
-    url = f"{PSGC_API_BASE_URL}/{path}"
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-    if not isinstance(data, list):
-        raise ValueError('Unexpected PSGC response type')
-    _psgc_cache_set(cache_key, data)
-    return data
+    def load():
+        url = f"{PSGC_API_BASE_URL}/{path}"
+        with timed(metrics, 'outbound_http_seconds', {'service': 'psgc'}):
+            resp = requests.get(url, timeout=10)
+            resp.raise_for_status()
+        data = resp.json()
+        if not isinstance(data, list):
+            raise ValueError('Unexpected PSGC response type')
+        return data
+
+    return _PSGC_CACHE.get_or_load(cache_key, load)
 
 
 def _psgc_normalize_list(items):
@@ -311,6 +530,14 @@ def resolve_psgc_selection(region_code: str, province_code: str, city_code: str,
     if not region_code or not city_code or not barangay_code:
         raise ValueError('Please complete your PSGC address selection.')
 
+    if PSGC_DATASET is not None:
+        try:
+            return PSGC_DATASET.resolve(region_code, province_code, city_code, barangay_code)
+        except KeyError:
+            if not PSGC_LIVE_FALLBACK:
+                raise ValueError('Invalid PSGC address selection.')
+            # Code newer than the snapshot; validate against the live API below.
+
     regions = _psgc_fetch_list('regions.json')
     region_name = _psgc_find_name(regions, region_code)
     if not region_name:
@@ -412,55 +639,174 @@ print(f"[DB CONFIG] Using PostgreSQL on Supabase")
 print(f"[DB CONFIG] Database URI: postgresql://***@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME', 'postgres')}")
 
 # Initialize database tables (SQLAlchemy will manage schema)
-with app.app_context():
-    try:
-        # Test connection first
-        with db.engine.connect() as conn:
-            conn.execute(db.text("SELECT 1"))
-        print("[DB INIT] ✓ Supabase connection successful!")
-        
-        # Create tables
-        db.create_all()
-        print("[DB INIT] ✓ Database tables initialized successfully")
+# Every gunicorn worker imports this module; the one holding this advisory lock runs the
+# migrations and the others skip them. Any constant works as long as all workers agree.
+STARTUP_MIGRATIONS_LOCK_KEY = 726_001
 
-        # Ensure seller_notifications table exists and has all required columns
-        try:
-            with db.engine.connect() as _mc:
-                _mc.execute(db.text("""
-                    CREATE TABLE IF NOT EXISTS seller_notifications (
-                        id SERIAL PRIMARY KEY,
-                        seller_id INTEGER NOT NULL,
-                        product_id INTEGER,
-                        order_id INTEGER,
-                        notification_type VARCHAR(50) NOT NULL,
-                        title VARCHAR(200),
-                        message TEXT NOT NULL,
-                        priority VARCHAR(20) DEFAULT 'normal',
-                        action_url VARCHAR(500),
-                        is_read BOOLEAN DEFAULT FALSE,
-                        read_at TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT NOW()
-                    )
-                """))
-                _mc.execute(db.text("""
-                    ALTER TABLE seller_notifications
-                        ADD COLUMN IF NOT EXISTS title VARCHAR(200),
-                        ADD COLUMN IF NOT EXISTS priority VARCHAR(20) DEFAULT 'normal',
-                        ADD COLUMN IF NOT EXISTS action_url VARCHAR(500),
-                        ADD COLUMN IF NOT EXISTS order_id INTEGER,
-                        ADD COLUMN IF NOT EXISTS product_id INTEGER
-                """))
-                _mc.commit()
-            print("[DB MIGRATION] ✓ seller_notifications table and columns ensured")
-        except Exception as _me:
-            print(f"[DB MIGRATION] seller_notifications migration skipped: {_me}")
 
+def _migrate_seller_notifications(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS seller_notifications (
+            id SERIAL PRIMARY KEY,
+            seller_id INTEGER NOT NULL,
+            product_id INTEGER,
+            order_id INTEGER,
+            notification_type VARCHAR(50) NOT NULL,
+            title VARCHAR(200),
+            message TEXT NOT NULL,
+            priority VARCHAR(20) DEFAULT 'normal',
+            action_url VARCHAR(500),
+            is_read BOOLEAN DEFAULT FALSE,
+            read_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+    cursor.execute("""
+        ALTER TABLE seller_notifications
+            ADD COLUMN IF NOT EXISTS title VARCHAR(200),
+            ADD COLUMN IF NOT EXISTS priority VARCHAR(20) DEFAULT 'normal',
+            ADD COLUMN IF NOT EXISTS action_url VARCHAR(500),
+            ADD COLUMN IF NOT EXISTS order_id INTEGER,
+            ADD COLUMN IF NOT EXISTS product_id INTEGER
+    """)
+    return "seller_notifications table and columns ensured"
+
+
+def _migrate_product_stats(cursor):
+    # Materialized rating/sales counters; seed them once when the table is new.
+    ensure_product_stats_table(cursor)
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM product_stats)")
+    if not cursor.fetchone()[0]:
+        rebuilt = rebuild_product_stats(cursor)
+        print(f"[DB MIGRATION] ✓ product_stats seeded for {rebuilt} products")
+    return "product_stats table ensured"
+
+
+def _migrate_seller_sales(cursor):
+    ensure_seller_sales_tables(cursor)
+    cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM seller_daily_sales) AND EXISTS (SELECT 1 FROM orders)")
+    if cursor.fetchone()[0]:
+        rebuilt = rebuild_seller_sales(cursor)
+        print(f"[DB MIGRATION] ✓ seller_daily_sales seeded with {rebuilt} rows")
+    return "seller_daily_sales rollup ensured"
+
+
+def _migrate_shipments(cursor):
+    removed, dropped_assigned = ensure_shipments_order_unique(cursor)
+    for ship_id, order_id, rider_id, status in dropped_assigned:
+        print(f"[DB MIGRATION] ⚠ dropped duplicate shipment {ship_id} for order {order_id} "
+              f"(rider {rider_id}, {status}); kept the newest assigned one")
+    return f"shipments unique per order ({removed} duplicates removed)"
+
+
+def _migrate_rider_metrics(cursor):
+    ensure_rider_metrics_tables(cursor)
+    cursor.execute(
+        "SELECT NOT EXISTS (SELECT 1 FROM rider_daily_metrics) "
+        "AND (EXISTS (SELECT 1 FROM rider_transactions) OR EXISTS (SELECT 1 FROM rider_ratings))"
+    )
+    if cursor.fetchone()[0]:
+        rebuilt = rebuild_rider_metrics(cursor)
+        print(f"[DB MIGRATION] ✓ rider_daily_metrics seeded with {rebuilt} rows")
+    return "rider metrics rollup ensured"
+
+
+def _migrate_commission_ledger(cursor):
+    ensure_commission_withdrawal_tables(cursor)
+    ensure_commission_ledger_table(cursor)
+    cursor.execute("SELECT NOW() - make_interval(secs => %s)", (COMMISSION_LEDGER_LOOKBACK_SECONDS,))
+    caught_up, full_scan = catch_up_commission_ledger_on_start(cursor, cursor.fetchone()[0])
+    return f"commission ledger ensured ({caught_up} rows caught up{', full scan' if full_scan else ''})"
+
+
+def _migrate_product_search(cursor):
+    trigram = ensure_product_search(cursor)
+    return f"product search index ensured (typo tolerance {'on' if trigram else 'off'})"
+
+
+def _ensured(ensure, message):
+    def migrate(cursor):
+        ensure(cursor)
+        return message
+    return migrate
+
+
+# (what, migrate(cursor) -> message, message when it fails); each runs in its own transaction.
+STARTUP_MIGRATIONS = (
+    ('seller_notifications migration', _migrate_seller_notifications, None),
+    ('product_stats migration', _migrate_product_stats, None),
+    ('stock_reservations migration', _ensured(ensure_stock_reservations_table, "stock_reservations table ensured"), None),
+    ('email_outbox migration', _ensured(ensure_email_outbox_table, "email_outbox table ensured"), None),
+    ('order history index', _ensured(ensure_order_history_index, "order history index ensured"), None),
+    ('seller_daily_sales migration', _migrate_seller_sales, None),
+    ('address area keys', _ensured(ensure_address_area_keys, "address area keys ensured"), None),
+    ('shipments unique order_id', _migrate_shipments,
+     "⚠ shipments unique order_id FAILED, shipments fall back to locking the order row until it is fixed"),
+    ('rider metrics migration', _migrate_rider_metrics, None),
+    ('commission ledger migration', _migrate_commission_ledger, None),
+    ('product search migration', _migrate_product_search, None),
+    ('image_derivatives migration', _ensured(ensure_image_derivatives_table, "image_derivatives ensured"), None),
+)
+
+
+def _startup_migration(label, migrate, failure=None):
+    """Run ``migrate(cursor)`` on its own pooled connection and commit, logging the outcome."""
+    try:
+        conn = db.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            message = migrate(cursor)
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+        print(f"[DB MIGRATION] ✓ {message}")
     except Exception as err:
-        print(f"[DB INIT ERROR] Failed to connect: {err}")
-        print("[DB INIT] Make sure DATABASE_URL is set on Render (or DB_HOST/DB_USER/DB_PASSWORD/DB_NAME/DB_PORT)")
+        print(f"[DB MIGRATION] {failure or label + ' skipped'}: {err}")
 
 
-def get_db():
+def _run_startup_migrations():
+    """Check the connection, create tables and run the idempotent schema migrations.
+
+    Only one worker at a time does this, under ``STARTUP_MIGRATIONS_LOCK_KEY``; a worker
+    that finds the lock taken starts without waiting, since another one is already on it.
+    """
+    with app.app_context():
+        try:
+            # Test connection first
+            lock_conn = db.engine.raw_connection()
+        except Exception as err:
+            print(f"[DB INIT ERROR] Failed to connect: {err}")
+            print("[DB INIT] Make sure DATABASE_URL is set on Render (or DB_HOST/DB_USER/DB_PASSWORD/DB_NAME/DB_PORT)")
+            return
+        try:
+            lock_cursor = lock_conn.cursor()
+            lock_cursor.execute("SELECT pg_try_advisory_lock(%s)", (STARTUP_MIGRATIONS_LOCK_KEY,))
+            locked = lock_cursor.fetchone()[0]
+            lock_conn.commit()
+            print("[DB INIT] ✓ Supabase connection successful!")
+            if not locked:
+                print("[DB MIGRATION] another worker is running the startup migrations; skipping them here")
+                return
+            try:
+                db.create_all()
+                print("[DB INIT] ✓ Database tables initialized successfully")
+                for label, migrate, failure in STARTUP_MIGRATIONS:
+                    _startup_migration(label, migrate, failure)
+            finally:
+                lock_cursor.execute("SELECT pg_advisory_unlock(%s)", (STARTUP_MIGRATIONS_LOCK_KEY,))
+                lock_conn.commit()
+        except Exception as err:
+            print(f"[DB INIT ERROR] Startup migrations failed: {err}")
+        finally:
+            lock_conn.close()
+
+
+if APP_STARTUP_TASKS:
+    _run_startup_migrations()
+
+
+def _checkout_db():
     """
     Returns a psycopg2 connection from SQLAlchemy's connection pool.
     This allows existing raw SQL code to work while we migrate to ORM.
@@ -470,20 +816,269 @@ def get_db():
     retry_delay = 0.5
     
     for attempt in range(max_retries):
+        started = time.perf_counter()
         try:
             # Get connection from SQLAlchemy's pool
             connection = db.engine.raw_connection()
+            metrics.observe('db_checkout_seconds', time.perf_counter() - started, {'outcome': 'ok'})
             return connection
         except Exception as err:
+            metrics.observe('db_checkout_seconds', time.perf_counter() - started, {'outcome': 'error'})
             if attempt < max_retries - 1:
                 print(f"[DB ERROR] Connection attempt {attempt + 1} failed: {err}. Retrying in {retry_delay}s...")
+                metrics.inc('db_checkout_retries_total')
+                metrics.inc('db_checkout_backoff_seconds_total', amount=retry_delay)
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
                 print(f"[DB ERROR] Failed to get database connection after {max_retries} attempts: {err}")
+                metrics.inc('db_checkout_failures_total')
                 return None
 
 
+def get_db():
+    """Database connection for raw SQL, or None if the database is unreachable.
+
+    Inside a request this is a lease on the request's single pooled
+    connection (utils/request_db.py), returned to the pool at teardown even
+    when ``close()`` is never called. Only ``commit()`` makes its writes
+    durable: a bare ``close()`` rolls back, as does teardown. Elsewhere it is
+    a pooled connection of its own that the caller must close.
+    """
+    if not has_request_context():
+        return _checkout_db()
+    request_db = g.get('request_db')
+    if request_db is None:
+        request_db = g.request_db = RequestConnection(_checkout_db, request_db_stats, g.get('query_profile'))
+    return request_db.lease()
+
+
+def db_cursor():
+    """``with db_cursor() as cursor:`` (RealDictCursor) commits on success, rolls back on error.
+
+    Raises ConnectionError when no connection could be checked out.
+    """
+    return transaction_cursor(get_db(), psycopg2.extras.RealDictCursor)
+
+
+def release_request_db():
+    """Hand the request's connection back early, before a handler waits (long-poll, SSE)."""
+    request_db = g.get('request_db')
+    if request_db is not None and request_db.connection is not None:
+        request_db.release()
+        request_db_stats.add('early_releases')
+
+
+@app.before_request
+def _start_request_metrics():
+    metrics.ensure_worker()
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        {'endpoint': endpoint, 'method': request.method})
+        metrics.inc('http_requests_total', {'endpoint': endpoint, 'method': request.method,
+                                            'status': str(response.status_code)})
+    return response
+
+
+@app.teardown_request
+def _count_request_exception(error):
+    if error is not None:
+        metrics.inc('http_request_exceptions_total', {'endpoint': request.endpoint or 'unmatched'})
+
+
+@app.before_request
+def _start_query_profile():
+    # Registered ahead of the access gate so its queries are profiled too.
+    if query_profiler.enabled and not request.path.startswith(('/static/', '/assets/')):
+        g.query_profile = query_profiler.start(request.method, request.path)
+
+
+@app.after_request
+def _report_db_usage(response):
+    request_db = g.get('request_db')
+    if request_db is not None:
+        if DB_CHECKOUT_HEADER:
+            response.headers['X-DB-Checkouts'] = f"{request_db.checkouts}; leases={request_db.leases}"
+        if request_db.checkouts > 1:
+            print(f"[DB] {request.method} {request.path} checked out {request_db.checkouts} connections")
+    profile = g.pop('query_profile', None)
+    if profile is not None:
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        response.headers['Server-Timing'] = query_profiler.finish(profile, f"{request.method} {route}")
+    return response
+
+
+@app.teardown_appcontext
+def _release_request_db(error):
+    request_db = g.pop('request_db', None)
+    if request_db is None:
+        return
+    request_db.release(error)
+    request_db_stats.record_request(request_db.checkouts)
+
+
+def _background_db_connection():
+    """Pooled connection for daemon threads, which run outside any app context."""
+    with app.app_context():
+        return _checkout_db()
+
+
+if APP_STARTUP_TASKS and STOCK_RESERVATION_SWEEP_SECONDS > 0:
+    start_reservation_sweeper(_background_db_connection, STOCK_RESERVATION_SWEEP_SECONDS)
+
+if APP_STARTUP_TASKS and SEARCH_SUGGEST_REBUILD_SECONDS > 0:
+    suggestion_index.start(_background_db_connection)
+
+if APP_STARTUP_TASKS and COMMISSION_LEDGER_SYNC_SECONDS > 0:
+    start_commission_ledger_sync(
+        _background_db_connection, COMMISSION_LEDGER_SYNC_SECONDS, COMMISSION_LEDGER_LOOKBACK_SECONDS
+    )
+
+
+email_outbox = None
+if EMAIL_OUTBOX_ENABLED:
+    email_outbox = EmailOutbox(
+        _background_db_connection,
+        SMTPSettings.from_env(),
+        batch_size=EMAIL_OUTBOX_BATCH_SIZE,
+        max_attempts=EMAIL_OUTBOX_MAX_ATTEMPTS,
+        poll_seconds=EMAIL_OUTBOX_POLL_SECONDS,
+    )
+    set_default_outbox(email_outbox)
+    if APP_STARTUP_TASKS and EMAIL_OUTBOX_WORKERS > 0:
+        email_outbox.start(EMAIL_OUTBOX_WORKERS)
+
+
+image_pipeline = ImagePipeline(
+    app.static_folder,
+    app.static_url_path,
+    connect=_background_db_connection,
+    workers=IMAGE_DERIVATIVE_WORKERS,
+)
+app.jinja_env.globals['image_sources'] = image_pipeline.sources
+
+static_assets = StaticAssets(app.static_folder, enabled=STATIC_ASSET_HASHING).load(build=STATIC_ASSET_BUILD_ON_START)
+
+
+def static_url(filename):
+    """URL of a CSS/JS file under static/: the hashed /assets/ copy when there is one."""
+    hashed = static_assets.hashed_name(filename)
+    if hashed is None:
+        static_assets.count('plain_urls')
+        return url_for('static', filename=filename)
+    static_assets.count('hashed_urls')
+    return url_for('static_asset', filename=hashed)
+
+
+app.jinja_env.globals['static_url'] = static_url
+
+
+@app.route('/assets/<path:filename>')
+def static_asset(filename):
+    """Hashed CSS/JS from static/dist, precompressed when the client accepts it.
+
+    Any hashed name still on disk is served, including ones from earlier
+    builds, so pages cached before a deploy keep working.
+    """
+    if not filename.endswith(STATIC_SOURCE_EXTENSIONS):
+        return 'Not found', 404
+    send_name, encoding = choose_encoding(static_assets.dist_folder, filename, request.accept_encodings)
+    mimetype = 'text/css' if filename.endswith('.css') else 'text/javascript'
+    response = send_from_directory(static_assets.dist_folder, send_name, mimetype=mimetype, max_age=31536000)
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.headers['Vary'] = 'Accept-Encoding'
+    static_assets.count('served')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+        static_assets.count(f'served_{encoding}')
+    return response
+
+
+def _seller_events_listen_connection():
+    """Dedicated connection for LISTEN, taken out of the pool for good."""
+    with app.app_context():
+        pooled = db.engine.raw_connection()
+        pooled.detach()
+        return pooled.dbapi_connection
+
+
+seller_event_hub = None
+seller_event_waiters = threading.BoundedSemaphore(SELLER_EVENTS_MAX_WAITERS) if SELLER_EVENTS_MAX_WAITERS else None
+if APP_STARTUP_TASKS and SELLER_EVENTS_ENABLED:
+    seller_event_hub = SellerEventHub(_seller_events_listen_connection)
+    seller_event_hub.start()
+
+
+def _collect_runtime_metrics():
+    """Values other objects already keep, read whenever this worker's metrics are written."""
+    rows = []
+    with app.app_context():
+        pool = db.engine.pool
+        rows += [
+            ('db_pool_size', 'gauge', None, pool.size()),
+            ('db_pool_checked_out', 'gauge', None, pool.checkedout()),
+            ('db_pool_checked_in', 'gauge', None, pool.checkedin()),
+            ('db_pool_overflow', 'gauge', None, pool.overflow()),
+        ]
+    for event, value in request_db_stats.snapshot().items():
+        if event != 'max_checkouts':
+            rows.append(('db_request_events_total', 'counter', {'event': event}, value))
+
+    caches = {}
+    for name, cache in (('psgc', _PSGC_CACHE), ('postal_codes', _POSTAL_CODE_CACHE)):
+        stats = cache.stats
+        caches[name] = (stats['hits'] + stats['shared_hits'] + stats['stale_hits'], stats['misses'])
+    if access_state_cache is not None:
+        caches['access_state'] = (access_state_cache.stats['hits'], access_state_cache.stats['misses'])
+    if page_caches is not None:
+        snapshot = page_caches.snapshot()
+        for part in ('fragments', 'responses'):
+            caches[f'page_{part}'] = (snapshot[part]['hits'], snapshot[part]['misses'])
+    caches['category_tree'] = (category_tree.stats['hits'], category_tree.stats['loads'])
+    caches['search_suggest'] = (suggestion_index.stats['memo_hits'],
+                                suggestion_index.stats['scans'] + suggestion_index.stats['cold'])
+    caches['image_manifests'] = (image_pipeline.stats['lookups'] - image_pipeline.stats['misses'],
+                                 image_pipeline.stats['misses'])
+    for name, (hits, misses) in caches.items():
+        rows.append(('cache_hits_total', 'counter', {'cache': name}, hits))
+        rows.append(('cache_misses_total', 'counter', {'cache': name}, misses))
+
+    pools = [('image_derivatives', image_pipeline.stats)]
+    if email_outbox is not None:
+        pools.append(('email_outbox', email_outbox.stats))
+    if seller_event_hub is not None:
+        pools.append(('seller_events', seller_event_hub.stats))
+    for source, stats in pools:
+        for event, value in stats.items():
+            if source == 'image_derivatives' and event in ('lookups', 'misses'):
+                continue
+            rows.append(('background_events_total', 'counter', {'source': source, 'event': event}, value))
+    return rows
+
+
+metrics.add_collector(_collect_runtime_metrics)
+SMTPSession.observer = lambda seconds, ok: metrics.observe(
+    'smtp_send_seconds', seconds, {'outcome': 'ok' if ok else 'error'}
+)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape target for every worker on this host."""
+    authorization = request.headers.get('Authorization') or ''
+    token_ok = bool(METRICS_TOKEN) and hmac.compare_digest(authorization, f'Bearer {METRICS_TOKEN}')
+    if not token_ok and not (session.get('logged_in') and session.get('role') == 'admin'):
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE, headers={'Cache-Control': 'no-store'})
+
+
 def convert_decimals_to_float(value):
     """Recursively convert Decimal objects within nested structures to floats."""
     if isinstance(value, list):
@@ -554,6 +1149,12 @@ app.jinja_env.filters['ph_time'] = ph_time_filter
 
 
 MAX_BRAND_CHAT_LENGTH = 2000
+BRAND_CHAT_PAGE_SIZE = 50  # messages per page for /api/brands/<slug>/messages
+BRAND_CHAT_MAX_PAGE_SIZE = 200
+MY_ORDERS_PAGE_SIZE = 20  # orders per page for /api/my-orders
+MY_ORDERS_MAX_PAGE_SIZE = 100
+RIDER_AVAILABLE_ORDERS_LIMIT = 100  # newest matching orders shown on a rider dashboard
+RIDER_HISTORY_MAX_DAYS = 366  # longest /api/rider/earnings?days= history
 
 
 CITY_COORDINATE_HINTS = {
@@ -1066,200 +1667,313 @@ def admin_create_tables():
             conn.rollback()
         return jsonify({'success': False, 'error': str(err)}), 500
 
-@app.route('/')
-def index():
-    if session.get('logged_in') and session.get('role') == 'buyer':
-        if get_current_buyer_approval_status() != 'approved':
-            return redirect(url_for('buyer_dashboard'))
+def _page_data(key, scopes, loader):
+    """Query results a storefront page renders from, shared by every viewer."""
+    if page_caches is None:
+        return loader()
+    data, _ = page_caches.fragments.get_or_render(key, scopes, loader)
+    return data
+
+
+def _page_response(key, scopes, render):
+    """Render a storefront page; anonymous viewers share one cached copy of the HTML.
+
+    ``render`` returns the HTML or None when there is nothing to show. Pages for
+    logged-in viewers depend on the session (navbar name, buttons), so they are
+    rendered per request from the cached page data instead.
+    """
+    if page_caches is None or session.get('logged_in'):
+        return render()
+    html, hit = page_caches.responses.get_or_render(key, scopes, render)
+    if html is None:
+        return None
+    response = make_response(html)
+    response.headers['X-Page-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+def _invalidate_product_pages(cursor, product_id):
+    """Call after committing a change to what ``product_id``'s page, its brand page or the home page shows."""
+    if page_caches is None or not product_id:
+        return
+    scopes = [product_scope(product_id), HOME_SCOPE]
+    try:
+        cursor.execute('SELECT seller_id FROM products WHERE id = %s', (product_id,))
+        row = cursor.fetchone()
+        if row and row.get('seller_id'):
+            scopes.append(brand_scope(row['seller_id']))
+    except Exception as err:
+        print(f"[PAGE CACHE] Could not resolve seller of product {product_id}: {err}")
+    page_caches.invalidate(*scopes)
+
+
+def _invalidate_brand_pages(seller_id):
+    """Call after committing a change to a seller's store details or status."""
+    if page_caches is None or not seller_id:
+        return
+    page_caches.invalidate(brand_scope(seller_id), BRANDS_SCOPE)
+
+
+def _refresh_product_suggestion(cursor, product_id):
+    """Call after committing an approval, edit, archive or restore of ``product_id``."""
+    if SEARCH_SUGGEST_REBUILD_SECONDS <= 0 or not product_id:
+        return
+    try:
+        suggestion_index.publish(load_product_change(cursor, product_id))
+    except Exception as err:
+        print(f"[SUGGEST] Could not refresh product {product_id}: {err}")
+
+
+def _refresh_store_suggestion(seller_id):
+    """Call after committing a change to a seller's store name, slug or status."""
+    if SEARCH_SUGGEST_REBUILD_SECONDS <= 0 or not seller_id:
+        return
+    try:
+        with db_cursor() as cursor:
+            change = load_store_change(cursor, seller_id)
+        suggestion_index.publish(change)
+    except Exception as err:
+        print(f"[SUGGEST] Could not refresh store {seller_id}: {err}")
 
+
+def _load_category_rows():
     conn = get_db()
-    products = []
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        rows = load_category_rows(cursor)
+        cursor.close()
+        conn.close()
+        return rows
+    except Exception as err:
+        print(f"[ERROR] Failed to load categories: {err}")
+        conn.close()
+        return None
 
-    if conn:
-        try:
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-            cursor.execute('''
-                SELECT
-                    p.id,
-                    p.name,
-                    p.price,
-                    p.slug,
-                    c.name as category_name,
-                    c.slug as category_slug,
-                    pi.image_url,
-                    COALESCE(AVG(r.rating), 0) as avg_rating,
-                    COUNT(DISTINCT r.id) as review_count,
-                    COALESCE(SUM(oi.quantity), 0) as sold_count
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
-                LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
-                LEFT JOIN reviews r ON p.id = r.product_id AND r.is_approved::int = 1
-                LEFT JOIN order_items oi ON p.id = oi.product_id
-                LEFT JOIN orders o ON oi.order_id = o.id AND o.order_status IN ('delivered', 'completed')
-                WHERE p.is_active::int = 1
-                GROUP BY p.id, p.name, p.price, p.slug, c.name, c.slug, pi.image_url
-                ORDER BY p.created_at DESC
-                LIMIT 20
-            ''')
-            products = cursor.fetchall()
+def _categories():
+    """The in-memory category tree; queries only when the categories changed (None if the DB is down)."""
+    return category_tree.snapshot(_load_category_rows)
 
 
-            for product in products:
-                cursor.execute('''
-                    SELECT image_url, is_primary, sort_order
-                    FROM product_images
-                    WHERE product_id = %s
-                    ORDER BY is_primary DESC, sort_order ASC
-                ''', (product['id'],))
-                product['all_images'] = cursor.fetchall()
+def _invalidate_categories():
+    """Call after committing any change to the categories table."""
+    category_tree.invalidate()
+    if SEARCH_SUGGEST_REBUILD_SECONDS <= 0:
+        return
+    try:
+        with db_cursor() as cursor:
+            change = load_categories_change(cursor)
+        suggestion_index.publish(change)
+    except Exception as err:
+        print(f"[SUGGEST] Could not refresh categories: {err}")
 
-            cursor.close()
-            conn.close()
-        except Exception as err:
-            print(f"Error fetching products: {err}")
-            if conn:
-                conn.close()
 
-    return render_template('pages/index.html', products=products)
+def _load_home_products():
+    conn = get_db()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+        cursor.execute('''
+            SELECT
+                p.id,
+                p.name,
+                p.price,
+                p.slug,
+                c.name as category_name,
+                c.slug as category_slug,
+                pi.image_url,
+                COALESCE(ps.avg_rating, 0) as avg_rating,
+                COALESCE(ps.review_count, 0) as review_count,
+                COALESCE(ps.sold_count, 0) as sold_count
+            FROM products p
+            LEFT JOIN categories c ON p.category_id = c.id
+            LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
+            LEFT JOIN product_stats ps ON ps.product_id = p.id
+            WHERE p.is_active::int = 1
+            ORDER BY p.created_at DESC
+            LIMIT 20
+        ''')
+        products = cursor.fetchall()
+
+        for product in products:
+            product['all_images'] = []
+        if products:
+            by_id = {product['id']: product for product in products}
+            cursor.execute('''
+                SELECT product_id, image_url, is_primary, sort_order
+                FROM product_images
+                WHERE product_id = ANY(%s)
+                ORDER BY product_id, is_primary DESC, sort_order ASC
+            ''', (list(by_id),))
+            for image in cursor.fetchall():
+                by_id[image.pop('product_id')]['all_images'].append(image)
+
+        cursor.close()
+        conn.close()
+        return products
+    except Exception as err:
+        print(f"Error fetching products: {err}")
+        if conn:
+            conn.close()
+        return None
 
-@app.route('/product/<int:product_id>')
-def product_page(product_id):
 
+@app.route('/')
+def index():
     if session.get('logged_in') and session.get('role') == 'buyer':
         if get_current_buyer_approval_status() != 'approved':
             return redirect(url_for('buyer_dashboard'))
 
-    user_first_name = None
-    if session.get('logged_in') and session.get('user_id'):
-        conn_user = get_db()
-        if conn_user:
-            try:
-                cursor_user = conn_user.cursor()
-                cursor_user.execute('SELECT first_name FROM users WHERE id = %s', (session.get('user_id'),))
-                user_data = cursor_user.fetchone()
-                if user_data:
-                    user_first_name = user_data['first_name']
-                cursor_user.close()
-                conn_user.close()
-            except:
-                pass
+    def render():
+        products = _page_data('home', [HOME_SCOPE], _load_home_products)
+        return render_template('pages/index.html', products=products or [])
+
+    return _page_response('home', [HOME_SCOPE], render)
 
+
+def _load_product_page(product_id):
+    """Everything product.html shows about ``product_id``, or None if it isn't on sale."""
     conn = get_db()
-    product = None
+    if not conn:
+        return None
+
     sizes = []
     colors = []
-    images = []
     stock_map = {}
+    try:
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-    if conn:
-        try:
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.execute('''
+            SELECT
+                p.id,
+                p.name,
+                p.description,
+                p.price,
+                p.brand,
+                p.seller_id,
+                c.name as category_name,
+                pi.image_url,
+                s.store_name,
+                u.first_name as seller_name,
+                COALESCE(ps.avg_rating, 0) as avg_rating,
+                COALESCE(ps.review_count, 0) as review_count,
+                COALESCE(ps.sold_count, 0) as sold_count
+            FROM products p
+            LEFT JOIN categories c ON p.category_id = c.id
+            LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
+            LEFT JOIN sellers s ON p.seller_id = s.id
+            LEFT JOIN users u ON s.user_id = u.id
+            LEFT JOIN product_stats ps ON ps.product_id = p.id
+            WHERE p.id = %s AND p.is_active::int = 1
+            AND (p.archive_status IS NULL OR p.archive_status = 'active')
+            LIMIT 1
+        ''', (product_id,))
 
+        product = cursor.fetchone()
+        if not product:
+            cursor.close()
+            conn.close()
+            return None
 
-            cursor.execute('''
-                SELECT
-                    p.id,
-                    p.name,
-                    p.description,
-                    p.price,
-                    p.brand,
-                    p.seller_id,
-                    c.name as category_name,
-                    pi.image_url,
-                    s.store_name,
-                    u.first_name as seller_name,
-                    COALESCE(AVG(r.rating), 0) as avg_rating,
-                    COUNT(DISTINCT r.id) as review_count,
-                    COALESCE(SUM(oi.quantity), 0) as sold_count
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.id
-                LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
-                LEFT JOIN sellers s ON p.seller_id = s.id
-                LEFT JOIN users u ON s.user_id = u.id
-                LEFT JOIN reviews r ON p.id = r.product_id AND r.is_approved::int = 1
-                LEFT JOIN order_items oi ON p.id = oi.product_id
-                LEFT JOIN orders o ON oi.order_id = o.id AND o.order_status IN ('delivered', 'completed')
-                WHERE p.id = %s AND p.is_active::int = 1
-                AND (p.archive_status IS NULL OR p.archive_status = 'active')
-                GROUP BY p.id, p.name, p.description, p.price, p.brand, p.seller_id, 
-                         c.name, pi.image_url, s.store_name, u.first_name
-            ''', (product_id,))
+        cursor.execute('''
+            SELECT image_url, is_primary
+            FROM product_images
+            WHERE product_id = %s
+            ORDER BY is_primary DESC, id ASC
+        ''', (product_id,))
 
-            product = cursor.fetchone()
+        images = cursor.fetchall()
 
-            if product:
 
-                cursor.execute('''
-                    SELECT image_url, is_primary
-                    FROM product_images
-                    WHERE product_id = %s
-                    ORDER BY is_primary DESC, id ASC
-                ''', (product_id,))
+        cursor.execute('''
+            SELECT size, color, stock_quantity
+            FROM product_variants
+            WHERE product_id = %s AND is_active::int = 1
+            ORDER BY size, color
+        ''', (product_id,))
 
-                images = cursor.fetchall()
+        variants = cursor.fetchall()
 
+        sizes = sorted(list(set([v['size'] for v in variants if v['size']])))
+        colors = sorted(list(set([v['color'] for v in variants if v['color']])))
 
-                cursor.execute('''
-                    SELECT size, color, stock_quantity
-                    FROM product_variants
-                    WHERE product_id = %s AND is_active::int = 1
-                    ORDER BY size, color
-                ''', (product_id,))
+        print(f"[DEBUG] Product {product_id}: Found {len(variants)} variants, {len(sizes)} sizes, {len(colors)} colors")
 
-                variants = cursor.fetchall()
+        # Build stock map
+        for v in variants:
+            key = f"{v['size']}_{v['color']}"
+            stock_map[key] = v['stock_quantity']
 
-                sizes = sorted(list(set([v['size'] for v in variants if v['size']])))
-                colors = sorted(list(set([v['color'] for v in variants if v['color']])))
-                
-                print(f"[DEBUG] Product {product_id}: Found {len(variants)} variants, {len(sizes)} sizes, {len(colors)} colors")
-                print(f"[DEBUG] Sizes: {sizes}")
-                print(f"[DEBUG] Colors: {colors}")
-                
-                # Build stock map
-                for v in variants:
-                    key = f"{v['size']}_{v['color']}"
-                    stock_map[key] = v['stock_quantity']
-                
-                # If no variants exist, product has no variations - leave empty
-                if len(variants) == 0:
-                    print(f"[DEBUG] No variants found for product {product_id}. Product has no size/color variations.")
-                    colors = []
-                    sizes = []
-                    stock_map = {'One Size_Standard': 100}  # Default stock for products without variations
+        # If no variants exist, product has no variations - leave empty
+        if len(variants) == 0:
+            colors = []
+            sizes = []
+            stock_map = {'One Size_Standard': 100}  # Default stock for products without variations
 
-            cursor.close()
+        cursor.close()
+        conn.close()
+    except Exception as err:
+        print(f"Error fetching product: {err}")
+        if conn:
             conn.close()
-        except Exception as err:
-            print(f"Error fetching product: {err}")
-            stock_map = {}
-            if conn:
-                conn.close()
-    else:
-        stock_map = {}
+        return None
+
+    return {
+        'product': product,
+        'sizes': sizes,
+        'colors': colors,
+        'images': images,
+        'stock_map': stock_map,
+        'seller_name': product.get('seller_name'),
+        'store_name': product.get('store_name'),
+    }
+
+
+@app.route('/product/<int:product_id>')
+def product_page(product_id):
+
+    if session.get('logged_in') and session.get('role') == 'buyer':
+        if get_current_buyer_approval_status() != 'approved':
+            return redirect(url_for('buyer_dashboard'))
+
+    key = ('product', product_id)
+    scopes = [product_scope(product_id)]
 
-    if not product:
+    def render():
+        page = _page_data(key, scopes, lambda: _load_product_page(product_id))
+        if page is None:
+            return None
+        # The viewer's name comes from the session, never from the shared page data.
+        return render_template('pages/product.html', user_first_name=session.get('first_name'), **page)
+
+    response = _page_response(key, scopes, render)
+    if response is None:
         flash('Product not found', 'error')
         return redirect(url_for('index'))
+    return response
 
-    return render_template('pages/product.html',
-                         product=product,
-                         sizes=sizes,
-                         colors=colors,
-                         images=images,
-                         stock_map=stock_map,
-                         user_first_name=user_first_name,
-                         seller_name=product.get('seller_name') if product else None,
-                         store_name=product.get('store_name') if product else None)
 
-@app.route('/brands/<string:store_slug>')
-def brand_store_page(store_slug):
-    """Public brand store showcasing a seller's catalog."""
+def _load_brand_id(store_slug):
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT id FROM sellers WHERE store_slug = %s AND status = 'approved' LIMIT 1", (store_slug,))
+            row = cursor.fetchone()
+        return row['id'] if row else None
+    except Exception as err:
+        print(f"[ERROR] Failed to resolve brand {store_slug}: {err}")
+        return None
+
+
+def _load_brand_page(seller_id):
+    """The approved seller ``seller_id`` and its live products, or None."""
     conn = get_db()
     if not conn:
-        flash('Unable to load brand right now.', 'error')
-        destination = 'buyer_dashboard' if session.get('logged_in') and session.get('role') == 'buyer' else 'index'
-        return redirect(url_for(destination))
+        return None
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -1269,17 +1983,15 @@ def brand_store_page(store_slug):
             SELECT id, user_id, store_name, store_slug, description, logo_url, address,
                    city, province, island_group, rating, total_sales
             FROM sellers
-            WHERE store_slug = %s AND status = 'approved'
+            WHERE id = %s AND status = 'approved'
             LIMIT 1
-        ''', (store_slug,))
+        ''', (seller_id,))
 
         brand = cursor.fetchone()
         if not brand:
             cursor.close()
             conn.close()
-            flash('Brand not found.', 'error')
-            destination = 'buyer_dashboard' if session.get('logged_in') and session.get('role') == 'buyer' else 'index'
-            return redirect(url_for(destination))
+            return None
 
         cursor.execute('''
             SELECT
@@ -1289,20 +2001,17 @@ def brand_store_page(store_slug):
                 p.price,
                 p.brand,
                 pi.image_url,
-                COALESCE(AVG(r.rating), 0) as avg_rating,
-                COUNT(DISTINCT r.id) as review_count,
-                COALESCE(SUM(oi.quantity), 0) as sold_count,
-                MAX(p.created_at) as created_at
+                COALESCE(ps.avg_rating, 0) as avg_rating,
+                COALESCE(ps.review_count, 0) as review_count,
+                COALESCE(ps.sold_count, 0) as sold_count,
+                p.created_at
             FROM products p
             LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
-            LEFT JOIN reviews r ON p.id = r.product_id AND r.is_approved::int = 1
-            LEFT JOIN order_items oi ON p.id = oi.product_id
-            LEFT JOIN orders o ON o.id = oi.order_id AND o.order_status IN ('delivered', 'completed')
+            LEFT JOIN product_stats ps ON ps.product_id = p.id
             WHERE p.seller_id = %s
               AND p.is_active::int = 1
               AND (p.archive_status IS NULL OR p.archive_status = 'active')
-            GROUP BY p.id, p.name, p.description, p.price, p.brand, pi.image_url
-            ORDER BY created_at DESC
+            ORDER BY p.created_at DESC
         ''', (brand['id'],))
 
         products = cursor.fetchall()
@@ -1310,42 +2019,115 @@ def brand_store_page(store_slug):
 
         cursor.close()
         conn.close()
+    except Exception as err:
+        print(f"[ERROR] Failed to load brand store: {err}")
+        if conn:
+            conn.close()
+        return None
 
-        if brand.get('rating') is not None:
-            brand['rating'] = float(brand['rating'])
-        if brand.get('total_sales') is not None:
-            brand['total_sales'] = float(brand['total_sales'])
-        brand['product_count'] = len(products)
+    if brand.get('rating') is not None:
+        brand['rating'] = float(brand['rating'])
+    if brand.get('total_sales') is not None:
+        brand['total_sales'] = float(brand['total_sales'])
+    brand['product_count'] = len(products)
 
-        for product in products:
-            product['price'] = float(product['price']) if product.get('price') is not None else 0
-            product['avg_rating'] = float(product['avg_rating']) if product.get('avg_rating') is not None else 0
-            product['sold_count'] = int(product.get('sold_count') or 0)
-            product['review_count'] = int(product.get('review_count') or 0)
+    for product in products:
+        product['price'] = float(product['price']) if product.get('price') is not None else 0
+        product['avg_rating'] = float(product['avg_rating']) if product.get('avg_rating') is not None else 0
+        product['sold_count'] = int(product.get('sold_count') or 0)
+        product['review_count'] = int(product.get('review_count') or 0)
+
+    brand['owner_user_id'] = brand.get('user_id')
+    return {'brand': brand, 'products': products}
 
-        brand['owner_user_id'] = brand.get('user_id')
 
+@app.route('/brands/<string:store_slug>')
+def brand_store_page(store_slug):
+    """Public brand store showcasing a seller's catalog."""
+    seller_id = _page_data(('brand-slug', store_slug), [BRANDS_SCOPE], lambda: _load_brand_id(store_slug))
+
+    key = ('brand', seller_id)
+    scopes = [brand_scope(seller_id)] if seller_id else []
+
+    def render():
+        page = _page_data(key, scopes, lambda: _load_brand_page(seller_id)) if seller_id else None
+        if page is None or page['brand'].get('store_slug') != store_slug:
+            return None
         viewer_info = {
             'id': session.get('user_id'),
             'role': session.get('role'),
             'is_logged_in': bool(session.get('logged_in'))
         }
+        return render_template('pages/brand_store.html', brand=page['brand'], products=page['products'], viewer=viewer_info)
 
-        return render_template('pages/brand_store.html', brand=brand, products=products, viewer=viewer_info)
-
-    except Exception as err:
-        print(f"[ERROR] Failed to render brand store: {err}")
-        if conn:
-            conn.close()
-        flash('Unable to load brand right now.', 'error')
+    response = _page_response(key, scopes, render) if seller_id else None
+    if response is None:
+        flash('Brand not found.', 'error')
         destination = 'buyer_dashboard' if session.get('logged_in') and session.get('role') == 'buyer' else 'index'
         return redirect(url_for(destination))
+    return response
+
+
+@app.route('/admin/cache-stats', methods=['GET'])
+def admin_cache_stats():
+    """Hit/miss counters for the in-process caches of this worker."""
+    if not session.get('logged_in') or session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Access denied'}), 403
+
+    caches = {
+        'psgc': dict(_PSGC_CACHE.stats),
+        'postal_codes': dict(_POSTAL_CODE_CACHE.stats),
+    }
+    if access_state_cache is not None:
+        caches['access_state'] = dict(access_state_cache.stats, hit_ratio=round(access_state_cache.hit_ratio(), 4))
+    if page_caches is not None:
+        caches['pages'] = page_caches.snapshot()
+    return jsonify({'success': True, 'pid': os.getpid(), 'caches': caches}), 200
 
 
 def _chat_error(message, status_code=400):
     return jsonify({'success': False, 'error': message}), status_code
 
 
+_STORE_MESSAGES_READY = False
+
+
+def ensure_store_messages_table(cursor):
+    """Create ``store_messages`` and its thread index once per process.
+
+    Chat pages page through a thread by id, so (seller_id, buyer_id, id)
+    turns every poll into a single index range scan.
+    """
+    global _STORE_MESSAGES_READY
+    if _STORE_MESSAGES_READY:
+        return True
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS store_messages (
+                id SERIAL PRIMARY KEY,
+                seller_id INT NOT NULL REFERENCES sellers(id) ON DELETE CASCADE,
+                buyer_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                sender_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                sender_role VARCHAR(20) NOT NULL DEFAULT 'buyer',
+                message TEXT NOT NULL,
+                is_read BOOLEAN DEFAULT FALSE,
+                read_at TIMESTAMP NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_store_messages_thread ON store_messages (seller_id, buyer_id, id)')
+        cursor.connection.commit()
+        _STORE_MESSAGES_READY = True
+        return True
+    except Exception as err:
+        print(f"[CHAT] Unable to ensure store_messages table: {err}")
+        try:
+            cursor.connection.rollback()
+        except Exception:
+            pass
+        return False
+
+
 @app.route('/messages')
 def messaging_page():
     if not session.get('logged_in'):
@@ -1389,7 +2171,7 @@ def messaging_page():
                 SELECT message, sender_role, created_at
                 FROM store_messages
                 WHERE seller_id = %s AND buyer_id = %s
-                ORDER BY created_at DESC, id DESC
+                ORDER BY id DESC
                 LIMIT 1
             ''', (row['id'], viewer_id))
             last_msg = cursor.fetchone()
@@ -1496,37 +2278,40 @@ def _should_enforce_account_access():
     """Skip enforcement for endpoints that must remain reachable."""
     endpoint = (request.endpoint or '').strip()
     path = (request.path or '').strip()
-    if endpoint in {'static', 'login', 'signup', 'logout', 'account_restricted'}:
+    if endpoint in {'static', 'static_asset', 'login', 'signup', 'logout', 'account_restricted'}:
         return False
-    if path.startswith('/static/'):
+    if path.startswith(('/static/', '/assets/')):
         return False
     return True
 
 
 def _get_user_access_row(user_id: int):
-    conn = get_db()
-    if not conn:
-        return None
+    if access_state_cache is None:
+        return _load_user_access_row(user_id)
+    return access_state_cache.get_or_load(user_id, lambda: _load_user_access_row(user_id))
+
+
+def _invalidate_user_access(user_id):
+    """Call after committing a change to a user's status, approval or session_version."""
+    if access_state_cache is not None and user_id:
+        access_state_cache.invalidate(int(user_id))
+
+
+def _load_user_access_row(user_id: int):
     try:
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cursor.execute('''
-            SELECT id, email, role,
-                   COALESCE(account_status, 'active') AS account_status,
-                   restriction_until,
-                   restriction_reason,
-                   COALESCE(session_version, 0) AS session_version
-            FROM users
-            WHERE id = %s
-        ''', (user_id,))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return row
+        with db_cursor() as cursor:
+            cursor.execute('''
+                SELECT id, email, role,
+                       COALESCE(account_status, 'active') AS account_status,
+                       restriction_until,
+                       restriction_reason,
+                       COALESCE(session_version, 0) AS session_version,
+                       buyer_approval_status
+                FROM users
+                WHERE id = %s
+            ''', (user_id,))
+            return cursor.fetchone()
     except Exception:
-        try:
-            conn.close()
-        except Exception:
-            pass
         return None
 
 
@@ -1557,6 +2342,7 @@ def _maybe_auto_unrestrict(user_id: int, access_row: dict):
                 conn.commit()
                 cur.close()
                 conn.close()
+                _invalidate_user_access(user_id)
                 access_row['account_status'] = 'active'
                 access_row['restriction_until'] = None
                 access_row['restriction_reason'] = None
@@ -1585,10 +2371,11 @@ def _handle_access_block(status: str):
 
 
 def enforce_account_access_if_needed():
-    if not session.get('logged_in'):
-        return None
+    # Exempt paths first: reading the session adds Vary: Cookie, which keeps shared caches off assets.
     if not _should_enforce_account_access():
         return None
+    if not session.get('logged_in'):
+        return None
 
     user_id = session.get('user_id')
     if not user_id:
@@ -1650,203 +2437,6 @@ def _notify_account_access_change(email: str, new_status: str, reason: str | Non
         return False
 
 
-def ensure_admin_commission_tables(cursor):
-    """Idempotently ensure commission withdrawal tables exist for legacy DBs."""
-    # Some deployments use MyISAM or have missing FK targets; create tables in a
-    # tolerant way so reporting can still function.
-    try:
-        cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_withdrawals (
-            id SERIAL PRIMARY KEY,
-            start_date DATE NOT NULL,
-            end_date DATE NOT NULL,
-            amount DECIMAL(12,2) NOT NULL,
-            claimed_by INT NULL,
-            claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            notes VARCHAR(255),
-            FOREIGN KEY (claimed_by) REFERENCES users(id) ON DELETE SET NULL
-        )''')
-    except Exception:
-        cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_withdrawals (
-            id SERIAL PRIMARY KEY,
-            start_date DATE NOT NULL,
-            end_date DATE NOT NULL,
-            amount DECIMAL(12,2) NOT NULL,
-            claimed_by INT NULL,
-            claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            notes VARCHAR(255)
-        )''')
-
-    # Drop old uniq_range constraint if present.
-    try:
-        cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname='public' AND tablename='admin_commission_withdrawals' AND indexname='uniq_range'")
-        rows = cursor.fetchall() or []
-        if rows:
-            cursor.execute('DROP INDEX IF EXISTS uniq_range')
-    except Exception:
-        pass
-
-    try:
-        cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_withdrawal_orders (
-            id SERIAL PRIMARY KEY,
-            withdrawal_id INT NOT NULL,
-            order_id INT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT uniq_order UNIQUE (order_id),
-            FOREIGN KEY (withdrawal_id) REFERENCES admin_commission_withdrawals(id) ON DELETE CASCADE,
-            FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
-        )''')
-    except Exception:
-        cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_withdrawal_orders (
-            id SERIAL PRIMARY KEY,
-            withdrawal_id INT NOT NULL,
-            order_id INT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT uniq_order UNIQUE (order_id)
-        )''')
-
-
-def _get_table_columns(cursor, table_name: str):
-    try:
-        cursor.execute(
-            "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s",
-            (table_name,)
-        )
-        rows = cursor.fetchall() or []
-        return {str(r.get('column_name') or '').lower() for r in rows if r.get('column_name')}
-    except Exception:
-        return set()
-
-
-def _pick_existing_column(columns_lower: set, candidates: list[str]):
-    for candidate in candidates:
-        if candidate.lower() in columns_lower:
-            return candidate
-    return None
-
-
-def ensure_admin_commission_ledger_tables(cursor):
-    """Ledger persists per-item commissions so reporting/withdrawals are fully audit-ready."""
-    cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_ledger (
-        id SERIAL PRIMARY KEY,
-        order_id INT NOT NULL,
-        order_number VARCHAR(64) NULL,
-        order_created_at TIMESTAMP NULL,
-        order_completed_at TIMESTAMP NULL,
-        order_status VARCHAR(32) NULL,
-        seller_id INT NOT NULL,
-        order_item_id INT NOT NULL,
-        product_name VARCHAR(255) NULL,
-        quantity INT NOT NULL DEFAULT 0,
-        item_subtotal DECIMAL(12,2) NOT NULL DEFAULT 0.00,
-        commission_rate DECIMAL(7,3) NOT NULL DEFAULT 0.000,
-        commission_amount DECIMAL(12,2) NOT NULL DEFAULT 0.00,
-        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        CONSTRAINT uniq_order_item UNIQUE (order_item_id)
-    )''')
-
-    # Schema upgrades for existing DBs.
-    try:
-        cols = _get_table_columns(cursor, 'admin_commission_ledger')
-        if 'order_completed_at' not in cols:
-            cursor.execute('ALTER TABLE admin_commission_ledger ADD COLUMN IF NOT EXISTS order_completed_at TIMESTAMP NULL')
-        cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname='public' AND tablename='admin_commission_ledger' AND indexname='idx_order_completed_at'")
-        rows = cursor.fetchall() or []
-        if not rows:
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_order_completed_at ON admin_commission_ledger(order_completed_at)')
-    except Exception:
-        pass
-
-
-def backfill_admin_commission_ledger(cursor, start_date: str | None = None, end_date: str | None = None, order_id: int | None = None):
-    """Insert missing ledger rows for completed/delivered orders (schema-tolerant).
-
-    Uses an order *completion* timestamp for date filtering/reporting where possible
-    (shipments.delivered_at -> orders.updated_at -> orders.created_at).
-    """
-    ensure_admin_commission_ledger_tables(cursor)
-
-    orders_cols = _get_table_columns(cursor, 'orders')
-    items_cols = _get_table_columns(cursor, 'order_items')
-    shipments_cols = _get_table_columns(cursor, 'shipments')
-
-    status_col = _pick_existing_column(orders_cols, ['order_status', 'status']) or 'order_status'
-    created_col = _pick_existing_column(orders_cols, ['created_at', 'order_date', 'date_created']) or 'created_at'
-    updated_col = _pick_existing_column(orders_cols, ['updated_at', 'date_updated'])
-    order_number_col = _pick_existing_column(orders_cols, ['order_number', 'reference', 'order_ref'])
-
-    qty_col = _pick_existing_column(items_cols, ['quantity', 'qty']) or 'quantity'
-    subtotal_col = _pick_existing_column(items_cols, ['subtotal', 'total', 'total_price', 'line_total']) or 'subtotal'
-    product_name_col = _pick_existing_column(items_cols, ['product_name', 'name', 'title'])
-
-    # Base filter: orders that represent finalized delivery/receipt.
-    finalized_statuses = ('delivered', 'completed')
-
-    where = [f"o.{status_col} IN (%s, %s)"]
-    params: list = [finalized_statuses[0], finalized_statuses[1]]
-
-    use_shipments_delivered_at = 'delivered_at' in shipments_cols
-    if use_shipments_delivered_at:
-        completed_expr = f"COALESCE(sh.delivered_at, o.{updated_col}, o.{created_col})" if updated_col else f"COALESCE(sh.delivered_at, o.{created_col})"
-        shipments_join = "LEFT JOIN shipments sh ON sh.order_id = o.id"
-    else:
-        completed_expr = f"COALESCE(o.{updated_col}, o.{created_col})" if updated_col else f"o.{created_col}"
-        shipments_join = ""
-
-    if order_id is not None:
-        where.append("o.id = %s")
-        params.append(order_id)
-    elif start_date and end_date:
-        where.append(f"DATE({completed_expr}) BETWEEN %s AND %s")
-        params.extend([start_date, end_date])
-
-    order_number_select = f"o.{order_number_col} AS order_number" if order_number_col else "CAST(o.id AS CHAR) AS order_number"
-    product_name_select = f"oi.{product_name_col} AS product_name" if product_name_col else "NULL AS product_name"
-
-    # Only insert rows not already in ledger.
-    cursor.execute(f'''
-        INSERT INTO admin_commission_ledger (
-            order_id,
-            order_number,
-            order_created_at,
-            order_completed_at,
-            order_status,
-            seller_id,
-            order_item_id,
-            product_name,
-            quantity,
-            item_subtotal,
-            commission_rate,
-            commission_amount
-        )
-        SELECT
-            o.id AS order_id,
-            {order_number_select},
-            o.{created_col} AS order_created_at,
-            {completed_expr} AS order_completed_at,
-            o.{status_col} AS order_status,
-            o.seller_id AS seller_id,
-            oi.id AS order_item_id,
-            {product_name_select},
-            COALESCE(oi.{qty_col}, 0) AS quantity,
-            COALESCE(oi.{subtotal_col}, 0) AS item_subtotal,
-            COALESCE(s.commission_rate, 0) AS commission_rate,
-            (COALESCE(oi.{subtotal_col}, 0) * COALESCE(s.commission_rate, 0)) / 100.0 AS commission_amount
-        FROM orders o
-        {shipments_join}
-        JOIN order_items oi ON oi.order_id = o.id
-        JOIN sellers s ON s.id = o.seller_id
-        LEFT JOIN admin_commission_ledger l ON l.order_item_id = oi.id
-        WHERE {' AND '.join(where)}
-          AND l.order_item_id IS NULL
-    ''', tuple(params))
-
-    try:
-        inserted = int(cursor.rowcount or 0)
-    except Exception:
-        inserted = 0
-    return inserted
-
-
 @app.route('/seller/sales-report', methods=['GET'])
 def seller_sales_report():
     if not _require_role('seller'):
@@ -1889,7 +2479,7 @@ def seller_sales_report():
             JOIN order_items oi ON oi.order_id = o.id
             WHERE o.seller_id = %s
               AND o.order_status = 'delivered'
-              AND DATE(o.created_at) BETWEEN %s AND %s
+              AND o.created_at >= %s::date AND o.created_at < %s::date + 1
             ORDER BY o.created_at DESC, o.id DESC, oi.id ASC
         ''', (seller_id, start_date, end_date))
         rows = cursor.fetchall() or []
@@ -1987,7 +2577,7 @@ def api_seller_sales_report():
             JOIN order_items oi ON oi.order_id = o.id
             WHERE o.seller_id = %s
               AND o.order_status = 'delivered'
-              AND DATE(o.created_at) BETWEEN %s AND %s
+              AND o.created_at >= %s::date AND o.created_at < %s::date + 1
             ORDER BY o.created_at DESC, o.id DESC, oi.id ASC
         ''', (seller_id, start_date, end_date))
         rows = cursor.fetchall() or []
@@ -2061,36 +2651,8 @@ def admin_commission_report():
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        ensure_admin_commission_tables(cursor)
-        ensure_admin_commission_ledger_tables(cursor)
-        reconciled = backfill_admin_commission_ledger(cursor, start_date=start_date, end_date=end_date)
-        # Persist reconciliation inserts for subsequent report loads.
-        try:
-            conn.commit()
-        except Exception:
-            pass
-        if reconciled:
-            flash(f'Reconciled {reconciled} missing completed transactions into the Commission Report.', 'success')
 
-        cursor.execute('''
-            SELECT
-                l.order_id,
-                l.order_number,
-                l.order_created_at,
-                l.order_completed_at,
-                l.order_status,
-                l.order_item_id,
-                l.product_name,
-                l.quantity,
-                l.item_subtotal,
-                l.commission_rate,
-                l.commission_amount
-            FROM admin_commission_ledger l
-            WHERE DATE(COALESCE(l.order_completed_at, l.order_created_at)) BETWEEN %s AND %s
-              AND l.order_status IN ('delivered', 'completed')
-            ORDER BY COALESCE(l.order_completed_at, l.order_created_at) DESC, l.order_id DESC, l.order_item_id ASC
-        ''', (start_date, end_date))
-        item_rows = cursor.fetchall() or []
+        item_rows = load_commission_items(cursor, start_date, end_date)
 
         order_totals = {}
         total_sales = 0.0
@@ -2105,13 +2667,7 @@ def admin_commission_report():
                 order_totals[order_id] = 0.0
             order_totals[order_id] += item_commission
 
-        cursor.execute('''
-            SELECT wo.order_id, w.claimed_at
-            FROM admin_commission_withdrawal_orders wo
-            JOIN admin_commission_withdrawals w ON w.id = wo.withdrawal_id
-        ''')
-        claim_rows = cursor.fetchall() or []
-        claimed_by_order = {row.get('order_id'): row.get('claimed_at') for row in claim_rows if row.get('order_id')}
+        claimed_by_order = load_order_claims(cursor, order_totals.keys())
 
         items = []
         for r in item_rows:
@@ -2206,33 +2762,8 @@ def api_admin_commission_report():
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        ensure_admin_commission_tables(cursor)
-        ensure_admin_commission_ledger_tables(cursor)
-        reconciled = backfill_admin_commission_ledger(cursor, start_date=start_date, end_date=end_date)
-        try:
-            conn.commit()
-        except Exception:
-            pass
 
-        cursor.execute('''
-            SELECT
-                l.order_id,
-                l.order_number,
-                l.order_created_at,
-                l.order_completed_at,
-                l.order_status,
-                l.order_item_id,
-                l.product_name,
-                l.quantity,
-                l.item_subtotal,
-                l.commission_rate,
-                l.commission_amount
-            FROM admin_commission_ledger l
-            WHERE DATE(COALESCE(l.order_completed_at, l.order_created_at)) BETWEEN %s AND %s
-              AND l.order_status IN ('delivered', 'completed')
-            ORDER BY COALESCE(l.order_completed_at, l.order_created_at) DESC, l.order_id DESC, l.order_item_id ASC
-        ''', (start_date, end_date))
-        item_rows = cursor.fetchall() or []
+        item_rows = load_commission_items(cursor, start_date, end_date)
 
         order_totals = {}
         total_sales = 0.0
@@ -2247,13 +2778,7 @@ def api_admin_commission_report():
                 order_totals[order_id] = 0.0
             order_totals[order_id] += item_commission
 
-        cursor.execute('''
-            SELECT wo.order_id, w.claimed_at
-            FROM admin_commission_withdrawal_orders wo
-            JOIN admin_commission_withdrawals w ON w.id = wo.withdrawal_id
-        ''')
-        claim_rows = cursor.fetchall() or []
-        claimed_by_order = {row.get('order_id'): row.get('claimed_at') for row in claim_rows if row.get('order_id')}
+        claimed_by_order = load_order_claims(cursor, order_totals.keys())
 
         items = []
         for r in item_rows:
@@ -2306,7 +2831,6 @@ def api_admin_commission_report():
             'success': True,
             'start_date': start_date,
             'end_date': end_date,
-            'reconciled': int(reconciled or 0),
             'totals': totals,
             'items': items,
             'withdrawals': withdrawals,
@@ -2339,23 +2863,9 @@ def admin_record_commission_withdrawal():
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        ensure_admin_commission_tables(cursor)
-        ensure_admin_commission_ledger_tables(cursor)
-        backfill_admin_commission_ledger(cursor, start_date=start_date, end_date=end_date)
         claimed_by = session.get('user_id')
 
-        cursor.execute('''
-            SELECT l.order_id,
-                   COALESCE(SUM(l.commission_amount), 0) AS order_commission
-            FROM admin_commission_ledger l
-            LEFT JOIN admin_commission_withdrawal_orders wo ON wo.order_id = l.order_id
-                        WHERE DATE(COALESCE(l.order_completed_at, l.order_created_at)) BETWEEN %s AND %s
-              AND l.order_status IN ('delivered', 'completed')
-              AND wo.order_id IS NULL
-            GROUP BY l.order_id
-            HAVING order_commission > 0
-        ''', (start_date, end_date))
-        unclaimed_orders = cursor.fetchall() or []
+        unclaimed_orders = load_unclaimed_order_commissions(cursor, start_date, end_date)
         if not unclaimed_orders:
             cursor.close()
             conn.close()
@@ -2382,21 +2892,15 @@ def admin_record_commission_withdrawal():
         cursor.execute('''
             INSERT INTO admin_commission_withdrawals (start_date, end_date, amount, claimed_by)
             VALUES (%s, %s, %s, %s)
+            RETURNING id
         ''', (start_date, end_date, amount, claimed_by))
-        withdrawal_id = cursor.lastrowid
+        withdrawal_id = cursor.fetchone()['id']
 
-        placeholders = ','.join(['%s'] * len(order_ids))
-        cursor.execute(f'''
+        # A concurrent withdrawal that claimed any of these orders first trips uniq_order.
+        cursor.execute('''
             INSERT INTO admin_commission_withdrawal_orders (withdrawal_id, order_id)
-            SELECT %s AS withdrawal_id, l.order_id
-            FROM (
-                SELECT DISTINCT order_id
-                FROM admin_commission_ledger
-                WHERE order_id IN ({placeholders})
-            ) l
-            LEFT JOIN admin_commission_withdrawal_orders wo ON wo.order_id = l.order_id
-            WHERE wo.order_id IS NULL
-        ''', tuple([withdrawal_id] + order_ids))
+            SELECT %s, order_id FROM UNNEST(%s::int[]) AS claimed(order_id)
+        ''', (withdrawal_id, order_ids))
 
         conn.commit()
         cursor.close()
@@ -2437,23 +2941,9 @@ def api_admin_record_commission_withdrawal():
 
     try:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        ensure_admin_commission_tables(cursor)
-        ensure_admin_commission_ledger_tables(cursor)
-        backfill_admin_commission_ledger(cursor, start_date=start_date, end_date=end_date)
         claimed_by = session.get('user_id')
 
-        cursor.execute('''
-            SELECT l.order_id,
-                   COALESCE(SUM(l.commission_amount), 0) AS order_commission
-            FROM admin_commission_ledger l
-            LEFT JOIN admin_commission_withdrawal_orders wo ON wo.order_id = l.order_id
-            WHERE DATE(COALESCE(l.order_completed_at, l.order_created_at)) BETWEEN %s AND %s
-              AND l.order_status IN ('delivered', 'completed')
-              AND wo.order_id IS NULL
-            GROUP BY l.order_id
-            HAVING order_commission > 0
-        ''', (start_date, end_date))
-        unclaimed_orders = cursor.fetchall() or []
+        unclaimed_orders = load_unclaimed_order_commissions(cursor, start_date, end_date)
 
         order_ids = [row['order_id'] for row in unclaimed_orders if row.get('order_id')]
         if not order_ids:
@@ -2473,21 +2963,15 @@ def api_admin_record_commission_withdrawal():
         cursor.execute('''
             INSERT INTO admin_commission_withdrawals (start_date, end_date, amount, claimed_by)
             VALUES (%s, %s, %s, %s)
+            RETURNING id
         ''', (start_date, end_date, amount, claimed_by))
-        withdrawal_id = cursor.lastrowid
+        withdrawal_id = cursor.fetchone()['id']
 
-        placeholders = ','.join(['%s'] * len(order_ids))
-        cursor.execute(f'''
+        # A concurrent withdrawal that claimed any of these orders first trips uniq_order.
+        cursor.execute('''
             INSERT INTO admin_commission_withdrawal_orders (withdrawal_id, order_id)
-            SELECT %s AS withdrawal_id, l.order_id
-            FROM (
-                SELECT DISTINCT order_id
-                FROM admin_commission_ledger
-                WHERE order_id IN ({placeholders})
-            ) l
-            LEFT JOIN admin_commission_withdrawal_orders wo ON wo.order_id = l.order_id
-            WHERE wo.order_id IS NULL
-        ''', tuple([withdrawal_id] + order_ids))
+            SELECT %s, order_id FROM UNNEST(%s::int[]) AS claimed(order_id)
+        ''', (withdrawal_id, order_ids))
 
         conn.commit()
         cursor.close()
@@ -2521,6 +3005,32 @@ def api_admin_record_commission_withdrawal():
         }), 409
 
 
+@app.route('/admin/query-profile', methods=['GET', 'POST'])
+def admin_query_profile():
+    """Worst routes by SQL time, repeated statements and slow queries seen by this worker."""
+    if not _require_role('admin'):
+        return redirect(url_for('login'))
+    if request.method == 'POST':
+        query_profiler.reset()
+        flash('Query profile cleared for this worker.', 'success')
+        return redirect(url_for('admin_query_profile'))
+
+    report = query_profiler.report()
+    for row in report['slow_queries']:
+        row['at_time'] = datetime.fromtimestamp(row['at'], tz=timezone.utc)
+    return render_template(
+        'pages/admin_query_profile.html',
+        enabled=query_profiler.enabled,
+        sample_rate=query_profiler.sample_rate,
+        slow_ms=query_profiler.slow_ms,
+        explain_sample=query_profiler.explain_sample,
+        n_plus_one_threshold=query_profiler.n_plus_one_threshold,
+        started_at=datetime.fromtimestamp(query_profiler.started_at, tz=timezone.utc),
+        pid=os.getpid(),
+        **report,
+    )
+
+
 @app.route('/admin/account-access', methods=['GET', 'POST'])
 def admin_account_access():
     """Admin UI to restrict/ban/unban accounts with audit logging."""
@@ -2626,6 +3136,7 @@ def admin_account_access():
             ))
 
             conn.commit()
+            _invalidate_user_access(target_user_id)
             _notify_account_access_change(target.get('email') or '', new_status, reason, restriction_until)
 
             flash(f"Updated {target.get('email')} to {new_status}.", 'success')
@@ -2796,6 +3307,7 @@ def admin_account_access_action():
         ))
 
         conn.commit()
+        _invalidate_user_access(target_user_id)
         _notify_account_access_change(target.get('email') or '', new_status, reason, restriction_until)
 
         cursor.execute('''
@@ -2890,17 +3402,43 @@ def _handle_brand_chat_get(cursor, brand, viewer_id, viewer_role):
     if (viewer_role or '').lower() != 'buyer' and not _ensure_chat_buyer_exists(cursor, buyer_id):
         return _chat_error('Buyer not found', 404)
 
-    cursor.execute('''
-        SELECT id, seller_id, buyer_id, sender_id, sender_role, message, is_read, read_at, created_at
-        FROM store_messages
-        WHERE seller_id = %s AND buyer_id = %s
-        ORDER BY created_at ASC, id ASC
-    ''', (brand['id'], buyer_id))
+    after_id = request.args.get('after_id', type=int)
+    before_id = request.args.get('before_id', type=int)
+    if after_id is not None and before_id is not None:
+        return _chat_error('Use either after_id or before_id, not both', 400)
+    limit = request.args.get('limit', type=int) or BRAND_CHAT_PAGE_SIZE
+    limit = max(1, min(limit, BRAND_CHAT_MAX_PAGE_SIZE))
+
+    # Keyset pages over (seller_id, buyer_id, id): after_id polls for newer
+    # messages, before_id scrolls back, neither returns the latest page.
+    if after_id is not None:
+        cursor.execute('''
+            SELECT id, seller_id, buyer_id, sender_id, sender_role, message, is_read, read_at, created_at
+            FROM store_messages
+            WHERE seller_id = %s AND buyer_id = %s AND id > %s
+            ORDER BY id ASC
+            LIMIT %s
+        ''', (brand['id'], buyer_id, after_id, limit + 1))
+        rows = cursor.fetchall() or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        before_clause = 'AND id < %s' if before_id is not None else ''
+        params = (brand['id'], buyer_id) + ((before_id,) if before_id is not None else ()) + (limit + 1,)
+        cursor.execute(f'''
+            SELECT id, seller_id, buyer_id, sender_id, sender_role, message, is_read, read_at, created_at
+            FROM store_messages
+            WHERE seller_id = %s AND buyer_id = %s {before_clause}
+            ORDER BY id DESC
+            LIMIT %s
+        ''', params)
+        rows = cursor.fetchall() or []
+        has_more = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
 
-    rows = cursor.fetchall() or []
     serialized = [_serialize_store_message(row, viewer_id) for row in rows]
 
-    return jsonify({
+    response = jsonify({
         'success': True,
         'messages': serialized,
         'brand': {
@@ -2908,8 +3446,18 @@ def _handle_brand_chat_get(cursor, brand, viewer_id, viewer_role):
             'store_name': brand['store_name'],
             'store_slug': brand['store_slug']
         },
-        'buyer_id': buyer_id
+        'buyer_id': buyer_id,
+        'paging': {
+            'limit': limit,
+            'has_more': has_more,
+            'oldest_id': serialized[0]['id'] if serialized else before_id,
+            'newest_id': serialized[-1]['id'] if serialized else after_id
+        }
     })
+    # Pollers revalidate with If-None-Match and get an empty 304 when nothing changed.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 def _handle_brand_chat_post(conn, cursor, brand, viewer_id, viewer_role, payload):
@@ -2937,20 +3485,10 @@ def _handle_brand_chat_post(conn, cursor, brand, viewer_id, viewer_role, payload
     cursor.execute('''
         INSERT INTO store_messages (seller_id, buyer_id, sender_id, sender_role, message)
         VALUES (%s, %s, %s, %s, %s)
+        RETURNING id, seller_id, buyer_id, sender_id, sender_role, message, is_read, read_at, created_at
     ''', (brand['id'], buyer_id, viewer_id, sender_role, message_body))
-
-    new_id = cursor.lastrowid
-    try:
-        conn.commit()
-    except Exception:
-        pass
-    cursor.execute('''
-        SELECT id, seller_id, buyer_id, sender_id, sender_role, message, is_read, read_at, created_at
-        FROM store_messages
-        WHERE id = %s
-        LIMIT 1
-    ''', (new_id,))
     fresh_row = cursor.fetchone()
+    conn.commit()
     serialized = _serialize_store_message(fresh_row, viewer_id)
 
     return jsonify({
@@ -3260,8 +3798,10 @@ def submit_review():
             SET rating = %s, review_count = %s
             WHERE id = %s
         ''', (round(avg_rating, 2), review_count, product_id))
+        refresh_product_review_stats(cursor, product_id)
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -3387,25 +3927,20 @@ def submit_rider_rating():
         cursor.execute('''
             INSERT INTO rider_ratings (rider_id, user_id, order_id, shipment_id, rating, comment)
             VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING id
         ''', (rider_id, user_id, order_id, order['shipment_id'], rating, comment))
 
-        rating_id = cursor.lastrowid
+        rating_id = cursor.fetchone()['id']
+        record_rider_rating(cursor, rating_id)
 
         # Update rider's average rating
-        cursor.execute('''
-            SELECT AVG(rating) as avg_rating, COUNT(*) as count
-            FROM rider_ratings
-            WHERE rider_id = %s
-        ''', (rider_id,))
-
-        stats = cursor.fetchone()
-        avg_rating = float(stats['avg_rating']) if stats['avg_rating'] else 0
+        stats = load_rider_rating_summary(cursor, rider_id)
 
         cursor.execute('''
             UPDATE riders
             SET rating = %s, total_deliveries = %s
             WHERE id = %s
-        ''', (round(avg_rating, 2), stats['count'], rider_id))
+        ''', (round(stats['avg_rating'], 2), stats['total_ratings'], rider_id))
 
         conn.commit()
         cursor.close()
@@ -3497,20 +4032,7 @@ def rider_rating_stats():
             return response, status_code
 
         # Get rating stats
-        cursor.execute('''
-            SELECT 
-                AVG(rating) as avg_rating,
-                COUNT(*) as total_ratings,
-                SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END) as five_star,
-                SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END) as four_star,
-                SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END) as three_star,
-                SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END) as two_star,
-                SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END) as one_star
-            FROM rider_ratings
-            WHERE rider_id = %s
-        ''', (rider['id'],))
-
-        stats = cursor.fetchone() or {}
+        stats = load_rider_rating_summary(cursor, rider['id'])
 
         cursor.execute('''
             SELECT 
@@ -3536,15 +4058,9 @@ def rider_rating_stats():
 
         return jsonify({
             'success': True,
-            'avg_rating': float(stats['avg_rating']) if stats.get('avg_rating') else 0,
-            'total_ratings': stats.get('total_ratings') if stats.get('total_ratings') else 0,
-            'rating_breakdown': {
-                '5': stats.get('five_star') if stats.get('five_star') else 0,
-                '4': stats.get('four_star') if stats.get('four_star') else 0,
-                '3': stats.get('three_star') if stats.get('three_star') else 0,
-                '2': stats.get('two_star') if stats.get('two_star') else 0,
-                '1': stats.get('one_star') if stats.get('one_star') else 0
-            },
+            'avg_rating': stats['avg_rating'],
+            'total_ratings': stats['total_ratings'],
+            'rating_breakdown': stats['breakdown'],
             'reviews': reviews
         }), 200
 
@@ -3578,15 +4094,9 @@ def get_rider_reviews(rider_id):
             return jsonify({'success': False, 'error': 'Rider not found'}), 404
 
         # Get average rating and count
-        cursor.execute('''
-            SELECT AVG(CAST(rating AS DECIMAL(3,1))) as avg_rating, COUNT(*) as total_count
-            FROM rider_ratings
-            WHERE rider_id = %s
-        ''', (rider_id,))
-
-        rating_data = cursor.fetchone()
-        overall_rating = float(rating_data['avg_rating']) if rating_data and rating_data['avg_rating'] else 0
-        total_ratings = int(rating_data['total_count']) if rating_data else 0
+        rating_data = load_rider_rating_summary(cursor, rider_id)
+        overall_rating = rating_data['avg_rating']
+        total_ratings = rating_data['total_ratings']
 
         # Get reviews sorted by latest first
         cursor.execute('''
@@ -3825,6 +4335,7 @@ def place_order():
                 normalized_items.append({
                     'cart_id': cart_item.get('cart_id'),
                     'id': cart_item.get('product_id'),
+                    'variant_id': cart_item.get('variant_id'),
                     'name': cart_item.get('name', 'Product'),
                     'price': price,
                     'quantity': quantity,
@@ -3836,38 +4347,34 @@ def place_order():
             total_amount = subtotal + shipping_fee
 
 
+        address_values = (
+            user_id,
+            f"{shipping.get('firstName', '')} {shipping.get('lastName', '')}".strip(),
+            shipping.get('phone', ''),
+            shipping.get('address', ''),
+            shipping.get('barangay', ''),
+            shipping.get('city', ''),
+            shipping.get('province', ''),
+            shipping.get('postalCode', ''),
+            shipping.get('country', 'Philippines')
+        )
+
         # Only insert/save address if user explicitly wants to save it
         if save_address:
+            # The saved address becomes the default only when the buyer has none yet.
             cursor.execute('''
                 INSERT INTO addresses (
                     user_id, full_name, phone, street_address,
                     barangay, city, province, postal_code, country,
                     address_type, is_default
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'shipping', 0)
-            ''', (
-                user_id,
-                f"{shipping.get('firstName', '')} {shipping.get('lastName', '')}".strip(),
-                shipping.get('phone', ''),
-                shipping.get('address', ''),
-                shipping.get('barangay', ''),
-                shipping.get('city', ''),
-                shipping.get('province', ''),
-                shipping.get('postalCode', ''),
-                shipping.get('country', 'Philippines')
-            ))
-
-            shipping_address_id = cursor.lastrowid
+                ) VALUES (
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, 'shipping',
+                    NOT EXISTS (SELECT 1 FROM addresses WHERE user_id = %s AND is_default::int = 1)
+                )
+                RETURNING id
+            ''', address_values + (user_id,))
+            shipping_address_id = cursor.fetchone()['id']
             billing_address_id = shipping_address_id
-
-            cursor.execute('SELECT COUNT(*) as count FROM addresses WHERE user_id = %s AND is_default::int = 1', (user_id,))
-            result = cursor.fetchone()
-            has_default = result and result['count'] > 0
-            is_default = not has_default
-
-            if is_default:
-                cursor.execute('UPDATE addresses SET is_default = FALSE WHERE user_id = %s', (user_id,))
-
-            cursor.execute('UPDATE addresses SET is_default = %s WHERE id = %s', (is_default, shipping_address_id))
         else:
             # If not saving address, use the default address on file
             cursor.execute('''
@@ -3888,31 +4395,13 @@ def place_order():
                         user_id, full_name, phone, street_address,
                         barangay, city, province, postal_code, country,
                         address_type, is_default
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'shipping', 0)
-                ''', (
-                    user_id,
-                    f"{shipping.get('firstName', '')} {shipping.get('lastName', '')}".strip(),
-                    shipping.get('phone', ''),
-                    shipping.get('address', ''),
-                    shipping.get('barangay', ''),
-                    shipping.get('city', ''),
-                    shipping.get('province', ''),
-                    shipping.get('postalCode', ''),
-                    shipping.get('country', 'Philippines')
-                ))
-                shipping_address_id = cursor.lastrowid
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'shipping', FALSE)
+                    RETURNING id
+                ''', address_values)
+                shipping_address_id = cursor.fetchone()['id']
                 billing_address_id = shipping_address_id
 
 
-
-        seller_id = 1
-        if items and len(items) > 0:
-            cursor.execute('SELECT seller_id FROM products WHERE id = %s', (items[0].get('id'),))
-            product_result = cursor.fetchone()
-            if product_result and product_result.get('seller_id'):
-                seller_id = product_result['seller_id']
-
-
         if payment_method == 'cod':
             payment_status = 'pending'
             payment_method_text = 'Cash on Delivery'
@@ -3925,6 +4414,9 @@ def place_order():
             }.get(payment_method, 'Online Payment')
 
 
+        order_lines = normalize_order_lines(items)
+
+        # The order is owned by the seller of the first line (defaults to seller 1).
         cursor.execute('''
             INSERT INTO orders (
                 order_number, user_id, seller_id,
@@ -3932,50 +4424,44 @@ def place_order():
                 subtotal, shipping_fee, total_amount,
                 payment_method, payment_status, order_status,
                 notes, created_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+            ) VALUES (
+                %s, %s, COALESCE((SELECT seller_id FROM products WHERE id = %s), 1),
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
+            )
+            RETURNING id, seller_id
         ''', (
-            order_number, user_id, seller_id, shipping_address_id, billing_address_id,
+            order_number, user_id, order_lines[0]['product_id'], shipping_address_id, billing_address_id,
             subtotal, shipping_fee, total_amount, payment_method_text, payment_status, 'pending', notes
         ))
+        order_row = cursor.fetchone()
+        order_id = order_row['id']
+        seller_id = order_row['seller_id']
 
-        order_id = cursor.lastrowid
-
-
-        for item in items:
-            product_id = item.get('id')
-            product_name = item.get('name', 'Product')
-            quantity = int(item.get('quantity', 1))
-            unit_price = float(item.get('price', 0))
-            item_subtotal = unit_price * quantity
-            size = item.get('size', '')
-            color = item.get('color', '')
-
-
-            cursor.execute('''
-                INSERT INTO order_items (
-                    order_id, product_id, product_name,
-                    size, color, quantity, unit_price, subtotal
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (order_id, product_id, product_name, size, color, quantity, unit_price, item_subtotal))
-
+        insert_order_items(cursor, order_id, order_lines)
 
-            cursor.execute('UPDATE products SET sales_count = sales_count + %s WHERE id = %s', (quantity, product_id))
+        # Hold stock before anything else locks product rows (lock order: variants, inventory, products).
+        reserved, short_product_ids = reserve_stock(
+            cursor, order_id, user_id, order_lines, STOCK_RESERVATION_TTL_SECONDS
+        )
+        if not reserved:
+            conn.rollback()
+            cursor.close()
+            conn.close()
+            names = ', '.join(sorted({
+                line['product_name'] for line in order_lines if line['product_id'] in short_product_ids
+            })) or 'some items'
+            return jsonify({
+                'success': False,
+                'message': f'Sorry, there is not enough stock left for: {names}. Please update your cart.'
+            }), 409
 
-            # Deduct stock from inventory
-            cursor.execute('''
-                UPDATE inventory 
-                SET stock_quantity = stock_quantity - %s 
-                WHERE product_id = %s AND variant_id IS NULL 
-                LIMIT 1
-            ''', (quantity, product_id))
+        add_sales_counts(cursor, order_lines)
+        sync_order_sales_rollup(cursor, order_id)
 
 
         if selected_cart_ids:
-            placeholders = ','.join(['%s'] * len(selected_cart_ids))
-            cursor.execute(f'''DELETE FROM cart WHERE user_id = %s AND id IN ({placeholders})''',
-                           tuple([user_id] + selected_cart_ids))
-            session['checkout_selection'] = []
-            session.modified = True
+            cursor.execute('''DELETE FROM cart WHERE user_id = %s AND id = ANY(%s)''',
+                           (user_id, list(selected_cart_ids)))
 
 
         cursor.execute('''
@@ -3986,7 +4472,7 @@ def place_order():
         ''', (order_id, payment_method_text, payment_provider, total_amount, 'PHP', 'pending'))
 
 
-        cursor.execute('INSERT INTO shipments (order_id, status, created_at) VALUES (%s, %s, NOW())', (order_id, 'pending'))
+        ensure_order_shipment(cursor, order_id)
 
 
 
@@ -4002,9 +4488,6 @@ def place_order():
             f'Order {order_number} placed with {len(items)} items'
         ))
 
-
-        conn.commit()
-
         # Create notification for seller about new order
         create_seller_notification(
             seller_id=seller_id,
@@ -4012,7 +4495,8 @@ def place_order():
             notification_type='new_order',
             title='New Order Received',
             message=f'New order {order_number} received with {len(items)} item(s). Total: PHP {total_amount:.2f}',
-            priority='high'
+            priority='high',
+            cursor=cursor
         )
 
         # Record order status change in history
@@ -4023,7 +4507,8 @@ def place_order():
             new_status='pending',
             changed_by_user_id=user_id,
             reason='Order placed by customer',
-            notes=f'Order created with {len(items)} items. Order number: {order_number}'
+            notes=f'Order created with {len(items)} items. Order number: {order_number}',
+            cursor=cursor
         )
 
         buyer_email = shipping.get('email', '')
@@ -4037,7 +4522,6 @@ def place_order():
 
         if buyer_email:
             try:
-                from utils.otp_service import OTPService
                 order_email_data = {
                     'items': items,
                     'subtotal': subtotal,
@@ -4046,10 +4530,18 @@ def place_order():
                     'shipping': shipping,
                     'payment_method': payment_method_text
                 }
-                OTPService.send_order_confirmation_email(buyer_email, order_number, order_email_data)
+                # Queued in the checkout transaction; the outbox worker delivers it after commit.
+                OTPService.send_order_confirmation_email(buyer_email, order_number, order_email_data, cursor=cursor)
             except Exception as email_error:
-                print(f"Warning: Could not send order confirmation email: {email_error}")
+                print(f"Warning: Could not queue order confirmation email: {email_error}")
 
+        conn.commit()
+        if email_outbox is not None:
+            email_outbox.wake()
+
+        if selected_cart_ids:
+            session['checkout_selection'] = []
+            session.modified = True
 
         cursor.close()
         conn.close()
@@ -4445,6 +4937,8 @@ def login():
                             account_status = 'active'
                 except Exception:
                     pass
+                # Logging in always starts from the row we just read.
+                _invalidate_user_access(user['id'])
 
                 if account_status == 'banned':
                     cursor.close()
@@ -5307,6 +5801,8 @@ def admin_approve_product(product_id):
         )
         conn.commit()
         print(f"[INFO] admin_approve_product: product {product_id} approved OK")
+        _invalidate_product_pages(cursor, product_id)
+        _refresh_product_suggestion(cursor, product_id)
 
         # Send notification to seller — failure here must NOT roll back the approval
         try:
@@ -5373,6 +5869,8 @@ def admin_reject_product(product_id):
         # Reject the product
         cursor.execute('UPDATE products SET approval_status = %s WHERE id = %s', ('rejected', product_id))
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
+        _refresh_product_suggestion(cursor, product_id)
 
         # Create notification for seller (non-fatal)
         try:
@@ -5454,6 +5952,8 @@ def admin_approve_seller(seller_id):
         conn.commit()
         cursor.close()
         conn.close()
+        _invalidate_brand_pages(seller_id)
+        _refresh_store_suggestion(seller_id)
 
         return jsonify({'success': True, 'message': 'Seller approved successfully'}), 200
 
@@ -5486,6 +5986,8 @@ def admin_reject_seller(seller_id):
         conn.commit()
         cursor.close()
         conn.close()
+        _invalidate_brand_pages(seller_id)
+        _refresh_store_suggestion(seller_id)
 
         return jsonify({'success': True, 'message': 'Seller rejected'}), 200
 
@@ -5707,6 +6209,7 @@ def admin_approve_buyer(buyer_user_id):
         conn.commit()
         cursor.close()
         conn.close()
+        _invalidate_user_access(buyer_user_id)
 
         email_sent = send_buyer_review_email(buyer, 'approved')
         return jsonify({'success': True, 'message': 'Buyer approved successfully', 'email_sent': email_sent}), 200
@@ -5747,6 +6250,7 @@ def admin_reject_buyer(buyer_user_id):
         conn.commit()
         cursor.close()
         conn.close()
+        _invalidate_user_access(buyer_user_id)
 
         email_sent = send_buyer_review_email(buyer, 'rejected')
         return jsonify({'success': True, 'message': 'Buyer rejected', 'email_sent': email_sent}), 200
@@ -5991,6 +6495,8 @@ def admin_approve_edit(edit_id):
             ''', (product_id,))
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
+        _refresh_product_suggestion(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -6140,6 +6646,8 @@ def admin_approve_recovery(request_id):
         ''', (user_id, request_id))
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
+        _refresh_product_suggestion(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -6785,14 +7293,10 @@ def seller_dashboard():
         ''', (seller_id,))
         recent_orders = cursor.fetchall()
 
-        cursor.execute('''
-            SELECT COALESCE(SUM(total_amount), 0) as today_sales
-            FROM orders
-            WHERE seller_id = %s AND DATE(created_at) = CURRENT_DATE
-            AND order_status != 'cancelled'
-        ''', (seller_id,))
-        result = cursor.fetchone()
-        today_sales = result['today_sales'] if result else 0
+        cursor.execute('SELECT CURRENT_DATE AS today')
+        today = cursor.fetchone()['today']
+        daily_revenue = load_seller_daily_revenue(cursor, seller_id, today - timedelta(days=6))
+        today_sales = daily_revenue.get(today, 0)
 
         cursor.execute('''
             SELECT COUNT(*) as pending_count
@@ -6811,32 +7315,18 @@ def seller_dashboard():
         ''', (seller_id,))
         top_products = cursor.fetchall()
 
-        cursor.execute('''
-            SELECT
-                TRIM(TO_CHAR(created_at, 'Day')) as day_name,
-                COALESCE(SUM(total_amount), 0) as daily_sales
-            FROM orders
-            WHERE seller_id = %s
-            AND created_at >= CURRENT_DATE - INTERVAL '6 days'
-            AND order_status != 'cancelled'
-            GROUP BY DATE(created_at), TRIM(TO_CHAR(created_at, 'Day'))
-            ORDER BY DATE(created_at)
-        ''', (seller_id,))
-        weekly_sales_raw = cursor.fetchall()
-
         days_order = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
         weekly_sales = {day: 0 for day in days_order}
 
-        for row in weekly_sales_raw:
-            if row and row.get('day_name'):
-                weekly_sales[row['day_name']] = float(row['daily_sales']) if row['daily_sales'] else 0
+        for sales_date, revenue in daily_revenue.items():
+            weekly_sales[sales_date.strftime('%A')] = float(revenue) if revenue else 0
 
         max_weekly_sales = max(weekly_sales.values()) if weekly_sales.values() else 1
         if max_weekly_sales == 0:
             max_weekly_sales = 1
 
-        cursor.execute('SELECT id, name, slug FROM categories WHERE is_active::int = 1 ORDER BY name')
-        categories = cursor.fetchall()
+        tree = _categories()
+        categories = tree.active_by_name('id', 'name', 'slug') if tree is not None else []
 
         cursor.close()
         conn.close()
@@ -7163,8 +7653,13 @@ def approve_review(review_id):
         conn = get_db()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-        cursor.execute('UPDATE reviews SET is_approved = TRUE WHERE id = %s', (review_id,))
+        cursor.execute('UPDATE reviews SET is_approved = TRUE WHERE id = %s RETURNING product_id', (review_id,))
+        review = cursor.fetchone()
+        if review:
+            refresh_product_review_stats(cursor, review['product_id'])
         conn.commit()
+        if review:
+            _invalidate_product_pages(cursor, review['product_id'])
         cursor.close()
         conn.close()
 
@@ -7182,8 +7677,13 @@ def reject_review(review_id):
         conn = get_db()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
 
-        cursor.execute('DELETE FROM reviews WHERE id = %s', (review_id,))
+        cursor.execute('DELETE FROM reviews WHERE id = %s RETURNING product_id', (review_id,))
+        review = cursor.fetchone()
+        if review:
+            refresh_product_review_stats(cursor, review['product_id'])
         conn.commit()
+        if review:
+            _invalidate_product_pages(cursor, review['product_id'])
         cursor.close()
         conn.close()
 
@@ -7265,6 +7765,7 @@ def seller_restock():
             ''', (quantity, product_id))
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -7360,60 +7861,101 @@ def seller_promotions():
         return jsonify({'success': False, 'error': str(err)}), 500
 
 
-def create_seller_notification(seller_id, order_id, notification_type, title, message, priority='normal'):
-    """Create a notification for seller when order is placed or status changes"""
+def _within_savepoint(statement, savepoint, enabled=True):
+    """Wrap ``statement`` in SAVEPOINT/RELEASE so it is still a single round-trip."""
+    if not enabled:
+        return statement
+    return f"SAVEPOINT {savepoint}; {statement.strip()}; RELEASE SAVEPOINT {savepoint}"
+
+
+def _rollback_savepoint(cursor, savepoint):
     try:
-        conn = get_db()
-        if not conn:
-            print(f"[NOTIFICATION] Failed to create notification: DB connection failed")
-            return False
-        
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+    except Exception as rollback_err:
+        print(f"[DB] Could not roll back to savepoint {savepoint}: {rollback_err}")
+
+
+def create_seller_notification(seller_id, order_id, notification_type, title, message, priority='normal', cursor=None):
+    """Create a notification for seller when order is placed or status changes
+
+    Pass ``cursor`` to write inside the caller's transaction instead of taking
+    (and committing) a lease of its own. The insert then runs under a
+    savepoint so a failure here never aborts the caller's transaction.
+    """
+    conn = None
+    try:
+        if cursor is None:
+            conn = get_db()
+            if not conn:
+                print(f"[NOTIFICATION] Failed to create notification: DB connection failed")
+                return False
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
         # Determine action URL based on notification type
         action_url = f'/seller-dashboard?tab=orders&order_id={order_id}'
         
-        cursor.execute('''
+        # Dashboards connected to /api/seller/events are told once this commits.
+        cursor.execute(_within_savepoint(notify_sql('''
             INSERT INTO seller_notifications (
                 seller_id, order_id, notification_type, title, message,
                 is_read, action_url, priority, created_at
             ) VALUES (%s, %s, %s, %s, %s, FALSE, %s, %s, NOW())
-        ''', (seller_id, order_id, notification_type, title, message, action_url, priority))
+            RETURNING id, seller_id, order_id, notification_type
+        ''', '''json_build_object(
+            'kind', 'notification', 'seller_id', inserted.seller_id, 'order_id', inserted.order_id,
+            'notification_id', inserted.id, 'notification_type', inserted.notification_type
+        )'''), 'seller_notification', conn is None), (seller_id, order_id, notification_type, title, message, action_url, priority))
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        if conn is not None:
+            conn.commit()
+            cursor.close()
+            conn.close()
         
         print(f"[NOTIFICATION] Created {notification_type} notification for seller {seller_id}, order {order_id}")
         return True
     except Exception as e:
         print(f"[NOTIFICATION ERROR] Failed to create notification: {e}")
+        if conn is None and cursor is not None:
+            _rollback_savepoint(cursor, 'seller_notification')
         return False
 
-def record_order_status_change(order_id, seller_id, old_status, new_status, changed_by_user_id, reason='', notes=''):
-    """Record order status change in history table"""
+def record_order_status_change(order_id, seller_id, old_status, new_status, changed_by_user_id, reason='', notes='', cursor=None):
+    """Record order status change in history table
+
+    Pass ``cursor`` to write inside the caller's transaction instead of taking
+    (and committing) a lease of its own. The insert then runs under a
+    savepoint so a failure here never aborts the caller's transaction.
+    """
+    conn = None
     try:
-        conn = get_db()
-        if not conn:
-            print(f"[STATUS HISTORY] Failed to record status change: DB connection failed")
-            return False
-        
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        if cursor is None:
+            conn = get_db()
+            if not conn:
+                print(f"[STATUS HISTORY] Failed to record status change: DB connection failed")
+                return False
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         
-        cursor.execute('''
+        cursor.execute(_within_savepoint(notify_sql('''
             INSERT INTO order_status_history (
                 order_id, seller_id, old_status, new_status, changed_by, reason, notes, created_at
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
-        ''', (order_id, seller_id, old_status, new_status, changed_by_user_id, reason, notes))
+            RETURNING order_id, seller_id, new_status
+        ''', '''json_build_object(
+            'kind', 'order_status', 'seller_id', inserted.seller_id, 'order_id', inserted.order_id,
+            'status', inserted.new_status
+        )'''), 'status_history', conn is None), (order_id, seller_id, old_status, new_status, changed_by_user_id, reason, notes))
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        if conn is not None:
+            conn.commit()
+            cursor.close()
+            conn.close()
         
         print(f"[STATUS HISTORY] Recorded status change for order {order_id}: {old_status} → {new_status}")
         return True
     except Exception as e:
         print(f"[STATUS HISTORY ERROR] Failed to record status change: {e}")
+        if conn is None and cursor is not None:
+            _rollback_savepoint(cursor, 'status_history')
         return False
 
 def fetch_cart_items_for_user(conn, user_id, cart_ids=None):
@@ -7612,61 +8154,41 @@ def _restore_inventory_row(cursor, product_id, variant_id, quantity):
     ''', (product_id, variant_id, quantity))
     return True
 
-def send_email(to_email, subject, html_body):
-    """Send email notification using configured SMTP credentials (or log in dev)."""
-    try:
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-
-        smtp_server = os.getenv('SMTP_SERVER') or os.getenv('MAIL_SERVER') or 'localhost'
-        smtp_port = int(os.getenv('SMTP_PORT') or os.getenv('MAIL_PORT') or '587')
-        sender_email = (
-            os.getenv('SENDER_EMAIL')
-            or os.getenv('SMTP_USERNAME')
-            or os.getenv('MAIL_USERNAME')
-            or os.getenv('MAIL_DEFAULT_SENDER')
-            or 'noreply@varon.com'
-        )
-        smtp_username = os.getenv('SMTP_USERNAME') or os.getenv('MAIL_USERNAME') or sender_email
-        sender_password = (
-            os.getenv('SENDER_PASSWORD')
-            or os.getenv('SMTP_PASSWORD')
-            or os.getenv('MAIL_PASSWORD')
-            or ''
-        )
-        use_tls_setting = os.getenv('SMTP_USE_TLS', os.getenv('MAIL_USE_TLS', 'true'))
-        use_tls = str(use_tls_setting).strip().lower() not in ('false', '0', 'no')
+def send_email(to_email, subject, html_body, cursor=None):
+    """Queue an email on the outbox (or log it in dev); delivery happens off-request.
 
-        dev_mode = (
-            os.getenv('EMAIL_LOG_ONLY', '').strip().lower() == 'true'
-            or (smtp_server in ('localhost', '127.0.0.1') and not sender_password and not os.getenv('MAIL_USERNAME'))
-        )
+    Pass the handler's ``cursor`` to queue inside its transaction so the email
+    only goes out if the handler's work commits.
+    """
+    if email_outbox is not None:
+        return email_outbox.enqueue(to_email, subject, html_body, cursor=cursor)
 
-        if dev_mode:
+    # No outbox (database unavailable at startup): deliver inline as before.
+    try:
+        settings = SMTPSettings.from_env()
+        if settings.log_only:
             print(f"[📧 EMAIL LOG] To: {to_email}")
             print(f"[📧 EMAIL LOG] Subject: {subject}")
             print(f"[📧 EMAIL LOG] Body: {html_body[:400]}...")
             return True
 
-        message = MIMEMultipart('alternative')
-        message['Subject'] = subject
-        message['From'] = sender_email
-        message['To'] = to_email
-        message.attach(MIMEText(html_body, 'html'))
-
-        with smtplib.SMTP(smtp_server, smtp_port, timeout=20) as server:
-            if sender_password:
-                if use_tls:
-                    server.starttls()
-                server.login(smtp_username, sender_password)
-            server.sendmail(sender_email, to_email, message.as_string())
-
+        session_smtp = SMTPSession(settings)
+        try:
+            session_smtp.send(settings.sender, to_email,
+                              build_email_message(settings.sender, to_email, subject, html_body))
+        finally:
+            session_smtp.close()
         return True
     except Exception as e:
         print(f"[⚠️] Email send error: {e}")
         return False
 
+def send_emails(messages, cursor=None):
+    """Queue ``(to_email, subject, html_body)`` tuples in one insert; returns how many were queued."""
+    if email_outbox is not None:
+        return email_outbox.enqueue_many(messages, cursor=cursor)
+    return sum(1 for to_email, subject, html_body in messages if send_email(to_email, subject, html_body))
+
 @app.route('/seller/promotion/create', methods=['POST'])
 def create_promotion():
     """Create a new promotion and notify interested buyers"""
@@ -7769,7 +8291,7 @@ def create_promotion():
         ''', (product_id,))
 
         buyers = cursor.fetchall()
-        emails_sent = 0
+        outgoing = []
 
         print(f"[PROMO CREATE] Found {len(buyers)} buyers to notify")
 
@@ -7804,15 +8326,15 @@ def create_promotion():
                     </html>
                     """
 
-                    if send_email(buyer['email'], email_subject, email_body):
-                        emails_sent += 1
+                    outgoing.append((buyer['email'], email_subject, email_body))
                 except Exception as email_err:
-                    print(f"[PROMO CREATE] Error sending email to {buyer['email']}: {email_err}")
+                    print(f"[PROMO CREATE] Error building email to {buyer['email']}: {email_err}")
 
         cursor.close()
         conn.close()
 
-        print(f"[PROMO CREATE] Success! Emails sent: {emails_sent}")
+        emails_sent = send_emails(outgoing)
+        print(f"[PROMO CREATE] Success! Emails queued: {emails_sent}")
 
         return jsonify({
             'success': True,
@@ -7934,6 +8456,7 @@ def admin_approve_promotion(promo_id):
         ''', (promo_id,))
 
         conn.commit()
+        _invalidate_product_pages(cursor, promo['product_id'])
 
 
         cursor.execute('''
@@ -7962,6 +8485,7 @@ def admin_approve_promotion(promo_id):
             discount_text = f"₱{promo['discount_value']:.2f} OFF"
             discount_color = "#8b5cf6"
 
+        outgoing = []
 
         if seller and seller.get('email'):
             try:
@@ -7987,10 +8511,9 @@ def admin_approve_promotion(promo_id):
                     </body>
                 </html>
                 """
-                send_email(seller['email'], email_subject, email_body)
-                print(f"[PROMO APPROVE] Seller approval email sent to {seller['email']}")
+                outgoing.append((seller['email'], email_subject, email_body))
             except Exception as email_err:
-                print(f"[PROMO APPROVE] Error sending seller email: {email_err}")
+                print(f"[PROMO APPROVE] Error building seller email: {email_err}")
 
 
         if interested_buyers:
@@ -8029,10 +8552,12 @@ def admin_approve_promotion(promo_id):
                             </body>
                         </html>
                         """
-                        send_email(buyer['email'], email_subject, email_body)
-                        print(f"[PROMO APPROVE] Buyer notification sent to {buyer['email']}")
+                        outgoing.append((buyer['email'], email_subject, email_body))
                     except Exception as email_err:
-                        print(f"[PROMO APPROVE] Error sending buyer email: {email_err}")
+                        print(f"[PROMO APPROVE] Error building buyer email: {email_err}")
+
+        queued = send_emails(outgoing)
+        print(f"[PROMO APPROVE] Queued {queued} notification emails for promotion {promo_id}")
 
         return jsonify({
             'success': True,
@@ -8132,40 +8657,18 @@ def seller_sales_analytics():
             return jsonify({'success': False, 'error': 'Seller not found'}), 404
 
 
-        cursor.execute('''
-            SELECT
-                COALESCE(SUM(o.total_amount), 0) as total_revenue,
-                COUNT(DISTINCT o.id) as total_orders,
-                COALESCE(AVG(o.total_amount), 0) as avg_order_value
-            FROM orders o
-            JOIN order_items oi ON o.id = oi.order_id
-            JOIN products p ON oi.product_id = p.id
-            WHERE p.seller_id = %s
-            AND o.created_at >= NOW() - INTERVAL '30 days'
-            AND o.order_status NOT IN ('cancelled', 'failed')
-        ''', (seller['id'],))
-
-        analytics = cursor.fetchone()
-
-
-        cursor.execute('''
-            SELECT
-                p.id,
-                p.name as product_name,
-                SUM(oi.quantity) as quantity_sold,
-                COALESCE(SUM(oi.quantity * oi.unit_price), 0) as product_revenue
-            FROM order_items oi
-            JOIN products p ON oi.product_id = p.id
-            JOIN orders o ON oi.order_id = o.id
-            WHERE p.seller_id = %s
-            AND o.created_at >= NOW() - INTERVAL '30 days'
-            AND o.order_status NOT IN ('cancelled', 'failed')
-            GROUP BY p.id, p.name
-            ORDER BY quantity_sold DESC
-            LIMIT 10
-        ''', (seller['id'],))
+        cursor.execute("SELECT CURRENT_DATE - 29 AS since")
+        since = cursor.fetchone()['since']
+        summary = load_seller_sales_summary(cursor, seller['id'], since)
+        total_orders = int(summary['total_orders']) if summary else 0
+        total_revenue = float(summary['total_revenue']) if summary else 0.0
+        analytics = {
+            'total_revenue': total_revenue,
+            'total_orders': total_orders,
+            'avg_order_value': total_revenue / total_orders if total_orders else 0,
+        }
 
-        top_products = cursor.fetchall()
+        top_products = load_seller_top_products(cursor, seller['id'], since, 10)
 
 
         for product in top_products:
@@ -8216,23 +8719,10 @@ def seller_performance():
             WHERE p.seller_id = %s
         ''', (seller['id'],))
 
-        rating_data = cursor.fetchone()
-
-
-        cursor.execute('''
-            SELECT COUNT(DISTINCT user_id) as repeat_customers
-            FROM (
-                SELECT o.user_id, COUNT(DISTINCT o.id) as order_count
-                FROM orders o
-                JOIN order_items oi ON o.id = oi.order_id
-                JOIN products p ON oi.product_id = p.id
-                WHERE p.seller_id = %s AND o.order_status NOT IN ('cancelled', 'failed')
-                GROUP BY o.user_id
-                HAVING order_count > 1
-            ) repeat_stats
-        ''', (seller['id'],))
+        rating_data = cursor.fetchone()
+
 
-        repeat_data = cursor.fetchone()
+        repeat_customers = count_repeat_customers(cursor, seller['id'])
 
 
         cursor.execute('''
@@ -8245,7 +8735,7 @@ def seller_performance():
             LEFT JOIN reviews r ON p.id = r.product_id
             WHERE p.seller_id = %s
             GROUP BY p.id, p.name
-            HAVING review_count > 0
+            HAVING COUNT(r.id) > 0
             ORDER BY avg_rating DESC, review_count DESC
             LIMIT 10
         ''', (seller['id'],))
@@ -8267,7 +8757,7 @@ def seller_performance():
             'performance': {
                 'avg_rating': float(rating_data['avg_rating']) if rating_data else 0,
                 'total_reviews': int(rating_data['total_reviews']) if rating_data else 0,
-                'repeat_customers': int(repeat_data['repeat_customers']) if repeat_data else 0,
+                'repeat_customers': repeat_customers,
                 'top_rated_products': top_rated or []
             }
         }), 200
@@ -8342,6 +8832,8 @@ def seller_brand_settings():
             conn.commit()
             cursor.close()
             conn.close()
+            _invalidate_brand_pages(seller['id'])
+            _refresh_store_suggestion(seller['id'])
 
             return jsonify({'success': True, 'message': 'Brand settings updated'}), 200
 
@@ -8685,6 +9177,7 @@ def seller_add_product():
 
                         image_url = f"/static/images/products/{unique_filename}"
                         uploaded_images.append(image_url)
+                        image_pipeline.submit(image_url)
         else:
             return jsonify({'error': 'At least one product image is required'}), 400
 
@@ -8836,6 +9329,7 @@ def seller_update_stock():
         ''', (stock_quantity, product_id))
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -8890,6 +9384,8 @@ def seller_archive_product():
         ''', (product_id, seller['id'], reason))
 
         conn.commit()
+        _invalidate_product_pages(cursor, product_id)
+        _refresh_product_suggestion(cursor, product_id)
         cursor.close()
         conn.close()
 
@@ -9077,8 +9573,8 @@ def seller_get_product(product_id):
         ''', (product_id,))
         variants = cursor.fetchall()
 
-        cursor.execute('SELECT id, name FROM categories WHERE is_active::int = 1 ORDER BY name')
-        categories = cursor.fetchall()
+        tree = _categories()
+        categories = tree.active_by_name('id', 'name') if tree is not None else []
 
         cursor.close()
         conn.close()
@@ -9388,7 +9884,7 @@ def check_db_schema():
 
 @app.route('/api/products')
 def api_products():
-    """Get all active products for browsing with optional search and category filter"""
+    """Active products for browsing: ranked search, category/price filters, keyset pages via ?cursor="""
     if session.get('logged_in') and session.get('role') == 'buyer':
         gate = buyer_approval_required_api()
         if gate is not None:
@@ -9417,173 +9913,31 @@ def api_products():
 
         category_filter_ids = []
         if category_ids:
-            expanded_ids = set(category_ids)
-            placeholders = ','.join(['%s'] * len(category_ids))
-            cursor.execute(f"""
-                SELECT id, parent_id
-                FROM categories
-                WHERE id IN ({placeholders})
-            """, tuple(category_ids))
-            selected_categories = cursor.fetchall()
-            parent_ids = [row['id'] for row in selected_categories if not row['parent_id']]
-
-            if parent_ids:
-                parent_placeholders = ','.join(['%s'] * len(parent_ids))
-                cursor.execute(f"""
-                    SELECT id
-                    FROM categories
-                    WHERE parent_id IN ({parent_placeholders}) AND is_active::int = 1
-                """, tuple(parent_ids))
-                child_rows = cursor.fetchall()
-                for child in child_rows:
-                    expanded_ids.add(child['id'])
-
-            category_filter_ids = sorted(expanded_ids)
-
-
-        query = """
-            SELECT
-                p.id,
-                p.name,
-                p.price,
-                p.description,
-                p.category_id,
-                pi.image_url,
-                c.name as category_name,
-                COALESCE(AVG(r.rating), 0) as avg_rating,
-                COUNT(DISTINCT r.id) as review_count,
-                COALESCE(SUM(oi.quantity), 0) as sold_count
-            FROM products p
-            LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
-            LEFT JOIN categories c ON p.category_id = c.id
-            LEFT JOIN reviews r ON p.id = r.product_id AND r.is_approved::int = 1
-            LEFT JOIN order_items oi ON p.id = oi.product_id
-            LEFT JOIN orders o ON oi.order_id = o.id AND o.order_status IN ('delivered', 'completed')
-            WHERE p.is_active::int = 1
-            AND (p.archive_status IS NULL OR p.archive_status = 'active')
-        """
-
-        params = []
-        search_pattern = None
-
-
-        if search:
-            search_pattern = f"%{search}%"
-            query += " AND (p.name LIKE %s OR p.description LIKE %s OR p.brand LIKE %s)"
-            params.extend([search_pattern, search_pattern, search_pattern])
-
-
-        if category_filter_ids:
-            placeholders = ','.join(['%s'] * len(category_filter_ids))
-            query += f" AND p.category_id IN ({placeholders})"
-            params.extend(category_filter_ids)
-
-        query += " GROUP BY p.id, p.name, p.price, p.description, p.category_id, pi.image_url, c.name"
-        query += " ORDER BY p.created_at DESC LIMIT %s"
-        params.append(limit)
-
-        cursor.execute(query, tuple(params))
-        products = cursor.fetchall()
-
-
-        products_list = []
-        for product in products:
-
-            product['price'] = float(product['price']) if product['price'] else 0
-            product['id'] = int(product['id'])
-            product['category_id'] = int(product['category_id']) if product['category_id'] else None
-            products_list.append(product)
+            tree = _categories()
+            category_filter_ids = tree.expand(category_ids) if tree is not None else sorted(set(category_ids))
 
 
+        try:
+            page = product_search.search(
+                cursor,
+                search,
+                limit=limit,
+                category_ids=category_filter_ids,
+                price_band=request.args.get('price_band', type=int),
+                after=request.args.get('cursor') or None,
+            )
+        except ValueError as invalid:
+            cursor.close()
+            conn.close()
+            return jsonify({'success': False, 'error': str(invalid)}), 400
+        products_list = page['products']
         for product in products_list:
-            cursor.execute("""
-                SELECT DISTINCT color
-                FROM product_variants
-                WHERE product_id = %s AND color IS NOT NULL AND color != '' AND stock_quantity > 0
-                ORDER BY color
-            """, (product['id'],))
-            colors = cursor.fetchall()
-            product['colors'] = [c['color'] for c in colors] if colors else []
-
-
-            promotion = None
-            try:
-                cursor.execute("""
-                    SELECT
-                        id,
-                        discount_type,
-                        discount_value,
-                        start_date,
-                        end_date,
-                        description,
-                        code
-                    FROM promotions
-                    WHERE product_id = %s
-                    AND is_active::int = 1
-                    AND is_approved::int = 1
-                    AND start_date <= NOW()
-                    AND end_date >= NOW()
-                    LIMIT 1
-                """, (product['id'],))
-                promotion = cursor.fetchone()
-            except Exception as promo_err:
-
-                print(f"[WARNING] Could not fetch promotions: {promo_err}")
-                promotion = None
-
-            if promotion:
-
-                discount_val = float(promotion['discount_value']) if promotion['discount_value'] else 0
-
-                product['promotion'] = {
-                    'id': promotion['id'],
-                    'discount_type': promotion['discount_type'],
-                    'discount_value': discount_val,
-                    'code': promotion['code'],
-                    'description': promotion['description']
-                }
-
-
-                if promotion['discount_type'] == 'percentage':
-                    product['original_price'] = float(product['price'])
-                    product['discounted_price'] = float(product['price']) * (1 - discount_val / 100)
-                    product['discount_display'] = f"{int(discount_val)}% OFF"
-                else:
-                    product['original_price'] = float(product['price'])
-                    product['discounted_price'] = float(product['price']) - discount_val
-                    product['discount_display'] = f"₱{int(discount_val)} OFF"
-
-                product['price_to_display'] = product['discounted_price']
-            else:
-                product['promotion'] = None
-                product['price_to_display'] = float(product['price'])
+            product['image_card_url'] = image_pipeline.variant_url(product.get('image_url'), 'card')
 
         brand_matches = []
-        if search_pattern:
+        if search and not request.args.get('cursor'):
             try:
-                cursor.execute("""
-                    SELECT
-                        s.id,
-                        s.store_name,
-                        s.store_slug,
-                        s.description,
-                        s.logo_url,
-                        s.island_group,
-                        s.rating,
-                        s.total_sales,
-                        COALESCE(COUNT(DISTINCT CASE
-                            WHEN p.is_active::int = 1 AND (p.archive_status IS NULL OR p.archive_status = 'active') THEN p.id
-                        END), 0) AS product_count,
-                        MAX(p.brand) AS primary_brand
-                    FROM sellers s
-                    LEFT JOIN products p ON p.seller_id = s.id
-                    WHERE s.status = 'approved'
-                      AND (s.store_name LIKE %s OR p.brand LIKE %s)
-                    GROUP BY s.id, s.store_name, s.store_slug, s.description, s.logo_url, s.island_group, s.rating, s.total_sales
-                    ORDER BY product_count DESC, s.store_name ASC
-                    LIMIT 4
-                """, (search_pattern, search_pattern))
-                brand_matches = cursor.fetchall()
+                brand_matches = product_search.brand_matches(cursor, search)
             except Exception as brand_err:
                 print(f"[WARNING] Failed to load brand matches: {brand_err}")
                 brand_matches = []
@@ -9602,7 +9956,9 @@ def api_products():
         return jsonify({
             'success': True,
             'products': products_list,
-            'brands': brand_matches
+            'brands': brand_matches,
+            'facets': page['facets'],
+            'next_cursor': page['next_cursor']
         }), 200
     except Exception as e:
         print(f"[ERROR] /api/products: {e}")
@@ -9613,99 +9969,73 @@ def api_products():
             'error': str(e)
         }), 500
 
-@app.route('/api/categories')
-def api_categories():
-    """Get all active categories organized hierarchically (parent with children)"""
-    try:
-        conn = get_db()
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+@app.route('/api/search/suggest')
+def api_search_suggest():
+    """Search-box suggestions (products, stores, brands, categories) from the in-memory prefix index"""
+    if session.get('logged_in') and session.get('role') == 'buyer':
+        gate = buyer_approval_required_api()
+        if gate is not None:
+            return gate
 
-        # Get all parent categories (where parent_id IS NULL)
-        cursor.execute("""
-            SELECT id, name, slug, category_type, is_active, parent_id
-            FROM categories
-            WHERE is_active::int = 1 AND parent_id IS NULL
-            ORDER BY id ASC
-        """)
-        parent_categories = cursor.fetchall()
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 8, type=int) or 8, MAX_SUGGESTIONS))
+    source = 'index'
+    suggestions = suggestion_index.suggest(query, limit)
+    if suggestions is None:
+        # Index still building in this worker: same shape, straight from the DB.
+        source = 'db'
+        try:
+            with db_cursor() as cursor:
+                suggestions = load_db_suggestions(cursor, query, limit)
+        except Exception as e:
+            print(f"[ERROR] /api/search/suggest: {e}")
+            return jsonify({'success': False, 'error': 'Database connection failed'}), 500
 
-        categories_response = []
-        
-        for parent in parent_categories:
-            # Get child categories for this parent
-            cursor.execute("""
-                SELECT id, name, slug, category_type, parent_id
-                FROM categories
-                WHERE is_active::int = 1 AND parent_id = %s
-                ORDER BY id ASC
-            """, (parent['id'],))
-            children = cursor.fetchall()
-            
-            parent_obj = {
-                'id': parent['id'],
-                'name': parent['name'],
-                'slug': parent['slug'],
-                'category_type': parent['category_type'] or 'general',
-                'parent_id': parent['parent_id'],
-                'children': []
-            }
-            
-            # Add children to parent
-            for child in children:
-                parent_obj['children'].append({
-                    'id': child['id'],
-                    'name': child['name'],
-                    'slug': child['slug'],
-                    'category_type': child['category_type'] or 'general',
-                    'parent_id': child['parent_id']
-                })
-            
-            categories_response.append(parent_obj)
+    results = []
+    for suggestion in suggestions:
+        url = None
+        if suggestion['kind'] == 'product':
+            url = url_for('product_page', product_id=suggestion['id'])
+        elif suggestion['kind'] == 'store' and suggestion.get('slug'):
+            url = url_for('brand_store_page', store_slug=suggestion['slug'])
+        results.append({'kind': suggestion['kind'], 'id': suggestion['id'], 'text': suggestion['text'], 'url': url})
 
-        cursor.close()
-        conn.close()
+    return jsonify({'success': True, 'query': query, 'suggestions': results, 'source': source}), 200
 
-        return jsonify({
-            'success': True,
-            'categories': categories_response
-        }), 200
-    except Exception as e:
-        print(f"[ERROR] Failed to load categories: {str(e)}")
+@app.route('/api/categories')
+def api_categories():
+    """Get all active categories organized hierarchically (parent with children)"""
+    tree = _categories()
+    if tree is None:
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Database connection failed'
         }), 500
 
+    return jsonify({
+        'success': True,
+        'categories': tree.as_response()
+    }), 200
+
 @app.route('/api/categories/<int:category_id>')
 def api_category_detail(category_id):
     """Get specific category details"""
-    try:
-        conn = get_db()
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        
-        cursor.execute("""
-            SELECT id, name, slug, category_type, parent_id, is_active
-            FROM categories
-            WHERE id = %s
-        """, (category_id,))
-        category = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
-        
-        if not category:
-            return jsonify({'success': False, 'error': 'Category not found'}), 404
-        
-        return jsonify({
-            'success': True,
-            'id': category['id'],
-            'name': category['name'],
-            'slug': category['slug'],
-            'category_type': category['category_type'] or 'general',
-            'parent_id': category['parent_id']
-        }), 200
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    tree = _categories()
+    if tree is None:
+        return jsonify({'success': False, 'error': 'Database connection failed'}), 500
+
+    category = tree.nodes.get(category_id)
+    if not category:
+        return jsonify({'success': False, 'error': 'Category not found'}), 404
+
+    return jsonify({
+        'success': True,
+        'id': category['id'],
+        'name': category['name'],
+        'slug': category['slug'],
+        'category_type': category['category_type'],
+        'parent_id': category['parent_id']
+    }), 200
 
 @app.route('/api/seller-products/<int:seller_id>')
 def api_seller_products(seller_id):
@@ -9784,7 +10114,10 @@ def api_user_orders():
 
 @app.route('/api/my-orders')
 def api_my_orders():
-    """Get orders for logged-in user with shipment status mapping"""
+    """Get one page of the logged-in user's orders with shipment status mapping.
+
+    Pass the returned ``paging.next_cursor`` back as ``cursor`` for the next page.
+    """
     gate = buyer_approval_required_api()
     if gate is not None:
         return gate
@@ -9794,26 +10127,13 @@ def api_my_orders():
         cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         user_id = session.get('user_id')
 
+        before_id = request.args.get('cursor', type=int)
+        limit = request.args.get('limit', type=int) or MY_ORDERS_PAGE_SIZE
+        limit = max(1, min(limit, MY_ORDERS_MAX_PAGE_SIZE))
 
-        cursor.execute('''
-            SELECT o.id, o.order_number, o.total_amount, o.order_status, o.payment_status, o.created_at,
-                   COALESCE(s.rider_id, o.rider_id) as rider_id,
-                   u.first_name, u.email,
-                   s.id as shipment_id, s.status as shipment_status, s.delivered_at
-            FROM orders o
-            JOIN users u ON o.user_id = u.id
-            LEFT JOIN shipments s ON o.id = s.order_id
-            WHERE o.user_id = %s
-            ORDER BY o.created_at DESC
-        ''', (user_id,))
-
-        orders = cursor.fetchall()
-
-
-
-
-
-
+        orders, has_more = load_order_history(cursor, user_id, limit, before_id)
+        # Tab badges count the whole history, not just the pages loaded so far.
+        status_counts = count_orders_by_status(cursor, user_id) if before_id is None else None
 
         for order in orders:
             if order.get('total_amount'):
@@ -9856,23 +10176,7 @@ def api_my_orders():
                 order['display_status'] = current_order_status.replace('_', ' ').title()
                 order['status_icon'] = '📋'
 
-
-            cursor.execute('''
-                SELECT oi.id, oi.product_id, oi.quantity, oi.unit_price, oi.subtotal,
-                       p.name as product_name,
-                       COALESCE(pi_primary.image_url, pi_any.image_url) as image_url
-                FROM order_items oi
-                LEFT JOIN products p ON oi.product_id = p.id
-                LEFT JOIN product_images pi_primary ON p.id = pi_primary.product_id AND pi_primary.is_primary::int = 1
-                LEFT JOIN product_images pi_any ON p.id = pi_any.product_id
-                WHERE oi.order_id = %s
-                GROUP BY oi.id, oi.product_id
-            ''', (order['id'],))
-
-            items = cursor.fetchall()
-
-
-            for item in items:
+            for item in order['items']:
                 if item.get('unit_price'):
                     item['unit_price'] = float(item['unit_price'])
                     item['price'] = float(item['unit_price'])
@@ -9881,39 +10185,24 @@ def api_my_orders():
                 if item.get('subtotal'):
                     item['subtotal'] = float(item['subtotal'])
 
-            order['items'] = items
-
-            # Check if product has been reviewed (for first product)
-            if order['items'] and len(order['items']) > 0:
-                first_product_id = order['items'][0]['product_id']
-                cursor.execute('''
-                    SELECT id FROM reviews
-                    WHERE product_id = %s AND user_id = %s AND order_id = %s
-                ''', (first_product_id, user_id, order['id']))
-                order['has_product_review'] = cursor.fetchone() is not None
-            else:
-                order['has_product_review'] = False
-
-            # Check if rider has been rated
-            if order.get('rider_id'):
-                cursor.execute('''
-                    SELECT id FROM rider_ratings
-                    WHERE rider_id = %s AND user_id = %s AND order_id = %s
-                ''', (order['rider_id'], user_id, order['id']))
-                order['has_rider_rating'] = cursor.fetchone() is not None
-            else:
-                order['has_rider_rating'] = False
-
         cursor.close()
         conn.close()
 
 
         orders = convert_decimals_to_float(orders)
 
-        return jsonify({
+        payload = {
             'success': True,
-            'orders': orders
-        }), 200
+            'orders': orders,
+            'paging': {
+                'limit': limit,
+                'has_more': has_more,
+                'next_cursor': orders[-1]['id'] if has_more and orders else None,
+            },
+        }
+        if status_counts is not None:
+            payload['status_counts'] = status_counts
+        return jsonify(payload), 200
 
     except Exception as e:
         return jsonify({
@@ -9978,12 +10267,14 @@ def api_cancel_my_order(order_id):
                 SET order_status = 'cancelled', updated_at = NOW()
                 WHERE id = %s
             ''', (order_id,))
+            sync_order_sales_rollup(cursor, order_id)
 
             cursor.execute('''
                 UPDATE shipments
                 SET status = 'cancelled', updated_at = NOW()
                 WHERE order_id = %s
             ''', (order_id,))
+            release_order_reservations(cursor, order_id)
 
             conn.commit()
 
@@ -10246,13 +10537,9 @@ def api_complete_order():
             SET order_status = 'completed', updated_at = NOW()
             WHERE id = %s
         ''', (order_id,))
-
-        # Persist commission transactions for audit-ready reporting.
-        try:
-            ensure_admin_commission_ledger_tables(cursor)
-            backfill_admin_commission_ledger(cursor, order_id=int(order_id))
-        except Exception as ledger_err:
-            print(f"[WARN] commission ledger record failed for order {order_id}: {ledger_err}")
+        sync_order_product_stats(cursor, order_id)
+        sync_order_sales_rollup(cursor, order_id)
+        record_order_commission(cursor, order_id)
 
         conn.commit()
         cursor.close()
@@ -10296,6 +10583,8 @@ def api_return_order():
             SET order_status = 'return_requested', updated_at = NOW()
             WHERE id = %s
         ''', (order_id,))
+        sync_order_product_stats(cursor, order_id)
+        sync_order_sales_rollup(cursor, order_id)
 
 
 
@@ -10593,6 +10882,7 @@ def upload_profile_picture():
 
 
         image_url = f"/static/images/profiles/{unique_filename}"
+        image_pipeline.submit(image_url)
 
 
         conn = get_db()
@@ -11162,7 +11452,11 @@ def seller_orders():
             filtered_status = status_map.get(status_filter, status_filter)
             query += f" AND o.order_status = '{filtered_status}'"
 
-        query += " GROUP BY o.id ORDER BY o.created_at DESC"
+        query += """
+            GROUP BY o.id, u.first_name, u.last_name, s.status, s.rider_id, s.id,
+                     a.city, a.province, a.postal_code
+            ORDER BY o.created_at DESC
+        """
 
         cursor.execute(query, (seller_id,))
         orders = cursor.fetchall()
@@ -11434,9 +11728,21 @@ def update_order_status():
         """
 
         cursor.execute(update_query, (new_status, order_id))
+        sync_order_product_stats(cursor, order_id)
+        sync_order_sales_rollup(cursor, order_id)
+        if new_status in ('delivered', 'completed'):
+            record_order_commission(cursor, order_id)
 
 
         if new_status == 'confirmed':
+            # Stock held at checkout is simply kept; older orders (or expired holds) deduct now.
+            if not commit_order_reservations(cursor, order_id):
+                success, error_msg = adjust_inventory_for_order(conn, order_id, 'deduct')
+                if not success:
+                    conn.rollback()
+                    cursor.close()
+                    conn.close()
+                    return jsonify({'success': False, 'error': error_msg or 'Unable to deduct stock for this order.'}), 400
 
             cursor.execute('''
                 SELECT o.shipping_address_id
@@ -11446,26 +11752,16 @@ def update_order_status():
             order_info = cursor.fetchone()
 
             if order_info:
+                shipment_id = ensure_order_shipment(cursor, order_id, seller_confirmed=True)
+                cursor.execute('''
+                    UPDATE shipments
+                    SET seller_confirmed = 1, seller_confirmed_at = NOW()
+                    WHERE id = %s
+                ''', (shipment_id,))
 
-                cursor.execute('SELECT id FROM shipments WHERE order_id = %s', (order_id,))
-                shipment = cursor.fetchone()
-
-                if not shipment:
-
-                    tracking_number = f"SHIP{order_id}{int(time.time())}"
-                    cursor.execute('''
-                        INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
-                        VALUES (%s, %s, 'pending', TRUE, NOW(), NOW())
-                    ''', (order_id, tracking_number))
-                    conn.commit()
-                else:
-
-                    cursor.execute('''
-                        UPDATE shipments
-                        SET seller_confirmed = 1, seller_confirmed_at = NOW()
-                        WHERE id = %s
-                    ''', (shipment['id'],))
-                    conn.commit()
+        elif new_status == 'waiting_for_pickup':
+            # Riders discover the order through its shipment row; create it here, not on read.
+            ensure_order_shipment(cursor, order_id, seller_confirmed=True)
 
         elif new_status == 'released_to_rider':
 
@@ -11483,22 +11779,9 @@ def update_order_status():
                 address = cursor.fetchone()
 
 
-                cursor.execute('SELECT id, rider_id FROM shipments WHERE order_id = %s', (order_id,))
-                shipment = cursor.fetchone()
-
-                if shipment:
-                    shipment_id = shipment['id']
-                    existing_rider_id = shipment['rider_id']
-                else:
-
-                    tracking_number = f"SHIP{order_id}{int(time.time())}"
-                    cursor.execute('''
-                        INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
-                        VALUES (%s, %s, 'picked_up', TRUE, NOW(), NOW())
-                    ''', (order_id, tracking_number))
-                    conn.commit()
-                    shipment_id = cursor.lastrowid
-                    existing_rider_id = None
+                shipment_id = ensure_order_shipment(cursor, order_id, status='picked_up', seller_confirmed=True)
+                cursor.execute('SELECT rider_id FROM shipments WHERE id = %s', (shipment_id,))
+                existing_rider_id = cursor.fetchone()['rider_id']
 
 
                 if not existing_rider_id and address:
@@ -11550,6 +11833,7 @@ def update_order_status():
                 SET status = 'cancelled', updated_at = NOW()
                 WHERE order_id = %s
             ''', (order_id,))
+            release_order_reservations(cursor, order_id)
 
         conn.commit()
 
@@ -13002,105 +13286,12 @@ def api_rider_available_orders():
             conn.close()
             return jsonify({'success': True, 'orders': [], 'service_area': None, 'message': 'No service area assigned'})
 
-        rider_db_id = rider['id']
         rider_service_area = rider['service_area']
-
-
-
-        service_areas = [area.strip() for area in rider_service_area.split(',') if area.strip()]
-
-        print(f"[DEBUG] Rider {rider_db_id} service area: {rider_service_area}")
-        print(f"[DEBUG] Parsed service areas: {service_areas}")
-
-
-        cursor.execute('''
-            SELECT o.id, o.order_number, o.user_id, o.total_amount, o.order_status, o.created_at,
-                   CONCAT(a.street_address, ', ', a.city, ', ', a.province, ' ', COALESCE(a.postal_code, '')) as delivery_address,
-                   a.province as delivery_province,
-                   a.postal_code as delivery_postal_code,
-                   a.city as delivery_city,
-                   CONCAT(u.first_name, ' ', u.last_name) as customer_name,
-                   u.phone as customer_phone,
-                   u.email,
-                   COALESCE(s.id, 0) as shipment_id,
-                   COALESCE(s.status, 'pending') as shipment_status,
-                   COALESCE(s.seller_confirmed, FALSE) as seller_confirmed,
-                   COALESCE(s.rider_id, 0) as assigned_rider_id
-            FROM orders o
-            JOIN users u ON o.user_id = u.id
-            JOIN addresses a ON o.shipping_address_id = a.id
-            LEFT JOIN shipments s ON s.order_id = o.id
-            WHERE o.order_status = 'waiting_for_pickup'
-            AND COALESCE(s.rider_id, 0) = 0
-            ORDER BY o.created_at DESC
-        ''')
-
-        all_orders = cursor.fetchall()
-        print(f"[DEBUG] Found {len(all_orders)} confirmed/pending orders total")
-
-
-        filtered_orders = []
-
-
-        region_city_mapping = {
-            'north luzon': ['baguio', 'la union', 'benguet', 'ifugao', 'mountain province', 'nueva vizcaya', 'nueva ecija', 'tarlac', 'pangasinan', 'quirino', 'aurora'],
-            'south luzon': ['cavite', 'laguna', 'quezon', 'batangas', 'marinduque', 'oriental mindoro', 'occidental mindoro', 'romblon', 'tayabas'],
-            'metro manila': ['ncr', 'manila', 'makati', 'quezon city', 'pasig', 'taguig', 'mandaluyong', 'san juan', 'marikina', 'parañaque', 'muntinlupa', 'las piñas', 'bacoor', 'caloocan', 'malabon', 'navotas', 'valenzuela'],
-            'visayas': ['cebu', 'bohol', 'negros', 'antique', 'capiz', 'iloilo', 'guimaras', 'siquijor'],
-            'mindanao': ['davao', 'cagayan de oro', 'zamboanga', 'butuan', 'general santos', 'koronadal', 'iligan', 'marawi', 'cotabato', 'surigao'],
-            'bicol': ['albay', 'camarines norte', 'camarines sur', 'catanduanes', 'masbate', 'sorsogon'],
-            'calabarzon': ['cavite', 'laguna', 'batangas', 'rizal', 'quezon'],
-            'mimaropa': ['marinduque', 'mindoro', 'palawan', 'romblon'],
-            'calamansi': ['camarines norte', 'camarines sur', 'albay'],
-        }
-
-        for order in all_orders:
-            order_province = order.get('delivery_province', '').strip().lower()
-            order_city = order.get('delivery_city', '').strip().lower()
-
-
-            matches_service_area = False
-            for service_area in service_areas:
-                service_area_lower = service_area.lower()
-
-
-                if (service_area_lower == order_province or
-                    service_area_lower == order_city or
-                    service_area_lower in order_province or
-                    order_province in service_area_lower or
-                    service_area_lower in order_city or
-                    order_city in service_area_lower):
-                    matches_service_area = True
-                    print(f"[DEBUG] Order {order['order_number']}: DIRECT MATCH - {order_city}, {order_province} matches service area '{service_area}'")
-                    break
-
-
-                if service_area_lower in region_city_mapping:
-                    cities_in_region = region_city_mapping[service_area_lower]
-                    if order_city in cities_in_region or order_province in cities_in_region:
-                        matches_service_area = True
-                        print(f"[DEBUG] Order {order['order_number']}: REGIONAL MATCH - {order_city}, {order_province} is in region '{service_area}'")
-                        break
-
-            if matches_service_area:
-                filtered_orders.append(order)
-            else:
-                print(f"[DEBUG] Order {order['order_number']}: NO MATCH - {order_city}, {order_province} | Service areas: {service_areas}")
-
-        print(f"[DEBUG] Filtered to {len(filtered_orders)} orders in service area")
-
+        filtered_orders = fetch_available_orders(
+            cursor, compile_service_area(rider_service_area), RIDER_AVAILABLE_ORDERS_LIMIT
+        )
 
         for order in filtered_orders:
-            if order['shipment_id'] == 0:
-                tracking_number = f"SHIP{order['id']}{int(time.time())}"
-                cursor.execute('''
-                    INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, created_at)
-                    VALUES (%s, %s, 'pending', %s, NOW())
-                ''', (order['id'], tracking_number, order.get('seller_confirmed', False)))
-                conn.commit()
-                order['shipment_id'] = cursor.lastrowid
-
-
             if order.get('total_amount'):
                 order['total_amount'] = float(order['total_amount'])
 
@@ -13111,8 +13302,7 @@ def api_rider_available_orders():
             'success': True,
             'orders': filtered_orders,
             'service_area': rider_service_area,
-            'total_filtered': len(filtered_orders),
-            'total_available': len(all_orders)
+            'total_filtered': len(filtered_orders)
         })
     except Exception as e:
         print(f"[ERROR] Error fetching available orders: {e}")
@@ -13479,6 +13669,7 @@ def api_rider_upload_document():
         file.save(file_path)
 
         file_url = f"/static/uploads/riders/{document_type}/{stored_name}"
+        image_pipeline.submit(file_url)
 
         cursor.execute('''
             INSERT INTO rider_documents (rider_id, document_type, file_url, verified, uploaded_at, updated_at)
@@ -13641,37 +13832,26 @@ def api_rider_earnings():
         rider_id = rider['id']
 
 
-        cursor.execute('''
-            SELECT COALESCE(SUM(earning_amount), 0) as today_earnings
-            FROM rider_transactions
-            WHERE rider_id = %s AND status = 'completed'
-            AND DATE(completed_at) = CURRENT_DATE
-        ''', (rider_id,))
-        today_data = cursor.fetchone()
-        today_earnings = float(today_data['today_earnings']) if today_data else 0
-
-
-        cursor.execute('''
-            SELECT COALESCE(SUM(earning_amount), 0) as weekly_earnings
-            FROM rider_transactions
-            WHERE rider_id = %s AND status = 'completed'
-            AND completed_at >= CURRENT_DATE - INTERVAL '7 days'
-        ''', (rider_id,))
-        weekly_data = cursor.fetchone()
-        weekly_earnings = float(weekly_data['weekly_earnings']) if weekly_data else 0
-
-
-        cursor.execute('''
-            SELECT COALESCE(SUM(earning_amount), 0) as monthly_earnings
-            FROM rider_transactions
-            WHERE rider_id = %s AND status = 'completed'
-            AND EXTRACT(YEAR FROM completed_at) = EXTRACT(YEAR FROM CURRENT_DATE)
-            AND EXTRACT(MONTH FROM completed_at) = EXTRACT(MONTH FROM CURRENT_DATE)
-        ''', (rider_id,))
-        monthly_data = cursor.fetchone()
-        monthly_earnings = float(monthly_data['monthly_earnings']) if monthly_data else 0
-
+        earnings = load_rider_earnings(cursor, rider_id)
+        today_earnings = earnings['today_earnings']
+        weekly_earnings = earnings['weekly_earnings']
+        monthly_earnings = earnings['monthly_earnings']
 
+        # ?days=N adds the per-day history for charts, read from the daily rollup.
+        history_days = request.args.get('days', type=int)
+        daily = None
+        if history_days:
+            history_days = max(1, min(history_days, RIDER_HISTORY_MAX_DAYS))
+            daily = [
+                {
+                    'date': row['metrics_date'].isoformat(),
+                    'deliveries': row['deliveries'],
+                    'earnings': float(row['earnings']),
+                    'ratings': row['ratings_count'],
+                    'avg_rating': float(row['avg_rating']) if row['avg_rating'] is not None else None,
+                }
+                for row in load_rider_daily_history(cursor, rider_id, history_days)
+            ]
 
         base_fare = weekly_earnings * 0.70
         tips = weekly_earnings * 0.20
@@ -13680,7 +13860,7 @@ def api_rider_earnings():
         cursor.close()
         conn.close()
 
-        return jsonify({
+        response = {
             'success': True,
             'today_earnings': today_earnings,
             'weekly_earnings': weekly_earnings,
@@ -13690,7 +13870,10 @@ def api_rider_earnings():
                 'tips': tips,
                 'bonuses': bonuses
             }
-        })
+        }
+        if daily is not None:
+            response['daily'] = daily
+        return jsonify(response)
     except Exception as e:
         print(f"Error fetching earnings: {e}")
         if conn:
@@ -13721,17 +13904,9 @@ def api_rider_ratings():
 
         rider_id = rider['id']
 
-        cursor.execute('''
-            SELECT 
-                AVG(rr.rating) as avg_rating,
-                COUNT(*) as total_count
-            FROM rider_ratings rr
-            WHERE rr.rider_id = %s
-        ''', (rider_id,))
-
-        rating_data = cursor.fetchone()
-        overall_rating = float(rating_data['avg_rating']) if rating_data and rating_data['avg_rating'] else 0
-        total_ratings = int(rating_data['total_count']) if rating_data else 0
+        rating_data = load_rider_rating_summary(cursor, rider_id)
+        overall_rating = rating_data['avg_rating']
+        total_ratings = rating_data['total_ratings']
 
         cursor.execute('''
             SELECT rr.created_at, rr.rating, rr.comment,
@@ -14176,6 +14351,10 @@ def api_rider_update_delivery_status():
                 SET order_status = %s, updated_at = NOW()
                 WHERE id = %s
             ''', (order_status, order_id))
+            sync_order_product_stats(cursor, order_id)
+            sync_order_sales_rollup(cursor, order_id)
+            if order_status == 'delivered':
+                record_order_commission(cursor, order_id)
             conn.commit()
 
 
@@ -14198,7 +14377,9 @@ def api_rider_update_delivery_status():
                         rider_id, order_id, shipment_id, earning_amount,
                         commission_rate, status, completed_at
                     ) VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                    RETURNING id
                 ''', (rider_db_id, order['id'], shipment_id, earning_amount, 15.00, 'completed'))
+                record_rider_transaction(cursor, cursor.fetchone()['id'])
 
 
                 cursor.execute('''
@@ -14294,6 +14475,9 @@ def api_rider_proof_of_delivery():
         # Update order status
         order_id = shipment['order_id']
         cursor.execute("UPDATE orders SET order_status = 'delivered', updated_at = NOW() WHERE id = %s", (order_id,))
+        sync_order_product_stats(cursor, order_id)
+        sync_order_sales_rollup(cursor, order_id)
+        record_order_commission(cursor, order_id)
 
         # Rider earnings (15%)
         cursor.execute('SELECT total_amount FROM orders WHERE id = %s', (order_id,))
@@ -14304,7 +14488,11 @@ def api_rider_proof_of_delivery():
                 INSERT INTO rider_transactions (rider_id, order_id, shipment_id, earning_amount, commission_rate, status, completed_at)
                 VALUES (%s, %s, %s, %s, 15.00, 'completed', NOW())
                 ON CONFLICT DO NOTHING
+                RETURNING id
             ''', (rider_id, order_id, shipment_id, earning))
+            transaction = cursor.fetchone()
+            if transaction:
+                record_rider_transaction(cursor, transaction['id'])
             cursor.execute('UPDATE riders SET total_deliveries = total_deliveries + 1, earnings = earnings + %s WHERE id = %s', (earning, rider_id))
 
         conn.commit()
@@ -14955,12 +15143,14 @@ def seller_confirm_order():
             conn.close()
             return jsonify({'success': False, 'error': 'Only pending orders can be confirmed.'}), 400
 
-        success, error_msg = adjust_inventory_for_order(conn, order_id, 'deduct')
-        if not success:
-            conn.rollback()
-            cursor.close()
-            conn.close()
-            return jsonify({'success': False, 'error': error_msg or 'Unable to deduct stock for this order.'}), 400
+        # Stock held at checkout is simply kept; older orders (or expired holds) deduct now.
+        if not commit_order_reservations(cursor, order_id):
+            success, error_msg = adjust_inventory_for_order(conn, order_id, 'deduct')
+            if not success:
+                conn.rollback()
+                cursor.close()
+                conn.close()
+                return jsonify({'success': False, 'error': error_msg or 'Unable to deduct stock for this order.'}), 400
 
         cursor.execute('SELECT province, city, postal_code FROM addresses WHERE id = %s', (order_check['shipping_address_id'],))
         address = cursor.fetchone()
@@ -14971,18 +15161,7 @@ def seller_confirm_order():
             WHERE id = %s
         ''', (order_id,))
 
-        cursor.execute('SELECT id FROM shipments WHERE order_id = %s', (order_id,))
-        shipment = cursor.fetchone()
-
-        if shipment:
-            shipment_id = shipment['id']
-        else:
-            tracking_number = f"SHIP{order_id}{int(time.time())}"
-            cursor.execute('''
-                INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
-                VALUES (%s, %s, 'pending', TRUE, NOW(), NOW())
-            ''', (order_id, tracking_number))
-            shipment_id = cursor.lastrowid
+        shipment_id = ensure_order_shipment(cursor, order_id, seller_confirmed=True)
 
         rider_assigned = False
         response_message = 'Order confirmed! Waiting for a rider to accept.'
@@ -15140,7 +15319,7 @@ def seller_release_to_rider():
             WHERE id = %s
         ''', (new_status, order_id))
 
-
+        ensure_order_shipment(cursor, order_id, seller_confirmed=True)
         cursor.execute('''
             UPDATE shipments
             SET rider_id = %s,
@@ -15579,6 +15758,73 @@ def get_seller_notifications():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/seller/events', methods=['GET'])
+def seller_events():
+    """Push notification/order changes to the seller dashboard.
+
+    Serves Server-Sent Events to ``EventSource`` clients and a JSON long-poll
+    (``?since=<cursor>``) to everything else. Both wait on the process-wide
+    LISTEN connection, so an idle dashboard costs no queries after connecting.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+    if seller_event_hub is None or not seller_event_hub.listening:
+        # Dashboards fall back to polling.
+        return jsonify({'success': False, 'error': 'Live updates unavailable'}), 503
+
+    try:
+        with db_cursor() as cursor:
+            cursor.execute('SELECT id FROM sellers WHERE user_id = %s', (session['user_id'],))
+            seller = cursor.fetchone()
+    except ConnectionError:
+        return jsonify({'success': False, 'error': 'Database connection failed'}), 500
+    # The wait below can last minutes; don't keep a pooled connection for it.
+    release_request_db()
+    if not seller:
+        return jsonify({'success': False, 'error': 'Not a seller'}), 403
+    seller_id = seller['id']
+
+    since = seller_event_hub.resume_from(request.headers.get('Last-Event-ID') or request.args.get('since'))
+
+    # Threads left for waiting; the rest are kept for requests that need a pooled connection.
+    if seller_event_waiters is None or not seller_event_waiters.acquire(blocking=False):
+        return jsonify({'success': False, 'error': 'Live updates unavailable'}), 503
+
+    if 'text/event-stream' not in (request.headers.get('Accept') or ''):
+        try:
+            timeout = _safe_int(request.args.get('timeout'))
+            if timeout is None or timeout > SELLER_EVENTS_LONG_POLL_SECONDS:
+                timeout = SELLER_EVENTS_LONG_POLL_SECONDS
+            timeout = max(0, timeout)
+            cursor_value, events = seller_event_hub.wait(seller_id, since, timeout)
+        finally:
+            seller_event_waiters.release()
+        return jsonify({
+            'success': True,
+            'cursor': seller_event_hub.event_id(cursor_value),
+            'events': [dict(event, id=seller_event_hub.event_id(seq)) for seq, event in events]
+        })
+
+    def stream(cursor_value):
+        yield 'retry: 5000\n\n'
+        deadline = time.monotonic() + SELLER_EVENTS_STREAM_SECONDS
+        while time.monotonic() < deadline:
+            cursor_value, events = seller_event_hub.wait(seller_id, cursor_value, SELLER_EVENTS_HEARTBEAT_SECONDS)
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            for seq, event in events:
+                yield f"id: {seller_event_hub.event_id(seq)}\nevent: {event.get('kind', 'message')}\ndata: {json.dumps(event)}\n\n"
+
+    response = Response(stream_with_context(stream(since)), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    # Runs when the server closes the response, whether the stream ended or the client left.
+    response.call_on_close(seller_event_waiters.release)
+    return response
+
+
 @app.route('/api/seller/notifications/<int:notification_id>/read', methods=['POST'])
 def mark_notification_read(notification_id):
     """Mark a specific notification as read"""
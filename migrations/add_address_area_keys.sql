@@ -0,0 +1,12 @@
+-- Normalized area keys for rider service-area matching (PostgreSQL)
+-- The app applies this at startup through utils/service_areas.ensure_address_area_keys.
+-- city_key/province_key must stay identical to utils/service_areas.area_key():
+-- lowercase, ñ -> n, punctuation collapsed to spaces, "City of X"/"X City" -> "x".
+
+ALTER TABLE addresses
+    ADD COLUMN IF NOT EXISTS city_key TEXT GENERATED ALWAYS AS (btrim(regexp_replace(regexp_replace(translate(lower(COALESCE(city, '')), 'ñÑ', 'nn'), '[^a-z0-9]+', ' ', 'g'), '^ *city of | city *$', '', 'g'))) STORED,
+    ADD COLUMN IF NOT EXISTS province_key TEXT GENERATED ALWAYS AS (btrim(regexp_replace(regexp_replace(translate(lower(COALESCE(province, '')), 'ñÑ', 'nn'), '[^a-z0-9]+', ' ', 'g'), '^ *city of | city *$', '', 'g'))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_addresses_city_key ON addresses (city_key);
+CREATE INDEX IF NOT EXISTS idx_addresses_province_key ON addresses (province_key);
+CREATE INDEX IF NOT EXISTS idx_orders_waiting_pickup ON orders (shipping_address_id) WHERE order_status = 'waiting_for_pickup';
@@ -0,0 +1,6 @@
+-- Keyset index for buyer order history (PostgreSQL)
+-- The app creates this at startup. /api/my-orders pages a buyer's orders by
+-- (created_at, id) newest first, so each page is a short range scan on this
+-- index instead of sorting the buyer's whole history.
+
+CREATE INDEX IF NOT EXISTS idx_orders_user_history ON orders (user_id, created_at DESC, id DESC);
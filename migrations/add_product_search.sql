@@ -0,0 +1,52 @@
+-- Ranked product search (PostgreSQL)
+-- The app applies this at startup through utils/product_search.ensure_product_search.
+-- products.search_vector is weighted name (A), brand (B), category name (C), description (D).
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION product_search_document(p_name TEXT, p_brand TEXT, p_category_id INTEGER, p_description TEXT)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('simple', coalesce(p_name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(p_brand, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce((SELECT name FROM categories WHERE id = p_category_id), '')), 'C')
+        || setweight(to_tsvector('simple', coalesce(p_description, '')), 'D')
+$$;
+
+CREATE OR REPLACE FUNCTION products_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := product_search_document(NEW.name, NEW.brand, NEW.category_id, NEW.description);
+    RETURN NEW;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION categories_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.name IS DISTINCT FROM OLD.name THEN
+        UPDATE products
+        SET search_vector = product_search_document(name, brand, category_id, description)
+        WHERE category_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS products_search_vector ON products;
+CREATE TRIGGER products_search_vector
+    BEFORE INSERT OR UPDATE OF name, brand, category_id, description ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_refresh();
+
+DROP TRIGGER IF EXISTS categories_search_vector ON categories;
+CREATE TRIGGER categories_search_vector
+    AFTER UPDATE OF name ON categories
+    FOR EACH ROW EXECUTE FUNCTION categories_search_vector_refresh();
+
+UPDATE products
+SET search_vector = product_search_document(name, brand, category_id, description)
+WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_products_search_vector ON products USING GIN (search_vector);
+
+-- Typo tolerance; skip these two statements where pg_trgm is not available.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_products_search_trgm
+    ON products USING GIN ((lower(coalesce(name, '') || ' ' || coalesce(brand, ''))) gin_trgm_ops);
@@ -0,0 +1,24 @@
+-- One shipment per order (PostgreSQL)
+-- The app applies this at startup through utils/shipments.ensure_shipments_order_unique.
+-- Removes duplicate unassigned shipments left by the old rider available-orders
+-- read path, makes shipments.order_id unique and creates the missing row for
+-- orders already waiting for pickup. If the index fails, some order has two
+-- rider-assigned shipments; resolve those by hand and run this again.
+
+DELETE FROM shipments s
+USING (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY order_id ORDER BY (rider_id IS NOT NULL) DESC, id
+    ) AS rank
+    FROM shipments
+) ranked
+WHERE s.id = ranked.id AND ranked.rank > 1 AND s.rider_id IS NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_shipments_order_id ON shipments (order_id);
+
+INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
+SELECT o.id, 'SHIP' || o.id || FLOOR(EXTRACT(EPOCH FROM NOW()))::bigint, 'pending', TRUE, NOW(), NOW()
+FROM orders o
+WHERE o.order_status = 'waiting_for_pickup'
+  AND NOT EXISTS (SELECT 1 FROM shipments s WHERE s.order_id = o.id)
+ON CONFLICT (order_id) DO NOTHING;
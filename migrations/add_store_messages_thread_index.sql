@@ -0,0 +1,6 @@
+-- Keyset index for brand chat threads (PostgreSQL)
+-- The app creates this on first chat request. /api/brands/<slug>/messages
+-- pages a buyer/seller thread by id (after_id / before_id), so every poll is a
+-- range scan on this index.
+
+CREATE INDEX IF NOT EXISTS idx_store_messages_thread ON store_messages (seller_id, buyer_id, id);
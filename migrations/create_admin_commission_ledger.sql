@@ -0,0 +1,27 @@
+-- Admin commission ledger (PostgreSQL)
+-- The app creates this at startup and fills it when orders are delivered or
+-- completed (utils/commission_ledger.record_order_commission), with a periodic
+-- catch-up; run scripts/sync_commission_ledger.py --all to backfill it again.
+
+CREATE TABLE IF NOT EXISTS admin_commission_ledger (
+    id SERIAL PRIMARY KEY,
+    order_id INT NOT NULL,
+    order_number VARCHAR(64) NULL,
+    order_created_at TIMESTAMP NULL,
+    order_completed_at TIMESTAMP NULL,
+    order_status VARCHAR(32) NULL,
+    seller_id INT NOT NULL,
+    order_item_id INT NOT NULL,
+    product_name VARCHAR(255) NULL,
+    quantity INT NOT NULL DEFAULT 0,
+    item_subtotal DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    commission_rate DECIMAL(7,3) NOT NULL DEFAULT 0.000,
+    commission_amount DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uniq_order_item UNIQUE (order_item_id)
+);
+
+ALTER TABLE admin_commission_ledger ADD COLUMN IF NOT EXISTS order_completed_at TIMESTAMP NULL;
+CREATE INDEX IF NOT EXISTS idx_order_completed_at ON admin_commission_ledger(order_completed_at);
+CREATE INDEX IF NOT EXISTS idx_commission_ledger_report_date ON admin_commission_ledger ((COALESCE(order_completed_at, order_created_at)));
+CREATE INDEX IF NOT EXISTS idx_commission_ledger_order ON admin_commission_ledger (order_id);
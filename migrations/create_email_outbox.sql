@@ -0,0 +1,22 @@
+-- Outbound email queue (PostgreSQL)
+-- The app creates this on startup. Handlers insert rows; outbox workers (in-app
+-- threads or scripts/email_worker.py) deliver them:
+-- pending -> sending -> sent | pending (retry with backoff) | failed.
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    to_email VARCHAR(255) NOT NULL,
+    subject VARCHAR(500) NOT NULL,
+    html_body TEXT NOT NULL,
+    sender VARCHAR(255),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    sent_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (next_attempt_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_email_outbox_sending ON email_outbox (locked_at) WHERE status = 'sending';
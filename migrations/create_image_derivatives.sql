@@ -0,0 +1,18 @@
+-- Image derivatives (PostgreSQL)
+-- The app creates this at startup. Rows are written by the background image pool
+-- (utils/image_derivatives.ImagePipeline) after each upload and by
+-- scripts/build_image_derivatives.py, which also reports the bytes saved.
+-- source_url matches product_images.image_url / users.profile_image.
+
+CREATE TABLE IF NOT EXISTS image_derivatives (
+    source_url VARCHAR(500) NOT NULL,
+    variant VARCHAR(16) NOT NULL,
+    format VARCHAR(8) NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    url VARCHAR(500) NOT NULL,
+    bytes INTEGER NOT NULL,
+    source_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source_url, variant, format)
+);
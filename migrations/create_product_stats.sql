@@ -0,0 +1,13 @@
+-- Materialized per-product rating and sales counters (PostgreSQL)
+-- The app creates this on startup; run scripts/rebuild_product_stats.py to (re)populate it.
+
+CREATE TABLE IF NOT EXISTS product_stats (
+    product_id INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    avg_rating NUMERIC(3, 2) NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    sold_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Marks whether an order's quantities are currently included in product_stats.sold_count
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS stats_counted BOOLEAN NOT NULL DEFAULT FALSE;
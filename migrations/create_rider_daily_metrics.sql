@@ -0,0 +1,23 @@
+-- Rider dashboard metrics (PostgreSQL)
+-- The app creates these at startup and seeds the rollup when empty; run
+-- scripts/rebuild_rider_metrics.py to backfill it again. New completed
+-- rider_transactions and rider_ratings rows are added through
+-- utils/rider_metrics.record_rider_transaction / record_rider_rating.
+
+CREATE TABLE IF NOT EXISTS rider_daily_metrics (
+    rider_id INTEGER NOT NULL,
+    metrics_date DATE NOT NULL,
+    deliveries INTEGER NOT NULL DEFAULT 0,
+    earnings NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    ratings_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    five_star INTEGER NOT NULL DEFAULT 0,
+    four_star INTEGER NOT NULL DEFAULT 0,
+    three_star INTEGER NOT NULL DEFAULT 0,
+    two_star INTEGER NOT NULL DEFAULT 0,
+    one_star INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (rider_id, metrics_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rider_transactions_rider_completed ON rider_transactions (rider_id, completed_at);
+CREATE INDEX IF NOT EXISTS idx_rider_ratings_rider_created ON rider_ratings (rider_id, created_at DESC);
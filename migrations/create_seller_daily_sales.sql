@@ -0,0 +1,29 @@
+-- Seller sales rollups (PostgreSQL)
+-- The app creates these at startup and seeds them when empty; run
+-- scripts/rebuild_seller_sales.py to backfill them again. Order status changes
+-- keep them current through utils/seller_sales.sync_order_sales_rollup, and
+-- orders.sales_rollup_state records which buckets each order is counted in:
+-- 0 none (cancelled/failed), 1 live, 2 delivered/completed.
+
+CREATE TABLE IF NOT EXISTS seller_daily_sales (
+    seller_id INTEGER NOT NULL,
+    sales_date DATE NOT NULL,
+    product_id INTEGER NOT NULL,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    units_sold INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    delivered_units INTEGER NOT NULL DEFAULT 0,
+    delivered_revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (seller_id, sales_date, product_id)
+);
+
+CREATE TABLE IF NOT EXISTS seller_customers (
+    seller_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (seller_id, user_id)
+);
+
+ALTER TABLE orders ADD COLUMN IF NOT EXISTS sales_rollup_state SMALLINT NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_orders_seller_created ON orders (seller_id, created_at DESC);
@@ -0,0 +1,22 @@
+-- Checkout stock holds (PostgreSQL)
+-- The app creates this on startup. Each row records stock taken from one
+-- product_variants row (source = 'variant') or product-level inventory row
+-- (source = 'inventory') for an order: held -> committed | released.
+
+CREATE TABLE IF NOT EXISTS stock_reservations (
+    id BIGSERIAL PRIMARY KEY,
+    order_id INTEGER REFERENCES orders(id) ON DELETE CASCADE,
+    user_id INTEGER,
+    product_id INTEGER NOT NULL,
+    variant_id INTEGER,
+    source VARCHAR(20) NOT NULL,
+    source_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    status VARCHAR(20) NOT NULL DEFAULT 'held',
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    released_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_held_expiry ON stock_reservations (expires_at) WHERE status = 'held';
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_order ON stock_reservations (order_id);
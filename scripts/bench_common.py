@@ -0,0 +1,67 @@
+"""
+Shared helpers for the local Postgres benchmark scripts in this folder.
+
+Benchmarks run against a throwaway database given by BENCH_DATABASE_URL
+(default: postgresql://postgres@localhost:5432/varon_bench). Never point this
+at Supabase - the seed step drops and recreates the tables it uses.
+"""
+import os
+import sys
+import time
+
+import psycopg2
+import psycopg2.extras
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+BENCH_DATABASE_URL = os.getenv('BENCH_DATABASE_URL', 'postgresql://postgres@localhost:5432/varon_bench')
+
+
+class CountingCursor(psycopg2.extras.RealDictCursor):
+    """RealDictCursor that counts every statement sent to the server."""
+
+    statements = 0
+
+    def execute(self, query, vars=None):
+        CountingCursor.statements += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        CountingCursor.statements += 1
+        return super().executemany(query, vars_list)
+
+
+def connect():
+    """Open a connection to the benchmark database or exit with a hint."""
+    try:
+        return psycopg2.connect(BENCH_DATABASE_URL)
+    except psycopg2.Error as err:
+        print(f"❌ Could not connect to {BENCH_DATABASE_URL}: {err}")
+        print("   Set BENCH_DATABASE_URL to a local, disposable Postgres database.")
+        sys.exit(1)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def time_call(fn, iterations):
+    """Run ``fn`` ``iterations`` times; return (latencies_ms, statements_per_call)."""
+    latencies = []
+    CountingCursor.statements = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, CountingCursor.statements / float(iterations or 1)
+
+
+def print_row(label, latencies, statements):
+    print(f"  {label:<28} queries={statements:>6.1f}  p50={percentile(latencies, 50):>8.2f}ms  p95={percentile(latencies, 95):>8.2f}ms")
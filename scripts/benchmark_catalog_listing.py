@@ -0,0 +1,139 @@
+"""
+Catalog listing benchmark for /api/products
+Compares the old fan-out aggregate with per-product color/promotion lookups
+against the browse path the app serves (utils.product_search, which batches
+through utils.catalog) at limit 20/50/200.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_catalog_listing.py
+"""
+import random
+
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.product_search import ProductSearch
+from utils.product_stats import ensure_product_stats_table, rebuild_product_stats
+
+PRODUCTS = 2000
+ITERATIONS = 30
+LIMITS = (20, 50, 200)
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS product_stats, promotions, order_items, orders, reviews, product_variants, product_images, products, categories CASCADE;
+CREATE TABLE categories (id SERIAL PRIMARY KEY, name VARCHAR(100), parent_id INT, is_active BOOLEAN DEFAULT TRUE);
+CREATE TABLE products (
+    id SERIAL PRIMARY KEY, category_id INT, name VARCHAR(200), description TEXT, brand VARCHAR(100),
+    price NUMERIC(10,2), is_active BOOLEAN DEFAULT TRUE, archive_status VARCHAR(20) DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE TABLE product_images (id SERIAL PRIMARY KEY, product_id INT, image_url VARCHAR(500), is_primary BOOLEAN);
+CREATE TABLE product_variants (id SERIAL PRIMARY KEY, product_id INT, color VARCHAR(50), size VARCHAR(20), stock_quantity INT);
+CREATE TABLE reviews (id SERIAL PRIMARY KEY, product_id INT, rating INT, is_approved BOOLEAN DEFAULT TRUE);
+CREATE TABLE orders (id SERIAL PRIMARY KEY, order_status VARCHAR(30));
+CREATE TABLE order_items (id SERIAL PRIMARY KEY, order_id INT, product_id INT, quantity INT);
+CREATE TABLE promotions (
+    id SERIAL PRIMARY KEY, product_id INT, discount_type VARCHAR(20), discount_value NUMERIC(10,2),
+    start_date TIMESTAMP, end_date TIMESTAMP, description TEXT, code VARCHAR(50),
+    is_active BOOLEAN DEFAULT TRUE, is_approved BOOLEAN DEFAULT TRUE
+);
+CREATE INDEX ON product_images (product_id);
+CREATE INDEX ON product_variants (product_id);
+CREATE INDEX ON reviews (product_id);
+CREATE INDEX ON order_items (product_id);
+CREATE INDEX ON promotions (product_id);
+CREATE INDEX ON products (created_at);
+"""
+
+
+def seed(conn):
+    rng = random.Random(42)
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("INSERT INTO categories (name) SELECT 'Category ' || g FROM generate_series(1, 12) g")
+    cursor.execute("""
+        INSERT INTO products (category_id, name, description, brand, price, created_at)
+        SELECT 1 + (g %% 12), 'Product ' || g, 'Description ' || g, 'Brand ' || (g %% 40),
+               100 + (g %% 900), NOW() - (g || ' minutes')::interval
+        FROM generate_series(1, %s) g
+    """, (PRODUCTS,))
+    cursor.execute("INSERT INTO product_images (product_id, image_url, is_primary) SELECT id, '/static/p' || id || '.webp', TRUE FROM products")
+    colors = ['Black', 'White', 'Navy', 'Olive', 'Beige']
+    variant_rows = [(pid, rng.choice(colors), size, rng.randint(0, 20)) for pid in range(1, PRODUCTS + 1) for size in ('S', 'M', 'L')]
+    cursor.executemany("INSERT INTO product_variants (product_id, color, size, stock_quantity) VALUES (%s, %s, %s, %s)", variant_rows)
+    cursor.execute("INSERT INTO reviews (product_id, rating) SELECT 1 + (g %% %s), 1 + (g %% 5) FROM generate_series(1, %s) g", (PRODUCTS, PRODUCTS * 5))
+    cursor.execute("INSERT INTO orders (order_status) SELECT 'delivered' FROM generate_series(1, %s)", (PRODUCTS * 2,))
+    cursor.execute("INSERT INTO order_items (order_id, product_id, quantity) SELECT 1 + (g %% %s), 1 + (g %% %s), 1 + (g %% 3) FROM generate_series(1, %s) g", (PRODUCTS * 2, PRODUCTS, PRODUCTS * 4))
+    cursor.execute("""
+        INSERT INTO promotions (product_id, discount_type, discount_value, start_date, end_date, code)
+        SELECT id, CASE WHEN id % 2 = 0 THEN 'percentage' ELSE 'fixed' END, 10,
+               NOW() - INTERVAL '1 day', NOW() + INTERVAL '1 day', 'PROMO' || id
+        FROM products WHERE id % 3 = 0
+    """)
+    ensure_product_stats_table(cursor)
+    rebuild_product_stats(cursor)
+    conn.commit()
+    cursor.close()
+
+
+LEGACY_PAGE_QUERY = """
+    SELECT
+        p.id, p.name, p.price, p.description, p.category_id, pi.image_url, c.name as category_name,
+        COALESCE(AVG(r.rating), 0) as avg_rating,
+        COUNT(DISTINCT r.id) as review_count,
+        COALESCE(SUM(oi.quantity), 0) as sold_count
+    FROM products p
+    LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
+    LEFT JOIN categories c ON p.category_id = c.id
+    LEFT JOIN reviews r ON p.id = r.product_id AND r.is_approved::int = 1
+    LEFT JOIN order_items oi ON p.id = oi.product_id
+    LEFT JOIN orders o ON oi.order_id = o.id AND o.order_status IN ('delivered', 'completed')
+    WHERE p.is_active::int = 1
+    AND (p.archive_status IS NULL OR p.archive_status = 'active')
+    GROUP BY p.id, p.name, p.price, p.description, p.category_id, pi.image_url, c.name
+    ORDER BY p.created_at DESC LIMIT %s
+"""
+
+
+def legacy_listing(cursor, limit):
+    """The original /api/products flow: fan-out aggregate plus two queries per row."""
+    cursor.execute(LEGACY_PAGE_QUERY, (limit,))
+    products = cursor.fetchall()
+    for product in products:
+        cursor.execute("""
+            SELECT DISTINCT color FROM product_variants
+            WHERE product_id = %s AND color IS NOT NULL AND color != '' AND stock_quantity > 0
+            ORDER BY color
+        """, (product['id'],))
+        product['colors'] = [c['color'] for c in cursor.fetchall()]
+        cursor.execute("""
+            SELECT id, discount_type, discount_value, start_date, end_date, description, code
+            FROM promotions
+            WHERE product_id = %s AND is_active::int = 1 AND is_approved::int = 1
+              AND start_date <= NOW() AND end_date >= NOW()
+            LIMIT 1
+        """, (product['id'],))
+        product['promotion'] = cursor.fetchone()
+    return products
+
+
+def main():
+    conn = connect()
+    print(f"Seeding {PRODUCTS} products...")
+    seed(conn)
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    search = ProductSearch(trigram=False)
+
+    print("\n" + "=" * 72)
+    print("CATALOG LISTING BENCHMARK")
+    print("=" * 72)
+    for limit in LIMITS:
+        print(f"\nlimit={limit}")
+        latencies, statements = time_call(lambda: legacy_listing(cursor, limit), ITERATIONS)
+        print_row('per-product (legacy)', latencies, statements)
+        latencies, statements = time_call(lambda: search.search(cursor, '', limit=limit), ITERATIONS)
+        print_row('product_search browse', latencies, statements)
+
+    cursor.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Admin commission report benchmark for utils.commission_ledger
+Seeds a marketplace with growing delivered-order history (older orders
+already claimed by withdrawals) but the same last-30-days traffic, then times
+one /api/admin/commission-report load:
+
+  legacy: create-if-missing DDL, three information_schema lookups, the
+          INSERT ... SELECT backfill anti-join over the range, a DATE()
+          filtered ledger read and every withdrawal claim ever recorded
+  ledger: load_commission_items (sargable report-date range) and
+          load_order_claims for the orders on the page
+
+The two must return the same rows. New deliveries are then recorded through
+record_order_commission and compared with what catch_up_commission_ledger
+inserts for the same orders.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_commission_report.py
+"""
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.commission_ledger import (
+    catch_up_commission_ledger, ensure_commission_ledger_table, load_commission_items, load_order_claims,
+    load_unclaimed_order_commissions, record_order_commission,
+)
+
+HISTORY_SIZES = (10000, 100000, 300000)  # delivered orders before the report window
+RECENT_ORDERS = 600                      # last 30 days, the same for every run
+ITEMS_PER_ORDER = 2
+SELLERS = 40
+ITERATIONS = 20
+RECORDED = 200
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS admin_commission_ledger, admin_commission_withdrawal_orders, admin_commission_withdrawals,
+                     shipments, order_items, orders, sellers CASCADE;
+CREATE TABLE sellers (id SERIAL PRIMARY KEY, store_name VARCHAR(100), commission_rate NUMERIC(5,2));
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, order_number VARCHAR(50), user_id INT, seller_id INT, total_amount NUMERIC(10,2),
+    order_status VARCHAR(30), created_at TIMESTAMP, updated_at TIMESTAMP
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY, order_id INT, product_id INT, product_name VARCHAR(200), quantity INT,
+    unit_price NUMERIC(10,2), subtotal NUMERIC(10,2)
+);
+CREATE TABLE shipments (id SERIAL PRIMARY KEY, order_id INT UNIQUE, status VARCHAR(30), delivered_at TIMESTAMP);
+CREATE TABLE admin_commission_withdrawals (
+    id SERIAL PRIMARY KEY, start_date DATE NOT NULL, end_date DATE NOT NULL, amount DECIMAL(12,2) NOT NULL,
+    claimed_by INT NULL, claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, notes VARCHAR(255)
+);
+CREATE TABLE admin_commission_withdrawal_orders (
+    id SERIAL PRIMARY KEY, withdrawal_id INT NOT NULL, order_id INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, CONSTRAINT uniq_order UNIQUE (order_id)
+);
+CREATE INDEX ON order_items (order_id);
+"""
+
+
+def seed(conn, history):
+    """Delivered orders: ``history`` older ones (claimed month by month) and RECENT_ORDERS in the window."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("""
+        INSERT INTO sellers (store_name, commission_rate)
+        SELECT 'Store ' || g, 3 + (g %% 5) FROM generate_series(1, %s) g
+    """, (SELLERS,))
+    total = history + RECENT_ORDERS
+    # Recent orders over the last 30 days, the rest over the three years before.
+    cursor.execute("""
+        INSERT INTO orders (order_number, user_id, seller_id, total_amount, order_status, created_at, updated_at)
+        SELECT 'ORD-' || g, 1 + g %% 5000, 1 + g %% %s, 0,
+               CASE WHEN g %% 3 = 0 THEN 'completed' ELSE 'delivered' END,
+               placed, placed + INTERVAL '2 days'
+        FROM (
+            SELECT g, CASE WHEN g <= %s THEN NOW() - INTERVAL '2 days' - make_interval(mins => g * 65)
+                           ELSE NOW() - INTERVAL '33 days' - make_interval(mins => (g * 787) %% 1500000) END AS placed
+            FROM generate_series(1, %s) g
+        ) o
+    """, (SELLERS, RECENT_ORDERS, total))
+    cursor.execute("""
+        INSERT INTO order_items (order_id, product_id, product_name, quantity, unit_price, subtotal)
+        SELECT o.id, i, 'Product ' || i, 1 + i, 250, 250 * (1 + i)
+        FROM orders o CROSS JOIN generate_series(1, %s) i
+    """, (ITEMS_PER_ORDER,))
+    cursor.execute("""
+        INSERT INTO shipments (order_id, status, delivered_at)
+        SELECT id, 'delivered', updated_at - INTERVAL '1 hour' FROM orders WHERE id % 4 <> 0
+    """)
+    ensure_commission_ledger_table(cursor)
+    catch_up_commission_ledger(cursor)
+    # Every month before the window was already withdrawn.
+    cursor.execute("""
+        INSERT INTO admin_commission_withdrawals (start_date, end_date, amount, claimed_at)
+        SELECT month::date, (month + INTERVAL '1 month - 1 day')::date, 0, month + INTERVAL '1 month'
+        FROM generate_series(date_trunc('month', NOW() - INTERVAL '4 years'),
+                             date_trunc('month', NOW() - INTERVAL '33 days'), INTERVAL '1 month') month
+    """)
+    cursor.execute("""
+        INSERT INTO admin_commission_withdrawal_orders (withdrawal_id, order_id)
+        SELECT w.id, l.order_id
+        FROM (SELECT DISTINCT order_id, COALESCE(order_completed_at, order_created_at) AS day
+              FROM admin_commission_ledger) l
+        JOIN admin_commission_withdrawals w ON l.day::date BETWEEN w.start_date AND w.end_date
+    """)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+
+
+def legacy_backfill(cursor, start_date, end_date):
+    """The per-request reconciliation the report used to run (PostgreSQL branch)."""
+    cursor.execute('''CREATE TABLE IF NOT EXISTS admin_commission_ledger (
+        id SERIAL PRIMARY KEY, order_id INT NOT NULL, order_number VARCHAR(64) NULL,
+        order_created_at TIMESTAMP NULL, order_completed_at TIMESTAMP NULL, order_status VARCHAR(32) NULL,
+        seller_id INT NOT NULL, order_item_id INT NOT NULL, product_name VARCHAR(255) NULL,
+        quantity INT NOT NULL DEFAULT 0, item_subtotal DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        commission_rate DECIMAL(7,3) NOT NULL DEFAULT 0.000, commission_amount DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, CONSTRAINT uniq_order_item UNIQUE (order_item_id)
+    )''')
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname='public' AND tablename='admin_commission_ledger' AND indexname='idx_order_completed_at'")
+    cursor.fetchall()
+    for table in ('admin_commission_ledger', 'orders', 'order_items', 'shipments'):
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s",
+            (table,)
+        )
+        cursor.fetchall()
+    completed_expr = "COALESCE(sh.delivered_at, o.updated_at, o.created_at)"
+    cursor.execute(f'''
+        INSERT INTO admin_commission_ledger (
+            order_id, order_number, order_created_at, order_completed_at, order_status, seller_id,
+            order_item_id, product_name, quantity, item_subtotal, commission_rate, commission_amount
+        )
+        SELECT o.id, o.order_number, o.created_at, {completed_expr}, o.order_status, o.seller_id,
+               oi.id, oi.product_name, COALESCE(oi.quantity, 0), COALESCE(oi.subtotal, 0),
+               COALESCE(s.commission_rate, 0), (COALESCE(oi.subtotal, 0) * COALESCE(s.commission_rate, 0)) / 100.0
+        FROM orders o
+        LEFT JOIN shipments sh ON sh.order_id = o.id
+        JOIN order_items oi ON oi.order_id = o.id
+        JOIN sellers s ON s.id = o.seller_id
+        LEFT JOIN admin_commission_ledger l ON l.order_item_id = oi.id
+        WHERE o.order_status IN (%s, %s)
+          AND DATE({completed_expr}) BETWEEN %s AND %s
+          AND l.order_item_id IS NULL
+    ''', ('delivered', 'completed', start_date, end_date))
+
+
+def legacy_report(cursor, start_date, end_date):
+    legacy_backfill(cursor, start_date, end_date)
+    cursor.execute('''
+        SELECT l.order_id, l.order_number, l.order_created_at, l.order_completed_at, l.order_status,
+               l.order_item_id, l.product_name, l.quantity, l.item_subtotal, l.commission_rate, l.commission_amount
+        FROM admin_commission_ledger l
+        WHERE DATE(COALESCE(l.order_completed_at, l.order_created_at)) BETWEEN %s AND %s
+          AND l.order_status IN ('delivered', 'completed')
+        ORDER BY COALESCE(l.order_completed_at, l.order_created_at) DESC, l.order_id DESC, l.order_item_id ASC
+    ''', (start_date, end_date))
+    item_rows = cursor.fetchall()
+    cursor.execute('''
+        SELECT wo.order_id, w.claimed_at
+        FROM admin_commission_withdrawal_orders wo
+        JOIN admin_commission_withdrawals w ON w.id = wo.withdrawal_id
+    ''')
+    claimed = {row['order_id']: row['claimed_at'] for row in cursor.fetchall()}
+    return [(row['order_item_id'], row['commission_amount'], claimed.get(row['order_id'])) for row in item_rows]
+
+
+def ledger_report(cursor, start_date, end_date):
+    item_rows = load_commission_items(cursor, start_date, end_date)
+    claimed = load_order_claims(cursor, {row['order_id'] for row in item_rows})
+    return [(row['order_item_id'], row['commission_amount'], claimed.get(row['order_id'])) for row in item_rows]
+
+
+def ledger_snapshot(cursor, order_ids):
+    cursor.execute('''
+        SELECT order_id, order_number, order_created_at, order_completed_at, order_status, seller_id,
+               order_item_id, product_name, quantity, item_subtotal, commission_rate, commission_amount
+        FROM admin_commission_ledger WHERE order_id = ANY(%s) ORDER BY order_item_id
+    ''', (order_ids,))
+    return [tuple(row.values()) for row in cursor.fetchall()]
+
+
+def check_event_driven(conn):
+    """Deliver orders one by one through record_order_commission; compare with a catch-up over them."""
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    cursor.execute('''
+        INSERT INTO orders (order_number, user_id, seller_id, total_amount, order_status, created_at, updated_at)
+        SELECT 'NEW-' || g, 1, 1 + g %% %s, 0, 'released_to_rider', NOW() - INTERVAL '1 day', NOW() - INTERVAL '1 day'
+        FROM generate_series(1, %s) g
+        RETURNING id
+    ''', (SELLERS, RECORDED))
+    order_ids = [row['id'] for row in cursor.fetchall()]
+    cursor.execute('''
+        INSERT INTO order_items (order_id, product_id, product_name, quantity, unit_price, subtotal)
+        SELECT o, i, 'Product ' || i, i, 99, 99 * i FROM UNNEST(%s::int[]) o CROSS JOIN generate_series(1, %s) i
+    ''', (order_ids, ITEMS_PER_ORDER))
+    skipped = record_order_commission(cursor, order_ids[0])  # not delivered yet: nothing to record
+    for order_id in order_ids:
+        cursor.execute("UPDATE orders SET order_status = 'delivered', updated_at = NOW() WHERE id = %s", (order_id,))
+        record_order_commission(cursor, order_id)
+    repeated = sum(record_order_commission(cursor, order_id) for order_id in order_ids)
+    recorded = ledger_snapshot(cursor, order_ids)
+    cursor.execute("DELETE FROM admin_commission_ledger WHERE order_id = ANY(%s)", (order_ids,))
+    cursor.execute("SELECT NOW() - INTERVAL '1 hour' AS since")
+    caught_up = catch_up_commission_ledger(cursor, cursor.fetchone()['since'])
+    rebuilt = ledger_snapshot(cursor, order_ids)
+    unclaimed = load_unclaimed_order_commissions(cursor, '2000-01-01', '2100-01-01')
+    conn.rollback()
+    cursor.close()
+    return (skipped == 0 and repeated == 0 and caught_up == RECORDED * ITEMS_PER_ORDER
+            and recorded == rebuilt and len(recorded) == caught_up
+            and {row['order_id'] for row in unclaimed} >= set(order_ids))
+
+
+def main():
+    conn = connect()
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    cursor.execute("SELECT (CURRENT_DATE - 29)::text AS start_date, CURRENT_DATE::text AS end_date")
+    window = cursor.fetchone()
+    start_date, end_date = window['start_date'], window['end_date']
+    cursor.close()
+
+    print("\n" + "=" * 78)
+    print(f"ADMIN COMMISSION REPORT BENCHMARK ({RECENT_ORDERS} orders x {ITEMS_PER_ORDER} items in the last 30 days)")
+    print("=" * 78)
+
+    mismatched = []
+    consistent = True
+    for history in HISTORY_SIZES:
+        print(f"\ndelivered orders before the window={history} (all claimed)")
+        seed(conn, history)
+        cursor = conn.cursor(cursor_factory=CountingCursor)
+        legacy = legacy_report(cursor, start_date, end_date)
+        ledger = ledger_report(cursor, start_date, end_date)
+        conn.rollback()
+        if legacy != ledger:
+            mismatched.append((history, len(legacy), len(ledger)))
+        iterations = max(5, ITERATIONS // (1 + history // 100000))
+        print_row('backfill per request (legacy)', *time_call(lambda: legacy_report(cursor, start_date, end_date), iterations))
+        conn.rollback()
+        print_row('event-driven ledger', *time_call(lambda: ledger_report(cursor, start_date, end_date), ITERATIONS))
+        conn.rollback()
+        cursor.close()
+        if history == HISTORY_SIZES[0]:
+            consistent = check_event_driven(conn)
+
+    conn.close()
+    for history, legacy_rows, ledger_rows in mismatched:
+        print(f"\n  history={history}: legacy returned {legacy_rows} rows, ledger {ledger_rows}")
+    failed = bool(mismatched) or not consistent
+    print("\n" + ("✗ Ledger report disagrees with the backfill path, or event-driven rows differ from a catch-up" if failed else
+                  "✓ Same rows, two indexed reads per report, event-driven ledger matches a catch-up"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
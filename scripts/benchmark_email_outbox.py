@@ -0,0 +1,163 @@
+"""
+Benchmark for utils.email_outbox against the local SMTP stub.
+1. Handler latency: approving a promotion that notifies 100 buyers, sending
+   inline (one SMTP connection per email, as admin_approve_promotion did)
+   versus one enqueue_many() call.
+2. Drain throughput: 2000 queued emails delivered by 1 and 4 outbox workers
+   over persistent connections, versus a fresh connection per email.
+3. Retry: with the SMTP server down, a batch goes back to pending with
+   backoff instead of being lost.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_email_outbox.py
+"""
+import threading
+import time
+
+import psycopg2
+
+from bench_common import BENCH_DATABASE_URL, connect, percentile
+from smtp_stub import start_stub
+from utils.email_outbox import (
+    EmailOutbox, SMTPSession, SMTPSettings, build_message, ensure_email_outbox_table
+)
+
+STUB_LATENCY_MS = 20        # per handshake and per message
+PROMO_RECIPIENTS = 100
+HANDLER_ITERATIONS = 5
+DRAIN_MESSAGES = 2000
+BODY = '<html><body>' + ('<p>Great news! A product you like is on sale.</p>' * 20) + '</body></html>'
+
+
+def settings_for(port):
+    return SMTPSettings(server='127.0.0.1', port=port, sender='noreply@varon.com',
+                        username='', password='', use_tls=False, log_only=False, timeout=5)
+
+
+def reset_outbox(conn):
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS email_outbox')
+    ensure_email_outbox_table(cursor)
+    conn.commit()
+    cursor.close()
+
+
+def messages(count):
+    return [(f'buyer{i}@example.com', f'Special Discount #{i}', BODY) for i in range(count)]
+
+
+def inline_send(settings, outgoing):
+    for to_email, subject, html_body in outgoing:
+        session = SMTPSession(settings)
+        try:
+            session.send(settings.sender, to_email, build_message(settings.sender, to_email, subject, html_body))
+        finally:
+            session.close()
+
+
+def bench_handler(settings, outbox):
+    outgoing = messages(PROMO_RECIPIENTS)
+    results = {}
+    for label, fn in (
+        ('inline SMTP', lambda: inline_send(settings, outgoing)),
+        ('enqueue_many', lambda: outbox.enqueue_many(outgoing)),
+    ):
+        latencies = []
+        for _ in range(HANDLER_ITERATIONS):
+            started = time.perf_counter()
+            fn()
+            latencies.append((time.perf_counter() - started) * 1000)
+        results[label] = latencies
+    return results
+
+
+def drain(outbox, workers):
+    def worker():
+        session = SMTPSession(outbox.settings)
+        try:
+            while outbox.drain_once(session):
+                pass
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def status_counts(conn):
+    cursor = conn.cursor()
+    cursor.execute('SELECT status, COUNT(*) FROM email_outbox GROUP BY status')
+    counts = dict(cursor.fetchall())
+    cursor.close()
+    return counts
+
+
+def main():
+    conn = connect()
+    stub = start_stub(latency_ms=STUB_LATENCY_MS)
+    settings = settings_for(stub.server_address[1])
+    outbox = EmailOutbox(lambda: psycopg2.connect(BENCH_DATABASE_URL), settings, batch_size=50, backoff_seconds=30)
+    failed = False
+
+    print("\n" + "=" * 78)
+    print(f"EMAIL OUTBOX BENCHMARK (SMTP stub latency {STUB_LATENCY_MS}ms per handshake and per message)")
+    print("=" * 78)
+
+    reset_outbox(conn)
+    print(f"\nHandler latency, promotion approval notifying {PROMO_RECIPIENTS} recipients")
+    results = bench_handler(settings, outbox)
+    for label, latencies in results.items():
+        print(f"  {label:<28} p50={percentile(latencies, 50):>9.2f}ms  p95={percentile(latencies, 95):>9.2f}ms")
+    speedup = percentile(results['inline SMTP'], 50) / max(percentile(results['enqueue_many'], 50), 0.001)
+    print(f"  -> request handler {speedup:.0f}x faster")
+
+    print(f"\nDrain throughput, {DRAIN_MESSAGES} queued emails")
+    reset_outbox(conn)
+    started = time.perf_counter()
+    inline_send(settings, messages(200))
+    per_connection = 200 / (time.perf_counter() - started)
+    print(f"  {'connection per email':<28} emails/sec={per_connection:>8.1f}")
+    for workers in (1, 4):
+        reset_outbox(conn)
+        outbox.enqueue_many(messages(DRAIN_MESSAGES))
+        connections_before = stub.connections
+        messages_before = stub.messages
+        elapsed = drain(outbox, workers)
+        delivered = stub.messages - messages_before
+        counts = status_counts(conn)
+        print(f"  {f'outbox, {workers} worker(s)':<28} emails/sec={delivered / elapsed:>8.1f}  "
+              f"smtp_connections={stub.connections - connections_before}  sent={counts.get('sent', 0)}")
+        if counts.get('sent', 0) != DRAIN_MESSAGES or delivered != DRAIN_MESSAGES:
+            failed = True
+
+    print("\nRetry with the SMTP server down")
+    reset_outbox(conn)
+    down = EmailOutbox(lambda: psycopg2.connect(BENCH_DATABASE_URL), settings_for(1), batch_size=50)
+    down.enqueue_many(messages(10))
+    session = SMTPSession(down.settings)
+    down.drain_once(session)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT COUNT(*) FILTER (WHERE status = 'pending' AND attempts = 1 AND next_attempt_at > NOW()),
+               COUNT(*)
+        FROM email_outbox
+    ''')
+    deferred, total = cursor.fetchone()
+    cursor.close()
+    print(f"  deferred for retry: {deferred}/{total}")
+    if deferred != total:
+        failed = True
+
+    conn.close()
+    stub.shutdown()
+    print("\n" + ("✗ Outbox lost or duplicated mail" if failed else "✓ Every queued email delivered exactly once; failures deferred"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Order history benchmark for /api/my-orders
+Replays the old loader (every order, then items + review + rating queries per
+order) and utils.order_history's paginated loader for buyers with growing
+lifetime order counts. The paginated loader should cost the same number of
+statements and roughly the same time whatever the history size.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_order_history.py
+"""
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.order_history import count_orders_by_status, ensure_order_history_index, load_order_history
+
+HISTORY_SIZES = (10, 200, 2000)
+ITEMS_PER_ORDER = 3
+PRODUCTS = 300
+PAGE_SIZE = 20
+ITERATIONS = 20
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS rider_ratings, reviews, shipments, product_images, order_items, orders, products, users CASCADE;
+CREATE TABLE users (id SERIAL PRIMARY KEY, first_name VARCHAR(100), email VARCHAR(200));
+CREATE TABLE products (id SERIAL PRIMARY KEY, name VARCHAR(200));
+CREATE TABLE product_images (
+    id SERIAL PRIMARY KEY, product_id INT, image_url VARCHAR(500), is_primary BOOLEAN DEFAULT FALSE
+);
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, order_number VARCHAR(50), user_id INT, rider_id INT, total_amount NUMERIC(10,2),
+    order_status VARCHAR(30), payment_status VARCHAR(20), created_at TIMESTAMP
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY, order_id INT, product_id INT, quantity INT, unit_price NUMERIC(10,2), subtotal NUMERIC(10,2)
+);
+CREATE TABLE shipments (
+    id SERIAL PRIMARY KEY, order_id INT, rider_id INT, status VARCHAR(30), delivered_at TIMESTAMP
+);
+CREATE TABLE reviews (id SERIAL PRIMARY KEY, product_id INT, user_id INT, order_id INT);
+CREATE TABLE rider_ratings (id SERIAL PRIMARY KEY, rider_id INT, user_id INT, order_id INT);
+CREATE INDEX ON product_images (product_id);
+CREATE INDEX ON order_items (order_id);
+CREATE INDEX ON shipments (order_id);
+CREATE INDEX ON reviews (user_id, order_id);
+CREATE INDEX ON rider_ratings (user_id, order_id);
+"""
+
+
+def seed(conn):
+    """One buyer per history size; returns {history_size: user_id}."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    ensure_order_history_index(cursor)
+    cursor.execute("INSERT INTO products (name) SELECT 'Product ' || g FROM generate_series(1, %s) g", (PRODUCTS,))
+    cursor.execute("""
+        INSERT INTO product_images (product_id, image_url, is_primary)
+        SELECT p.id, '/static/uploads/p' || p.id || '-' || g || '.jpg', g = 2
+        FROM products p, generate_series(1, 3) g
+    """)
+    buyers = {}
+    for size in HISTORY_SIZES:
+        cursor.execute("INSERT INTO users (first_name, email) VALUES ('Buyer', %s) RETURNING id", (f'buyer{size}@example.com',))
+        user_id = cursor.fetchone()[0]
+        buyers[size] = user_id
+        cursor.execute("""
+            INSERT INTO orders (order_number, user_id, rider_id, total_amount, order_status, payment_status, created_at)
+            SELECT 'ORD-' || %s || '-' || g, %s, CASE WHEN g %% 2 = 0 THEN 1 + g %% 10 END, 597,
+                   CASE WHEN g %% 2 = 0 THEN 'delivered' ELSE 'pending' END, 'pending',
+                   NOW() - make_interval(hours => g)
+            FROM generate_series(1, %s) g
+        """, (user_id, user_id, size))
+    cursor.execute("""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal)
+        SELECT o.id, 1 + (o.id * 7 + g) %% %s, 1, 199, 199
+        FROM orders o, generate_series(1, %s) g
+    """, (PRODUCTS, ITEMS_PER_ORDER))
+    cursor.execute("""
+        INSERT INTO shipments (order_id, rider_id, status, delivered_at)
+        SELECT id, rider_id, 'delivered', created_at + INTERVAL '1 day' FROM orders WHERE rider_id IS NOT NULL
+    """)
+    cursor.execute("""
+        INSERT INTO reviews (product_id, user_id, order_id)
+        SELECT DISTINCT ON (oi.order_id) oi.product_id, o.user_id, o.id
+        FROM orders o JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.id % 4 = 0
+        ORDER BY oi.order_id, oi.id
+    """)
+    cursor.execute("""
+        INSERT INTO rider_ratings (rider_id, user_id, order_id)
+        SELECT rider_id, user_id, id FROM orders WHERE rider_id IS NOT NULL AND id % 3 = 0
+    """)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+    return buyers
+
+
+def legacy_my_orders(cursor, user_id):
+    """The original handler: all orders, then three lookups per order."""
+    cursor.execute('''
+        SELECT o.id, o.order_number, o.total_amount, o.order_status, o.payment_status, o.created_at,
+               COALESCE(s.rider_id, o.rider_id) as rider_id,
+               u.first_name, u.email,
+               s.id as shipment_id, s.status as shipment_status, s.delivered_at
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        LEFT JOIN shipments s ON o.id = s.order_id
+        WHERE o.user_id = %s
+        ORDER BY o.created_at DESC
+    ''', (user_id,))
+    orders = cursor.fetchall()
+    for order in orders:
+        cursor.execute('''
+            SELECT oi.id, oi.product_id, oi.quantity, oi.unit_price, oi.subtotal,
+                   MAX(p.name) as product_name,
+                   COALESCE(MAX(pi_primary.image_url), MAX(pi_any.image_url)) as image_url
+            FROM order_items oi
+            LEFT JOIN products p ON oi.product_id = p.id
+            LEFT JOIN product_images pi_primary ON p.id = pi_primary.product_id AND pi_primary.is_primary::int = 1
+            LEFT JOIN product_images pi_any ON p.id = pi_any.product_id
+            WHERE oi.order_id = %s
+            GROUP BY oi.id, oi.product_id
+        ''', (order['id'],))
+        order['items'] = cursor.fetchall()
+        if order['items']:
+            cursor.execute('SELECT id FROM reviews WHERE product_id = %s AND user_id = %s AND order_id = %s',
+                           (order['items'][0]['product_id'], user_id, order['id']))
+            order['has_product_review'] = cursor.fetchone() is not None
+        if order.get('rider_id'):
+            cursor.execute('SELECT id FROM rider_ratings WHERE rider_id = %s AND user_id = %s AND order_id = %s',
+                           (order['rider_id'], user_id, order['id']))
+            order['has_rider_rating'] = cursor.fetchone() is not None
+    return orders
+
+
+def paged_my_orders(cursor, user_id):
+    """First page plus tab counts, as /api/my-orders serves it now."""
+    orders, _ = load_order_history(cursor, user_id, PAGE_SIZE)
+    count_orders_by_status(cursor, user_id)
+    return orders
+
+
+def main():
+    conn = connect()
+    print(f"Seeding buyers with {', '.join(str(size) for size in HISTORY_SIZES)} lifetime orders...")
+    buyers = seed(conn)
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+
+    print("\n" + "=" * 78)
+    print(f"ORDER HISTORY BENCHMARK ({ITEMS_PER_ORDER} items per order, page size {PAGE_SIZE})")
+    print("=" * 78)
+
+    failed = False
+    for size, user_id in buyers.items():
+        print(f"\nlifetime orders={size}")
+        legacy = legacy_my_orders(cursor, user_id)
+        paged = paged_my_orders(cursor, user_id)
+        # The first page must match what the old loader showed at the top of the list.
+        for old, new in zip(legacy[:PAGE_SIZE], paged):
+            same = (old['id'] == new['id'] and [i['id'] for i in old['items']] == [i['id'] for i in new['items']]
+                    and [i['image_url'] for i in old['items']] == [i['image_url'] for i in new['items']]
+                    and old.get('has_product_review', False) == new['has_product_review']
+                    and old.get('has_rider_rating', False) == new['has_rider_rating'])
+            if not same:
+                print(f"  ✗ order {new['id']} differs from the legacy loader")
+                failed = True
+                break
+
+        iterations = max(1, ITERATIONS // (1 + size // 200))
+        print_row('all orders + N+1 (legacy)', *time_call(lambda: legacy_my_orders(cursor, user_id), iterations))
+        print_row(f'first page of {PAGE_SIZE}', *time_call(lambda: paged_my_orders(cursor, user_id), ITERATIONS))
+
+        last_page_cursor = None
+        pages = 0
+        while True:
+            orders, has_more = load_order_history(cursor, user_id, PAGE_SIZE, last_page_cursor)
+            pages += 1
+            if not has_more:
+                break
+            last_page_cursor = orders[-1]['id']
+        print_row(f'deepest page ({pages} pages)',
+                  *time_call(lambda: load_order_history(cursor, user_id, PAGE_SIZE, last_page_cursor), ITERATIONS))
+        conn.rollback()
+
+    conn.close()
+    print("\n" + ("✗ Paginated loader disagrees with the legacy loader" if failed else
+                  "✓ Constant queries per page, same orders, items, images and flags"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
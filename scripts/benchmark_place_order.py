@@ -0,0 +1,270 @@
+"""
+Order placement benchmark for /api/place-order
+Replays the checkout write transaction with the old per-line statements and
+the post-commit notification/history connections, then with the set-based
+utils.order_placement helpers on a single connection. Reports statements per
+order and orders/sec with several concurrent buyers.
+
+The schema keeps the real foreign keys from order_items to orders and products
+(database.sql), so inserting the items takes FOR KEY SHARE on the product rows
+before add_sales_counts locks them, as in production. A set-based run that
+deadlocks fails the benchmark.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_place_order.py
+"""
+import random
+import threading
+import time
+
+import psycopg2
+
+from bench_common import BENCH_DATABASE_URL, CountingCursor, connect, percentile
+from utils.order_placement import add_sales_counts, insert_order_items, normalize_order_lines
+
+PRODUCTS = 500
+SELLERS = 20
+BUYERS = 64
+CART_LINES = 20
+ORDERS_PER_BUYER = 25
+CONCURRENCY = (1, 4, 8)
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS order_status_history, seller_notifications, activity_logs, shipments, transactions,
+    cart, order_items, orders, inventory, addresses, products CASCADE;
+CREATE TABLE products (id SERIAL PRIMARY KEY, seller_id INT, name VARCHAR(200), price NUMERIC(10,2), sales_count INT DEFAULT 0);
+CREATE TABLE inventory (
+    id SERIAL PRIMARY KEY, product_id INT REFERENCES products(id) ON DELETE CASCADE, variant_id INT, stock_quantity INT
+);
+CREATE TABLE addresses (
+    id SERIAL PRIMARY KEY, user_id INT, full_name VARCHAR(200), phone VARCHAR(30), street_address TEXT,
+    barangay VARCHAR(100), city VARCHAR(100), province VARCHAR(100), postal_code VARCHAR(10),
+    country VARCHAR(100), address_type VARCHAR(20), is_default BOOLEAN DEFAULT FALSE
+);
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, order_number VARCHAR(50) UNIQUE, user_id INT, seller_id INT,
+    shipping_address_id INT, billing_address_id INT, subtotal NUMERIC(10,2), shipping_fee NUMERIC(10,2),
+    total_amount NUMERIC(10,2), payment_method VARCHAR(50), payment_status VARCHAR(20),
+    order_status VARCHAR(30), notes TEXT, created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY,
+    order_id INT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INT NOT NULL REFERENCES products(id) ON DELETE RESTRICT,
+    variant_id INT, product_name VARCHAR(200), size VARCHAR(20),
+    color VARCHAR(50), quantity INT, unit_price NUMERIC(10,2), subtotal NUMERIC(10,2)
+);
+CREATE TABLE cart (id SERIAL PRIMARY KEY, user_id INT, product_id INT, quantity INT);
+CREATE TABLE transactions (
+    id SERIAL PRIMARY KEY, order_id INT, payment_method VARCHAR(50), payment_gateway VARCHAR(50),
+    amount NUMERIC(10,2), currency VARCHAR(3), status VARCHAR(20)
+);
+CREATE TABLE shipments (id SERIAL PRIMARY KEY, order_id INT, status VARCHAR(30), created_at TIMESTAMP);
+CREATE TABLE activity_logs (
+    id SERIAL PRIMARY KEY, user_id INT, action VARCHAR(100), entity_type VARCHAR(50), entity_id INT, description TEXT
+);
+CREATE TABLE seller_notifications (
+    id SERIAL PRIMARY KEY, seller_id INT, order_id INT, notification_type VARCHAR(50), title VARCHAR(255),
+    message TEXT, is_read BOOLEAN DEFAULT FALSE, action_url VARCHAR(500), priority VARCHAR(20), created_at TIMESTAMP
+);
+CREATE TABLE order_status_history (
+    id SERIAL PRIMARY KEY, order_id INT, seller_id INT, old_status VARCHAR(30), new_status VARCHAR(30),
+    changed_by INT, reason TEXT, notes TEXT, created_at TIMESTAMP
+);
+CREATE INDEX ON addresses (user_id);
+CREATE INDEX ON order_items (order_id);
+CREATE INDEX ON inventory (product_id);
+CREATE INDEX ON cart (user_id);
+"""
+
+
+def seed(conn):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("""
+        INSERT INTO products (seller_id, name, price)
+        SELECT 1 + (g %% %s), 'Product ' || g, 100 + (g %% 900) FROM generate_series(1, %s) g
+    """, (SELLERS, PRODUCTS))
+    cursor.execute("INSERT INTO inventory (product_id, stock_quantity) SELECT id, 1000000 FROM products")
+    cursor.execute("""
+        INSERT INTO addresses (user_id, full_name, street_address, city, province, country, address_type, is_default)
+        SELECT g, 'Buyer ' || g, 'Street ' || g, 'City', 'Province', 'Philippines', 'shipping', TRUE
+        FROM generate_series(1, %s) g
+    """, (BUYERS,))
+    conn.commit()
+    cursor.close()
+
+
+def build_cart(rng):
+    return [
+        {'id': rng.randint(1, PRODUCTS), 'name': 'Product', 'price': 199.0,
+         'quantity': rng.randint(1, 3), 'size': 'M', 'color': 'Black'}
+        for _ in range(CART_LINES)
+    ]
+
+
+def _order_number(user_id):
+    return f"ORD-{time.time_ns()}-{user_id}-{random.randint(0, 9999)}"
+
+
+def _write_order_trailer(cursor, order_id, user_id, total):
+    cursor.execute('DELETE FROM cart WHERE user_id = %s AND id = ANY(%s)', (user_id, [0]))
+    cursor.execute('''
+        INSERT INTO transactions (order_id, payment_method, payment_gateway, amount, currency, status)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    ''', (order_id, 'Cash on Delivery', None, total, 'PHP', 'pending'))
+    cursor.execute('INSERT INTO shipments (order_id, status, created_at) VALUES (%s, %s, NOW())', (order_id, 'pending'))
+    cursor.execute('''
+        INSERT INTO activity_logs (user_id, action, entity_type, entity_id, description)
+        VALUES (%s, %s, %s, %s, %s)
+    ''', (user_id, 'order_placed', 'order', order_id, 'Order placed'))
+
+
+def legacy_place_order(conn, user_id, items):
+    """The original flow: three statements per line, helpers on fresh connections."""
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    cursor.execute('SELECT id FROM addresses WHERE user_id = %s AND is_default::int = 1 LIMIT 1', (user_id,))
+    address_id = cursor.fetchone()['id']
+    cursor.execute('SELECT seller_id FROM products WHERE id = %s', (items[0]['id'],))
+    seller_id = cursor.fetchone()['seller_id']
+    total = sum(item['price'] * item['quantity'] for item in items)
+    cursor.execute('''
+        INSERT INTO orders (order_number, user_id, seller_id, shipping_address_id, billing_address_id,
+                            subtotal, shipping_fee, total_amount, payment_method, payment_status, order_status, notes, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, 0, %s, 'Cash on Delivery', 'pending', 'pending', '', NOW())
+        RETURNING id
+    ''', (_order_number(user_id), user_id, seller_id, address_id, address_id, total, total))
+    order_id = cursor.fetchone()['id']
+    for item in items:
+        cursor.execute('''
+            INSERT INTO order_items (order_id, product_id, product_name, size, color, quantity, unit_price, subtotal)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ''', (order_id, item['id'], item['name'], item['size'], item['color'], item['quantity'],
+              item['price'], item['price'] * item['quantity']))
+        cursor.execute('UPDATE products SET sales_count = sales_count + %s WHERE id = %s', (item['quantity'], item['id']))
+        cursor.execute('''
+            UPDATE inventory SET stock_quantity = stock_quantity - %s
+            WHERE product_id = %s AND variant_id IS NULL
+        ''', (item['quantity'], item['id']))
+    _write_order_trailer(cursor, order_id, user_id, total)
+    conn.commit()
+    cursor.close()
+
+    # create_seller_notification / record_order_status_change each checked out a connection.
+    for statement, params in (
+        ("INSERT INTO seller_notifications (seller_id, order_id, notification_type, title, message, priority, created_at) "
+         "VALUES (%s, %s, 'new_order', 'New Order Received', 'New order', 'high', NOW())", (seller_id, order_id)),
+        ("INSERT INTO order_status_history (order_id, seller_id, old_status, new_status, changed_by, created_at) "
+         "VALUES (%s, %s, NULL, 'pending', %s, NOW())", (order_id, seller_id, user_id)),
+    ):
+        helper_conn = psycopg2.connect(BENCH_DATABASE_URL)
+        helper_cursor = helper_conn.cursor(cursor_factory=CountingCursor)
+        helper_cursor.execute(statement, params)
+        helper_conn.commit()
+        helper_conn.close()
+
+
+def set_based_place_order(conn, user_id, items):
+    """The new flow: constant statements, one transaction on one connection."""
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    cursor.execute('SELECT id FROM addresses WHERE user_id = %s AND is_default::int = 1 LIMIT 1', (user_id,))
+    address_id = cursor.fetchone()['id']
+    lines = normalize_order_lines(items)
+    total = sum(line['subtotal'] for line in lines)
+    cursor.execute('''
+        INSERT INTO orders (order_number, user_id, seller_id, shipping_address_id, billing_address_id,
+                            subtotal, shipping_fee, total_amount, payment_method, payment_status, order_status, notes, created_at)
+        VALUES (%s, %s, COALESCE((SELECT seller_id FROM products WHERE id = %s), 1), %s, %s, %s, 0, %s,
+                'Cash on Delivery', 'pending', 'pending', '', NOW())
+        RETURNING id, seller_id
+    ''', (_order_number(user_id), user_id, lines[0]['product_id'], address_id, address_id, total, total))
+    order = cursor.fetchone()
+    insert_order_items(cursor, order['id'], lines)
+    add_sales_counts(cursor, lines)
+    _write_order_trailer(cursor, order['id'], user_id, total)
+    cursor.execute(
+        "SAVEPOINT seller_notification; INSERT INTO seller_notifications (seller_id, order_id, notification_type, title, "
+        "message, priority, created_at) VALUES (%s, %s, 'new_order', 'New Order Received', 'New order', 'high', NOW()); "
+        "RELEASE SAVEPOINT seller_notification", (order['seller_id'], order['id']))
+    cursor.execute(
+        "SAVEPOINT status_history; INSERT INTO order_status_history (order_id, seller_id, old_status, new_status, "
+        "changed_by, created_at) VALUES (%s, %s, NULL, 'pending', %s, NOW()); RELEASE SAVEPOINT status_history",
+        (order['id'], order['seller_id'], user_id))
+    conn.commit()
+    cursor.close()
+
+
+def run_buyers(place_order, concurrency):
+    """Run ``concurrency`` buyer threads; return (orders/sec, p50 ms, p95 ms, statements/order, failed, deadlocks)."""
+    latencies = []
+    failures = []
+    deadlocks = []
+    lock = threading.Lock()
+    CountingCursor.statements = 0
+
+    def buyer(worker):
+        rng = random.Random(worker)
+        conn = psycopg2.connect(BENCH_DATABASE_URL)
+        local = []
+        failed = 0
+        deadlocked = 0
+        for index in range(ORDERS_PER_BUYER):
+            user_id = 1 + (worker * ORDERS_PER_BUYER + index) % BUYERS
+            started = time.perf_counter()
+            try:
+                place_order(conn, user_id, build_cart(rng))
+            except psycopg2.errors.DeadlockDetected:
+                conn.rollback()
+                failed += 1
+                deadlocked += 1
+                continue
+            except psycopg2.Error:
+                conn.rollback()
+                failed += 1
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            failures.append(failed)
+            deadlocks.append(deadlocked)
+
+    threads = [threading.Thread(target=buyer, args=(worker,)) for worker in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    orders = len(latencies)
+    return (orders / elapsed, percentile(latencies, 50), percentile(latencies, 95),
+            CountingCursor.statements / float(orders or 1), sum(failures), sum(deadlocks))
+
+
+def main():
+    conn = connect()
+    print(f"Seeding {PRODUCTS} products and {BUYERS} buyers...")
+    seed(conn)
+    conn.close()
+
+    print("\n" + "=" * 72)
+    print(f"PLACE ORDER BENCHMARK ({CART_LINES}-line carts, {ORDERS_PER_BUYER} orders per buyer thread)")
+    print("=" * 72)
+    set_based_deadlocks = 0
+    for concurrency in CONCURRENCY:
+        print(f"\nconcurrent buyers={concurrency}")
+        for label, place_order in (('per-line (legacy)', legacy_place_order), ('set-based', set_based_place_order)):
+            throughput, p50, p95, statements, failed, deadlocks = run_buyers(place_order, concurrency)
+            print(f"  {label:<20} statements/order={statements:>5.1f}  orders/sec={throughput:>7.1f}  "
+                  f"p50={p50:>7.2f}ms  p95={p95:>7.2f}ms  failed={failed}  deadlocks={deadlocks}")
+            if place_order is set_based_place_order:
+                set_based_deadlocks += deadlocks
+
+    print("\n" + ("✗ Set-based checkout deadlocked" if set_based_deadlocks else
+                  "✓ Set-based checkout: constant statements, no deadlocks"))
+    if set_based_deadlocks:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Product search benchmark for /api/products?search=
+Compares the old case-sensitive LIKE '%term%' listing and brand queries against
+utils.product_search (weighted tsvector + GIN, ranked, keyset pages, facets)
+at 10k/100k/1M products.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_product_search.py [sizes]
+e.g. python scripts/benchmark_product_search.py 10000,100000
+The 1M seed takes a few minutes.
+"""
+import sys
+import time
+
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.catalog import LISTING_PAGE_QUERY, decorate_listing
+from utils.product_search import ProductSearch, ensure_product_search
+
+SIZES = (10_000, 100_000, 1_000_000)
+ITERATIONS = 10
+LIMIT = 50
+QUERIES = (
+    ('common term', 'shirt'),
+    ('two terms', 'linen jacket'),
+    ('prefix', 'jack'),
+    ('no match', 'zzqx'),
+)
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS product_stats, promotions, product_variants, product_images, products, sellers, categories CASCADE;
+CREATE TABLE categories (id SERIAL PRIMARY KEY, name VARCHAR(100), parent_id INT, is_active BOOLEAN DEFAULT TRUE);
+CREATE TABLE sellers (
+    id SERIAL PRIMARY KEY, store_name VARCHAR(200), store_slug VARCHAR(200), description TEXT, logo_url VARCHAR(500),
+    island_group VARCHAR(20), rating NUMERIC(3,2), total_sales NUMERIC(12,2), status VARCHAR(20) DEFAULT 'approved'
+);
+CREATE TABLE products (
+    id SERIAL PRIMARY KEY, seller_id INT, category_id INT, name VARCHAR(200), description TEXT, brand VARCHAR(100),
+    price NUMERIC(10,2), is_active BOOLEAN DEFAULT TRUE, archive_status VARCHAR(20) DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE TABLE product_images (id SERIAL PRIMARY KEY, product_id INT, image_url VARCHAR(500), is_primary BOOLEAN);
+CREATE TABLE product_variants (id SERIAL PRIMARY KEY, product_id INT, color VARCHAR(50), stock_quantity INT);
+CREATE TABLE promotions (
+    id SERIAL PRIMARY KEY, product_id INT, discount_type VARCHAR(20), discount_value NUMERIC(10,2),
+    start_date TIMESTAMP, end_date TIMESTAMP, description TEXT, code VARCHAR(50),
+    is_active BOOLEAN DEFAULT TRUE, is_approved BOOLEAN DEFAULT TRUE
+);
+CREATE TABLE product_stats (product_id INT PRIMARY KEY, avg_rating NUMERIC(3,2), review_count INT, sold_count INT);
+CREATE INDEX ON products (seller_id);
+CREATE INDEX ON product_images (product_id);
+CREATE INDEX ON product_variants (product_id);
+CREATE INDEX ON promotions (product_id);
+"""
+
+# Deterministic catalogue text: "<style> <color> <material> <item>", brands cycle per seller.
+SEED_PRODUCTS_SQL = """
+    INSERT INTO products (seller_id, category_id, name, description, brand, price, created_at)
+    SELECT 1 + (g %% 200),
+           1 + (g %% 12),
+           (ARRAY['Classic','Slim','Relaxed','Vintage','Everyday','Premium','Oversized'])[1 + g %% 7] || ' ' ||
+           (ARRAY['Red','Navy','Black','White','Olive','Beige','Grey','Maroon','Mustard'])[1 + g %% 9] || ' ' ||
+           (ARRAY['Cotton','Linen','Denim','Wool','Silk','Polyester'])[1 + g %% 6] || ' ' ||
+           (ARRAY['Shirt','Jacket','Pants','Dress','Shorts','Hoodie','Skirt','Polo','Blouse','Jeans','Cardigan'])[1 + g %% 11]
+           || ' ' || g,
+           'Made for island weather. ' ||
+           (ARRAY['Breathable weave','Machine washable','Tailored fit','Soft brushed finish','Locally sewn'])[1 + g %% 5] ||
+           '. Pairs well with our ' ||
+           (ARRAY['sandals','sneakers','loafers','boots','slides'])[1 + g %% 5] || '.',
+           (ARRAY['Bench','Penshoppe','Kamiseta','Folded & Hung','Oxygen','Human','Bayo','Plains & Prints'])[1 + g %% 8],
+           50 + (g * 37 %% 6000),
+           NOW() - (g || ' seconds')::interval
+    FROM generate_series(1, %s) g
+"""
+
+LEGACY_BRAND_QUERY = """
+    SELECT s.id, s.store_name, s.store_slug, s.description, s.logo_url, s.island_group, s.rating, s.total_sales,
+           COALESCE(COUNT(DISTINCT CASE
+               WHEN p.is_active::int = 1 AND (p.archive_status IS NULL OR p.archive_status = 'active') THEN p.id
+           END), 0) AS product_count,
+           MAX(p.brand) AS primary_brand
+    FROM sellers s
+    LEFT JOIN products p ON p.seller_id = s.id
+    WHERE s.status = 'approved'
+      AND (s.store_name LIKE %s OR p.brand LIKE %s)
+    GROUP BY s.id, s.store_name, s.store_slug, s.description, s.logo_url, s.island_group, s.rating, s.total_sales
+    ORDER BY product_count DESC, s.store_name ASC
+    LIMIT 4
+"""
+
+
+def seed(conn, size):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("INSERT INTO categories (name) SELECT (ARRAY['Tops','Bottoms','Dresses','Outerwear','Activewear','Loungewear','Formal','Swimwear','Kids','Accessories','Footwear','Bags'])[g] FROM generate_series(1, 12) g")
+    cursor.execute("INSERT INTO sellers (store_name, store_slug) SELECT 'Store ' || g, 'store-' || g FROM generate_series(1, 200) g")
+    trigram = ensure_product_search(cursor, backfill=False)
+    started = time.perf_counter()
+    cursor.execute(SEED_PRODUCTS_SQL, (size,))
+    seeded = time.perf_counter() - started
+    cursor.execute("INSERT INTO product_images (product_id, image_url, is_primary) SELECT id, '/static/p' || id || '.webp', TRUE FROM products")
+    conn.commit()
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+    return trigram, seeded
+
+
+def legacy_listing(cursor, pattern):
+    """The original LIKE listing page, decorated the same way as the search results."""
+    cursor.execute(LISTING_PAGE_QUERY + """
+        AND (p.name LIKE %s OR p.description LIKE %s OR p.brand LIKE %s)
+        ORDER BY p.created_at DESC LIMIT %s
+    """, (pattern, pattern, pattern, LIMIT))
+    products = cursor.fetchall()
+    decorate_listing(cursor, products)
+    return products
+
+
+def legacy_search(cursor, term):
+    """The original /api/products?search= flow: LIKE listing plus the LIKE brand strip."""
+    pattern = f"%{term}%"
+    legacy_listing(cursor, pattern)
+    cursor.execute(LEGACY_BRAND_QUERY, (pattern, pattern))
+    cursor.fetchall()
+
+
+def ranked_search(search, cursor, term, after=None):
+    page = search.search(cursor, term, limit=LIMIT, after=after)
+    if not after:
+        search.brand_matches(cursor, term)
+    return page
+
+
+def deep_page_cursor(search, cursor, term, pages):
+    """``next_cursor`` after ``pages`` pages of ``term``, or None if it runs out first."""
+    after = None
+    for _ in range(pages):
+        after = search.search(cursor, term, limit=LIMIT, after=after)['next_cursor']
+        if after is None:
+            return None
+    return after
+
+
+def run(conn, size):
+    print(f"\nSeeding {size:,} products...", end=" ", flush=True)
+    trigram, seeded = seed(conn, size)
+    print(f"{seeded:.1f}s including search_vector triggers (pg_trgm {'available' if trigram else 'unavailable'})")
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    search = ProductSearch(trigram=trigram)
+    iterations = ITERATIONS if size < 1_000_000 else max(3, ITERATIONS // 2)
+
+    for label, term in QUERIES:
+        legacy_hits = len(legacy_listing(cursor, f"%{term}%"))
+        facets = ranked_search(search, cursor, term)['facets']
+        total = sum(band['count'] for band in facets['price_bands']) if facets else 0
+        conn.rollback()
+        print(f"\n  '{term}' ({label}): LIKE finds {legacy_hits} on page 1 (case-sensitive), search matches {total:,}")
+        latencies, statements = time_call(lambda: legacy_search(cursor, term), iterations)
+        print_row('LIKE (legacy)', latencies, statements)
+        conn.rollback()
+        latencies, statements = time_call(lambda: ranked_search(search, cursor, term), iterations)
+        print_row('tsvector + facets', latencies, statements)
+        conn.rollback()
+
+    after = deep_page_cursor(search, cursor, 'shirt', 10)
+    if after:
+        latencies, statements = time_call(lambda: ranked_search(search, cursor, 'shirt', after), iterations)
+        print_row("'shirt' page 11 (keyset)", latencies, statements)
+    latencies, statements = time_call(lambda: search.search(cursor, '', limit=LIMIT), iterations)
+    print_row('browse page 1', latencies, statements)
+    if trigram:
+        latencies, statements = time_call(lambda: ranked_search(search, cursor, 'jakcet'), iterations)
+        print_row("'jakcet' (typo)", latencies, statements)
+    conn.rollback()
+    cursor.close()
+
+
+def main():
+    sizes = SIZES
+    if len(sys.argv) > 1:
+        sizes = tuple(int(value) for value in sys.argv[1].split(','))
+    conn = connect()
+    print("=" * 72)
+    print("PRODUCT SEARCH BENCHMARK")
+    print("=" * 72)
+    for size in sizes:
+        run(conn, size)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Rider dashboard benchmark for utils.rider_metrics
+Seeds riders with growing tenure (lifetime completed deliveries and ratings)
+but the same last-month traffic, then times the earnings and ratings panels:
+
+  legacy: three DATE()/EXTRACT() aggregates over rider_transactions plus an
+          AVG/histogram over every rider_ratings row
+  rollup: load_rider_earnings (one pass over the (rider_id, completed_at)
+          range) plus load_rider_rating_summary from rider_daily_metrics
+
+The two must return the same numbers. A batch of deliveries and ratings is
+then recorded through record_rider_transaction / record_rider_rating and the
+incrementally kept rollup is compared with rebuild_rider_metrics.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_rider_dashboard.py
+"""
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.rider_metrics import (
+    ensure_rider_metrics_tables, load_rider_daily_history, load_rider_earnings, load_rider_rating_summary,
+    rebuild_rider_metrics, record_rider_rating, record_rider_transaction,
+)
+
+TENURES = (1000, 10000, 100000)  # lifetime completed deliveries per rider
+RECENT_DELIVERIES = 400          # last 45 days, the same for every rider
+RATINGS_PER_DELIVERY = 0.6
+ITERATIONS = 50
+RECORDED = 200
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS rider_daily_metrics, rider_ratings, rider_transactions CASCADE;
+CREATE TABLE rider_transactions (
+    id SERIAL PRIMARY KEY, rider_id INT, order_id INT, shipment_id INT, earning_amount NUMERIC(10,2),
+    commission_rate NUMERIC(5,2), status VARCHAR(20), completed_at TIMESTAMP
+);
+CREATE TABLE rider_ratings (
+    id SERIAL PRIMARY KEY, rider_id INT NOT NULL, user_id INT NOT NULL, order_id INT, shipment_id INT,
+    rating INT NOT NULL, comment TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX ON rider_ratings (rider_id);
+"""
+
+
+def seed(conn):
+    """One rider per tenure; returns {tenure: rider_id}."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    riders = {}
+    for rider_id, tenure in enumerate(TENURES, start=1):
+        riders[tenure] = rider_id
+        # Recent deliveries spread over 45 days, the rest over the three years before.
+        cursor.execute("""
+            INSERT INTO rider_transactions (rider_id, order_id, shipment_id, earning_amount, commission_rate, status, completed_at)
+            SELECT %s, g, g, 20 + (g %% 130), 15.00, CASE WHEN g %% 25 = 0 THEN 'pending' ELSE 'completed' END,
+                   CASE WHEN g <= %s THEN NOW() - make_interval(mins => g * 162)
+                        ELSE NOW() - INTERVAL '46 days' - make_interval(mins => (g * 787) %% 1500000) END
+            FROM generate_series(1, %s) g
+        """, (rider_id, RECENT_DELIVERIES, tenure))
+        cursor.execute("""
+            INSERT INTO rider_ratings (rider_id, user_id, order_id, rating, comment, created_at)
+            SELECT rider_id, 1 + order_id %% 500, order_id, 1 + (order_id * 7) %% 5, 'ok', completed_at + INTERVAL '1 hour'
+            FROM rider_transactions
+            WHERE rider_id = %s AND status = 'completed' AND random() < %s
+        """, (rider_id, RATINGS_PER_DELIVERY))
+    ensure_rider_metrics_tables(cursor)
+    rebuild_rider_metrics(cursor)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+    return riders
+
+
+def legacy_panels(cursor, rider_id):
+    cursor.execute('''
+        SELECT COALESCE(SUM(earning_amount), 0) as today_earnings
+        FROM rider_transactions
+        WHERE rider_id = %s AND status = 'completed'
+        AND DATE(completed_at) = CURRENT_DATE
+    ''', (rider_id,))
+    today = cursor.fetchone()['today_earnings']
+    cursor.execute('''
+        SELECT COALESCE(SUM(earning_amount), 0) as weekly_earnings
+        FROM rider_transactions
+        WHERE rider_id = %s AND status = 'completed'
+        AND completed_at >= CURRENT_DATE - INTERVAL '7 days'
+    ''', (rider_id,))
+    weekly = cursor.fetchone()['weekly_earnings']
+    cursor.execute('''
+        SELECT COALESCE(SUM(earning_amount), 0) as monthly_earnings
+        FROM rider_transactions
+        WHERE rider_id = %s AND status = 'completed'
+        AND EXTRACT(YEAR FROM completed_at) = EXTRACT(YEAR FROM CURRENT_DATE)
+        AND EXTRACT(MONTH FROM completed_at) = EXTRACT(MONTH FROM CURRENT_DATE)
+    ''', (rider_id,))
+    monthly = cursor.fetchone()['monthly_earnings']
+    cursor.execute('''
+        SELECT
+            AVG(rating) as avg_rating,
+            COUNT(*) as total_ratings,
+            SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END) as five_star,
+            SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END) as four_star,
+            SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END) as three_star,
+            SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END) as two_star,
+            SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END) as one_star
+        FROM rider_ratings
+        WHERE rider_id = %s
+    ''', (rider_id,))
+    stats = cursor.fetchone()
+    return (
+        round(float(today), 2), round(float(weekly), 2), round(float(monthly), 2),
+        round(float(stats['avg_rating'] or 0), 6), stats['total_ratings'],
+        tuple(int(stats[key] or 0) for key in ('one_star', 'two_star', 'three_star', 'four_star', 'five_star')),
+    )
+
+
+def rollup_panels(cursor, rider_id):
+    earnings = load_rider_earnings(cursor, rider_id)
+    ratings = load_rider_rating_summary(cursor, rider_id)
+    return (
+        round(earnings['today_earnings'], 2), round(earnings['weekly_earnings'], 2),
+        round(earnings['monthly_earnings'], 2), round(ratings['avg_rating'], 6), ratings['total_ratings'],
+        tuple(ratings['breakdown'][str(stars)] for stars in range(1, 6)),
+    )
+
+
+def rollup_snapshot(cursor):
+    cursor.execute("SELECT * FROM rider_daily_metrics ORDER BY rider_id, metrics_date")
+    return [tuple(row.values()) for row in cursor.fetchall()]
+
+
+def check_incremental(conn, rider_id):
+    """Record new deliveries and ratings one by one; compare with a full rebuild."""
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    for index in range(RECORDED):
+        cursor.execute('''
+            INSERT INTO rider_transactions (rider_id, order_id, shipment_id, earning_amount, commission_rate, status, completed_at)
+            VALUES (%s, %s, %s, %s, 15.00, 'completed', NOW() - make_interval(hours => %s))
+            RETURNING id
+        ''', (rider_id, 10 ** 7 + index, 10 ** 7 + index, 35 + index % 40, index))
+        record_rider_transaction(cursor, cursor.fetchone()['id'])
+        if index % 2:
+            cursor.execute('''
+                INSERT INTO rider_ratings (rider_id, user_id, order_id, rating, comment)
+                VALUES (%s, %s, %s, %s, '') RETURNING id
+            ''', (rider_id, index, 10 ** 7 + index, 1 + index % 5))
+            record_rider_rating(cursor, cursor.fetchone()['id'])
+    incremental = rollup_snapshot(cursor)
+    rebuild_rider_metrics(cursor)
+    rebuilt = rollup_snapshot(cursor)
+    history = load_rider_daily_history(cursor, rider_id, 30)
+    conn.rollback()
+    cursor.close()
+    return incremental == rebuilt and len(history) <= 30
+
+
+def main():
+    conn = connect()
+    print(f"Seeding riders with {', '.join(str(tenure) for tenure in TENURES)} lifetime deliveries...")
+    riders = seed(conn)
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+
+    print("\n" + "=" * 78)
+    print(f"RIDER DASHBOARD BENCHMARK ({RECENT_DELIVERIES} deliveries in the last 45 days, "
+          f"~{RATINGS_PER_DELIVERY:.0%} rated)")
+    print("=" * 78)
+
+    mismatched = []
+    for tenure, rider_id in riders.items():
+        print(f"\nlifetime deliveries={tenure}")
+        legacy = legacy_panels(cursor, rider_id)
+        rollup = rollup_panels(cursor, rider_id)
+        if legacy != rollup:
+            mismatched.append((tenure, legacy, rollup))
+        iterations = max(5, ITERATIONS // (1 + tenure // 10000))
+        print_row('per-window scans (legacy)', *time_call(lambda: legacy_panels(cursor, rider_id), iterations))
+        print_row('one pass + daily rollup', *time_call(lambda: rollup_panels(cursor, rider_id), ITERATIONS))
+        conn.rollback()
+    cursor.close()
+
+    consistent = check_incremental(conn, riders[TENURES[0]])
+    conn.close()
+    for tenure, legacy, rollup in mismatched:
+        print(f"\n  tenure={tenure}: legacy={legacy}\n  {'':<11}rollup={rollup}")
+    failed = bool(mismatched) or not consistent
+    print("\n" + ("✗ Rider metrics disagree with the per-call aggregates or a full rebuild" if failed else
+                  "✓ Same numbers, two indexed statements per dashboard load, incremental rollup matches a rebuild"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
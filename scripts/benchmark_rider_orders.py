@@ -0,0 +1,246 @@
+"""
+Rider order discovery benchmark for /api/rider/available-orders
+Seeds PENDING_ORDERS orders waiting for pickup across the country and RIDERS
+riders with city, province, region and multi-area service areas, then times
+one dashboard refresh per rider:
+
+  legacy: every waiting order platform-wide, matched in Python with substring
+          checks and a region table rebuilt per call (debug prints left out,
+          so this is a lower bound for the old handler)
+  keyed:  utils.service_areas - the compiled key set is matched in Postgres
+          against the generated addresses.city_key / province_key columns
+
+Both are scored against REGION_OF_PROVINCE, the ground truth for which places a
+city, province or region name covers. The run fails when the keyed filter misses
+or adds an order, or drops one the legacy matcher got right. The legacy matcher's
+own misses and false positives are reported alongside.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_rider_orders.py
+"""
+import random
+
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.service_areas import (
+    REGION_AREAS, address_in_service_area, compile_service_area, ensure_address_area_keys, fetch_available_orders,
+)
+
+PENDING_ORDERS = 10000
+OTHER_ORDERS = 20000  # delivered/confirmed orders the filter has to skip
+RIDERS = 500
+LIMIT = 100
+ITERATIONS = 200
+
+# (city, province) pairs, written the way buyers type them.
+PLACES = [
+    ('Quezon City', 'Metro Manila'), ('City of Manila', 'Metro Manila'), ('Makati City', 'Metro Manila'),
+    ('Las Piñas', 'Metro Manila'), ('Pasig', 'NCR'), ('Taguig City', 'Metro Manila'),
+    ('Cebu City', 'Cebu'), ('Mandaue', 'Cebu'), ('Lapu-Lapu City', 'Cebu'), ('Tagbilaran', 'Bohol'),
+    ('Iloilo City', 'Iloilo'), ('Bacolod', 'Negros Occidental'), ('Dumaguete', 'Negros Oriental'),
+    ('Davao City', 'Davao del Sur'), ('Digos City', 'Davao del Sur'), ('Tagum', 'Davao del Norte'),
+    ('Cagayan de Oro', 'Misamis Oriental'), ('Zamboanga City', 'Zamboanga del Sur'),
+    ('General Santos', 'South Cotabato'), ('Butuan', 'Agusan del Norte'), ('Iligan', 'Lanao del Norte'),
+    ('Cotabato City', 'Maguindanao'), ('Surigao City', 'Surigao del Norte'),
+    ('Baguio', 'Benguet'), ('San Fernando', 'La Union'), ('Dagupan', 'Pangasinan'), ('Tarlac City', 'Tarlac'),
+    ('Cabanatuan', 'Nueva Ecija'), ('Bacoor', 'Cavite'), ('Dasmariñas', 'Cavite'), ('Santa Rosa', 'Laguna'),
+    ('Calamba', 'Laguna'), ('Lipa', 'Batangas'), ('Batangas City', 'Batangas'), ('Antipolo', 'Rizal'),
+    ('Lucena', 'Quezon'), ('Tayabas', 'Quezon'), ('Legazpi', 'Albay'), ('Naga', 'Camarines Sur'),
+    ('Puerto Princesa', 'Palawan'), ('Calapan', 'Oriental Mindoro'), ('Boac', 'Marinduque'), ('Roxas', 'Capiz'),
+    ('San Jose', 'Antique'),
+]
+
+# Which region names cover each province above.
+REGION_OF_PROVINCE = {
+    'metro manila': {'metro manila'}, 'ncr': {'metro manila'},
+    'cebu': {'visayas'}, 'bohol': {'visayas'}, 'iloilo': {'visayas'}, 'negros occidental': {'visayas'},
+    'negros oriental': {'visayas'}, 'capiz': {'visayas'}, 'antique': {'visayas'},
+    'davao del sur': {'mindanao'}, 'davao del norte': {'mindanao'}, 'misamis oriental': {'mindanao'},
+    'zamboanga del sur': {'mindanao'}, 'south cotabato': {'mindanao'}, 'agusan del norte': {'mindanao'},
+    'lanao del norte': {'mindanao'}, 'maguindanao': {'mindanao'}, 'surigao del norte': {'mindanao'},
+    'benguet': {'north luzon'}, 'la union': {'north luzon'}, 'pangasinan': {'north luzon'},
+    'tarlac': {'north luzon'}, 'nueva ecija': {'north luzon'},
+    'cavite': {'south luzon', 'calabarzon'}, 'laguna': {'south luzon', 'calabarzon'},
+    'batangas': {'south luzon', 'calabarzon'}, 'rizal': {'south luzon', 'calabarzon'},
+    'quezon': {'south luzon', 'calabarzon'},
+    'albay': {'bicol', 'calamansi'}, 'camarines sur': {'bicol', 'calamansi'},
+    'palawan': {'mimaropa'}, 'oriental mindoro': {'mimaropa', 'south luzon'},
+    'marinduque': {'mimaropa', 'south luzon'},
+}
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS shipments, orders, addresses, users CASCADE;
+CREATE TABLE users (id SERIAL PRIMARY KEY, first_name VARCHAR(100), last_name VARCHAR(100), email VARCHAR(200), phone VARCHAR(20));
+CREATE TABLE addresses (
+    id SERIAL PRIMARY KEY, user_id INT, street_address TEXT, city VARCHAR(100), province VARCHAR(100), postal_code VARCHAR(20)
+);
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, order_number VARCHAR(50), user_id INT, shipping_address_id INT,
+    total_amount NUMERIC(10,2), order_status VARCHAR(30), created_at TIMESTAMP
+);
+CREATE TABLE shipments (id SERIAL PRIMARY KEY, order_id INT, rider_id INT, status VARCHAR(30), seller_confirmed BOOLEAN);
+CREATE INDEX ON shipments (order_id);
+"""
+
+
+def service_areas(rng):
+    cities = [city for city, _ in PLACES]
+    provinces = sorted({province for _, province in PLACES})
+    regions = [region.title() for region in REGION_AREAS]
+    areas = []
+    for index in range(RIDERS):
+        kind = index % 4
+        if kind == 0:
+            areas.append(rng.choice(cities))
+        elif kind == 1:
+            areas.append(rng.choice(provinces))
+        elif kind == 2:
+            areas.append(rng.choice(regions))
+        else:
+            areas.append(', '.join(rng.sample(cities + provinces, 3)))
+    return areas
+
+
+def seed(conn, rng):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("""
+        INSERT INTO users (first_name, last_name, email, phone)
+        SELECT 'Buyer', g::text, 'buyer' || g || '@example.com', '0917' || g FROM generate_series(1, 2000) g
+    """)
+    rows = []
+    for index in range(PENDING_ORDERS + OTHER_ORDERS):
+        city, province = rng.choice(PLACES)
+        rows.append((1 + index % 2000, f'{index} Rizal St', city, province, '1000'))
+    cursor.executemany(
+        "INSERT INTO addresses (user_id, street_address, city, province, postal_code) VALUES (%s, %s, %s, %s, %s)", rows
+    )
+    ensure_address_area_keys(cursor)
+    cursor.execute("""
+        INSERT INTO orders (order_number, user_id, shipping_address_id, total_amount, order_status, created_at)
+        SELECT 'ORD-' || a.id, a.user_id, a.id, 499,
+               CASE WHEN a.id <= %s THEN 'waiting_for_pickup' WHEN a.id %% 2 = 0 THEN 'delivered' ELSE 'confirmed' END,
+               NOW() - make_interval(mins => a.id)
+        FROM addresses a
+    """, (PENDING_ORDERS,))
+    # A fifth of the waiting orders already have a (still unassigned) shipment row.
+    cursor.execute("""
+        INSERT INTO shipments (order_id, rider_id, status, seller_confirmed)
+        SELECT id, CASE WHEN id % 10 = 0 THEN 1 END, 'pending', TRUE FROM orders WHERE id % 5 = 0
+    """)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+
+
+def legacy_available_orders(cursor, rider_service_area):
+    service_areas_list = [area.strip() for area in rider_service_area.split(',') if area.strip()]
+    cursor.execute('''
+        SELECT o.id, o.order_number, o.user_id, o.total_amount, o.order_status, o.created_at,
+               CONCAT(a.street_address, ', ', a.city, ', ', a.province, ' ', COALESCE(a.postal_code, '')) as delivery_address,
+               a.province as delivery_province, a.postal_code as delivery_postal_code, a.city as delivery_city,
+               CONCAT(u.first_name, ' ', u.last_name) as customer_name, u.phone as customer_phone, u.email,
+               COALESCE(s.id, 0) as shipment_id, COALESCE(s.status, 'pending') as shipment_status,
+               COALESCE(s.seller_confirmed, FALSE) as seller_confirmed, COALESCE(s.rider_id, 0) as assigned_rider_id
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        JOIN addresses a ON o.shipping_address_id = a.id
+        LEFT JOIN shipments s ON s.order_id = o.id
+        WHERE o.order_status = 'waiting_for_pickup'
+        AND COALESCE(s.rider_id, 0) = 0
+        ORDER BY o.created_at DESC
+    ''')
+    all_orders = cursor.fetchall()
+    region_city_mapping = {region: list(areas) for region, areas in REGION_AREAS.items()}
+    filtered = []
+    for order in all_orders:
+        order_province = order.get('delivery_province', '').strip().lower()
+        order_city = order.get('delivery_city', '').strip().lower()
+        for service_area in service_areas_list:
+            area = service_area.lower()
+            if (area == order_province or area == order_city or area in order_province or order_province in area
+                    or area in order_city or order_city in area):
+                filtered.append(order)
+                break
+            if area in region_city_mapping and (order_city in region_city_mapping[area]
+                                                or order_province in region_city_mapping[area]):
+                filtered.append(order)
+                break
+    return filtered
+
+
+def keyed_available_orders(cursor, rider_service_area):
+    return fetch_available_orders(cursor, compile_service_area(rider_service_area), LIMIT)
+
+
+def truly_in_area(rider_service_area, city, province):
+    """Ground truth: the rider named this exact city, this province, or a region containing it."""
+    province = province.lower()
+    names = {area.strip().lower() for area in rider_service_area.split(',')}
+    if 'ncr' in names:
+        names.add('metro manila')
+    return bool(names & ({city.lower(), province} | REGION_OF_PROVINCE[province]))
+
+
+def main():
+    rng = random.Random(15)
+    conn = connect()
+    print(f"Seeding {PENDING_ORDERS} waiting orders ({OTHER_ORDERS} others) and {RIDERS} riders...")
+    seed(conn, rng)
+    riders = service_areas(rng)
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+
+    print("\n" + "=" * 78)
+    print(f"RIDER AVAILABLE ORDERS BENCHMARK ({PENDING_ORDERS} waiting orders, {RIDERS} riders, limit {LIMIT})")
+    print("=" * 78)
+
+    cursor.execute("""
+        SELECT o.id, a.city, a.province FROM orders o
+        JOIN addresses a ON a.id = o.shipping_address_id
+        LEFT JOIN shipments s ON s.order_id = o.id
+        WHERE o.order_status = 'waiting_for_pickup' AND COALESCE(s.rider_id, 0) = 0
+        ORDER BY o.created_at DESC
+    """)
+    waiting = cursor.fetchall()
+    sql_mismatched = 0
+    keyed_missed = keyed_extra = regressions = legacy_missed = legacy_extra = 0
+    failing = set()
+    for service_area in riders:
+        keys = compile_service_area(service_area)
+        matched = [row['id'] for row in waiting if address_in_service_area(keys, row['city'], row['province'])]
+        if [row['id'] for row in keyed_available_orders(cursor, service_area)] != matched[:LIMIT]:
+            sql_mismatched += 1
+        matched = set(matched)
+        truth = {row['id'] for row in waiting if truly_in_area(service_area, row['city'], row['province'])}
+        legacy = {row['id'] for row in legacy_available_orders(cursor, service_area)}
+        keyed_missed += len(truth - matched)
+        keyed_extra += len(matched - truth)
+        regressions += len((legacy & truth) - matched)
+        legacy_missed += len(truth - legacy)
+        legacy_extra += len(legacy - truth)
+        if matched != truth:
+            failing.add(service_area)
+
+    print(f"\n  keyed SQL differing from address_in_service_area: {sql_mismatched}/{RIDERS} riders")
+    print(f"  keyed vs ground truth: {keyed_missed} missed, {keyed_extra} wrongly included")
+    print(f"  legacy true positives the keyed filter drops: {regressions}")
+    print(f"  legacy vs ground truth: {legacy_missed} missed, {legacy_extra} wrongly included")
+    for service_area in sorted(failing)[:10]:
+        print(f"    wrong: {service_area!r}")
+
+    turn = iter(range(10 ** 9))
+    print()
+    print_row('all waiting + Python (legacy)',
+              *time_call(lambda: legacy_available_orders(cursor, riders[next(turn) % RIDERS]), ITERATIONS // 10))
+    print_row('keyed SQL filter',
+              *time_call(lambda: keyed_available_orders(cursor, riders[next(turn) % RIDERS]), ITERATIONS))
+    conn.rollback()
+    conn.close()
+
+    failed = sql_mismatched or keyed_missed or keyed_extra or regressions
+    print("\n" + ("✗ Keyed filter disagrees with the ground truth" if failed else
+                  "✓ One query per refresh, only matching orders fetched"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
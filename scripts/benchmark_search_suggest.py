@@ -0,0 +1,114 @@
+"""
+Search-suggestion benchmark for /api/search/suggest
+Builds utils.search_suggest's in-memory prefix index from a seeded catalogue
+and times, per typed prefix, what one keystroke costs:
+  - the old browse box: a full /api/products search (ProductSearch.search)
+  - the cold-index fallback: load_db_suggestions
+  - the index: an uncached prefix scan and a memoized lookup
+plus the build time and the cost of applying one incremental change.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_search_suggest.py [sizes]
+e.g. python scripts/benchmark_search_suggest.py 10000,100000
+"""
+import sys
+import time
+
+import psycopg2.extras
+
+from bench_common import CountingCursor, connect, percentile, print_row, time_call
+from benchmark_product_search import seed
+from utils.product_search import ProductSearch
+from utils.search_suggest import SuggestionIndex, load_db_suggestions, load_product_change
+
+SIZES = (10_000, 100_000)
+DB_ITERATIONS = 10
+INDEX_ITERATIONS = 2000
+PREFIXES = ('s', 'sh', 'shi', 'linen j', 'vintage red', 'zzq')
+
+
+def add_sales_counts(conn):
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE products ADD COLUMN sales_count INT DEFAULT 0")
+    cursor.execute("UPDATE products SET sales_count = (id * 7919) % 5000")
+    conn.commit()
+    cursor.execute("ANALYZE products")
+    conn.commit()
+    cursor.close()
+
+
+def time_micro(fn, iterations):
+    """Run ``fn`` ``iterations`` times; return latencies in microseconds."""
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return latencies
+
+
+def print_micro(label, latencies):
+    print(f"  {label:<28} queries=   0.0  p50={percentile(latencies, 50):>8.1f}us  p95={percentile(latencies, 95):>8.1f}us")
+
+
+def uncached(index, prefix):
+    index._state.memo.pop(prefix, None)
+    return index.suggest(prefix, 8)
+
+
+def run(conn, size):
+    print(f"\nSeeding {size:,} products...", end=" ", flush=True)
+    seed(conn, size)
+    add_sales_counts(conn)
+    print("done")
+
+    index = SuggestionIndex()
+    started = time.perf_counter()
+    index.rebuild(connect)
+    built = time.perf_counter() - started
+    size_info = index.size()
+    print(f"  index build {built:.2f}s: {size_info['entries']:,} names, {size_info['keys']:,} keys")
+
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    search = ProductSearch(trigram=False)
+    for prefix in PREFIXES:
+        top = [suggestion['text'] for suggestion in index.suggest(prefix, 3)]
+        print(f"\n  '{prefix}': {top}")
+        latencies, statements = time_call(lambda: search.search(cursor, prefix, limit=50), DB_ITERATIONS)
+        print_row('/api/products search', latencies, statements)
+        conn.rollback()
+        latencies, statements = time_call(lambda: load_db_suggestions(cursor, prefix, 8), DB_ITERATIONS)
+        print_row('DB fallback (cold index)', latencies, statements)
+        conn.rollback()
+        print_micro('index, uncached scan', time_micro(lambda: uncached(index, prefix), max(20, INDEX_ITERATIONS // 20)))
+        print_micro('index, memoized', time_micro(lambda: index.suggest(prefix, 8), INDEX_ITERATIONS))
+
+    change_cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    change = load_product_change(change_cursor, size // 2)
+    renamed = dict(change, row=dict(change['row'], name='Limited Edition ' + change['row']['name']))
+    conn.rollback()
+    latencies = []
+    for iteration in range(200):
+        started = time.perf_counter()
+        index.apply(renamed if iteration % 2 == 0 else change)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    print()
+    print_micro('apply one product rename', latencies)
+    change_cursor.close()
+    cursor.close()
+
+
+def main():
+    sizes = SIZES
+    if len(sys.argv) > 1:
+        sizes = tuple(int(value) for value in sys.argv[1].split(','))
+    conn = connect()
+    print("=" * 72)
+    print("SEARCH SUGGESTION BENCHMARK")
+    print("=" * 72)
+    for size in sizes:
+        run(conn, size)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Seller dashboard benchmark for the seller_daily_sales rollup
+Replays the old dashboard/analytics/performance aggregates over orders ⋈
+order_items ⋈ products and the rollup reads that replaced them, for sellers
+with growing lifetime order counts but the same recent traffic. The rollup
+reads should cost about the same whatever the seller's history.
+
+It also moves a batch of orders through placement, cancellation and
+delivery with sync_order_sales_rollup and checks the incrementally kept
+tables match a from-scratch rebuild_seller_sales.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/benchmark_seller_dashboard.py
+"""
+from bench_common import CountingCursor, connect, print_row, time_call
+from utils.seller_sales import (
+    count_repeat_customers, ensure_seller_sales_tables, load_seller_daily_revenue, load_seller_sales_summary,
+    load_seller_top_products, rebuild_seller_sales, sync_order_sales_rollup,
+)
+
+HISTORY_SIZES = (1000, 10000, 100000)
+RECENT_ORDERS = 600  # last 30 days, the same for every seller
+ITEMS_PER_ORDER = 2
+PRODUCTS_PER_SELLER = 50
+BUYERS = 2000
+ITERATIONS = 20
+SYNCED_ORDERS = 300
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS seller_daily_sales, seller_customers, order_items, orders, products, sellers CASCADE;
+CREATE TABLE sellers (id SERIAL PRIMARY KEY, store_name VARCHAR(100));
+CREATE TABLE products (id SERIAL PRIMARY KEY, seller_id INT, name VARCHAR(200));
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, user_id INT, seller_id INT, total_amount NUMERIC(10,2),
+    order_status VARCHAR(30), created_at TIMESTAMP
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY, order_id INT, product_id INT, quantity INT, unit_price NUMERIC(10,2), subtotal NUMERIC(10,2)
+);
+CREATE INDEX ON order_items (order_id);
+CREATE INDEX ON order_items (product_id);
+CREATE INDEX ON products (seller_id);
+"""
+
+
+def seed(conn):
+    """One seller per history size; returns {history_size: seller_id}."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    ensure_seller_sales_tables(cursor)
+    sellers = {}
+    for size in HISTORY_SIZES:
+        cursor.execute("INSERT INTO sellers (store_name) VALUES (%s) RETURNING id", (f'Store {size}',))
+        seller_id = cursor.fetchone()[0]
+        sellers[size] = seller_id
+        cursor.execute("""
+            INSERT INTO products (seller_id, name)
+            SELECT %s, 'Product ' || %s || '-' || g FROM generate_series(1, %s) g
+        """, (seller_id, seller_id, PRODUCTS_PER_SELLER))
+        # Recent orders spread over 30 days, the rest over the two years before.
+        cursor.execute("""
+            INSERT INTO orders (user_id, seller_id, total_amount, order_status, created_at)
+            SELECT 1 + (g * 7919) %% %s, %s, 447,
+                   CASE WHEN g %% 10 = 0 THEN 'cancelled' WHEN g %% 3 = 0 THEN 'pending' ELSE 'delivered' END,
+                   CASE WHEN g <= %s THEN NOW() - make_interval(mins => g * 72)
+                        ELSE NOW() - INTERVAL '31 days' - make_interval(mins => (g * 1051) %% 1000000) END
+            FROM generate_series(1, %s) g
+        """, (BUYERS, seller_id, RECENT_ORDERS, size))
+    cursor.execute("""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal)
+        SELECT o.id, p.first_id + (o.id * 13 + g) %% %s, g, 199, 199 * g
+        FROM orders o
+        JOIN (SELECT seller_id, MIN(id) AS first_id FROM products GROUP BY seller_id) p ON p.seller_id = o.seller_id,
+             generate_series(1, %s) g
+    """, (PRODUCTS_PER_SELLER, ITEMS_PER_ORDER))
+    rebuild_seller_sales(cursor)
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+    return sellers
+
+
+def legacy_dashboard(cursor, seller_id):
+    """Today's sales, the 7-day chart, 30-day analytics and repeat customers as computed before."""
+    cursor.execute('''
+        SELECT COALESCE(SUM(total_amount), 0) as today_sales
+        FROM orders
+        WHERE seller_id = %s AND DATE(created_at) = CURRENT_DATE
+        AND order_status != 'cancelled'
+    ''', (seller_id,))
+    cursor.execute('''
+        SELECT TRIM(TO_CHAR(created_at, 'Day')) as day_name, COALESCE(SUM(total_amount), 0) as daily_sales
+        FROM orders
+        WHERE seller_id = %s AND created_at >= CURRENT_DATE - INTERVAL '6 days' AND order_status != 'cancelled'
+        GROUP BY DATE(created_at), TRIM(TO_CHAR(created_at, 'Day'))
+        ORDER BY DATE(created_at)
+    ''', (seller_id,))
+    cursor.execute('''
+        SELECT COALESCE(SUM(o.total_amount), 0) as total_revenue, COUNT(DISTINCT o.id) as total_orders
+        FROM orders o
+        JOIN order_items oi ON o.id = oi.order_id
+        JOIN products p ON oi.product_id = p.id
+        WHERE p.seller_id = %s AND o.created_at >= NOW() - INTERVAL '30 days'
+        AND o.order_status NOT IN ('cancelled', 'failed')
+    ''', (seller_id,))
+    cursor.execute('''
+        SELECT p.id, p.name, SUM(oi.quantity) as quantity_sold
+        FROM order_items oi
+        JOIN products p ON oi.product_id = p.id
+        JOIN orders o ON oi.order_id = o.id
+        WHERE p.seller_id = %s AND o.created_at >= NOW() - INTERVAL '30 days'
+        AND o.order_status NOT IN ('cancelled', 'failed')
+        GROUP BY p.id, p.name
+        ORDER BY quantity_sold DESC
+        LIMIT 10
+    ''', (seller_id,))
+    cursor.execute('''
+        SELECT COUNT(*) as repeat_customers
+        FROM (
+            SELECT o.user_id
+            FROM orders o
+            JOIN order_items oi ON o.id = oi.order_id
+            JOIN products p ON oi.product_id = p.id
+            WHERE p.seller_id = %s AND o.order_status NOT IN ('cancelled', 'failed')
+            GROUP BY o.user_id
+            HAVING COUNT(DISTINCT o.id) > 1
+        ) repeat_stats
+    ''', (seller_id,))
+
+
+def rollup_dashboard(cursor, seller_id):
+    """The same numbers read from seller_daily_sales and seller_customers."""
+    cursor.execute("SELECT CURRENT_DATE - 6 AS week, CURRENT_DATE - 29 AS month")
+    since = cursor.fetchone()
+    load_seller_daily_revenue(cursor, seller_id, since['week'])
+    load_seller_sales_summary(cursor, seller_id, since['month'])
+    load_seller_top_products(cursor, seller_id, since['month'], 10)
+    count_repeat_customers(cursor, seller_id)
+
+
+def rollup_snapshot(cursor):
+    cursor.execute("""
+        SELECT seller_id, sales_date, product_id, order_count, units_sold, revenue, delivered_units, delivered_revenue
+        FROM seller_daily_sales
+        WHERE order_count <> 0 OR units_sold <> 0 OR delivered_units <> 0
+        ORDER BY 1, 2, 3
+    """)
+    daily = [tuple(row.values()) for row in cursor.fetchall()]
+    cursor.execute("SELECT seller_id, user_id, order_count FROM seller_customers WHERE order_count > 0 ORDER BY 1, 2")
+    return daily, [tuple(row.values()) for row in cursor.fetchall()]
+
+
+def check_incremental(conn, seller_id):
+    """Place, cancel and deliver orders through sync_order_sales_rollup; compare with a rebuild."""
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+    cursor.execute("""
+        INSERT INTO orders (user_id, seller_id, total_amount, order_status, created_at)
+        SELECT 1 + g %% 50, %s, 447, 'pending', NOW() - make_interval(mins => g)
+        FROM generate_series(1, %s) g
+        RETURNING id
+    """, (seller_id, SYNCED_ORDERS))
+    order_ids = [row['id'] for row in cursor.fetchall()]
+    cursor.execute("""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal)
+        SELECT o, (SELECT MIN(id) FROM products WHERE seller_id = %s) + o %% 5, 1, 199, 199
+        FROM unnest(%s::int[]) o, generate_series(1, 2) g
+    """, (seller_id, order_ids))
+    for order_id in order_ids:
+        sync_order_sales_rollup(cursor, order_id)
+    for index, order_id in enumerate(order_ids):
+        status = ('cancelled', 'delivered', 'completed', 'return_requested', 'confirmed')[index % 5]
+        cursor.execute("UPDATE orders SET order_status = %s WHERE id = %s", (status, order_id))
+        sync_order_sales_rollup(cursor, order_id)
+        sync_order_sales_rollup(cursor, order_id)  # repeated calls must be no-ops
+    incremental = rollup_snapshot(cursor)
+    rebuild_seller_sales(cursor)
+    rebuilt = rollup_snapshot(cursor)
+    conn.rollback()
+    cursor.close()
+    return incremental == rebuilt
+
+
+def main():
+    conn = connect()
+    print(f"Seeding sellers with {', '.join(str(size) for size in HISTORY_SIZES)} lifetime orders...")
+    sellers = seed(conn)
+    cursor = conn.cursor(cursor_factory=CountingCursor)
+
+    print("\n" + "=" * 78)
+    print(f"SELLER DASHBOARD BENCHMARK ({RECENT_ORDERS} orders in the last 30 days, {ITEMS_PER_ORDER} items each)")
+    print("=" * 78)
+
+    for size, seller_id in sellers.items():
+        print(f"\nlifetime orders={size}")
+        iterations = max(2, ITERATIONS // (1 + size // 10000))
+        print_row('order scans (legacy)', *time_call(lambda: legacy_dashboard(cursor, seller_id), iterations))
+        print_row('seller_daily_sales', *time_call(lambda: rollup_dashboard(cursor, seller_id), ITERATIONS))
+        conn.rollback()
+    cursor.close()
+
+    consistent = check_incremental(conn, sellers[HISTORY_SIZES[0]])
+    conn.close()
+    print("\n" + ("✓ Incremental rollup matches a full rebuild" if consistent else
+                  "✗ Incremental rollup drifted from a full rebuild"))
+    if not consistent:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
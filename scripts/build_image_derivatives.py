@@ -0,0 +1,111 @@
+"""
+Build thumb/card/detail derivatives for uploads already on disk and report the bytes saved.
+Run this with: python scripts/build_image_derivatives.py [--force] [--report] [--workers N]
+New uploads are processed by the app (IMAGE_DERIVATIVE_WORKERS); this covers files saved
+before that, or all of them when the web processes don't resize. Images that already have a
+manifest are skipped unless --force. --report only prints the totals recorded so far.
+Safe to run alongside the app.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2.extras
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import app, _background_db_connection
+from utils.image_derivatives import (
+    DERIVED_DIRNAME, SOURCE_EXTENSIONS, available_formats, build_derivatives, ensure_image_derivatives_table,
+    load_derivative_savings, record_derivatives,
+)
+
+UPLOAD_DIRS = ('images/products', 'images/profiles', 'uploads/riders')
+
+
+def upload_urls(static_folder, static_url_path):
+    """URLs of every image under UPLOAD_DIRS, skipping derivative folders."""
+    for upload_dir in UPLOAD_DIRS:
+        root = os.path.join(static_folder, *upload_dir.split('/'))
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = [name for name in subdirs if name != DERIVED_DIRNAME]
+            relative = os.path.relpath(directory, static_folder).replace(os.sep, '/')
+            for name in sorted(files):
+                if name.lower().endswith(SOURCE_EXTENSIONS):
+                    yield f"{static_url_path}/{relative}/{name}"
+
+
+def megabytes(value):
+    return f"{(value or 0) / 1048576:.1f}MB"
+
+
+def print_report(cursor):
+    rows = load_derivative_savings(cursor)
+    if not rows:
+        print("No derivatives recorded yet")
+        return
+    print(f"{'variant':<8} {'format':<6} {'images':>7} {'originals':>10} {'derivatives':>12} {'saved':>10}")
+    for row in rows:
+        source_bytes = int(row['source_bytes'] or 0)
+        derivative_bytes = int(row['derivative_bytes'] or 0)
+        saved = source_bytes - derivative_bytes
+        share = saved * 100.0 / source_bytes if source_bytes else 0.0
+        print(f"{row['variant']:<8} {row['format']:<6} {row['images']:>7} {megabytes(source_bytes):>10} "
+              f"{megabytes(derivative_bytes):>12} {megabytes(saved):>10} ({share:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--force', action='store_true', help='rebuild images that already have derivatives')
+    parser.add_argument('--report', action='store_true', help='only print the recorded totals')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    conn = _background_db_connection()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    try:
+        ensure_image_derivatives_table(cursor)
+        conn.commit()
+        if not args.report:
+            if not available_formats():
+                print("✗ Pillow with WebP support is required: pip install -r requirements.txt")
+                sys.exit(1)
+            urls = list(upload_urls(app.static_folder, app.static_url_path))
+            print(f"Processing {len(urls)} images with {args.workers} workers "
+                  f"({', '.join(available_formats())})...")
+
+            def build(url):
+                try:
+                    return url, build_derivatives(app.static_folder, url, app.static_url_path, force=args.force), None
+                except Exception as err:
+                    return url, None, err
+
+            failed = 0
+            with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+                for url, manifest, err in pool.map(build, urls):
+                    if err is not None:
+                        failed += 1
+                        print(f"  ✗ {url}: {err}")
+                    elif manifest is not None:
+                        record_derivatives(cursor, manifest)
+            conn.commit()
+            print(f"✓ {len(urls) - failed} images have derivatives ({failed} failed)\n")
+        print_report(cursor)
+        cursor.close()
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Backfill failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
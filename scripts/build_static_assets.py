@@ -0,0 +1,45 @@
+"""
+Write the content-hashed CSS/JS copies (and their .gz/.br variants) into static/dist.
+Run this with: python scripts/build_static_assets.py
+The app builds them at startup too; run this at deploy time when the web processes can't
+write to static/ (STATIC_ASSET_BUILD_ON_START=false). Does not need the database.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.static_assets import DIST_DIRNAME, brotli, build_static_assets
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+
+def kilobytes(value):
+    return f"{value / 1024:.1f}KB" if value is not None else '-'
+
+
+def main():
+    try:
+        manifest, sizes = build_static_assets(STATIC_FOLDER)
+    except OSError as err:
+        print(f"✗ Build failed: {err}")
+        sys.exit(1)
+
+    print(f"{'asset':<28} {'hashed name':<40} {'raw':>9} {'gzip':>9} {'brotli':>9}")
+    totals = {'bytes': 0, 'gzip': 0, 'br': 0}
+    for relative, hashed in sorted(manifest.items()):
+        entry = sizes[relative]
+        print(f"{relative:<28} {hashed:<40} {kilobytes(entry['bytes']):>9} "
+              f"{kilobytes(entry['gzip']):>9} {kilobytes(entry['br']):>9}")
+        totals['bytes'] += entry['bytes']
+        totals['gzip'] += entry['gzip'] or entry['bytes']
+        totals['br'] += entry['br'] or entry['gzip'] or entry['bytes']
+    print(f"{'total':<69} {kilobytes(totals['bytes']):>9} {kilobytes(totals['gzip']):>9} "
+          f"{kilobytes(totals['br']) if brotli else '-':>9}")
+    if brotli is None:
+        print("  (brotli not installed: pip install -r requirements.txt)")
+    print(f"✓ {len(manifest)} assets written to static/{DIST_DIRNAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Deliver queued email from the email_outbox table.
+Run this with: python scripts/email_worker.py [--once] [--workers N]
+Use it when web processes run with EMAIL_OUTBOX_WORKERS=0, or to flush the
+queue by hand (--once). Safe to run next to the in-app workers: rows are
+claimed with FOR UPDATE SKIP LOCKED.
+"""
+import argparse
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('EMAIL_OUTBOX_WORKERS', '0')  # this process does the draining, not the app import
+
+from app import email_outbox, _background_db_connection, EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_POLL_SECONDS
+from utils.email_outbox import EmailOutbox, SMTPSession, SMTPSettings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--once', action='store_true', help='drain what is due now and exit')
+    parser.add_argument('--workers', type=int, default=1, help='delivery threads (one SMTP connection each)')
+    args = parser.parse_args()
+
+    outbox = email_outbox or EmailOutbox(
+        _background_db_connection,
+        SMTPSettings.from_env(),
+        batch_size=EMAIL_OUTBOX_BATCH_SIZE,
+        max_attempts=EMAIL_OUTBOX_MAX_ATTEMPTS,
+        poll_seconds=EMAIL_OUTBOX_POLL_SECONDS,
+    )
+
+    if args.once:
+        session = SMTPSession(outbox.settings)
+        try:
+            while outbox.drain_once(session) >= outbox.batch_size:
+                pass
+        except Exception as err:
+            print(f"✗ Delivery failed: {err}")
+            sys.exit(1)
+        finally:
+            session.close()
+        print(f"✓ Sent {outbox.stats['sent']}, retrying {outbox.stats['retried']}, failed {outbox.stats['failed']}")
+        return
+
+    print(f"✓ Email worker running with {args.workers} thread(s); Ctrl+C to stop")
+    stop = threading.Event()
+    threads = [threading.Thread(target=outbox.run_worker, args=(stop,), daemon=True) for _ in range(args.workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            stop.wait(1)
+    except KeyboardInterrupt:
+        stop.set()
+        outbox.wake()
+        for thread in threads:
+            thread.join(outbox.poll_seconds + 5)
+        print(f"\n✓ Stopped. Sent {outbox.stats['sent']}, failed {outbox.stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
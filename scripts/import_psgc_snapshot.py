@@ -0,0 +1,72 @@
+"""
+Import a PSGC snapshot (regions, provinces, cities/municipalities, barangays)
+into the compact offline artifact loaded by app.py at startup.
+
+Run with:
+    python scripts/import_psgc_snapshot.py                      # download from PSGC_API_BASE_URL
+    python scripts/import_psgc_snapshot.py --source-dir ./psgc  # use previously downloaded JSON files
+
+The source directory must contain regions.json, provinces.json,
+cities-municipalities.json and barangays.json in the psgc.gitlab.io format.
+Restart the app (or redeploy) after importing to pick up the new snapshot.
+"""
+import argparse
+import json
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.psgc_dataset import build_snapshot, load_psgc_dataset, write_snapshot
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.getenv('PSGC_DATASET_PATH', os.path.join(ROOT_DIR, 'data', 'psgc_snapshot.json.gz'))
+DEFAULT_API = os.getenv('PSGC_API_BASE_URL', 'https://psgc.gitlab.io/api').rstrip('/')
+LISTS = ('regions', 'provinces', 'cities-municipalities', 'barangays')
+
+
+def load_list(name, source_dir, api_base):
+    if source_dir:
+        with open(os.path.join(source_dir, f"{name}.json"), 'r', encoding='utf-8') as handle:
+            data = json.load(handle)
+    else:
+        print(f"  Downloading {api_base}/{name}.json ...")
+        resp = requests.get(f"{api_base}/{name}.json", timeout=120)
+        resp.raise_for_status()
+        data = resp.json()
+    if not isinstance(data, list):
+        raise ValueError(f"{name}.json is not a JSON array")
+    print(f"  ✓ {name}: {len(data)} rows")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline PSGC dataset artifact.')
+    parser.add_argument('--source-dir', help='Directory with PSGC JSON files (skips downloading)')
+    parser.add_argument('--api-base', default=DEFAULT_API, help='PSGC API base URL')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Artifact path (.json.gz)')
+    args = parser.parse_args()
+
+    print("Importing PSGC snapshot...")
+    try:
+        regions, provinces, cities, barangays = (load_list(name, args.source_dir, args.api_base) for name in LISTS)
+    except (OSError, ValueError, requests.RequestException) as err:
+        print(f"✗ Import failed: {err}")
+        sys.exit(1)
+
+    snapshot = build_snapshot(regions, provinces, cities, barangays, source=args.source_dir or args.api_base)
+    write_snapshot(args.output, snapshot)
+
+    dataset = load_psgc_dataset(args.output)
+    if dataset is None:
+        print("✗ Wrote the artifact but could not load it back")
+        sys.exit(1)
+
+    size_kb = os.path.getsize(args.output) / 1024.0
+    print(f"\n✓ Wrote {args.output} ({size_kb:.0f} KB, {len(dataset.nodes)} areas)")
+
+
+if __name__ == "__main__":
+    main()
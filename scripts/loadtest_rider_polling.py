@@ -0,0 +1,217 @@
+"""
+Concurrent rider polling load test for /api/rider/available-orders
+N rider threads poll the available-orders query for overlapping service
+areas while sellers keep moving new orders to waiting_for_pickup.
+
+  legacy: the old handler - orders without a shipment get one INSERTed and
+          committed per row inside the GET, with no unique order_id
+  pure:   utils.shipments - the transition creates the shipment through
+          ensure_order_shipment (several sellers' requests racing on the same
+          order), riders poll in READ ONLY transactions
+
+Each run counts orders that ended up with more than one shipment and, for
+the pure run, polled rows that came back without a shipment.
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/loadtest_rider_polling.py
+"""
+import random
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+
+from bench_common import BENCH_DATABASE_URL, connect
+from utils.service_areas import compile_service_area, ensure_address_area_keys, fetch_available_orders
+from utils.shipments import ensure_order_shipment, ensure_shipments_order_unique
+
+WAITING_ORDERS = 400
+RELEASED_DURING_RUN = 200   # orders moved to waiting_for_pickup while riders poll
+SELLER_THREADS = 4          # each releases every order, so they race on the same rows
+POLLS_PER_RIDER = 40
+LIMIT = 100
+CONCURRENCY = (8, 32)
+SERVICE_AREAS = ('Metro Manila', 'Quezon City, Makati', 'NCR', 'Cebu, Metro Manila')
+PLACES = [('Quezon City', 'Metro Manila'), ('Makati City', 'Metro Manila'), ('Pasig', 'NCR'), ('Cebu City', 'Cebu')]
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS shipments, orders, addresses, users CASCADE;
+CREATE TABLE users (id SERIAL PRIMARY KEY, first_name VARCHAR(100), last_name VARCHAR(100), email VARCHAR(200), phone VARCHAR(20));
+CREATE TABLE addresses (
+    id SERIAL PRIMARY KEY, user_id INT, street_address TEXT, city VARCHAR(100), province VARCHAR(100), postal_code VARCHAR(20)
+);
+CREATE TABLE orders (
+    id SERIAL PRIMARY KEY, order_number VARCHAR(50), user_id INT, shipping_address_id INT,
+    total_amount NUMERIC(10,2), order_status VARCHAR(30), created_at TIMESTAMP, updated_at TIMESTAMP
+);
+CREATE TABLE shipments (
+    id SERIAL PRIMARY KEY, order_id INT NOT NULL, rider_id INT, tracking_number VARCHAR(100), status VARCHAR(30),
+    seller_confirmed BOOLEAN DEFAULT FALSE, seller_confirmed_at TIMESTAMP, created_at TIMESTAMP
+);
+CREATE INDEX ON shipments (order_id);
+"""
+
+
+def seed(conn):
+    """Orders waiting for pickup with no shipment yet, plus confirmed ones to release during the run."""
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    cursor.execute("INSERT INTO users (first_name, last_name, email, phone) VALUES ('Buyer', 'One', 'b@example.com', '0917')")
+    total = WAITING_ORDERS + RELEASED_DURING_RUN
+    cursor.executemany(
+        "INSERT INTO addresses (user_id, street_address, city, province, postal_code) VALUES (1, %s, %s, %s, '1000')",
+        [(f'{index} Rizal St',) + PLACES[index % len(PLACES)] for index in range(total)]
+    )
+    ensure_address_area_keys(cursor)
+    cursor.execute("""
+        INSERT INTO orders (order_number, user_id, shipping_address_id, total_amount, order_status, created_at)
+        SELECT 'ORD-' || a.id, 1, a.id, 499,
+               CASE WHEN a.id <= %s THEN 'waiting_for_pickup' ELSE 'confirmed' END,
+               NOW() - make_interval(secs => a.id)
+        FROM addresses a
+    """, (WAITING_ORDERS,))
+    cursor.execute("ANALYZE")
+    conn.commit()
+    cursor.close()
+
+
+def legacy_poll(cursor, conn, area_keys):
+    """The old GET: read, then INSERT and commit a shipment for each order that lacks one."""
+    orders = fetch_available_orders(cursor, area_keys, LIMIT)
+    writes = 0
+    for order in orders:
+        if order['shipment_id'] == 0:
+            cursor.execute('''
+                INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, created_at)
+                VALUES (%s, %s, 'pending', %s, NOW())
+            ''', (order['id'], f"SHIP{order['id']}{int(time.time())}", order.get('seller_confirmed', False)))
+            conn.commit()
+            writes += 1
+    conn.commit()
+    return orders, writes
+
+
+def pure_poll(cursor, conn, area_keys):
+    orders = fetch_available_orders(cursor, area_keys, LIMIT)
+    conn.commit()
+    return orders, 0
+
+
+def legacy_release(cursor, order_id):
+    cursor.execute("UPDATE orders SET order_status = 'waiting_for_pickup', updated_at = NOW() WHERE id = %s", (order_id,))
+
+
+def pure_release(cursor, order_id):
+    cursor.execute("UPDATE orders SET order_status = 'waiting_for_pickup', updated_at = NOW() WHERE id = %s", (order_id,))
+    ensure_order_shipment(cursor, order_id, seller_confirmed=True)
+
+
+def run(poll, release, concurrency):
+    counters = {'polls': 0, 'rows': 0, 'writes': 0, 'unshipped_rows': 0, 'errors': 0}
+    lock = threading.Lock()
+    start = threading.Barrier(concurrency + SELLER_THREADS)
+
+    def rider(worker):
+        conn = psycopg2.connect(BENCH_DATABASE_URL)
+        if poll is pure_poll:
+            conn.set_session(readonly=True)
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        area_keys = compile_service_area(SERVICE_AREAS[worker % len(SERVICE_AREAS)])
+        local = dict.fromkeys(counters, 0)
+        start.wait()
+        for _ in range(POLLS_PER_RIDER):
+            try:
+                orders, writes = poll(cursor, conn, area_keys)
+            except psycopg2.Error:
+                conn.rollback()
+                local['errors'] += 1
+                continue
+            local['polls'] += 1
+            local['rows'] += len(orders)
+            local['writes'] += writes
+            local['unshipped_rows'] += sum(1 for order in orders if order['shipment_id'] == 0)
+        conn.close()
+        with lock:
+            for key, value in local.items():
+                counters[key] += value
+
+    def seller(worker):
+        rng = random.Random(worker)
+        conn = psycopg2.connect(BENCH_DATABASE_URL)
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        order_ids = list(range(WAITING_ORDERS + 1, WAITING_ORDERS + RELEASED_DURING_RUN + 1))
+        rng.shuffle(order_ids)
+        start.wait()
+        for order_id in order_ids:
+            try:
+                release(cursor, order_id)
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                with lock:
+                    counters['errors'] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=rider, args=(worker,)) for worker in range(concurrency)]
+    threads += [threading.Thread(target=seller, args=(worker,)) for worker in range(SELLER_THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counters['elapsed'] = time.perf_counter() - started
+    return counters
+
+
+def shipment_counts(cursor):
+    """(orders with more than one shipment, extra rows, waiting orders with none)."""
+    cursor.execute("""
+        SELECT COUNT(*), COALESCE(SUM(copies - 1), 0)
+        FROM (SELECT order_id, COUNT(*) AS copies FROM shipments GROUP BY order_id HAVING COUNT(*) > 1) d
+    """)
+    duplicated, extra = cursor.fetchone()
+    cursor.execute("""
+        SELECT COUNT(*) FROM orders o
+        WHERE o.order_status = 'waiting_for_pickup' AND NOT EXISTS (SELECT 1 FROM shipments s WHERE s.order_id = o.id)
+    """)
+    return duplicated, extra, cursor.fetchone()[0]
+
+
+def main():
+    conn = connect()
+
+    print("\n" + "=" * 78)
+    print(f"RIDER POLLING LOAD TEST ({WAITING_ORDERS} waiting orders, {RELEASED_DURING_RUN} released during the run "
+          f"by {SELLER_THREADS} sellers, {POLLS_PER_RIDER} polls per rider)")
+    print("=" * 78)
+
+    failed = False
+    for concurrency in CONCURRENCY:
+        print(f"\nconcurrent riders={concurrency}")
+        for label, poll, release in (('insert on read (legacy)', legacy_poll, legacy_release),
+                                     ('pure read', pure_poll, pure_release)):
+            seed(conn)
+            if poll is pure_poll:
+                cursor = conn.cursor()
+                ensure_shipments_order_unique(cursor)
+                conn.commit()
+                cursor.close()
+            result = run(poll, release, concurrency)
+            cursor = conn.cursor()
+            duplicated, extra, missing = shipment_counts(cursor)
+            cursor.close()
+            print(f"  {label:<24} polls/sec={result['polls'] / result['elapsed']:>7.1f}  "
+                  f"writes_in_get={result['writes']:>5}  duplicated_orders={duplicated:>4} (+{extra} rows)  "
+                  f"rows_without_shipment={result['unshipped_rows']:>5}  errors={result['errors']}")
+            if poll is pure_poll and (duplicated or missing or result['unshipped_rows'] or result['errors']):
+                failed = True
+
+    conn.close()
+    print("\n" + ("✗ Shipments duplicated or missing under concurrent polling" if failed else
+                  "✓ Polling writes nothing, every waiting order has exactly one shipment"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
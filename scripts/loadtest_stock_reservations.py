@@ -0,0 +1,236 @@
+"""
+Concurrent checkout load test for utils.stock_reservations
+N buyer threads hammer a handful of hot SKUs with multi-line carts (lines in
+random order, so naive per-line locking deadlocks). Each run checks that no
+stock row went negative and that every unit taken is backed by exactly one
+hold, then expires all holds and checks the stock comes back.
+
+The unguarded per-line decrement place_order used before is run first for
+comparison, so the report shows both the oversell it allowed and the
+throughput cost of reserving.
+
+Each checkout inserts its order_items first, as place_order does. Their foreign
+keys take FOR KEY SHARE on the product and variant rows, so the stock locks
+taken afterwards must not conflict with that (a FOR UPDATE here deadlocks).
+
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/loadtest_stock_reservations.py
+"""
+import random
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+
+from bench_common import BENCH_DATABASE_URL, connect
+from utils.stock_reservations import (
+    ensure_stock_reservations_table, release_expired_reservations, reserve_stock
+)
+
+PRODUCTS = 10
+VARIANTS_PER_PRODUCT = 3
+STOCK_PER_VARIANT = 40
+INVENTORY_ONLY_PRODUCTS = 2     # products sold without variants (product-level inventory row)
+INVENTORY_STOCK = 60
+CART_LINES = 4
+ATTEMPTS_PER_BUYER = 40
+CONCURRENCY = (4, 8, 16)
+AMPLE_STOCK = 1000000           # throughput phase: nobody ever runs out
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS stock_reservations, order_items, orders, inventory, product_variants, products CASCADE;
+CREATE TABLE products (id SERIAL PRIMARY KEY, name VARCHAR(200));
+CREATE TABLE orders (id SERIAL PRIMARY KEY, user_id INT, created_at TIMESTAMP DEFAULT NOW());
+CREATE TABLE product_variants (
+    id SERIAL PRIMARY KEY, product_id INT REFERENCES products(id) ON DELETE CASCADE,
+    size VARCHAR(20), color VARCHAR(50), stock_quantity INT
+);
+CREATE TABLE inventory (
+    id SERIAL PRIMARY KEY, product_id INT REFERENCES products(id) ON DELETE CASCADE,
+    variant_id INT REFERENCES product_variants(id) ON DELETE CASCADE, stock_quantity INT
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY,
+    order_id INT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INT NOT NULL REFERENCES products(id) ON DELETE RESTRICT,
+    variant_id INT REFERENCES product_variants(id) ON DELETE RESTRICT,
+    quantity INT NOT NULL
+);
+CREATE INDEX ON product_variants (product_id);
+CREATE INDEX ON inventory (product_id);
+"""
+
+
+def seed(conn, variant_stock=STOCK_PER_VARIANT, inventory_stock=INVENTORY_STOCK):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    ensure_stock_reservations_table(cursor)
+    cursor.execute("INSERT INTO products (name) SELECT 'Product ' || p FROM generate_series(1, %s) p",
+                   (PRODUCTS + INVENTORY_ONLY_PRODUCTS,))
+    cursor.execute("""
+        INSERT INTO product_variants (product_id, size, color, stock_quantity)
+        SELECT p, 'S' || v, 'Black', %s
+        FROM generate_series(1, %s) p, generate_series(1, %s) v
+        ORDER BY p, v
+    """, (variant_stock, PRODUCTS, VARIANTS_PER_PRODUCT))
+    cursor.execute("""
+        INSERT INTO inventory (product_id, variant_id, stock_quantity)
+        SELECT p, NULL, %s FROM generate_series(%s, %s) p
+    """, (inventory_stock, PRODUCTS + 1, PRODUCTS + INVENTORY_ONLY_PRODUCTS))
+    cursor.execute("SELECT id, product_id FROM product_variants ORDER BY id")
+    variants = cursor.fetchall()
+    conn.commit()
+    cursor.close()
+    return variants
+
+
+def total_stock(cursor):
+    cursor.execute("""
+        SELECT (SELECT COALESCE(SUM(stock_quantity), 0) FROM product_variants)
+             + (SELECT COALESCE(SUM(stock_quantity), 0) FROM inventory),
+               (SELECT COUNT(*) FROM product_variants WHERE stock_quantity < 0)
+             + (SELECT COUNT(*) FROM inventory WHERE stock_quantity < 0),
+               (SELECT COALESCE(SUM(-LEAST(stock_quantity, 0)), 0) FROM product_variants)
+             + (SELECT COALESCE(SUM(-LEAST(stock_quantity, 0)), 0) FROM inventory)
+    """)
+    return cursor.fetchone()
+
+
+def build_cart(rng, variants):
+    lines = []
+    for _ in range(CART_LINES):
+        if rng.random() < 0.25:
+            product_id = rng.randint(PRODUCTS + 1, PRODUCTS + INVENTORY_ONLY_PRODUCTS)
+            lines.append({'product_id': product_id, 'variant_id': None, 'quantity': rng.randint(1, 3)})
+        else:
+            variant_id, product_id = rng.choice(variants)
+            lines.append({'product_id': product_id, 'variant_id': variant_id, 'quantity': rng.randint(1, 3)})
+    return lines
+
+
+def unguarded_checkout(cursor, order_id, user_id, lines):
+    """The old place_order behaviour: decrement per line, in cart order, no stock check."""
+    for line in lines:
+        if line['variant_id']:
+            cursor.execute('UPDATE product_variants SET stock_quantity = stock_quantity - %s WHERE id = %s',
+                           (line['quantity'], line['variant_id']))
+        else:
+            cursor.execute('UPDATE inventory SET stock_quantity = stock_quantity - %s WHERE product_id = %s AND variant_id IS NULL',
+                           (line['quantity'], line['product_id']))
+    return True, []
+
+
+def reserving_checkout(cursor, order_id, user_id, lines):
+    return reserve_stock(cursor, order_id, user_id, lines, 3600)
+
+
+def run(checkout, concurrency, variants):
+    counters = {'placed': 0, 'units': 0, 'rejected': 0, 'deadlocks': 0}
+    lock = threading.Lock()
+
+    def buyer(worker):
+        rng = random.Random(worker)
+        conn = psycopg2.connect(BENCH_DATABASE_URL)
+        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            # The legacy path deadlocks constantly; don't wait the default 1s to find out.
+            cursor.execute("SET deadlock_timeout = '100ms'")
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+        local = dict.fromkeys(counters, 0)
+        for _ in range(ATTEMPTS_PER_BUYER):
+            lines = build_cart(rng, variants)
+            try:
+                cursor.execute('INSERT INTO orders (user_id) VALUES (%s) RETURNING id', (worker,))
+                order_id = cursor.fetchone()['id']
+                cursor.execute('''
+                    INSERT INTO order_items (order_id, product_id, variant_id, quantity)
+                    SELECT %s, line.product_id, line.variant_id, line.quantity
+                    FROM unnest(%s::int[], %s::int[], %s::int[]) AS line(product_id, variant_id, quantity)
+                ''', (order_id, [line['product_id'] for line in lines], [line['variant_id'] for line in lines],
+                      [line['quantity'] for line in lines]))
+                ok, _short = checkout(cursor, order_id, worker, lines)
+                if ok:
+                    conn.commit()
+                    local['placed'] += 1
+                    local['units'] += sum(line['quantity'] for line in lines)
+                else:
+                    conn.rollback()
+                    local['rejected'] += 1
+            except psycopg2.errors.DeadlockDetected:
+                conn.rollback()
+                local['deadlocks'] += 1
+        conn.close()
+        with lock:
+            for key, value in local.items():
+                counters[key] += value
+
+    threads = [threading.Thread(target=buyer, args=(worker,)) for worker in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counters['elapsed'] = time.perf_counter() - started
+    return counters
+
+
+def main():
+    conn = connect()
+    initial = PRODUCTS * VARIANTS_PER_PRODUCT * STOCK_PER_VARIANT + INVENTORY_ONLY_PRODUCTS * INVENTORY_STOCK
+
+    print("\n" + "=" * 78)
+    print(f"STOCK RESERVATION LOAD TEST ({initial} units on {PRODUCTS * VARIANTS_PER_PRODUCT + INVENTORY_ONLY_PRODUCTS} SKUs, "
+          f"{CART_LINES}-line carts, {ATTEMPTS_PER_BUYER} checkouts per buyer)")
+    print("=" * 78)
+
+    failed = False
+    for concurrency in CONCURRENCY:
+        print(f"\nconcurrent buyers={concurrency}")
+        for label, checkout in (('unguarded (legacy)', unguarded_checkout), ('reserve_stock', reserving_checkout)):
+            variants = seed(conn)
+            result = run(checkout, concurrency, variants)
+            cursor = conn.cursor()
+            remaining, negative_rows, oversold = total_stock(cursor)
+            cursor.execute("SELECT COALESCE(SUM(quantity), 0) FROM stock_reservations WHERE status = 'held'")
+            held = cursor.fetchone()[0]
+            print(f"  {label:<20} orders/sec={result['placed'] / result['elapsed']:>7.1f}  placed={result['placed']:>4}  "
+                  f"rejected={result['rejected']:>4}  deadlocks={result['deadlocks']:>3}  "
+                  f"negative_rows={negative_rows}  oversold_units={oversold}")
+
+            if checkout is reserving_checkout:
+                consistent = (negative_rows == 0 and oversold == 0
+                              and held == result['units'] and remaining == initial - held)
+                cursor.execute("UPDATE stock_reservations SET expires_at = NOW() - INTERVAL '1 second'")
+                released = 0
+                while True:
+                    batch = release_expired_reservations(cursor, 200)
+                    released += batch
+                    if batch < 200:
+                        break
+                conn.commit()
+                restored, _, _ = total_stock(cursor)
+                print(f"  {'':<20} holds={held} units, stock+holds={remaining + held}/{initial}, "
+                      f"released={released} holds -> stock back to {restored}/{initial}")
+                if not consistent or restored != initial or result['deadlocks']:
+                    failed = True
+            cursor.close()
+
+    print(f"\nthroughput cost with ample stock (no sell-out), {CONCURRENCY[-1]} buyers")
+    for label, checkout in (('unguarded (legacy)', unguarded_checkout), ('reserve_stock', reserving_checkout)):
+        variants = seed(conn, AMPLE_STOCK, AMPLE_STOCK)
+        result = run(checkout, CONCURRENCY[-1], variants)
+        print(f"  {label:<20} orders/sec={result['placed'] / result['elapsed']:>7.1f}  placed={result['placed']:>4}  "
+              f"deadlocks={result['deadlocks']:>3}")
+        if checkout is reserving_checkout and result['deadlocks']:
+            failed = True
+
+    conn.close()
+    print("\n" + ("✗ Reservation invariants violated" if failed else "✓ Zero oversell, zero deadlocks, all holds accounted for"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Rebuild the materialized product_stats table from reviews and orders.
+Run this with: python scripts/rebuild_product_stats.py
+Safe to run at any time - it recomputes every row and resyncs orders.stats_counted.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import app, get_db
+from utils.product_stats import ensure_product_stats_table, rebuild_product_stats
+
+
+def main():
+    with app.app_context():
+        conn = get_db()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        ensure_product_stats_table(cursor)
+        rows = rebuild_product_stats(cursor)
+        conn.commit()
+        cursor.close()
+        print(f"✓ product_stats rebuilt for {rows} products")
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Rebuild failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
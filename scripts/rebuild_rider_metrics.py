@@ -0,0 +1,39 @@
+"""
+Backfill the rider_daily_metrics rollup from rider_transactions and rider_ratings.
+Run this with: python scripts/rebuild_rider_metrics.py
+Safe to run at any time - it recomputes every row.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import _background_db_connection
+from utils.rider_metrics import ensure_rider_metrics_tables, rebuild_rider_metrics
+
+
+def main():
+    conn = _background_db_connection()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        ensure_rider_metrics_tables(cursor)
+        rows = rebuild_rider_metrics(cursor)
+        conn.commit()
+        cursor.close()
+        print(f"✓ rider_daily_metrics rebuilt with {rows} (rider, day) rows")
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Rebuild failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
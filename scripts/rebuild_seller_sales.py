@@ -0,0 +1,39 @@
+"""
+Backfill the seller_daily_sales and seller_customers rollups from orders.
+Run this with: python scripts/rebuild_seller_sales.py
+Safe to run at any time - it recomputes every row and resyncs orders.sales_rollup_state.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import _background_db_connection
+from utils.seller_sales import ensure_seller_sales_tables, rebuild_seller_sales
+
+
+def main():
+    conn = _background_db_connection()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        ensure_seller_sales_tables(cursor)
+        rows = rebuild_seller_sales(cursor)
+        conn.commit()
+        cursor.close()
+        print(f"✓ seller_daily_sales rebuilt with {rows} (seller, day, product) rows")
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Rebuild failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
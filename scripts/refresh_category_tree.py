@@ -0,0 +1,29 @@
+"""
+Make every running worker reload its in-memory category tree.
+Run this with: python scripts/refresh_category_tree.py
+Needed after categories are edited outside the app (SQL migrations, psql);
+otherwise workers pick the change up within CATEGORY_TREE_SECONDS.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import app, LOOKUP_CACHE_PATH, _categories, _invalidate_categories
+
+
+def main():
+    with app.app_context():
+        _invalidate_categories()
+        tree = _categories()
+    if tree is None:
+        print("✗ Category version bumped, but the categories could not be read back")
+        sys.exit(1)
+    active = sum(1 for node in tree.nodes.values() if node['is_active'])
+    print(f"✓ Category version bumped in {LOOKUP_CACHE_PATH} ({len(tree.nodes)} categories, {active} active)")
+
+
+if __name__ == "__main__":
+    main()
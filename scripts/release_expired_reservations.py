@@ -0,0 +1,49 @@
+"""
+Release checkout stock holds that outlived STOCK_RESERVATION_TTL_SECONDS.
+Run this with: python scripts/release_expired_reservations.py
+The app already sweeps every STOCK_RESERVATION_SWEEP_SECONDS; use this from cron
+when the in-process sweeper is disabled. Safe to run alongside the app.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import app, get_db
+from utils.stock_reservations import ensure_stock_reservations_table, release_expired_reservations
+
+BATCH_SIZE = 500
+
+
+def main():
+    with app.app_context():
+        conn = get_db()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        ensure_stock_reservations_table(cursor)
+        conn.commit()
+        released = 0
+        while True:
+            batch = release_expired_reservations(cursor, BATCH_SIZE)
+            conn.commit()
+            released += batch
+            if batch < BATCH_SIZE:
+                break
+        cursor.close()
+        print(f"✓ Released {released} expired stock holds")
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Release failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Minimal local SMTP sink for exercising the email outbox.
+Run this with: python scripts/smtp_stub.py [--port 2525] [--latency-ms 0]
+then start the app with SMTP_SERVER=127.0.0.1 SMTP_PORT=2525 EMAIL_LOG_ONLY=false.
+Accepts every message, counts it and throws it away. --latency-ms adds a delay
+to each accepted message and to each new connection's greeting, roughly what a
+real provider costs per send and per handshake.
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, latency_ms=0):
+        super().__init__(address, SMTPStubHandler)
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.connections = 0
+
+    def count(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        server.count('connections')
+        if server.latency:
+            time.sleep(server.latency)
+        self.reply('220 varon-smtp-stub ESMTP ready')
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.wfile.write(b'250-varon-smtp-stub\r\n250-8BITMIME\r\n250 SIZE 52428800\r\n')
+            elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b'.\r\n', b'.\n'):
+                        break
+                if server.latency:
+                    time.sleep(server.latency)
+                server.count('messages')
+                self.reply('250 OK queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+def start_stub(port=0, latency_ms=0):
+    """Start the stub on a background thread; returns the server (``server_address`` has the port)."""
+    server = SMTPStubServer(('127.0.0.1', port), latency_ms)
+    threading.Thread(target=server.serve_forever, name='smtp-stub', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SMTP sink')
+    parser.add_argument('--port', type=int, default=2525)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    server = SMTPStubServer(('127.0.0.1', args.port), args.latency_ms)
+    print(f"✓ SMTP stub listening on 127.0.0.1:{args.port} (latency {args.latency_ms}ms); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n✓ Received {server.messages} messages over {server.connections} connections")
+
+
+if __name__ == "__main__":
+    main()
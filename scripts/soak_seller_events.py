@@ -0,0 +1,315 @@
+"""
+Soak test for the seller dashboard push channel (/api/seller/events).
+Runs the real app on a scratch copy of the schema and measures how many
+queries per minute DASHBOARDS idle seller dashboards cost:
+
+  before: every dashboard polls /seller/orders every 30s (the old
+          setInterval(fetchOrderCount, 30000))
+  after:  every dashboard holds one EventSource stream open
+
+Queries are counted on the wire by a small proxy between the app and
+Postgres, so everything the app sends is included: request queries, the
+BEGIN/ROLLBACK psycopg2 wraps them in, pool pre-ping and the LISTEN
+connection. Finally a notification is written and
+every dashboard of that seller must receive it.
+
+The scratch database <bench db>_soak is dropped and recreated.
+Run with: BENCH_DATABASE_URL=postgresql://... python scripts/soak_seller_events.py
+"""
+import http.client
+import os
+import random
+import socket
+import struct
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import parse_dsn
+
+from bench_common import BENCH_DATABASE_URL
+
+DASHBOARDS = int(os.getenv('SOAK_DASHBOARDS', '500'))
+SELLERS = 50
+WINDOW_SECONDS = int(os.getenv('SOAK_SECONDS', '60'))
+POLL_INTERVAL_SECONDS = 30
+
+SSL_REQUEST_CODES = (80877103, 80877104)  # SSLRequest, GSSENCRequest
+
+
+class QueryCountingProxy:
+    """TCP proxy to Postgres that counts query messages ('Q' simple, 'P' extended) sent by clients."""
+
+    def __init__(self, upstream_host, upstream_port):
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.queries = 0
+        self._lock = threading.Lock()
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(256)
+        self.port = self.listener.getsockname()[1]
+
+    def _upstream(self):
+        if self.upstream_host.startswith('/'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(os.path.join(self.upstream_host, f'.s.PGSQL.{self.upstream_port}'))
+        else:
+            sock = socket.create_connection((self.upstream_host, self.upstream_port))
+        return sock
+
+    def start(self):
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def _accept(self):
+        while True:
+            client, _ = self.listener.accept()
+            server = self._upstream()
+            threading.Thread(target=self._client_to_server, args=(client, server), daemon=True).start()
+            threading.Thread(target=self._pipe, args=(server, client), daemon=True).start()
+
+    @staticmethod
+    def _pipe(source, target):
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                target.sendall(data)
+        except OSError:
+            pass
+        finally:
+            for sock in (source, target):
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+    def _client_to_server(self, client, server):
+        buffer = b''
+        startup = True
+        try:
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                server.sendall(data)
+                buffer += data
+                while True:
+                    if startup:
+                        if len(buffer) < 8:
+                            break
+                        length, code = struct.unpack('!ii', buffer[:8])
+                        if len(buffer) < length:
+                            break
+                        buffer = buffer[length:]
+                        startup = code in SSL_REQUEST_CODES
+                        continue
+                    if len(buffer) < 5:
+                        break
+                    kind = buffer[:1]
+                    length = struct.unpack('!i', buffer[1:5])[0]
+                    if len(buffer) < 1 + length:
+                        break
+                    if kind in (b'Q', b'P'):
+                        with self._lock:
+                            self.queries += 1
+                    buffer = buffer[1 + length:]
+        except OSError:
+            pass
+        finally:
+            for sock in (client, server):
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+
+def recreate_database():
+    params = parse_dsn(BENCH_DATABASE_URL)
+    soak_db = f"{params.get('dbname', 'postgres')}_soak"
+    admin = psycopg2.connect(**dict(params, dbname='postgres'))
+    admin.autocommit = True
+    cursor = admin.cursor()
+    cursor.execute(f'DROP DATABASE IF EXISTS {soak_db}')
+    cursor.execute(f'CREATE DATABASE {soak_db}')
+    admin.close()
+    return dict(params, dbname=soak_db)
+
+
+def seed(params):
+    conn = psycopg2.connect(**params)
+    cursor = conn.cursor()
+    cursor.execute('''
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS account_status VARCHAR(20),
+            ADD COLUMN IF NOT EXISTS restriction_until TIMESTAMP,
+            ADD COLUMN IF NOT EXISTS restriction_reason TEXT,
+            ADD COLUMN IF NOT EXISTS session_version INT DEFAULT 0
+    ''')
+    # Columns production has that the ORM models don't declare, read by /seller/orders.
+    cursor.execute('''
+        ALTER TABLE orders
+            ADD COLUMN IF NOT EXISTS seller_confirmed_rider BOOLEAN DEFAULT FALSE,
+            ADD COLUMN IF NOT EXISTS buyer_approved_rider BOOLEAN DEFAULT FALSE
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_status_history (
+            id SERIAL PRIMARY KEY, order_id INT, seller_id INT, old_status VARCHAR(30), new_status VARCHAR(30),
+            changed_by INT, reason TEXT, notes TEXT, created_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO users (first_name, last_name, email, password, role)
+        SELECT 'Seller', s::text, 'seller' || s || '@example.com', 'x', 'seller'
+        FROM generate_series(1, %s) s
+    ''', (SELLERS,))
+    cursor.execute('''
+        INSERT INTO sellers (user_id, store_name, store_slug, status)
+        SELECT id, 'Store ' || id, 'store-' || id, 'approved' FROM users ORDER BY id
+    ''')
+    cursor.execute('SELECT id, user_id FROM sellers ORDER BY id')
+    sellers = cursor.fetchall()
+    conn.commit()
+    conn.close()
+    return sellers
+
+
+def session_cookie(app, user_id):
+    serializer = app.session_interface.get_signing_serializer(app)
+    value = serializer.dumps({'logged_in': True, 'user_id': user_id, 'role': 'seller', 'session_version': 0})
+    return f"{app.config.get('SESSION_COOKIE_NAME', 'session')}={value}"
+
+
+def polling_dashboard(port, cookie, stop, counters, lock):
+    rng = random.Random()
+    stop.wait(rng.uniform(0, POLL_INTERVAL_SECONDS))  # dashboards were opened at different times
+    while not stop.is_set():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            conn.request('GET', '/seller/orders', headers={'Cookie': cookie})
+            status = conn.getresponse().status
+            with lock:
+                counters['requests'] += 1
+                counters['errors'] += status != 200
+        except OSError:
+            with lock:
+                counters['errors'] += 1
+        finally:
+            conn.close()
+        stop.wait(POLL_INTERVAL_SECONDS)
+
+
+def streaming_dashboard(port, cookie, stop, seller_id, received, connected):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=WINDOW_SECONDS + 60)
+    try:
+        conn.request('GET', '/api/seller/events', headers={'Cookie': cookie, 'Accept': 'text/event-stream'})
+        response = conn.getresponse()
+        if response.status != 200:
+            print(f"  ✗ stream refused: HTTP {response.status}")
+            return
+        connected.release()
+        while not stop.is_set():
+            line = response.fp.readline()
+            if not line:
+                break
+            if line.startswith(b'event: notification'):
+                received.append(seller_id)
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def measure(proxy, seconds):
+    start = proxy.queries
+    time.sleep(seconds)
+    return (proxy.queries - start) * 60.0 / seconds
+
+
+def main():
+    params = recreate_database()
+    proxy = QueryCountingProxy(params.get('host') or 'localhost', int(params.get('port') or 5432)).start()
+
+    os.environ['DATABASE_URL'] = (
+        f"postgresql+psycopg2://{params.get('user', 'postgres')}@127.0.0.1:{proxy.port}/{params['dbname']}?sslmode=disable"
+    )
+    os.environ['EMAIL_OUTBOX_WORKERS'] = '0'
+    os.environ['STOCK_RESERVATION_SWEEP_SECONDS'] = '0'
+    os.environ['SELLER_EVENTS_ENABLED'] = 'true'
+    os.environ['SELLER_EVENTS_HEARTBEAT_SECONDS'] = '15'
+
+    import app as varon
+    from werkzeug.serving import ThreadedWSGIServer, make_server
+
+    sellers = seed(params)
+    ThreadedWSGIServer.request_queue_size = 1024  # every stream connects at once
+    server = make_server('127.0.0.1', 0, varon.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+    while not varon.seller_event_hub.listening:
+        time.sleep(0.1)
+
+    dashboards = [sellers[i % len(sellers)] for i in range(DASHBOARDS)]
+    cookies = {user_id: session_cookie(varon.app, user_id) for _, user_id in sellers}
+
+    print("\n" + "=" * 78)
+    print(f"SELLER DASHBOARD SOAK ({DASHBOARDS} idle dashboards across {len(sellers)} sellers, {WINDOW_SECONDS}s windows)")
+    print("=" * 78)
+
+    idle = measure(proxy, 5)
+    print(f"\n  {'app idle, no dashboards':<34} queries/min={idle:>9.1f}")
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    counters = {'requests': 0, 'errors': 0}
+    threads = [threading.Thread(target=polling_dashboard, args=(port, cookies[user_id], stop, counters, lock), daemon=True)
+               for _, user_id in dashboards]
+    for thread in threads:
+        thread.start()
+    polling = measure(proxy, WINDOW_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join(35)
+    print(f"  {'before: poll /seller/orders @30s':<34} queries/min={polling:>9.1f}  "
+          f"requests={counters['requests']} errors={counters['errors']}")
+
+    stop = threading.Event()
+    received = []
+    connected = threading.Semaphore(0)
+    threads = [threading.Thread(target=streaming_dashboard,
+                                args=(port, cookies[user_id], stop, seller_id, received, connected), daemon=True)
+               for seller_id, user_id in dashboards]
+    opened = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for _ in dashboards:
+        connected.acquire(timeout=60)
+    print(f"  {'':<34} {len(dashboards)} streams opened in {time.perf_counter() - opened:.1f}s")
+    streaming = measure(proxy, WINDOW_SECONDS)
+    print(f"  {'after: SSE /api/seller/events':<34} queries/min={streaming:>9.1f}")
+
+    target_seller = sellers[0][0]
+    expected = sum(1 for seller_id, _ in dashboards if seller_id == target_seller)
+    with varon.app.app_context():
+        varon.create_seller_notification(target_seller, None, 'new_order', 'New Order Received', 'Soak test order')
+    deadline = time.time() + 5
+    while time.time() < deadline and len(received) < expected:
+        time.sleep(0.05)
+    delivered = sum(1 for seller_id in received if seller_id == target_seller)
+    leaked = len(received) - delivered
+    print(f"\n  push: {delivered}/{expected} dashboards of seller {target_seller} notified, {leaked} other dashboards woken")
+    stop.set()
+    server.shutdown()
+
+    failed = delivered != expected or leaked or streaming > max(polling / 10.0, idle + 10)
+    print("\n" + ("✗ Push channel did not hold up" if failed else
+                  f"✓ Idle dashboards: {polling:.0f} -> {streaming:.0f} queries/min, pushes delivered"))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
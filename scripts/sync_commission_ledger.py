@@ -0,0 +1,50 @@
+"""
+Insert admin_commission_ledger rows missing for delivered/completed orders.
+Run this with: python scripts/sync_commission_ledger.py [--all]
+The app records ledger rows when an order is delivered or completed and catches up
+every COMMISSION_LEDGER_SYNC_SECONDS; use this from cron when that is disabled.
+By default it looks at orders updated in the last COMMISSION_LEDGER_LOOKBACK_SECONDS;
+--all scans every order (e.g. after finalizing orders directly in SQL, or as the upgrade step when
+the app runs with APP_STARTUP_TASKS off) and marks the ledger complete. Safe to run at any time.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('APP_STARTUP_TASKS', 'off')  # no migrations or background threads for a one-off run
+
+from app import _background_db_connection, COMMISSION_LEDGER_LOOKBACK_SECONDS
+from utils.commission_ledger import (
+    ensure_commission_ledger_table, catch_up_commission_ledger, mark_commission_ledger_complete,
+)
+
+
+def main():
+    conn = _background_db_connection()
+    if not conn:
+        print("❌ Failed to connect to database")
+        sys.exit(1)
+
+    try:
+        cursor = conn.cursor()
+        ensure_commission_ledger_table(cursor)
+        if '--all' in sys.argv[1:]:
+            inserted = catch_up_commission_ledger(cursor)
+            mark_commission_ledger_complete(cursor)
+        else:
+            cursor.execute("SELECT NOW() - make_interval(secs => %s)", (COMMISSION_LEDGER_LOOKBACK_SECONDS,))
+            inserted = catch_up_commission_ledger(cursor, cursor.fetchone()[0])
+        conn.commit()
+        cursor.close()
+        print(f"✓ Inserted {inserted} missing commission ledger rows")
+    except Exception as err:
+        conn.rollback()
+        print(f"✗ Sync failed: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1676 @@
+      const regionCoordinates = {
+        'north luzon': { center: [16.4023, 120.5960], zoom: 7, radius: 150000, displayName: 'North Luzon' },
+        'central luzon': { center: [15.4828, 120.7129], zoom: 8, radius: 100000, displayName: 'Central Luzon' },
+        'south luzon': { center: [14.2691, 121.4147], zoom: 8, radius: 120000, displayName: 'South Luzon' },
+        'visayas': { center: [11.2447, 123.0167], zoom: 7, radius: 200000, displayName: 'Visayas' },
+        'mindanao': { center: [7.1907, 124.2250], zoom: 7, radius: 250000, displayName: 'Mindanao' },
+
+        'sta cruz': { center: [14.2691, 121.4147], zoom: 13, radius: 5000, displayName: 'Sta Cruz, Laguna' },
+        'santa cruz': { center: [14.2691, 121.4147], zoom: 13, radius: 5000, displayName: 'Santa Cruz, Laguna' },
+        'calamba': { center: [14.2117, 121.1653], zoom: 13, radius: 6000, displayName: 'Calamba, Laguna' },
+        'los baños': { center: [14.1697, 121.2408], zoom: 13, radius: 5000, displayName: 'Los Baños, Laguna' },
+        'manila': { center: [14.5995, 120.9842], zoom: 12, radius: 8000, displayName: 'Manila (NCR)' },
+        'quezon city': { center: [14.6760, 121.0437], zoom: 12, radius: 10000, displayName: 'Quezon City (NCR)' }
+      };
+
+      const shipmentStatusMeta = {
+        'pending': { label: 'Waiting Approval', color: '#92400e', bg: '#fffbeb' },
+        'assigned_to_rider': { label: 'Assigned to You', color: '#2563eb', bg: '#dbeafe' },
+        'picked_up': { label: 'Picked Up', color: '#1d4ed8', bg: '#dbeafe' },
+        'in_transit': { label: 'In Transit', color: '#8b5cf6', bg: '#f3e8ff' },
+        'out_for_delivery': { label: 'Out for Delivery', color: '#ec4899', bg: '#fce7f3' },
+        'delivered': { label: 'Delivered', color: '#15803d', bg: '#dcfce7' }
+      };
+
+      const riderStatusFlow = [
+        { key: 'picked_up', label: 'Picked Up', emoji: '📦' },
+        { key: 'in_transit', label: 'In Transit', emoji: '🚗' },
+        { key: 'out_for_delivery', label: 'Out for Delivery', emoji: '🚪' },
+        { key: 'delivered', label: 'Delivered', emoji: '✅' }
+      ];
+
+      let activeDeliveryCache = [];
+
+      function getShipmentStatusMeta(status) {
+        if (!status) {
+          return { label: 'Pending', color: '#6b7280', bg: '#f3f4f6' };
+        }
+        return shipmentStatusMeta[status] || {
+          label: status.replace('_', ' ').toUpperCase(),
+          color: '#6b7280',
+          bg: '#f3f4f6'
+        };
+      }
+
+      function formatDateTime(dateString) {
+        if (!dateString) {
+          return '—';
+        }
+        if (window.PhilippineTime && typeof window.PhilippineTime.formatDateTime === 'function') {
+          const formatted = window.PhilippineTime.formatDateTime(dateString, {
+            month: 'short',
+            day: 'numeric',
+            year: 'numeric',
+            hour: '2-digit',
+            minute: '2-digit'
+          });
+          if (formatted) {
+            return formatted;
+          }
+        }
+        const parsed = new Date(dateString);
+        if (Number.isNaN(parsed.getTime())) {
+          return '—';
+        }
+        return parsed.toLocaleString('en-PH', {
+          month: 'short',
+          day: 'numeric',
+          year: 'numeric',
+          hour: '2-digit',
+          minute: '2-digit',
+          timeZone: 'Asia/Manila'
+        });
+      }
+
+      function getNextStatus(currentStatus) {
+        if (!currentStatus || currentStatus === 'pending' || currentStatus === 'assigned_to_rider') {
+          return riderStatusFlow[0].key;
+        }
+        const index = riderStatusFlow.findIndex(step => step.key === currentStatus);
+        if (index === -1 || index === riderStatusFlow.length - 1) {
+          return null;
+        }
+        return riderStatusFlow[index + 1].key;
+      }
+
+      function renderStatusStepper(order) {
+        const currentStatus = order.shipment_status || 'pending';
+        const currentIndex = riderStatusFlow.findIndex(step => step.key === currentStatus);
+        const isPending = currentStatus === 'pending' || currentStatus === 'assigned_to_rider';
+        const isDelivered = currentStatus === 'delivered';
+
+        // Show all completed steps as checkmarks
+        let html = '';
+
+        // Show all completed steps
+        for (let i = 0; i < currentIndex; i++) {
+          const step = riderStatusFlow[i];
+          html += `<button class="status-chip done" disabled style="opacity:1">${step.emoji} ${step.label} ✓</button>`;
+        }
+
+        // Show current active step only if not pending and not delivered
+        if (!isPending && !isDelivered) {
+          const currentStep = riderStatusFlow[currentIndex];
+          html += `<button class="status-chip active" disabled>${currentStep.emoji} ${currentStep.label}</button>`;
+        }
+
+        // Show next button only if not delivered
+        if (!isDelivered && currentIndex < riderStatusFlow.length - 1) {
+          const nextStep = riderStatusFlow[currentIndex + 1];
+          html += `<button class="status-chip next" onclick="updateDeliveryStatus(${order.shipment_id}, '${nextStep.key}')" style="cursor:pointer">→ Advance to ${nextStep.label}</button>`;
+        }
+
+        // Show delivered checkmark if delivered
+        if (isDelivered) {
+          html += `<button class="status-chip done" disabled style="opacity:1">✅ Delivered ✓</button>`;
+        }
+
+        return html;
+      }
+
+      function renderActiveDeliveryModalContent(deliveries = []) {
+        const container = document.getElementById('activeDeliveryList');
+        if (!container) {
+          return;
+        }
+
+        if (!deliveries.length) {
+          container.innerHTML = '<div style="padding:30px;text-align:center;color:#6b7280">No active deliveries right now. Accept an order to see live updates here.</div>';
+          return;
+        }
+
+        container.innerHTML = deliveries.map(delivery => {
+          const statusMeta = getShipmentStatusMeta(delivery.shipment_status);
+          const earning = (parseFloat(delivery.total_amount || 0) * 0.15).toFixed(2);
+          const totalAmount = parseFloat(delivery.total_amount || 0).toFixed(2);
+          const nextStatus = getNextStatus(delivery.shipment_status);
+          const nextStatusMeta = nextStatus ? getShipmentStatusMeta(nextStatus) : null;
+
+          const nextButton = nextStatus ? `
+            <button style="background:#10b981;color:#fff" onclick="updateDeliveryStatus(${delivery.shipment_id}, '${nextStatus}')">
+              Advance to ${nextStatusMeta.label}
+            </button>
+          ` : '';
+
+          const acceptButton = (delivery.shipment_status === 'pending' || delivery.shipment_status === 'assigned_to_rider') ? `
+            <button style="background:#f97316;color:#fff" onclick="acceptOrder(${delivery.shipment_id})">
+              Accept Delivery
+            </button>
+          ` : '';
+
+          return `
+            <div class="active-delivery-card">
+              <div class="card-header">
+                <div>
+                  <div class="card-title">Order #${delivery.order_number}</div>
+                  <div class="card-subtitle">Updated ${formatDateTime(delivery.available_since || delivery.created_at)}</div>
+                </div>
+                <span class="status-pill" style="background:${statusMeta.bg};color:${statusMeta.color}">${statusMeta.label}</span>
+              </div>
+              <div class="card-details">
+                <div>
+                  <div class="label">Customer</div>
+                  <div class="value">${delivery.customer_name || 'N/A'}</div>
+                  <div class="muted">${delivery.customer_phone || 'No phone on file'}</div>
+                </div>
+                <div>
+                  <div class="label">Dropoff</div>
+                  <div class="value">${delivery.delivery_address || 'Not provided'}</div>
+                  <div class="muted">${[delivery.city, delivery.province].filter(Boolean).join(', ')}</div>
+                </div>
+                <div>
+                  <div class="label">Earnings</div>
+                  <div class="value">₱${earning}</div>
+                  <div class="muted">Order ₱${totalAmount}</div>
+                </div>
+              </div>
+              <div class="status-stepper">
+                ${renderStatusStepper(delivery)}
+              </div>
+              <div class="card-actions">
+                ${acceptButton}
+                ${nextButton}
+                <button style="background:#3b82f6;color:#fff" onclick="viewShipmentDetails(${delivery.shipment_id}, '${delivery.order_number}')">View Details</button>
+              </div>
+            </div>
+          `;
+        }).join('');
+      }
+
+      function updateActiveDeliveryNotifications(deliveries = []) {
+        activeDeliveryCache = deliveries;
+        const alertBtn = document.getElementById('activeDeliveryAlerts');
+        const badge = document.getElementById('activeDeliveryBadge');
+
+        if (!alertBtn || !badge) {
+          return;
+        }
+
+        const count = deliveries.length;
+        badge.textContent = count;
+
+        if (count === 0) {
+          alertBtn.classList.add('disabled-alert');
+          alertBtn.setAttribute('disabled', 'disabled');
+        } else {
+          alertBtn.classList.remove('disabled-alert');
+          alertBtn.removeAttribute('disabled');
+        }
+
+        renderActiveDeliveryModalContent(deliveries);
+      }
+
+      function buildActiveDeliveryActions(order) {
+        if (!order.seller_confirmed) {
+          return `
+            <div style="display:flex;gap:6px;flex-wrap:wrap;align-items:center;justify-content:center">
+              <span style="font-size:12px;color:#f59e0b;font-weight:600">⏳ Waiting for seller</span>
+              <button onclick="viewShipmentDetails(${order.shipment_id}, '${order.order_number}')"
+                      style="background:#3b82f6;color:#fff;border:none;cursor:pointer;padding:4px 8px;border-radius:6px;font-weight:600;font-size:11px;transition:all 0.2s;white-space:nowrap"
+                      onmouseover="this.style.background='#2563eb'"
+                      onmouseout="this.style.background='#3b82f6'">
+                📊 Details
+              </button>
+            </div>
+          `;
+        }
+
+        if (order.shipment_status === 'pending' || order.shipment_status === 'assigned_to_rider') {
+          return `
+            <div style="display:flex;gap:6px;flex-wrap:wrap;align-items:center;justify-content:center">
+              <button onclick="acceptOrder(${order.shipment_id})"
+                      style="background:#10b981;color:#fff;border:none;cursor:pointer;padding:6px 12px;border-radius:6px;font-weight:600;font-size:12px;transition:all 0.2s;white-space:nowrap"
+                      onmouseover="this.style.background='#059669'"
+                      onmouseout="this.style.background='#10b981'">
+                Accept
+              </button>
+              <button onclick="viewShipmentDetails(${order.shipment_id}, '${order.order_number}')"
+                      style="background:#6b7280;color:#fff;border:none;cursor:pointer;padding:4px 8px;border-radius:6px;font-weight:600;font-size:11px;transition:all 0.2s;white-space:nowrap"
+                      onmouseover="this.style.background='#4b5563'"
+                      onmouseout="this.style.background='#6b7280'">
+                📊 Details
+              </button>
+            </div>
+          `;
+        }
+
+        if (order.shipment_status === 'delivered') {
+          return `
+            <div style="display:flex;gap:6px;flex-wrap:wrap;align-items:center;justify-content:center">
+              <span style="background:#10b981;color:#fff;padding:6px 10px;border-radius:6px;font-size:11px;font-weight:600">✓ Delivered</span>
+              <button onclick="viewShipmentDetails(${order.shipment_id}, '${order.order_number}')"
+                      style="background:#6b7280;color:#fff;border:none;cursor:pointer;padding:4px 8px;border-radius:6px;font-weight:600;font-size:11px;transition:all 0.2s;white-space:nowrap"
+                      onmouseover="this.style.background='#4b5563'"
+                      onmouseout="this.style.background='#6b7280'">
+                📊 Details
+              </button>
+            </div>
+          `;
+        }
+
+        const nextStatus = getNextStatus(order.shipment_status);
+        const nextStatusMeta = nextStatus ? getShipmentStatusMeta(nextStatus) : null;
+        const nextButton = nextStatus ? `
+          <button onclick="updateDeliveryStatus(${order.shipment_id}, '${nextStatus}')"
+                  style="background:#10b981;color:#fff;border:none;cursor:pointer;padding:6px 12px;border-radius:6px;font-weight:600;font-size:12px;transition:all 0.2s;white-space:nowrap"
+                  onmouseover="this.style.background='#059669'"
+                  onmouseout="this.style.background='#10b981'">
+            Advance to ${nextStatusMeta.label}
+          </button>
+        ` : '';
+
+        return `
+          <div class="status-actions-wrapper">
+            <div class="status-stepper">
+              ${renderStatusStepper(order)}
+            </div>
+            <div style="display:flex;gap:6px;flex-wrap:wrap;justify-content:center">
+              ${nextButton}
+              <button onclick="viewShipmentDetails(${order.shipment_id}, '${order.order_number}')"
+                      style="background:#6b7280;color:#fff;border:none;cursor:pointer;padding:4px 8px;border-radius:6px;font-weight:600;font-size:11px;transition:all 0.2s;white-space:nowrap"
+                      onmouseover="this.style.background='#4b5563'"
+                      onmouseout="this.style.background='#6b7280'">
+                📊 Details
+              </button>
+            </div>
+          </div>
+        `;
+      }
+
+      const documentTypeDefinitions = [
+        { key: 'government_id', label: "Driver's License" },
+        { key: 'vehicle_registration', label: 'Vehicle Registration' },
+        { key: 'orcr', label: 'Official Receipt / CR' },
+        { key: 'car_photo', label: 'Vehicle Photo' }
+      ];
+
+      function triggerDocumentUpload(docType) {
+        const input = document.getElementById(`doc-file-${docType}`);
+        if (input) {
+          input.click();
+        }
+      }
+
+      function handleDocumentUpload(event, docType) {
+        const file = event.target.files && event.target.files[0];
+        if (!file) {
+          return;
+        }
+
+        const card = document.querySelector(`[data-doc-type="${docType}"]`);
+        const statusNote = card ? card.querySelector('.doc-upload-status') : null;
+        if (statusNote) {
+          statusNote.textContent = 'Uploading document...';
+        }
+
+        const formData = new FormData();
+        formData.append('document_type', docType);
+        formData.append('document', file);
+
+        fetch('/api/rider/upload-document', {
+          method: 'POST',
+          body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+          if (!data.success) {
+            throw new Error(data.error || 'Upload failed');
+          }
+          loadDocumentStatuses();
+          alert('Document uploaded successfully. It will be reviewed shortly.');
+        })
+        .catch(error => {
+          console.error('Error uploading document:', error);
+          alert('Failed to upload document. Please try again.');
+          if (statusNote) {
+            statusNote.textContent = 'Upload failed. Please retry.';
+          }
+        })
+        .finally(() => {
+          event.target.value = '';
+        });
+      }
+
+      function loadDocumentStatuses() {
+        fetch('/api/rider/document-status')
+          .then(response => response.json())
+          .then(data => {
+            if (!data.success || !data.documents) {
+              throw new Error(data.error || 'Unable to load documents');
+            }
+
+            documentTypeDefinitions.forEach(def => {
+              const card = document.querySelector(`[data-doc-type="${def.key}"]`);
+              if (!card) {
+                return;
+              }
+              const badge = card.querySelector('.doc-status');
+              const note = card.querySelector('.doc-upload-status');
+              const viewLink = card.querySelector('.doc-view-link');
+              const docData = data.documents[def.key];
+
+              if (!docData) {
+                badge.textContent = 'Not uploaded';
+                badge.className = 'doc-status doc-status-missing';
+                if (note) {
+                  note.textContent = 'No file uploaded yet.';
+                }
+                if (viewLink) {
+                  viewLink.style.display = 'none';
+                  viewLink.removeAttribute('href');
+                }
+                return;
+              }
+
+              if (docData.verified) {
+                badge.textContent = 'Verified';
+                badge.className = 'doc-status doc-status-verified';
+                if (note) {
+                  note.textContent = `Approved ${formatDateTime(docData.updated_at || docData.uploaded_at)}`;
+                }
+              } else {
+                badge.textContent = 'Pending review';
+                badge.className = 'doc-status doc-status-pending';
+                if (note) {
+                  note.textContent = `Uploaded ${formatDateTime(docData.uploaded_at)} · Awaiting approval`;
+                }
+              }
+
+              if (viewLink) {
+                if (docData.file_url) {
+                  viewLink.style.display = 'inline-flex';
+                  viewLink.href = docData.file_url;
+                } else {
+                  viewLink.style.display = 'none';
+                  viewLink.removeAttribute('href');
+                }
+              }
+            });
+          })
+          .catch(error => {
+            console.error('Error loading document statuses:', error);
+          });
+      }
+
+      function openActiveDeliveryModal() {
+        if (!activeDeliveryCache.length) {
+          alert('No active deliveries yet. Accept an order to see notifications.');
+          return;
+        }
+        const modal = document.getElementById('activeDeliveryModal');
+        if (modal) {
+          modal.style.display = 'flex';
+        }
+      }
+
+      function closeActiveDeliveryModal() {
+        const modal = document.getElementById('activeDeliveryModal');
+        if (modal) {
+          modal.style.display = 'none';
+        }
+      }
+
+
+      function initializeMap() {
+
+        const serviceAreaText = window.RIDER_SERVICE_AREA || 'South Luzon';
+        console.log('Service Area from DB:', serviceAreaText);
+
+
+        const serviceAreaParts = serviceAreaText.split(',').map(part => part.trim());
+        const mainRegion = serviceAreaParts[0];
+        const normalizedRegion = mainRegion.toLowerCase().trim();
+
+        console.log('Parsed main region:', mainRegion);
+        console.log('All service area parts:', serviceAreaParts);
+
+
+        let regionConfig = null;
+        for (const [region, config] of Object.entries(regionCoordinates)) {
+          if (normalizedRegion.includes(region.toLowerCase()) || region.toLowerCase().includes(normalizedRegion)) {
+            regionConfig = config;
+            console.log('Matched region:', region, config);
+            break;
+          }
+        }
+
+
+        if (!regionConfig) {
+          console.log('No match found, using default: South Luzon');
+          regionConfig = regionCoordinates['south luzon'];
+        }
+
+
+        const map = L.map('serviceMap').setView(regionConfig.center, regionConfig.zoom);
+
+
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+          attribution: '© <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
+          maxZoom: 19
+        }).addTo(map);
+
+
+        const serviceArea = L.circle(regionConfig.center, {
+          color: '#10b981',
+          fillColor: '#10b981',
+          fillOpacity: 0.15,
+          radius: regionConfig.radius
+        }).addTo(map);
+
+
+        const centerMarker = L.marker(regionConfig.center, {
+          icon: L.divIcon({
+            className: 'center-marker',
+            html: '<div style="background:#0a0a0a;color:white;padding:6px 12px;border-radius:20px;font-size:12px;font-weight:600;white-space:nowrap;box-shadow:0 2px 8px rgba(0,0,0,0.3);">📍 ' + regionConfig.displayName + '</div>',
+            iconSize: [120, 32],
+            iconAnchor: [60, 16]
+          })
+        }).addTo(map);
+
+        centerMarker.bindPopup(`<b>${regionConfig.displayName}</b><br>Your Service Area`);
+
+
+        L.control.scale().addTo(map);
+      }
+
+
+      function switchSection(sectionId) {
+
+        document.querySelectorAll('[id$="-section"]').forEach(section => {
+          section.style.display = 'none';
+        });
+
+
+        const selectedSection = document.getElementById(sectionId + '-section');
+        if (selectedSection) {
+          selectedSection.style.display = 'block';
+        }
+
+
+        document.querySelectorAll('.side-link').forEach(link => {
+          link.classList.remove('active');
+        });
+
+
+        const activeLink = Array.from(document.querySelectorAll('.side-link')).find(
+          link => link.textContent.toLowerCase().includes(sectionId.toLowerCase())
+        );
+        if (activeLink) {
+          activeLink.classList.add('active');
+        }
+
+
+        if (sectionId === 'deliveries') {
+          loadOrdersAndDeliveries();
+        }
+      }
+
+
+      function clearFilters() {
+        document.getElementById('filterProvince').value = '';
+        document.getElementById('filterCity').value = '';
+        document.getElementById('filterPostalCode').value = '';
+        loadOrdersAndDeliveries();
+      }
+
+
+
+      function loadOrdersAndDeliveries() {
+
+        const filterProvince = document.getElementById('filterProvince')?.value.trim() || '';
+        const filterCity = document.getElementById('filterCity')?.value.trim() || '';
+        const filterPostalCode = document.getElementById('filterPostalCode')?.value.trim() || '';
+
+
+        Promise.all([
+          fetch('/api/rider/available-orders').then(r => r.json()),
+          fetch('/api/rider/active-deliveries' + (filterProvince || filterCity || filterPostalCode ?
+            '?' + new URLSearchParams({province: filterProvince, city: filterCity, postal_code: filterPostalCode}).toString() : '')).then(r => r.json())
+        ])
+        .then(([availableData, activeData]) => {
+          const tbody = document.querySelector('#orders-deliveries-tbody');
+          const allOrders = [];
+
+
+          if (availableData.success && availableData.orders && availableData.orders.length > 0) {
+            const availableOrders = availableData.orders.filter(order =>
+              order.order_status === 'waiting_for_pickup' && !order.assigned_rider_id
+            );
+            availableOrders.forEach(order => {
+              allOrders.push({...order, type: 'available'});
+            });
+          }
+
+
+          if (activeData.deliveries && activeData.deliveries.length > 0) {
+            activeData.deliveries.forEach(order => {
+              allOrders.push({...order, type: 'active'});
+            });
+          }
+
+
+          if (activeData.service_area) {
+            document.getElementById('riderServiceArea').textContent = activeData.service_area || 'Not assigned';
+          }
+
+          updateActiveDeliveryNotifications(activeData.deliveries || []);
+
+
+          document.getElementById('order-count').textContent = `${allOrders.length} Orders`;
+
+          if (allOrders.length > 0) {
+            tbody.innerHTML = allOrders.map(order => {
+              const earning = (parseFloat(order.total_amount) * 0.15).toFixed(2);
+              const orderLocation = `${order.delivery_city || order.city}, ${order.delivery_province || order.province}`;
+
+
+              let statusText, statusColor, statusBg;
+
+              if (order.type === 'available') {
+                statusText = 'Available';
+                statusColor = '#059669';
+                statusBg = '#ecfdf5';
+              } else {
+                const statusMeta = getShipmentStatusMeta(order.shipment_status);
+                statusText = statusMeta.label;
+                statusColor = statusMeta.color;
+                statusBg = statusMeta.bg;
+              }
+
+
+              let actionButton = '';
+
+              if (order.type === 'available') {
+                actionButton = `
+                  <button onclick="acceptOrder(${order.shipment_id})"
+                          style="background:#10b981;color:#fff;border:none;cursor:pointer;padding:6px 12px;border-radius:6px;font-weight:600;font-size:12px;transition:all 0.2s;white-space:nowrap"
+                          onmouseover="this.style.background='#059669'"
+                          onmouseout="this.style.background='#10b981'">
+                    Accept Order
+                  </button>
+                `;
+              } else {
+                actionButton = buildActiveDeliveryActions(order);
+              }
+
+              const availableDate = order.available_since || order.created_at;
+              const dateFormatted = availableDate ? formatDateTime(availableDate) : 'N/A';
+
+              return `
+                <tr style="border-bottom:1px solid #e5e7eb;transition:background 0.2s">
+                  <td style="padding:12px 14px;font-weight:700;color:#0a0a0a;white-space:nowrap">
+                    #${order.order_number}
+                  </td>
+                  <td style="padding:12px 14px;font-size:13px;color:#374151;white-space:nowrap">
+                    ${dateFormatted}
+                  </td>
+                  <td style="padding:12px 14px">
+                    <div style="font-weight:600;color:#0a0a0a;margin-bottom:3px">${order.customer_name}</div>
+                    <div style="font-size:12px;color:#666;margin-bottom:4px">${order.delivery_address}</div>
+                    <div style="font-size:11px;color:#10b981;font-weight:500">📍 ${orderLocation}</div>
+                  </td>
+                  <td style="padding:12px 14px;font-weight:600;color:#0a0a0a">
+                    ₱${parseFloat(order.total_amount).toFixed(2)}
+                  </td>
+                  <td style="padding:12px 14px;text-align:right;font-weight:700;color:#10b981;font-size:13px">
+                    ₱${earning}
+                  </td>
+                  <td style="padding:12px 14px">
+                    <span style="background:${statusBg};color:${statusColor};padding:6px 10px;border-radius:6px;font-size:12px;font-weight:600;white-space:nowrap;display:inline-block">
+                      ${statusText}
+                    </span>
+                  </td>
+                  <td style="padding:12px 14px;text-align:center">
+                    ${actionButton}
+                  </td>
+                </tr>
+              `;
+            }).join('');
+          } else {
+            const filterText = (filterProvince || filterCity || filterPostalCode) ?
+              'No orders found in this area. Try adjusting your filters.' :
+              'No available or active orders right now. Check back soon!';
+            tbody.innerHTML = `<tr><td colspan="7" style="text-align:center;color:#999;padding:40px">${filterText}</td></tr>`;
+          }
+        })
+        .catch(error => {
+          console.error('Error loading orders and deliveries:', error);
+          document.querySelector('#orders-deliveries-tbody').innerHTML =
+            '<tr><td colspan="7" style="text-align:center;color:#dc2626;padding:40px">Error loading orders</td></tr>';
+          updateActiveDeliveryNotifications([]);
+        });
+      }
+
+
+      function loadAvailableOrders() {
+        loadOrdersAndDeliveries();
+      }
+
+      function loadMyActiveDeliveries() {
+        loadOrdersAndDeliveries();
+      }
+
+
+      function acceptOrder(shipmentId) {
+        // Show confirmation modal
+        const confirmModal = document.createElement('div');
+        confirmModal.style.cssText = `
+          position: fixed;
+          inset: 0;
+          background: rgba(10,10,10,0.5);
+          display: flex;
+          align-items: center;
+          justify-content: center;
+          z-index: 8000;
+          animation: fadeIn 0.2s ease;
+        `;
+        confirmModal.innerHTML = `
+          <div style="background:#fff;border-radius:12px;padding:24px;max-width:380px;width:90%;box-shadow:0 20px 45px rgba(0,0,0,0.25);text-align:center">
+            <div style="font-size:40px;margin-bottom:12px">📦</div>
+            <h2 style="margin:0 0 8px;font-size:20px;color:#0a0a0a">Accept This Order?</h2>
+            <p style="margin:0 0 20px;color:#666;font-size:14px">You'll be assigned to deliver this order and earn commission on completion.</p>
+            <div style="display:flex;gap:10px;justify-content:center">
+              <button id="cancelAcceptBtn" style="padding:10px 20px;border:1px solid #ddd;background:#f3f4f6;color:#0a0a0a;border-radius:8px;font-weight:600;cursor:pointer;transition:all 0.2s">Cancel</button>
+              <button id="confirmAcceptBtn" style="padding:10px 20px;border:none;background:#10b981;color:#fff;border-radius:8px;font-weight:600;cursor:pointer;transition:all 0.2s">Accept Order</button>
+            </div>
+          </div>
+        `;
+        document.body.appendChild(confirmModal);
+
+        // Cancel button - properly remove the entire modal
+        document.getElementById('cancelAcceptBtn').addEventListener('click', () => {
+          confirmModal.remove();
+        });
+
+        document.getElementById('confirmAcceptBtn').addEventListener('click', () => {
+          confirmModal.remove();
+
+          // Show loading notification
+          const loadingNotif = document.createElement('div');
+          loadingNotif.style.cssText = `
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            padding: 16px 24px;
+            background: #3b82f6;
+            color: white;
+            border-radius: 8px;
+            font-size: 14px;
+            font-weight: 500;
+            z-index: 9999;
+            display: flex;
+            align-items: center;
+            gap: 12px;
+          `;
+          loadingNotif.innerHTML = `<span style="font-size:18px;animation:spin 1s linear infinite">⏳</span>Accepting order...`;
+          document.body.appendChild(loadingNotif);
+
+          fetch('/api/rider/accept-order', {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ shipment_id: shipmentId })
+          })
+          .then(response => response.json())
+          .then(data => {
+            loadingNotif.remove();
+
+            if (data.success) {
+              showStatusNotification('📦', 'Order Accepted', 'You can now start the delivery!', 'success');
+              setTimeout(() => {
+                loadAvailableOrders();
+                loadMyActiveDeliveries();
+              }, 500);
+            } else {
+              showStatusNotification('❌', 'Failed to Accept', data.error || 'Unknown error', 'error');
+            }
+          })
+          .catch(error => {
+            loadingNotif.remove();
+            console.error('Error accepting order:', error);
+            showStatusNotification('❌', 'Error', 'Connection failed. Please try again.', 'error');
+          });
+        });
+      }
+
+
+      function showStatusNotification(statusEmoji, statusLabel, message, type = 'success') {
+        const notification = document.createElement('div');
+        notification.style.cssText = `
+          position: fixed;
+          top: 20px;
+          right: 20px;
+          padding: 16px 24px;
+          background: ${type === 'success' ? '#10b981' : type === 'error' ? '#ef4444' : '#3b82f6'};
+          color: white;
+          border-radius: 8px;
+          box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+          font-size: 14px;
+          font-weight: 500;
+          z-index: 9999;
+          animation: slideIn 0.3s ease;
+          display: flex;
+          align-items: center;
+          gap: 12px;
+          max-width: 400px;
+        `;
+        notification.innerHTML = `<span style="font-size:20px">${statusEmoji}</span><div><strong>${statusLabel}</strong><br/>${message}</div>`;
+        document.body.appendChild(notification);
+
+        setTimeout(() => {
+          notification.style.animation = 'slideOut 0.3s ease';
+          setTimeout(() => notification.remove(), 300);
+        }, 4000);
+      }
+
+      function updateDeliveryStatus(shipmentId, newStatus) {
+        if (!newStatus) return;
+
+        const statusConfig = {
+          'picked_up': { emoji: '📦', label: 'Picked Up', message: 'You have picked up the order' },
+          'in_transit': { emoji: '🚗', label: 'In Transit', message: 'On the way to delivery location' },
+          'out_for_delivery': { emoji: '🚪', label: 'Out for Delivery', message: 'You have arrived at the delivery location' },
+          'delivered': { emoji: '✅', label: 'Delivered', message: 'Order successfully delivered! 🎉' }
+        };
+
+        const config = statusConfig[newStatus] || { emoji: '📋', label: newStatus, message: 'Status updated' };
+
+        // POD flow: intercept 'delivered' with photo upload modal
+        if (newStatus === 'delivered') {
+          showProofOfDeliveryModal(shipmentId);
+          return;
+        }
+
+        // Show confirmation modal for all other status transitions
+        const confirmModal = document.createElement('div');
+        confirmModal.style.cssText = `
+          position: fixed;
+          inset: 0;
+          background: rgba(10,10,10,0.5);
+          display: flex;
+          align-items: center;
+          justify-content: center;
+          z-index: 8000;
+          animation: fadeIn 0.2s ease;
+        `;
+        confirmModal.innerHTML = `
+          <div style="background:#fff;border-radius:12px;padding:24px;max-width:380px;width:90%;box-shadow:0 20px 45px rgba(0,0,0,0.25);text-align:center">
+            <div style="font-size:40px;margin-bottom:12px">${config.emoji}</div>
+            <h2 style="margin:0 0 8px;font-size:20px;color:#0a0a0a">Mark as ${config.label}?</h2>
+            <p style="margin:0 0 20px;color:#666;font-size:14px">${config.message}</p>
+            <div style="display:flex;gap:10px;justify-content:center">
+              <button id="cancelStatusBtn" style="padding:10px 20px;border:1px solid #ddd;background:#f3f4f6;color:#0a0a0a;border-radius:8px;font-weight:600;cursor:pointer;transition:all 0.2s">Cancel</button>
+              <button id="confirmStatusBtn" style="padding:10px 20px;border:none;background:#10b981;color:#fff;border-radius:8px;font-weight:600;cursor:pointer;transition:all 0.2s">Confirm</button>
+            </div>
+          </div>
+        `;
+        document.body.appendChild(confirmModal);
+
+        document.getElementById('cancelStatusBtn').addEventListener('click', () => {
+          confirmModal.remove();
+        });
+
+        document.getElementById('confirmStatusBtn').addEventListener('click', () => {
+          confirmModal.remove();
+
+          const loadingNotif = document.createElement('div');
+          loadingNotif.style.cssText = `
+            position: fixed;
+            top: 20px;
+            right: 20px;
+            padding: 16px 24px;
+            background: #3b82f6;
+            color: white;
+            border-radius: 8px;
+            font-size: 14px;
+            font-weight: 500;
+            z-index: 9999;
+            display: flex;
+            align-items: center;
+            gap: 12px;
+          `;
+          loadingNotif.innerHTML = `<span style="font-size:18px;animation:spin 1s linear infinite">⏳</span>Updating status...`;
+          document.body.appendChild(loadingNotif);
+
+          fetch('/api/rider/update-delivery-status', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ shipment_id: shipmentId, status: newStatus })
+          })
+          .then(response => response.json())
+          .then(data => {
+            loadingNotif.remove();
+            if (data.success) {
+              showStatusNotification(config.emoji, config.label, config.message, 'success');
+              setTimeout(() => { loadMyActiveDeliveries(); }, 500);
+            } else {
+              showStatusNotification('❌', 'Error', data.error || 'Failed to update status', 'error');
+            }
+          })
+          .catch(error => {
+            loadingNotif.remove();
+            console.error('Error updating status:', error);
+            showStatusNotification('❌', 'Error', 'Connection failed. Please try again.', 'error');
+          });
+        });
+      }
+
+      function showProofOfDeliveryModal(shipmentId) {
+        const modal = document.createElement('div');
+        modal.id = 'podModal';
+        modal.style.cssText = `
+          position: fixed;
+          inset: 0;
+          background: rgba(10,10,10,0.6);
+          display: flex;
+          align-items: center;
+          justify-content: center;
+          z-index: 8000;
+          animation: fadeIn 0.2s ease;
+          padding: 16px;
+        `;
+        modal.innerHTML = `
+          <div style="background:#fff;border-radius:16px;padding:28px 24px;max-width:420px;width:100%;box-shadow:0 24px 60px rgba(0,0,0,0.3);">
+            <div style="text-align:center;margin-bottom:20px">
+              <div style="font-size:44px;margin-bottom:8px">📸</div>
+              <h2 style="margin:0 0 6px;font-size:20px;color:#0a0a0a;font-weight:700">Proof of Delivery</h2>
+              <p style="margin:0;color:#6b7280;font-size:14px">Take a photo to confirm successful delivery</p>
+            </div>
+
+            <div id="podPhotoArea" style="border:2px dashed #d1d5db;border-radius:12px;padding:20px;text-align:center;cursor:pointer;margin-bottom:16px;transition:border-color 0.2s;background:#f9fafb" onclick="document.getElementById('podPhotoInput').click()">
+              <img id="podPhotoPreview" src="" alt="" style="display:none;max-height:180px;max-width:100%;border-radius:8px;object-fit:cover;margin-bottom:8px" />
+              <div id="podPhotoPlaceholder">
+                <div style="font-size:32px;margin-bottom:8px">📷</div>
+                <p style="margin:0;font-size:14px;color:#6b7280;font-weight:500">Tap to take / upload photo</p>
+                <p style="margin:4px 0 0;font-size:12px;color:#9ca3af">Required — max 10MB</p>
+              </div>
+            </div>
+            <input type="file" id="podPhotoInput" accept="image/*" capture="environment" style="display:none" />
+
+            <div style="margin-bottom:20px">
+              <label style="display:block;font-size:13px;font-weight:600;color:#374151;margin-bottom:6px">Delivery Notes <span style="font-weight:400;color:#9ca3af">(optional)</span></label>
+              <textarea id="podNotes" rows="3" placeholder="e.g. Left with guard, Package in good condition…" style="width:100%;padding:10px 12px;border:1.5px solid #e5e7eb;border-radius:8px;font-size:14px;resize:none;outline:none;transition:border-color 0.2s;box-sizing:border-box;font-family:inherit" onfocus="this.style.borderColor='#10b981'" onblur="this.style.borderColor='#e5e7eb'"></textarea>
+            </div>
+
+            <div style="display:flex;gap:10px">
+              <button id="podCancelBtn" style="flex:1;padding:12px;border:1.5px solid #e5e7eb;background:#f9fafb;color:#374151;border-radius:10px;font-weight:600;font-size:15px;cursor:pointer;transition:all 0.2s" onmouseover="this.style.background='#f3f4f6'" onmouseout="this.style.background='#f9fafb'">Cancel</button>
+              <button id="podSubmitBtn" style="flex:2;padding:12px;border:none;background:#10b981;color:#fff;border-radius:10px;font-weight:700;font-size:15px;cursor:pointer;transition:all 0.2s" onmouseover="this.style.background='#059669'" onmouseout="this.style.background='#10b981'">✅ Confirm Delivery</button>
+            </div>
+          </div>
+        `;
+        document.body.appendChild(modal);
+
+        const photoInput = document.getElementById('podPhotoInput');
+        const photoPreview = document.getElementById('podPhotoPreview');
+        const photoPlaceholder = document.getElementById('podPhotoPlaceholder');
+        const photoArea = document.getElementById('podPhotoArea');
+
+        photoInput.addEventListener('change', () => {
+          const file = photoInput.files[0];
+          if (!file) return;
+          if (file.size > 10 * 1024 * 1024) {
+            showStatusNotification('❌', 'File Too Large', 'Photo must be under 10MB', 'error');
+            photoInput.value = '';
+            return;
+          }
+          const reader = new FileReader();
+          reader.onload = e => {
+            photoPreview.src = e.target.result;
+            photoPreview.style.display = 'block';
+            photoPlaceholder.style.display = 'none';
+            photoArea.style.borderColor = '#10b981';
+            photoArea.style.background = '#f0fdf4';
+          };
+          reader.readAsDataURL(file);
+        });
+
+        document.getElementById('podCancelBtn').addEventListener('click', () => {
+          modal.remove();
+        });
+
+        document.getElementById('podSubmitBtn').addEventListener('click', () => {
+          const file = photoInput.files[0];
+          if (!file) {
+            photoArea.style.borderColor = '#ef4444';
+            photoArea.style.animation = 'shake 0.3s ease';
+            showStatusNotification('📷', 'Photo Required', 'Please take or upload a delivery photo', 'error');
+            setTimeout(() => { photoArea.style.borderColor = '#d1d5db'; photoArea.style.animation = ''; }, 1000);
+            return;
+          }
+
+          const notes = document.getElementById('podNotes').value.trim();
+          const submitBtn = document.getElementById('podSubmitBtn');
+          submitBtn.disabled = true;
+          submitBtn.textContent = '⏳ Submitting...';
+          submitBtn.style.background = '#6b7280';
+
+          const formData = new FormData();
+          formData.append('shipment_id', shipmentId);
+          formData.append('photo', file);
+          if (notes) formData.append('notes', notes);
+
+          fetch('/api/rider/proof-of-delivery', {
+            method: 'POST',
+            body: formData
+          })
+          .then(r => r.json())
+          .then(data => {
+            modal.remove();
+            if (data.success) {
+              showStatusNotification('✅', 'Delivered!', 'Proof of delivery submitted successfully 🎉', 'success');
+              setTimeout(() => {
+                loadMyActiveDeliveries();
+                loadDeliveryHistory();
+              }, 500);
+            } else {
+              showStatusNotification('❌', 'Error', data.error || 'Failed to submit proof of delivery', 'error');
+            }
+          })
+          .catch(err => {
+            modal.remove();
+            console.error('POD submit error:', err);
+            showStatusNotification('❌', 'Error', 'Connection failed. Please try again.', 'error');
+          });
+        });
+      }
+
+      // Add CSS animations
+      if (!document.querySelector('style[data-rider-animations]')) {
+        const style = document.createElement('style');
+        style.setAttribute('data-rider-animations', '');
+        style.textContent = `
+          @keyframes slideIn {
+            from { transform: translateX(400px); opacity: 0; }
+            to { transform: translateX(0); opacity: 1; }
+          }
+          @keyframes slideOut {
+            from { transform: translateX(0); opacity: 1; }
+            to { transform: translateX(400px); opacity: 0; }
+          }
+          @keyframes fadeIn {
+            from { opacity: 0; }
+            to { opacity: 1; }
+          }
+          @keyframes spin {
+            to { transform: rotate(360deg); }
+          }
+          @keyframes shake {
+            0%,100% { transform: translateX(0); }
+            25% { transform: translateX(-6px); }
+            75% { transform: translateX(6px); }
+          }
+        `;
+        document.head.appendChild(style);
+      }
+
+
+      function viewShipmentDetails(shipmentId, orderNumber) {
+
+        fetch('/api/rider/shipment-details/' + shipmentId)
+          .then(response => response.json())
+          .then(data => {
+            if (data.success && data.shipment) {
+              const s = data.shipment;
+
+
+              const statusDescriptions = {
+                'pending': { text: 'Pending', emoji: '⏳', color: '#f59e0b', description: 'Seller has not confirmed yet' },
+                'assigned_to_rider': { text: 'Assigned', emoji: '📍', color: '#3b82f6', description: 'Assigned to you, waiting for acceptance' },
+                'picked_up': { text: 'Picked Up', emoji: '📦', color: '#3b82f6', description: 'You have picked up the order' },
+                'in_transit': { text: 'In Transit', emoji: '🚗', color: '#8b5cf6', description: 'On the way to delivery location' },
+                'out_for_delivery': { text: 'Out for Delivery', emoji: '🚪', color: '#ec4899', description: 'At delivery location, finalizing' },
+                'delivered': { text: 'Delivered', emoji: '✅', color: '#10b981', description: 'Successfully delivered' },
+                'failed': { text: 'Failed', emoji: '❌', color: '#ef4444', description: 'Delivery could not be completed' }
+              };
+
+              const currentStatus = statusDescriptions[s.status] || {
+                text: s.status.replace('_', ' ').toUpperCase(),
+                emoji: '📋',
+                color: '#6b7280',
+                description: 'Current status'
+              };
+
+
+              let timeline = '';
+              const statuses = ['pending', 'assigned_to_rider', 'picked_up', 'in_transit', 'out_for_delivery', 'delivered'];
+              const currentIndex = statuses.indexOf(s.status);
+
+              statuses.forEach((status, index) => {
+                const statusInfo = statusDescriptions[status];
+                const isCompleted = index <= currentIndex;
+                const isCurrent = index === currentIndex;
+                const bgColor = isCompleted ? statusInfo.color : '#e5e7eb';
+                const textColor = isCompleted ? '#fff' : '#6b7280';
+
+                timeline += `
+                  <div style="display:flex;align-items:center;gap:12px;margin-bottom:12px">
+                    <div style="width:8px;height:8px;border-radius:999px;background:${bgColor};flex-shrink:0;border:2px solid ${isCurrent ? statusInfo.color : 'transparent'}"></div>
+                    <div>
+                      <div style="font-weight:600;color:${isCurrent ? statusInfo.color : '#0a0a0a'};font-size:13px">${statusInfo.emoji} ${statusInfo.text}</div>
+                      <div style="font-size:12px;color:#666;margin-top:2px">${statusInfo.description}</div>
+                    </div>
+                  </div>
+                `;
+              });
+
+              const details = `
+📦 SHIPMENT STATUS DETAILS
+═══════════════════════════════════
+
+Order #: ${orderNumber}
+Shipment ID: ${shipmentId}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Customer: ${s.customer_name || 'N/A'}
+Delivery Address: ${s.delivery_address || 'N/A'}
+📍 Location: ${s.delivery_city}, ${s.delivery_province}
+
+Amount: ₱${parseFloat(s.total_amount || 0).toFixed(2)}
+Your Earning (15%): ₱${(parseFloat(s.total_amount || 0) * 0.15).toFixed(2)}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Current Status: ${currentStatus.emoji} ${currentStatus.text}
+
+Delivery Timeline:
+${timeline}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+${s.created_at ? `Created: ${formatDateTime(s.created_at)}` : ''}
+${s.updated_at ? `Last Updated: ${formatDateTime(s.updated_at)}` : ''}
+              `;
+
+              alert(details);
+            } else {
+              alert('Unable to load shipment details. Please try again.');
+            }
+          })
+          .catch(error => {
+            console.error('Error fetching shipment details:', error);
+            alert('Error loading shipment details. Please try again.');
+          });
+      }
+
+
+      function loadDeliveryHistory() {
+        fetch('/api/rider/delivery-history')
+          .then(response => response.json())
+          .then(data => {
+            const tbody = document.querySelector('#history-table tbody');
+            if (data.success && data.history && data.history.length > 0) {
+              tbody.innerHTML = data.history.map((delivery) => {
+                const deliveredDate = delivery.delivered_at ? formatDateTime(delivery.delivered_at) : 'N/A';
+                const earning = (parseFloat(delivery.total_amount) * 0.15).toFixed(2);
+                const location = `${delivery.city}, ${delivery.province}`.trim();
+
+                return `
+                  <tr style="border-left:4px solid #10b981;background:#f0fdf4">
+                    <td>
+                      <div style="font-weight:600;color:#0a0a0a">#${delivery.order_number}</div>
+                      <div style="font-size:11px;color:#999">${deliveredDate}</div>
+                    </td>
+                    <td>
+                      <div style="color:#0a0a0a;font-weight:500">${delivery.customer_name || 'N/A'}</div>
+                      <div style="font-size:11px;color:#999">${delivery.customer_phone || 'N/A'}</div>
+                    </td>
+                    <td style="color:#10b981;font-weight:600;font-size:14px">₱${earning}</td>
+                    <td>
+                      <div style="display:flex;align-items:center;gap:6px">
+                        <span style="background:#dcfce7;color:#15803d;padding:4px 8px;border-radius:4px;font-size:11px;font-weight:600">✓ Delivered</span>
+                      </div>
+                      <div style="font-size:10px;color:#666;margin-top:4px">📍 ${location}</div>
+                    </td>
+                    <td style="text-align:center">
+                      <button onclick="viewDeliveredOrderDetails(${delivery.id}, '${delivery.order_number}', '${delivery.customer_name}', ${delivery.total_amount}, '${deliveredDate}')" class="tag" style="background:#10b981;color:#fff;border:none;cursor:pointer;padding:6px 12px;border-radius:6px;font-size:11px;font-weight:600;transition:all 0.2s" onmouseover="this.style.background='#059669'" onmouseout="this.style.background='#10b981'">View</button>
+                    </td>
+                  </tr>
+                `;
+              }).join('');
+            } else {
+              tbody.innerHTML = '<tr><td colspan="5" style="text-align:center;color:#999;padding:20px">No delivery history found</td></tr>';
+            }
+          })
+          .catch(error => {
+            console.error('Error loading delivery history:', error);
+            document.querySelector('#history-table tbody').innerHTML = '<tr><td colspan="5" style="text-align:center;color:#ef4444;padding:20px">Error loading history</td></tr>';
+          });
+      }
+
+
+      function viewDeliveredOrderDetails(orderId, orderNumber, customerName, totalAmount, deliveredDate) {
+        const earning = (parseFloat(totalAmount) * 0.15).toFixed(2);
+        const details = `
+📦 ORDER #${orderNumber}
+━━━━━━━━━━━━━━━━━━━━━━━━
+Customer: ${customerName}
+Total Amount: ₱${parseFloat(totalAmount).toFixed(2)}
+Your Earnings (15%): ₱${earning}
+Delivered On: ${deliveredDate}
+Status: ✓ Delivered
+        `;
+        alert(details);
+      }
+
+
+      function viewHistoryDetails(index, date, orderCount, earnings) {
+        const details = `
+Delivery Date: ${date}
+Total Deliveries: ${orderCount}
+Daily Earnings: ₱${parseFloat(earnings).toFixed(2)}
+        `;
+        alert(details);
+      }
+
+
+      function updateHistoryRecord(index, date) {
+        alert('Edit delivery record for ' + date + '\n(To be implemented)');
+      }
+
+
+      function loadEarnings() {
+        fetch('/api/rider/earnings')
+          .then(response => response.json())
+          .then(data => {
+            if (data.success) {
+
+              document.getElementById('weekly-earnings').textContent = '₱' + parseFloat(data.weekly_earnings).toFixed(2);
+              document.getElementById('monthly-earnings').textContent = '₱' + parseFloat(data.monthly_earnings).toFixed(2);
+
+
+              const tbody = document.querySelector('#earnings-breakdown-table tbody');
+              tbody.innerHTML = `
+                <tr>
+                  <td>Base Fare</td>
+                  <td>₱${parseFloat(data.breakdown.base_fare).toFixed(2)}</td>
+                  <td>70%</td>
+                </tr>
+                <tr>
+                  <td>Tips</td>
+                  <td>₱${parseFloat(data.breakdown.tips).toFixed(2)}</td>
+                  <td>20%</td>
+                </tr>
+                <tr>
+                  <td>Bonuses</td>
+                  <td>₱${parseFloat(data.breakdown.bonuses).toFixed(2)}</td>
+                  <td>10%</td>
+                </tr>
+              `;
+            } else {
+              document.querySelector('#earnings-breakdown-table tbody').innerHTML = '<tr><td colspan="3" style="text-align:center;color:#999">No earnings data available</td></tr>';
+            }
+          })
+          .catch(error => {
+            console.error('Error loading earnings:', error);
+            document.querySelector('#earnings-breakdown-table tbody').innerHTML = '<tr><td colspan="3" style="text-align:center;color:#ef4444">Error loading earnings</td></tr>';
+          });
+      }
+
+
+      function loadRatings() {
+        fetch('/api/rider/rating-stats')
+          .then(response => response.json())
+          .then(data => {
+            if (data.success) {
+              // Update overview rating card
+              const ratingValue = parseFloat(data.avg_rating).toFixed(1);
+              const ratingCards = document.querySelectorAll('.card .inner');
+              ratingCards.forEach(card => {
+                const metric = card.querySelector('.metric');
+                if (metric && metric.textContent.includes('Rating')) {
+                  card.querySelector('.value').textContent = ratingValue;
+                }
+              });
+
+              // Update ratings section if it exists
+              const overallRatingEl = document.getElementById('overall-rating');
+              if (overallRatingEl) {
+                overallRatingEl.textContent = ratingValue;
+              }
+
+              const fullStars = Math.floor(data.avg_rating);
+              const stars = '⭐'.repeat(fullStars);
+              const ratingStarsEl = document.getElementById('rating-stars');
+              if (ratingStarsEl) {
+                ratingStarsEl.textContent = stars;
+              }
+
+              const ratingCountEl = document.getElementById('rating-count');
+              if (ratingCountEl) {
+                ratingCountEl.textContent = `(${data.total_ratings} ratings)`;
+              }
+
+              // Update rating breakdown if section exists
+              const breakdownEl = document.getElementById('rating-breakdown');
+              if (breakdownEl && data.rating_breakdown) {
+                const breakdown = data.rating_breakdown;
+                const total = data.total_ratings;
+                let breakdownHTML = '<div style="margin-top: 20px;">';
+                for (let i = 5; i >= 1; i--) {
+                  const count = breakdown[i.toString()] || 0;
+                  const percentage = total > 0 ? (count / total * 100).toFixed(0) : 0;
+                  breakdownHTML += `
+                    <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 8px;">
+                      <span style="width: 60px;">${i} star${i > 1 ? 's' : ''}</span>
+                      <div style="flex: 1; background: #e5e7eb; border-radius: 4px; height: 8px; overflow: hidden;">
+                        <div style="background: #fbbf24; height: 100%; width: ${percentage}%;"></div>
+                      </div>
+                      <span style="width: 50px; text-align: right; color: #6b7280;">${count}</span>
+                    </div>
+                  `;
+                }
+                breakdownHTML += '</div>';
+                breakdownEl.innerHTML = breakdownHTML;
+              }
+
+              renderReviewsTable(data.reviews || []);
+            }
+          })
+          .catch(error => {
+            console.error('Error loading ratings:', error);
+            renderReviewsTable(null, true);
+          });
+      }
+
+      function renderReviewsTable(reviews, hasError = false) {
+        const reviewsTableBody = document.querySelector('#reviews-table tbody');
+        if (!reviewsTableBody) {
+          return;
+        }
+
+        if (hasError) {
+          reviewsTableBody.innerHTML = '<tr><td colspan="4" style="text-align:center;color:#ef4444">Error loading reviews</td></tr>';
+          return;
+        }
+
+        if (!reviews || reviews.length === 0) {
+          reviewsTableBody.innerHTML = '<tr><td colspan="4" style="text-align:center;color:#999">No reviews yet</td></tr>';
+          return;
+        }
+
+        let html = '';
+        reviews.forEach(review => {
+          const formattedDate = review.created_at ? formatDateTime(review.created_at) : '—';
+          const stars = '⭐'.repeat(Math.max(1, Math.round(review.rating || 0)));
+          html += `
+            <tr>
+              <td>${formattedDate}</td>
+              <td>${review.customer_name || 'Customer'}</td>
+              <td>${stars}</td>
+              <td>${review.comment || 'No comment provided'}</td>
+            </tr>
+          `;
+        });
+
+        reviewsTableBody.innerHTML = html;
+      }
+
+
+      const regionProvinces = {
+        'North Luzon': [
+          'Ilocos Norte', 'Ilocos Sur', 'La Union', 'Pangasinan',
+          'Baguio City', 'Benguet', 'Abra', 'Kalinga', 'Apayao', 'Mountain Province',
+          'Cagayan', 'Isabela', 'Nueva Vizcaya', 'Quirino', 'Batanes'
+        ],
+        'Central Luzon': [
+          'Pampanga', 'Tarlac', 'Nueva Ecija', 'Zambales', 'Bataan',
+          'Bulacan', 'Aurora', 'Angeles City', 'Olongapo City', 'San Fernando City'
+        ],
+        'South Luzon': [
+          'Laguna', 'Batangas', 'Cavite', 'Rizal', 'Quezon',
+          'Antipolo City', 'Lucena City', 'Batangas City', 'Lipa City', 'Tagaytay City',
+          'Calamba City', 'Los Baños', 'Biñan City', 'Cabuyao', 'San Pablo City',
+          'Albay', 'Camarines Norte', 'Camarines Sur', 'Catanduanes', 'Masbate', 'Sorsogon',
+          'Marinduque', 'Occidental Mindoro', 'Oriental Mindoro', 'Palawan', 'Romblon',
+          'Manila', 'Quezon City', 'Makati', 'Pasig', 'Taguig', 'Mandaluyong',
+          'Marikina', 'Pasay', 'Parañaque', 'Las Piñas', 'Muntinlupa', 'Caloocan',
+          'Malabon', 'Navotas', 'Valenzuela', 'San Juan'
+        ],
+        'Visayas': [
+          'Cebu', 'Cebu City', 'Mandaue City', 'Lapu-Lapu City', 'Talisay City',
+          'Iloilo', 'Iloilo City', 'Bacolod City', 'Negros Occidental', 'Negros Oriental',
+          'Bohol', 'Tagbilaran City', 'Dumaguete City', 'Roxas City', 'Kalibo',
+          'Tacloban City', 'Ormoc City', 'Leyte', 'Samar', 'Eastern Samar', 'Northern Samar',
+          'Biliran', 'Southern Leyte'
+        ],
+        'Mindanao': [
+          'Davao City', 'Davao del Norte', 'Davao del Sur', 'Davao Oriental', 'Davao de Oro',
+          'Cagayan de Oro City', 'Misamis Oriental', 'Misamis Occidental', 'Iligan City',
+          'Zamboanga City', 'Zamboanga del Norte', 'Zamboanga del Sur', 'Zamboanga Sibugay',
+          'General Santos City', 'South Cotabato', 'North Cotabato', 'Sultan Kudarat',
+          'Butuan City', 'Agusan del Norte', 'Agusan del Sur', 'Surigao del Norte', 'Surigao del Sur',
+          'Cotabato City', 'Maguindanao', 'Lanao del Norte', 'Lanao del Sur', 'Marawi City',
+          'Bukidnon', 'Valencia City', 'Malaybalay City'
+        ]
+      };
+
+
+      function updateCoverageDetails() {
+        const serviceAreaText = window.RIDER_SERVICE_AREA || 'South Luzon';
+        console.log('Updating coverage details for:', serviceAreaText);
+
+
+        const serviceAreaParts = serviceAreaText.split(',').map(part => part.trim());
+        const mainRegion = serviceAreaParts[0];
+
+
+        let coverageText = 'Covering: ';
+
+
+        const allRegionProvinces = regionProvinces[mainRegion] || [];
+
+        if (allRegionProvinces.length > 0) {
+
+          coverageText += allRegionProvinces.join(', ');
+        } else {
+
+          coverageText += mainRegion;
+        }
+
+
+        const coverageDescription = document.getElementById('coverage-description');
+        if (coverageDescription) {
+          coverageDescription.textContent = coverageText;
+        }
+      }
+
+
+      function toggleEditMode() {
+        const viewMode = document.getElementById('profileViewMode');
+        const editMode = document.getElementById('profileEditMode');
+        const editBtn = document.getElementById('editProfileBtn');
+
+        if (editMode.style.display === 'none') {
+
+          viewMode.style.display = 'none';
+          editMode.style.display = 'block';
+          editBtn.textContent = '✕ Cancel';
+          editBtn.style.background = '#ef4444';
+        } else {
+
+          viewMode.style.display = 'block';
+          editMode.style.display = 'none';
+          editBtn.textContent = '✎ Edit Profile';
+          editBtn.style.background = '#0a0a0a';
+        }
+      }
+
+
+      function saveProfileChanges() {
+        const firstName = document.getElementById('editFirstName').value.trim();
+        const lastName = document.getElementById('editLastName').value.trim();
+        const email = document.getElementById('editEmail').value.trim();
+        const phone = document.getElementById('editPhone').value.trim();
+        const vehicleType = document.getElementById('editVehicle').value;
+        const licenseNumber = document.getElementById('editLicense').value.trim();
+
+
+        if (!firstName || !lastName) {
+          alert('Please enter both first and last name');
+          return;
+        }
+
+        if (!email) {
+          alert('Please enter email address');
+          return;
+        }
+
+        if (!phone) {
+          alert('Please enter phone number');
+          return;
+        }
+
+
+        const button = event.target;
+        const originalText = button.textContent;
+        button.textContent = '⏳ Saving...';
+        button.disabled = true;
+
+
+        fetch('/api/rider/update-profile', {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json'
+          },
+          body: JSON.stringify({
+            first_name: firstName,
+            last_name: lastName,
+            email: email,
+            phone: phone,
+            vehicle_type: vehicleType,
+            license_number: licenseNumber
+          })
+        })
+        .then(response => response.json())
+        .then(data => {
+          button.textContent = originalText;
+          button.disabled = false;
+
+          if (data.success) {
+
+            document.getElementById('viewFirstName').textContent = firstName;
+            document.getElementById('viewLastName').textContent = lastName;
+            document.getElementById('viewEmail').textContent = email;
+            document.getElementById('viewPhone').textContent = phone;
+            document.getElementById('viewVehicle').textContent = vehicleType || 'Not specified';
+            document.getElementById('viewLicense').textContent = licenseNumber || 'Not provided';
+            document.getElementById('viewRiderName').textContent = firstName + ' ' + lastName;
+
+            alert('✓ Profile updated successfully!');
+            toggleEditMode();
+          } else {
+            alert('Error: ' + (data.error || 'Failed to update profile'));
+          }
+        })
+        .catch(error => {
+          console.error('Error saving profile:', error);
+          button.textContent = originalText;
+          button.disabled = false;
+          alert('Error saving profile. Please try again.');
+        });
+      }
+
+
+      function openChangePasswordModal() {
+        document.getElementById('changePasswordModal').style.display = 'flex';
+      }
+
+
+      function closeChangePasswordModal() {
+        document.getElementById('changePasswordModal').style.display = 'none';
+        document.getElementById('changePasswordForm').reset();
+      }
+
+
+      function changePassword() {
+        const currentPassword = document.getElementById('currentPassword').value;
+        const newPassword = document.getElementById('newPassword').value;
+        const confirmPassword = document.getElementById('confirmPassword').value;
+
+        if (!currentPassword || !newPassword || !confirmPassword) {
+          alert('Please fill in all password fields');
+          return;
+        }
+
+        if (newPassword !== confirmPassword) {
+          alert('New passwords do not match');
+          return;
+        }
+
+        if (newPassword.length < 6) {
+          alert('Password must be at least 6 characters');
+          return;
+        }
+
+        const button = event.target;
+        const originalText = button.textContent;
+        button.textContent = '⏳ Updating...';
+        button.disabled = true;
+
+        fetch('/api/rider/change-password', {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json'
+          },
+          body: JSON.stringify({
+            current_password: currentPassword,
+            new_password: newPassword
+          })
+        })
+        .then(response => response.json())
+        .then(data => {
+          button.textContent = originalText;
+          button.disabled = false;
+
+          if (data.success) {
+            alert('✓ Password changed successfully!');
+            closeChangePasswordModal();
+          } else {
+            alert('Error: ' + (data.error || 'Failed to change password'));
+          }
+        })
+        .catch(error => {
+          console.error('Error changing password:', error);
+          button.textContent = originalText;
+          button.disabled = false;
+          alert('Error changing password. Please try again.');
+        });
+      }
+
+
+      function uploadProfileImage(input) {
+        if (!input.files || !input.files[0]) return;
+
+        const file = input.files[0];
+
+
+        if (!file.type.startsWith('image/')) {
+          alert('Please select a valid image file.');
+          return;
+        }
+
+
+        if (file.size > 5 * 1024 * 1024) {
+          alert('Image size must be less than 5MB.');
+          return;
+        }
+
+
+        const reader = new FileReader();
+        reader.onload = function(e) {
+          document.getElementById('profileImage').src = e.target.result;
+        };
+        reader.readAsDataURL(file);
+
+
+        const formData = new FormData();
+        formData.append('profile_image', file);
+
+        fetch('/api/rider/upload-profile-image', {
+          method: 'POST',
+          body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+          if (data.success) {
+            alert('Profile image updated successfully!');
+          } else {
+            alert('Failed to upload image: ' + (data.error || 'Unknown error'));
+
+            location.reload();
+          }
+        })
+        .catch(error => {
+          console.error('Error uploading image:', error);
+          alert('Error uploading image. Please try again.');
+
+          location.reload();
+        });
+      }
+
+
+      document.addEventListener('DOMContentLoaded', function() {
+
+        document.getElementById('overview-section').style.display = 'block';
+
+
+        updateCoverageDetails();
+
+
+        initializeMap();
+
+
+        loadDeliveryHistory();
+        loadEarnings();
+        loadRatings();
+
+
+        document.querySelectorAll('.show-section').forEach(link => {
+          link.addEventListener('click', function(e) {
+            e.preventDefault();
+            const section = this.getAttribute('data-section');
+            if (section) {
+              switchSection(section);
+            }
+          });
+        });
+
+
+        document.querySelectorAll('.side-link').forEach(link => {
+          link.addEventListener('click', function(e) {
+            e.preventDefault();
+
+
+            const onclickAttr = this.getAttribute('onclick');
+            if (onclickAttr) {
+
+              const match = onclickAttr.match(/switchSection\('(.+?)'\)/);
+              if (match && match[1]) {
+                switchSection(match[1]);
+              }
+            }
+          });
+        });
+
+        const activeModal = document.getElementById('activeDeliveryModal');
+        if (activeModal) {
+          activeModal.addEventListener('click', function(e) {
+            if (e.target === activeModal) {
+              closeActiveDeliveryModal();
+            }
+          });
+        }
+
+        document.addEventListener('keydown', function(e) {
+          if (e.key === 'Escape') {
+            closeActiveDeliveryModal();
+          }
+        });
+
+        updateActiveDeliveryNotifications([]);
+        loadDocumentStatuses();
+
+        const approvalModal = document.getElementById('riderApprovalModal');
+        if (approvalModal) {
+          approvalModal.style.display = 'flex';
+          const dismissBtn = document.getElementById('riderApprovalDismiss');
+          if (dismissBtn) {
+            dismissBtn.addEventListener('click', function() {
+              approvalModal.style.display = 'none';
+            });
+          }
+        }
+
+        console.log('Rider Dashboard initialized');
+      });
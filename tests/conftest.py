@@ -0,0 +1,25 @@
+"""
+Shared fixtures. Tests that need Postgres use ``bench_db``, which points at
+the same throwaway database as scripts/bench_common.py (BENCH_DATABASE_URL)
+and skips when it cannot be reached. Never point it at Supabase: the tests
+drop and recreate the tables they use.
+"""
+import os
+
+import psycopg2
+import pytest
+
+BENCH_DATABASE_URL = os.getenv('BENCH_DATABASE_URL', 'postgresql://postgres@localhost:5432/varon_bench')
+
+
+@pytest.fixture
+def bench_db():
+    """``(url, connection)`` for the benchmark database."""
+    try:
+        conn = psycopg2.connect(BENCH_DATABASE_URL, connect_timeout=3)
+    except psycopg2.OperationalError as err:
+        pytest.skip(f'BENCH_DATABASE_URL not reachable: {err}')
+    try:
+        yield BENCH_DATABASE_URL, conn
+    finally:
+        conn.close()
@@ -0,0 +1,134 @@
+"""
+Concurrent checkouts over shared SKUs, with the foreign keys production has.
+
+Each checkout runs the place_order write path: order row, order_items (whose
+foreign keys take FOR KEY SHARE on the product and variant rows),
+products.sales_count, then the stock holds. Any FOR UPDATE on those rows
+deadlocks against another checkout's share lock, so this fails on a single
+deadlock as well as on oversell.
+"""
+import random
+import threading
+
+import psycopg2
+import psycopg2.extras
+
+from utils.order_placement import add_sales_counts, insert_order_items
+from utils.stock_reservations import ensure_stock_reservations_table, reserve_stock
+
+PRODUCTS = 6
+VARIANTS_PER_PRODUCT = 2
+STOCK_PER_VARIANT = 15
+BUYERS = 8
+ATTEMPTS_PER_BUYER = 15
+
+SCHEMA_SQL = """
+DROP TABLE IF EXISTS stock_reservations, order_items, orders, inventory, product_variants, products CASCADE;
+CREATE TABLE products (id SERIAL PRIMARY KEY, name VARCHAR(200), sales_count INT DEFAULT 0);
+CREATE TABLE orders (id SERIAL PRIMARY KEY, user_id INT);
+CREATE TABLE product_variants (
+    id SERIAL PRIMARY KEY, product_id INT NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    size VARCHAR(20), color VARCHAR(50), stock_quantity INT
+);
+CREATE TABLE inventory (
+    id SERIAL PRIMARY KEY, product_id INT REFERENCES products(id) ON DELETE CASCADE,
+    variant_id INT REFERENCES product_variants(id) ON DELETE CASCADE, stock_quantity INT
+);
+CREATE TABLE order_items (
+    id SERIAL PRIMARY KEY,
+    order_id INT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INT NOT NULL REFERENCES products(id) ON DELETE RESTRICT,
+    variant_id INT REFERENCES product_variants(id) ON DELETE RESTRICT,
+    product_name VARCHAR(200), size VARCHAR(20), color VARCHAR(50),
+    quantity INT NOT NULL, unit_price NUMERIC(10,2), subtotal NUMERIC(10,2)
+);
+"""
+
+
+def seed(conn):
+    cursor = conn.cursor()
+    cursor.execute(SCHEMA_SQL)
+    ensure_stock_reservations_table(cursor)
+    cursor.execute("INSERT INTO products (name) SELECT 'Product ' || p FROM generate_series(1, %s) p", (PRODUCTS,))
+    cursor.execute("""
+        INSERT INTO product_variants (product_id, size, color, stock_quantity)
+        SELECT p, 'S' || v, 'Black', %s FROM generate_series(1, %s) p, generate_series(1, %s) v ORDER BY p, v
+    """, (STOCK_PER_VARIANT, PRODUCTS, VARIANTS_PER_PRODUCT))
+    cursor.execute('SELECT id, product_id FROM product_variants ORDER BY id')
+    variants = cursor.fetchall()
+    conn.commit()
+    cursor.close()
+    return variants
+
+
+def test_concurrent_checkouts_neither_deadlock_nor_oversell(bench_db):
+    url, conn = bench_db
+    variants = seed(conn)
+    totals = {'placed': 0, 'units': 0, 'rejected': 0, 'deadlocks': 0}
+    lock = threading.Lock()
+    errors = []
+
+    def buyer(worker):
+        rng = random.Random(worker)
+        local = dict.fromkeys(totals, 0)
+        buyer_conn = psycopg2.connect(url)
+        cursor = buyer_conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        try:
+            cursor.execute("SET deadlock_timeout = '100ms'")
+            buyer_conn.commit()
+            for _ in range(ATTEMPTS_PER_BUYER):
+                lines = []
+                for variant_id, product_id in rng.sample(variants, 3):  # random line order
+                    lines.append({
+                        'product_id': product_id, 'variant_id': variant_id, 'product_name': 'p',
+                        'size': 'S', 'color': 'Black', 'quantity': rng.randint(1, 2),
+                        'unit_price': 10, 'subtotal': 10,
+                    })
+                try:
+                    cursor.execute('INSERT INTO orders (user_id) VALUES (%s) RETURNING id', (worker,))
+                    order_id = cursor.fetchone()['id']
+                    insert_order_items(cursor, order_id, lines)
+                    add_sales_counts(cursor, lines)
+                    ok, _short = reserve_stock(cursor, order_id, worker, lines, 3600)
+                    if ok:
+                        buyer_conn.commit()
+                        local['placed'] += 1
+                        local['units'] += sum(line['quantity'] for line in lines)
+                    else:
+                        buyer_conn.rollback()
+                        local['rejected'] += 1
+                except psycopg2.errors.DeadlockDetected:
+                    buyer_conn.rollback()
+                    local['deadlocks'] += 1
+        except Exception as err:
+            errors.append(err)
+        finally:
+            buyer_conn.close()
+            with lock:
+                for key, value in local.items():
+                    totals[key] += value
+
+    threads = [threading.Thread(target=buyer, args=(worker,)) for worker in range(BUYERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert totals['deadlocks'] == 0
+    assert totals['placed'] > 0 and totals['rejected'] > 0  # the stock really ran out
+
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM product_variants WHERE stock_quantity < 0')
+    assert cursor.fetchone()[0] == 0
+    cursor.execute('SELECT SUM(stock_quantity) FROM product_variants')
+    remaining = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(SUM(quantity), 0) FROM stock_reservations WHERE status = 'held'")
+    held = cursor.fetchone()[0]
+    cursor.execute('SELECT SUM(sales_count) FROM products')
+    sold = cursor.fetchone()[0]
+    assert held == sold == totals['units']
+    assert remaining + held == PRODUCTS * VARIANTS_PER_PRODUCT * STOCK_PER_VARIANT
+    cursor.execute('DROP TABLE IF EXISTS stock_reservations, order_items, orders, inventory, product_variants, products CASCADE')
+    conn.commit()
+    cursor.close()
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from utils.lookup_cache import LookupCache, SQLiteCacheStore, VersionStamps
+
+
+@pytest.fixture
+def shared_store(tmp_path):
+    return SQLiteCacheStore(str(tmp_path / 'lookup_cache.sqlite3'))
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LookupCache('t', ttl_seconds=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now the most recent
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats['evictions'] == 1
+
+
+def test_get_or_load_caches_values_but_not_none():
+    cache = LookupCache('t', ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None if len(calls) == 1 else 'value'
+
+    assert cache.get_or_load('k', loader) is None
+    assert cache.get_or_load('k', loader) == 'value'
+    assert cache.get_or_load('k', loader) == 'value'
+    assert len(calls) == 2
+    assert cache.stats['misses'] == 2 and cache.stats['hits'] == 1
+
+
+def test_stale_entry_is_served_while_one_background_refresh_runs():
+    cache = LookupCache('t', ttl_seconds=60, stale_seconds=60)
+    cache._remember('k', time.time() - 1, 'old')
+    release = threading.Event()
+    refreshed = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        refreshed.set()
+        return 'new'
+
+    assert cache.get_or_load('k', loader) == 'old'
+    assert cache.get_or_load('k', loader) == 'old'  # refresh already in flight: not started twice
+    release.set()
+    assert refreshed.wait(5)
+    for _ in range(500):
+        if cache.stats['refreshes']:
+            break
+        time.sleep(0.01)
+    assert cache.get('k') == 'new'
+    assert calls == ['cache-refresh-t']
+    assert cache.stats['stale_hits'] == 2 and cache.stats['refreshes'] == 1
+
+
+def test_background_refresh_enters_refresh_context_only_there():
+    entered = []
+
+    class Context:
+        def __enter__(self):
+            entered.append(threading.current_thread().name)
+
+        def __exit__(self, *exc):
+            return False
+
+    cache = LookupCache('t', ttl_seconds=60, stale_seconds=60, refresh_context=Context)
+    done = threading.Event()
+    assert cache.get_or_load('miss', lambda: 'loaded') == 'loaded'
+    assert entered == []
+
+    cache._remember('k', time.time() - 1, 'old')
+    cache.get_or_load('k', lambda: done.set() or 'new')
+    assert done.wait(5)
+    assert entered == ['cache-refresh-t']
+
+
+def test_entry_past_the_stale_window_is_loaded_inline():
+    cache = LookupCache('t', ttl_seconds=60, stale_seconds=1)
+    cache._remember('k', time.time() - 10, 'old')
+    assert cache.get_or_load('k', lambda: 'new') == 'new'
+    assert cache.stats['misses'] == 1 and cache.stats['stale_hits'] == 0
+
+
+def test_shared_tier_is_seen_by_another_process_cache(shared_store):
+    writer = LookupCache('t', ttl_seconds=60, shared_store=shared_store)
+    reader = LookupCache('t', ttl_seconds=60, shared_store=shared_store)
+    writer.set('k', {'v': 1})
+    assert reader.get('k') == {'v': 1}
+    assert reader.stats['shared_hits'] == 1
+    writer.delete('k')
+    assert LookupCache('t', ttl_seconds=60, shared_store=shared_store).get('k') is None
+
+
+def test_version_stamps_are_process_local_without_a_store():
+    stamps = VersionStamps('v')
+    assert stamps.get(7) == 0
+    stamps.bump(7)
+    stamps.bump('7')
+    assert stamps.get('7') == 2
+    assert VersionStamps('v').get(7) == 0
+
+
+def test_version_stamps_move_forward_for_every_worker(shared_store):
+    first = VersionStamps('v', shared_store)
+    second = VersionStamps('v', shared_store)
+    assert first.get('seller:1') == second.get('seller:1') == 0
+    first.bump('seller:1')
+    seen = second.get('seller:1')
+    assert seen > 0
+    second.bump('seller:1')
+    assert first.get('seller:1') > seen
+    assert first.get('seller:2') == 0
@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+import pytest
+
+from utils.product_search import decode_cursor, encode_cursor, parse_terms, prefix_tsquery
+
+
+@pytest.mark.parametrize('sort_value, product_id', [
+    (Decimal('0.123456'), 42),
+    (Decimal('0'), 1),
+    (987654, 987654),  # browse pages sort by id
+    (Decimal('-1.5'), 3),
+])
+def test_cursor_round_trips(sort_value, product_id):
+    token = encode_cursor(sort_value, product_id)
+    assert '=' not in token and '+' not in token and '/' not in token  # safe in a query string
+    assert decode_cursor(token) == (Decimal(str(sort_value)), product_id)
+
+
+@pytest.mark.parametrize('token', [
+    '',
+    'not-a-cursor',
+    encode_cursor('abc', 1),  # sort value is not a number
+    'WzEsMiwzXQ',  # [1,2,3]
+    'eyJhIjogMX0',  # {"a": 1}
+    'éééé',
+])
+def test_tampered_cursor_is_a_value_error(token):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(token)
+
+
+def test_terms_and_prefix_query():
+    terms = parse_terms("Men's  Linen-Jacket_XL!")
+    assert terms == ['men', 's', 'linen', 'jacket', 'xl']
+    assert prefix_tsquery(['red', 'shoe']) == 'red:* & shoe:*'
+    assert prefix_tsquery(['red'], 'A') == 'red:*A'
+    assert len(parse_terms(' '.join(f'w{i}' for i in range(20)))) == 8
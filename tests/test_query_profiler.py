@@ -0,0 +1,27 @@
+from utils.query_profiler import normalize_sql
+
+
+def test_literals_and_placeholders_become_question_marks():
+    sql = "SELECT * FROM orders WHERE id = 42 AND note = 'it''s' AND total > -3.5 AND user_id = %s"
+    assert normalize_sql(sql) == 'SELECT * FROM orders WHERE id = ? AND note = ? AND total > ? AND user_id = ?'
+
+
+def test_in_lists_collapse_regardless_of_length():
+    short = normalize_sql('SELECT 1 FROM t WHERE id IN (%s)')
+    long = normalize_sql('SELECT 1 FROM t WHERE id IN (%s, %s,%s ,  %s)')
+    named = normalize_sql('SELECT 1 FROM t WHERE id IN (%(a)s, %(b)s)')
+    assert short == long == named == 'SELECT ? FROM t WHERE id IN (?)'
+
+
+def test_whitespace_is_collapsed():
+    sql = """
+        SELECT a,
+               b
+        FROM t   WHERE x = %(x)s
+        LIMIT 10
+    """
+    assert normalize_sql(sql) == 'SELECT a, b FROM t WHERE x = ? LIMIT ?'
+
+
+def test_digits_inside_identifiers_are_kept():
+    assert normalize_sql('SELECT col1, t2.id FROM t2 WHERE $1 = 1') == 'SELECT col1, t2.id FROM t2 WHERE $1 = ?'
@@ -0,0 +1,227 @@
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR, TRANSACTION_STATUS_INTRANS
+
+from utils.request_db import RequestConnection, RequestConnectionStats, transaction_cursor
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        self.connection.log.append(sql)
+        if sql == 'fail':
+            self.connection.status = TRANSACTION_STATUS_INERROR
+        elif not sql.startswith(('RELEASE', 'ROLLBACK TO')):
+            self.connection.status = TRANSACTION_STATUS_INTRANS
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection to follow the lease state machine."""
+
+    def __init__(self):
+        self.log = []
+        self.status = TRANSACTION_STATUS_IDLE
+        self.closed = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def commit(self):
+        self.log.append('COMMIT')
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.log.append('ROLLBACK')
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def request_db():
+    connections = []
+
+    def checkout():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    owner = RequestConnection(checkout, RequestConnectionStats())
+    owner.checked_out = connections
+    return owner
+
+
+def test_every_lease_shares_one_checkout(request_db):
+    leases = [request_db.lease() for _ in range(3)]
+    for lease in leases:
+        lease.close()
+    assert len(request_db.checked_out) == 1
+    assert request_db.checkouts == 1 and request_db.leases == 3
+    assert request_db.stats.snapshot()['nested_leases'] == 0
+
+
+def test_failed_checkout_gives_no_lease():
+    owner = RequestConnection(lambda: None)
+    assert owner.lease() is None
+    assert owner.checkouts == 0
+
+
+def test_owning_lease_commits_and_rolls_back_for_real(request_db):
+    lease = request_db.lease()
+    lease.cursor().execute('INSERT 1')
+    lease.commit()
+    lease.cursor().execute('INSERT 2')
+    lease.rollback()
+    assert request_db.checked_out[0].log == ['INSERT 1', 'COMMIT', 'INSERT 2', 'ROLLBACK']
+
+
+def test_owning_lease_bare_close_rolls_back(request_db):
+    lease = request_db.lease()
+    lease.cursor().execute('INSERT 1')
+    lease.close()
+    lease.close()  # idempotent
+    assert request_db.checked_out[0].log == ['INSERT 1', 'ROLLBACK']
+    assert request_db.open_leases == 0
+
+
+def test_lease_taken_mid_transaction_runs_under_a_savepoint(request_db):
+    outer = request_db.lease()
+    outer.cursor().execute('SELECT 1')
+    inner = request_db.lease()
+    inner.cursor().execute('INSERT 1')
+    inner.rollback()
+    inner.close()
+    log = request_db.checked_out[0].log
+    assert log == [
+        'SELECT 1', 'SAVEPOINT request_lease_1', 'INSERT 1',
+        'ROLLBACK TO SAVEPOINT request_lease_1',
+        'ROLLBACK TO SAVEPOINT request_lease_1', 'RELEASE SAVEPOINT request_lease_1',
+    ]
+    assert request_db.stats.snapshot()['nested_leases'] == 1
+
+
+def test_nested_commit_waits_for_the_owning_commit(request_db):
+    outer = request_db.lease()
+    outer.cursor().execute('SELECT 1')
+    inner = request_db.lease()
+    inner.cursor().execute('INSERT 1')
+    inner.commit()
+    inner.close()
+    outer.commit()
+    log = request_db.checked_out[0].log
+    assert log[-1] == 'COMMIT'
+    assert log.count('COMMIT') == 1
+    assert 'RELEASE SAVEPOINT request_lease_1' in log
+
+
+def test_nested_commit_is_discarded_by_a_bare_owning_close(request_db):
+    outer = request_db.lease()
+    outer.cursor().execute('SELECT 1')
+    inner = request_db.lease()
+    inner.cursor().execute('INSERT 1')
+    inner.commit()
+    inner.close()
+    outer.close()
+    log = request_db.checked_out[0].log
+    assert 'COMMIT' not in log
+    assert log[-1] == 'ROLLBACK'
+
+
+def test_lease_taken_while_idle_owns_the_next_transaction(request_db):
+    first = request_db.lease()
+    second = request_db.lease()  # nothing open yet: no savepoint
+    second.cursor().execute('INSERT 1')
+    second.commit()
+    assert request_db.checked_out[0].log == ['INSERT 1', 'COMMIT']
+    first.close()
+
+
+def test_savepoint_lease_outliving_its_transaction_commits_for_real(request_db):
+    outer = request_db.lease()
+    outer.cursor().execute('SELECT 1')
+    inner = request_db.lease()
+    outer.commit()  # the savepoint is gone with the transaction
+    inner.cursor().execute('INSERT 1')
+    inner.commit()
+    assert request_db.checked_out[0].log[-2:] == ['INSERT 1', 'COMMIT']
+
+
+def test_aborted_transaction_is_rolled_back_for_the_next_lease(request_db):
+    first = request_db.lease()
+    first.cursor().execute('fail')
+    second = request_db.lease()
+    assert request_db.checked_out[0].log == ['fail', 'ROLLBACK']
+    second.cursor().execute('SELECT 1')
+    assert request_db.checked_out[0].log[-1] == 'SELECT 1'
+
+
+def test_release_rolls_back_and_returns_the_connection(request_db):
+    lease = request_db.lease()
+    lease.cursor().execute('INSERT 1')
+    request_db.release()
+    connection = request_db.checked_out[0]
+    assert connection.log == ['INSERT 1', 'ROLLBACK'] and connection.closed
+    stats = request_db.stats.snapshot()
+    assert stats['teardown_rollbacks'] == 1 and stats['unclosed_leases'] == 1
+
+    request_db.lease().close()  # a later get_db() checks out again
+    assert request_db.checkouts == 2
+
+
+def test_transaction_cursor_commits_or_rolls_back(request_db):
+    with transaction_cursor(request_db.lease()) as cursor:
+        cursor.execute('INSERT 1')
+    with pytest.raises(RuntimeError):
+        with transaction_cursor(request_db.lease()) as cursor:
+            cursor.execute('INSERT 2')
+            raise RuntimeError('boom')
+    assert request_db.checked_out[0].log == ['INSERT 1', 'COMMIT', 'INSERT 2', 'ROLLBACK']
+    assert request_db.open_leases == 0
+    with pytest.raises(ConnectionError):
+        with transaction_cursor(None):
+            pass
+
+
+def test_nested_commit_durability_on_postgres(bench_db):
+    url, admin = bench_db
+    cursor = admin.cursor()
+    cursor.execute('DROP TABLE IF EXISTS request_db_test; CREATE TABLE request_db_test (v INT)')
+    admin.commit()
+
+    def run(outer_commits):
+        owner = RequestConnection(lambda: psycopg2.connect(url))
+        outer = owner.lease()
+        outer.cursor().execute('SELECT 1')
+        inner = owner.lease()
+        inner.cursor().execute('INSERT INTO request_db_test VALUES (1)')
+        inner.commit()
+        inner.close()
+        if outer_commits:
+            outer.commit()
+        outer.close()
+        owner.release()
+        cursor.execute('SELECT COUNT(*) FROM request_db_test')
+        count = cursor.fetchone()[0]
+        admin.commit()
+        return count
+
+    try:
+        assert run(outer_commits=False) == 0
+        assert run(outer_commits=True) == 1
+    finally:
+        cursor.execute('DROP TABLE IF EXISTS request_db_test')
+        admin.commit()
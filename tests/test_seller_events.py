@@ -0,0 +1,37 @@
+import json
+
+from utils.seller_events import FOREIGN_CURSOR, RECENT_EVENTS_PER_SELLER, SellerEventHub
+
+
+def publish(hub, seller_id, kind='notification'):
+    hub.publish(json.dumps({'seller_id': seller_id, 'kind': kind}))
+
+
+def test_events_resume_from_this_hubs_ids():
+    hub = SellerEventHub(connect=None)
+    start = hub.resume_from(None)
+    publish(hub, 1)
+    publish(hub, 2)
+    publish(hub, 1, 'order_status')
+    cursor, events = hub.wait(1, start, timeout=0)
+    assert [event['kind'] for _, event in events] == ['notification', 'order_status']
+    assert hub.resume_from(hub.event_id(cursor)) == cursor
+    assert hub.wait(1, cursor, timeout=0) == (cursor, [])
+
+
+def test_ids_from_another_hub_get_an_explicit_resync():
+    hub, other = SellerEventHub(connect=None), SellerEventHub(connect=None)
+    publish(hub, 1)
+    for event_id in (other.event_id(1), '1', 'garbage', f'{hub.boot_id}-x'):
+        assert hub.resume_from(event_id) == FOREIGN_CURSOR
+    cursor, events = hub.wait(1, hub.resume_from(other.event_id(1)), timeout=0)
+    assert events == [(cursor, {'kind': 'resync', 'seller_id': 1})]
+
+
+def test_cursor_older_than_the_kept_events_gets_a_resync():
+    hub = SellerEventHub(connect=None)
+    start = hub.cursor()
+    for _ in range(RECENT_EVENTS_PER_SELLER + 1):
+        publish(hub, 1)
+    _, events = hub.wait(1, start, timeout=0)
+    assert [event['kind'] for _, event in events] == ['resync']
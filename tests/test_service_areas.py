@@ -0,0 +1,55 @@
+import pytest
+
+from utils.service_areas import address_in_service_area, area_key, compile_service_area
+
+
+@pytest.mark.parametrize('raw, key', [
+    ('Quezon City', 'quezon city'),  # a city named after a province keeps its suffix
+    ('Quezon', 'quezon'),
+    ('City of Makati', 'makati'),
+    ('Makati City', 'makati'),
+    ('  Las Piñas ', 'las pinas'),
+    ('Tawi-Tawi', 'tawi tawi'),
+    ('', ''),
+])
+def test_area_key(raw, key):
+    assert area_key(raw) == key
+
+
+@pytest.mark.parametrize('service_area, city, province, expected', [
+    # A region covers its provinces and cities.
+    ('Metro Manila', 'Makati City', 'Metro Manila', True),
+    ('Metro Manila', 'Quezon City', 'NCR, Second District', True),
+    ('NCR', 'Pasig', 'Metro Manila', True),
+    ('Metro Manila', 'Paranaque', '', True),
+    ('South Luzon', 'Lucena City', 'Quezon', True),
+    # ...but "Quezon" the province is not Quezon City, and vice versa.
+    ('South Luzon', 'Quezon City', 'Metro Manila', False),
+    ('Quezon City', 'Lucena City', 'Quezon', False),
+    ('Quezon', 'Quezon City', 'Metro Manila', False),
+    # Province names match as whole words inside a longer province field only.
+    ('Visayas', 'Dumaguete', 'Negros Oriental', True),
+    ('Mindanao', 'Davao City', 'Davao del Sur', True),
+    ('Cebu', 'Mandaue', 'Cebu', True),
+    ('Cebu', 'Mandaue', 'Cebuano Heights', False),
+    # Cities only match the city field.
+    ('Cotabato City', 'Kidapawan', 'Cotabato', False),
+    ('Cotabato City', 'Cotabato City', 'Maguindanao', True),
+    # Several comma-separated areas.
+    ('Bicol, Palawan', 'Puerto Princesa', 'Palawan', True),
+    ('Bicol, Palawan', 'Cebu City', 'Cebu', False),
+])
+def test_address_in_service_area(service_area, city, province, expected):
+    assert address_in_service_area(compile_service_area(service_area), city, province) is expected
+
+
+def test_empty_service_area_covers_nothing():
+    keys = compile_service_area('')
+    assert not keys
+    assert compile_service_area(' , ,') == keys
+    assert not address_in_service_area(keys, 'Makati', 'Metro Manila')
+
+
+def test_region_aliases_expand_to_the_same_keys():
+    assert compile_service_area('ncr') == compile_service_area('Metro Manila')
+    assert compile_service_area('National Capital Region') == compile_service_area('metro manila')
@@ -0,0 +1,81 @@
+"""
+Versioned per-user access-state cache for the ``before_request`` account gate.
+
+Every logged-in request used to check out a pooled connection to read the
+user's account status, restriction and ``session_version`` (plus the buyer
+approval status for buyers still waiting on approval). ``AccessStateCache``
+keeps those rows in a small in-process LRU with a short TTL so most requests
+never touch Postgres.
+
+Writes that change one of the cached columns call ``invalidate(user_id)``.
+That drops the local entry and bumps the user's ``VersionStamps`` entry in
+the shared SQLite store (the same one the lookup caches use), and every
+worker checks that stamp before trusting its own copy. So a ban,
+restriction, approval or forced logout takes effect on the next request in
+every worker, not after the TTL. Without a shared store the TTL bounds how
+long other workers can lag.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from utils.lookup_cache import VersionStamps
+
+
+class AccessStateCache:
+    """LRU of user access rows keyed by user_id, invalidated by version bumps."""
+
+    def __init__(self, ttl_seconds, max_entries=10000, shared_store=None, report_every=10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.report_every = report_every
+        self.versions = VersionStamps('access_state_version', shared_store)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get_or_load(self, user_id, loader):
+        """Return the access row for ``user_id``, calling ``loader()`` on a miss.
+
+        Rows are copied on the way in and out so callers may mutate them.
+        ``loader`` returning None (unknown user, DB down) is never cached.
+        """
+        version = self.versions.get(user_id)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] >= now and version is not None and entry[1] == version:
+                self._entries.move_to_end(user_id)
+                self._count('hits')
+                return dict(entry[2])
+            self._count('misses')
+
+        row = loader()
+        if row is None or version is None:
+            return row
+        with self._lock:
+            self._entries[user_id] = (now + self.ttl_seconds, version, dict(row))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return row
+
+    def invalidate(self, user_id):
+        """Forget ``user_id`` here and make every other worker reload it."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self.stats['invalidations'] += 1
+        self.versions.bump(user_id)
+
+    def hit_ratio(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / float(lookups) if lookups else 0.0
+
+    def _count(self, key):
+        # Caller holds self._lock.
+        self.stats[key] += 1
+        lookups = self.stats['hits'] + self.stats['misses']
+        if self.report_every and lookups % self.report_every == 0:
+            print(f"[ACCESS CACHE] hit ratio {self.hit_ratio():.1%} over {lookups} lookups "
+                  f"({self.stats['invalidations']} invalidations, {len(self._entries)} users cached)")
@@ -0,0 +1,117 @@
+"""
+Catalog listing helpers for the product browse/search API.
+
+``utils.product_search`` picks the page of product ids; ``LISTING_PAGE_QUERY``
+then loads those rows (ratings and sold counts come from ``product_stats``) and
+``decorate_listing`` adds the in-stock variant colors and active promotion of
+the whole page in one statement each. The number of round-trips is therefore
+constant regardless of the requested ``limit``.
+"""
+
+
+LISTING_PAGE_QUERY = """
+    SELECT
+        p.id,
+        p.name,
+        p.price,
+        p.description,
+        p.category_id,
+        pi.image_url,
+        c.name as category_name,
+        COALESCE(ps.avg_rating, 0) as avg_rating,
+        COALESCE(ps.review_count, 0) as review_count,
+        COALESCE(ps.sold_count, 0) as sold_count
+    FROM products p
+    LEFT JOIN product_images pi ON p.id = pi.product_id AND pi.is_primary::int = 1
+    LEFT JOIN categories c ON p.category_id = c.id
+    LEFT JOIN product_stats ps ON ps.product_id = p.id
+    WHERE p.is_active::int = 1
+    AND (p.archive_status IS NULL OR p.archive_status = 'active')
+"""
+
+
+def load_listing_colors(cursor, product_ids):
+    """Return ``{product_id: [color, ...]}`` for in-stock variants of all given products."""
+    if not product_ids:
+        return {}
+
+    cursor.execute("""
+        SELECT product_id, array_agg(DISTINCT color ORDER BY color) AS colors
+        FROM product_variants
+        WHERE product_id = ANY(%s)
+          AND color IS NOT NULL AND color != '' AND stock_quantity > 0
+        GROUP BY product_id
+    """, (list(product_ids),))
+    return {row['product_id']: list(row['colors'] or []) for row in cursor.fetchall()}
+
+
+def load_active_promotions(cursor, product_ids):
+    """Return ``{product_id: promotion_row}`` with at most one live promotion per product."""
+    if not product_ids:
+        return {}
+
+    cursor.execute("""
+        SELECT DISTINCT ON (product_id)
+            product_id,
+            id,
+            discount_type,
+            discount_value,
+            start_date,
+            end_date,
+            description,
+            code
+        FROM promotions
+        WHERE product_id = ANY(%s)
+          AND is_active::int = 1
+          AND is_approved::int = 1
+          AND start_date <= NOW()
+          AND end_date >= NOW()
+        ORDER BY product_id, start_date DESC, id DESC
+    """, (list(product_ids),))
+    return {row['product_id']: row for row in cursor.fetchall()}
+
+
+def apply_listing_pricing(products, colors_by_product, promotions_by_product):
+    """Attach colors, promotion and display prices to every product in a single pass."""
+    for product in products:
+        product['colors'] = colors_by_product.get(product['id'], [])
+
+        promotion = promotions_by_product.get(product['id'])
+        price = float(product['price'] or 0)
+        if not promotion:
+            product['promotion'] = None
+            product['price_to_display'] = price
+            continue
+
+        discount_val = float(promotion['discount_value']) if promotion['discount_value'] else 0
+        product['promotion'] = {
+            'id': promotion['id'],
+            'discount_type': promotion['discount_type'],
+            'discount_value': discount_val,
+            'code': promotion['code'],
+            'description': promotion['description']
+        }
+        product['original_price'] = price
+        if promotion['discount_type'] == 'percentage':
+            product['discounted_price'] = price * (1 - discount_val / 100)
+            product['discount_display'] = f"{int(discount_val)}% OFF"
+        else:
+            product['discounted_price'] = price - discount_val
+            product['discount_display'] = f"₱{int(discount_val)} OFF"
+        product['price_to_display'] = product['discounted_price']
+
+    return products
+
+
+def decorate_listing(cursor, products):
+    """Batch-load colors and promotions for ``products`` and apply pricing in place."""
+    product_ids = [product['id'] for product in products]
+    colors_by_product = load_listing_colors(cursor, product_ids)
+
+    try:
+        promotions_by_product = load_active_promotions(cursor, product_ids)
+    except Exception as promo_err:
+        print(f"[WARNING] Could not fetch promotions: {promo_err}")
+        promotions_by_product = {}
+
+    return apply_listing_pricing(products, colors_by_product, promotions_by_product)
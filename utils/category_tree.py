@@ -0,0 +1,154 @@
+"""
+Process-wide category tree for the catalog endpoints.
+
+``api_categories`` used to query the parents and then each parent's
+children, ``api_products`` ran one or two category queries per request to
+widen a parent filter to its children, and the seller dashboard re-read
+every category on each load. Categories change a few times a year, so each
+worker keeps one ``CategorySnapshot`` (id -> node, parent -> children,
+slug -> id) built from a single SELECT and shares it across requests.
+
+Code that edits categories calls ``CategoryTree.invalidate()``. That bumps
+the ``category_version`` stamp in the shared lookup store, and every worker
+rebuilds its snapshot on the next read. The TTL is only a safety net for
+edits made straight in SQL (migrations, psql).
+"""
+import threading
+import time
+
+from utils.lookup_cache import VersionStamps
+
+CATEGORY_TREE_SQL = '''
+    SELECT id, name, slug, category_type, parent_id, is_active::int = 1 as is_active
+    FROM categories
+    ORDER BY id
+'''
+
+_STAMP_KEY = 'categories'
+
+
+def load_category_rows(cursor):
+    """Read every category, active or not, in one statement."""
+    cursor.execute(CATEGORY_TREE_SQL)
+    return cursor.fetchall()
+
+
+class CategorySnapshot:
+    """Immutable view of the categories table built from ``load_category_rows``."""
+
+    def __init__(self, rows):
+        self.nodes = {}
+        self.children = {}
+        self.by_slug = {}
+        for row in rows:
+            node = {
+                'id': row['id'],
+                'name': row['name'],
+                'slug': row['slug'],
+                'category_type': row['category_type'] or 'general',
+                'parent_id': row['parent_id'],
+                'is_active': bool(row['is_active']),
+            }
+            self.nodes[node['id']] = node
+            if node['slug']:
+                self.by_slug[node['slug']] = node['id']
+            if node['parent_id']:
+                self.children.setdefault(node['parent_id'], []).append(node['id'])
+        self._response = self._build_response()
+        self._active_by_name = sorted(
+            (node for node in self.nodes.values() if node['is_active']),
+            key=lambda node: (node['name'] or '', node['id']),
+        )
+
+    def expand(self, category_ids):
+        """Return the sorted filter ids for ``category_ids``.
+
+        Known top-level categories are widened to their active children; ids
+        the table doesn't have are kept as given, like the old SQL did.
+        """
+        expanded = set(category_ids)
+        for category_id in category_ids:
+            node = self.nodes.get(category_id)
+            if node is None or node['parent_id']:
+                continue
+            expanded.update(child_id for child_id in self.children.get(category_id, ())
+                            if self.nodes[child_id]['is_active'])
+        return sorted(expanded)
+
+    def active_by_name(self, *fields):
+        """Active categories ordered by name, as dicts holding only ``fields``."""
+        return [{field: node[field] for field in fields} for node in self._active_by_name]
+
+    def as_response(self):
+        """Active parents with their active children, as /api/categories returns them."""
+        return [dict(parent, children=[dict(child) for child in parent['children']])
+                for parent in self._response]
+
+    def _build_response(self):
+        response = []
+        for node in self.nodes.values():
+            if node['parent_id'] or not node['is_active']:
+                continue
+            response.append({
+                'id': node['id'],
+                'name': node['name'],
+                'slug': node['slug'],
+                'category_type': node['category_type'],
+                'parent_id': node['parent_id'],
+                'children': [
+                    {
+                        'id': child['id'],
+                        'name': child['name'],
+                        'slug': child['slug'],
+                        'category_type': child['category_type'],
+                        'parent_id': child['parent_id'],
+                    }
+                    for child in (self.nodes[child_id] for child_id in self.children.get(node['id'], ()))
+                    if child['is_active']
+                ],
+            })
+        return response
+
+
+class CategoryTree:
+    """Holds the current ``CategorySnapshot`` and rebuilds it when the stamp moves."""
+
+    def __init__(self, ttl_seconds, shared_store=None):
+        self.ttl_seconds = ttl_seconds
+        self.versions = VersionStamps('category_version', shared_store)
+        self._snapshot = None
+        self._version = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'invalidations': 0}
+
+    def snapshot(self, loader):
+        """Return the current snapshot, calling ``loader()`` for the rows when stale.
+
+        ``loader`` returning None (DB down) keeps serving the previous
+        snapshot if there is one; None is returned only when there never was.
+        """
+        version = self.versions.get(_STAMP_KEY)
+        now = time.time()
+        with self._lock:
+            if (self._snapshot is not None and version is not None
+                    and version == self._version and self._expires_at >= now):
+                self.stats['hits'] += 1
+                return self._snapshot
+
+        rows = loader()
+        with self._lock:
+            if rows is None:
+                return self._snapshot
+            self.stats['loads'] += 1
+            self._snapshot = CategorySnapshot(rows)
+            self._version = version
+            self._expires_at = now + self.ttl_seconds
+            return self._snapshot
+
+    def invalidate(self):
+        """Make every worker reload the categories on its next read."""
+        with self._lock:
+            self._version = None
+            self.stats['invalidations'] += 1
+        self.versions.bump(_STAMP_KEY)
@@ -0,0 +1,368 @@
+"""
+Admin commission ledger: one row per order item of a delivered/completed order.
+
+The admin commission report (page and API) and both withdrawal endpoints used
+to run ``backfill_admin_commission_ledger`` on every request: three
+``information_schema`` lookups to pick column names, then an INSERT ... SELECT
+anti-join over every delivered order in the range. The report then loaded
+every withdrawal claim ever recorded to mark the rows it showed.
+
+Now:
+  - ``record_order_commission`` writes an order's rows when it is delivered or
+    completed, in the same transaction as the status change. It inserts only
+    missing items, so calling it twice is harmless.
+  - ``catch_up_commission_ledger`` runs the same insert over orders finalized
+    since a given time. A daemon thread (``start_commission_ledger_sync``) or
+    scripts/sync_commission_ledger.py runs it so status changes made outside
+    the app still reach the ledger.
+  - The first startup on a ledger that was filled the old way (per report
+    range) scans every finalized order once; ``COMMISSION_LEDGER_VERSION`` in
+    the table comment records that it has run.
+  - Column lookups are cached per process (``table_columns``), and so is the
+    schema-tolerant insert statement built from them.
+  - Report reads use a sargable range on the ledger's report date, and
+    ``load_order_claims`` only reads claims for the orders being shown.
+  - The ledger and withdrawal tables are created once at startup, not per request.
+"""
+import threading
+import time
+
+_COLUMNS_LOCK = threading.Lock()
+_TABLE_COLUMNS = {}
+_LEDGER_INSERT_SQL = None
+
+FINALIZED_STATUSES = ('delivered', 'completed')
+
+# Stored as the ledger table's comment once every finalized order has been scanned. Until it
+# matches, startup does a full catch-up instead of the lookback window; bump it if a bug ever
+# leaves older orders out of the ledger.
+COMMISSION_LEDGER_VERSION = 'commission ledger v1'
+
+COMMISSION_LEDGER_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS admin_commission_ledger (
+        id SERIAL PRIMARY KEY,
+        order_id INT NOT NULL,
+        order_number VARCHAR(64) NULL,
+        order_created_at TIMESTAMP NULL,
+        order_completed_at TIMESTAMP NULL,
+        order_status VARCHAR(32) NULL,
+        seller_id INT NOT NULL,
+        order_item_id INT NOT NULL,
+        product_name VARCHAR(255) NULL,
+        quantity INT NOT NULL DEFAULT 0,
+        item_subtotal DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        commission_rate DECIMAL(7,3) NOT NULL DEFAULT 0.000,
+        commission_amount DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT uniq_order_item UNIQUE (order_item_id)
+    )
+'''
+
+WITHDRAWAL_TABLES_SQL = (
+    ('admin_commission_withdrawals', '''
+        CREATE TABLE IF NOT EXISTS admin_commission_withdrawals (
+            id SERIAL PRIMARY KEY,
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            claimed_by INT NULL,
+            claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notes VARCHAR(255)
+        )
+    ''', 'ALTER TABLE admin_commission_withdrawals ADD CONSTRAINT admin_commission_withdrawals_claimed_by_fkey '
+         'FOREIGN KEY (claimed_by) REFERENCES users(id) ON DELETE SET NULL'),
+    ('admin_commission_withdrawal_orders', '''
+        CREATE TABLE IF NOT EXISTS admin_commission_withdrawal_orders (
+            id SERIAL PRIMARY KEY,
+            withdrawal_id INT NOT NULL,
+            order_id INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT uniq_order UNIQUE (order_id),
+            FOREIGN KEY (withdrawal_id) REFERENCES admin_commission_withdrawals(id) ON DELETE CASCADE
+        )
+    ''', 'ALTER TABLE admin_commission_withdrawal_orders ADD CONSTRAINT admin_commission_withdrawal_orders_order_id_fkey '
+         'FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE'),
+)
+
+# The report date: completion time, or placement time for rows recorded without one.
+REPORT_DATE_SQL = 'COALESCE(l.order_completed_at, l.order_created_at)'
+
+COMMISSION_LEDGER_UPGRADES_SQL = (
+    'ALTER TABLE admin_commission_ledger ADD COLUMN IF NOT EXISTS order_completed_at TIMESTAMP NULL',
+    'CREATE INDEX IF NOT EXISTS idx_order_completed_at ON admin_commission_ledger(order_completed_at)',
+    'CREATE INDEX IF NOT EXISTS idx_commission_ledger_report_date '
+    'ON admin_commission_ledger ((COALESCE(order_completed_at, order_created_at)))',
+    'CREATE INDEX IF NOT EXISTS idx_commission_ledger_order ON admin_commission_ledger (order_id)',
+)
+
+
+def table_columns(cursor, table_name):
+    """Lower-cased column names of ``table_name``, looked up once per process.
+
+    A failed or empty lookup is not cached, so a table created later is seen.
+    """
+    with _COLUMNS_LOCK:
+        cached = _TABLE_COLUMNS.get(table_name)
+    if cached is not None:
+        return cached
+    try:
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s",
+            (table_name,)
+        )
+        rows = cursor.fetchall() or []
+    except Exception:
+        return set()
+    columns = {str(_first(row) or '').lower() for row in rows if _first(row)}
+    if columns:
+        with _COLUMNS_LOCK:
+            _TABLE_COLUMNS[table_name] = columns
+    return columns
+
+
+def reset_schema_cache():
+    """Forget cached column lookups, e.g. after a migration in the same process."""
+    global _LEDGER_INSERT_SQL
+    with _COLUMNS_LOCK:
+        _TABLE_COLUMNS.clear()
+        _LEDGER_INSERT_SQL = None
+
+
+def _first(row):
+    return row.get('column_name') if isinstance(row, dict) else row[0]
+
+
+def _pick_existing_column(columns_lower, candidates):
+    for candidate in candidates:
+        if candidate.lower() in columns_lower:
+            return candidate
+    return None
+
+
+def ensure_commission_withdrawal_tables(cursor):
+    """Create the withdrawal tables if missing. ``uniq_order`` is what stops an order being claimed twice.
+
+    Foreign keys to users/orders are added when the tables are created and
+    skipped (inside a savepoint) on databases where the target is missing.
+    """
+    for table, create_sql, foreign_key_sql in WITHDRAWAL_TABLES_SQL:
+        cursor.execute("SELECT to_regclass(%s) IS NULL AS missing", (table,))
+        row = cursor.fetchone()
+        missing = row['missing'] if isinstance(row, dict) else row[0]
+        cursor.execute(create_sql)
+        if not missing:
+            continue
+        cursor.execute('SAVEPOINT commission_fk')
+        try:
+            cursor.execute(foreign_key_sql)
+        except Exception:
+            cursor.execute('ROLLBACK TO SAVEPOINT commission_fk')
+        cursor.execute('RELEASE SAVEPOINT commission_fk')
+    # Old deployments had one withdrawal per date range; ranges may overlap now.
+    cursor.execute('DROP INDEX IF EXISTS uniq_range')
+
+
+def ensure_commission_ledger_table(cursor):
+    """Create the ledger and its report indexes if missing."""
+    cursor.execute(COMMISSION_LEDGER_TABLE_SQL)
+    for statement in COMMISSION_LEDGER_UPGRADES_SQL:
+        cursor.execute(statement)
+
+
+def _ledger_insert_sql(cursor):
+    """(INSERT ... SELECT with a ``{where}`` slot, last-touched column), built once per process.
+
+    Order completion time is shipments.delivered_at -> orders.updated_at ->
+    orders.created_at, whichever the schema has.
+    """
+    global _LEDGER_INSERT_SQL
+    if _LEDGER_INSERT_SQL is not None:
+        return _LEDGER_INSERT_SQL
+
+    orders_cols = table_columns(cursor, 'orders')
+    items_cols = table_columns(cursor, 'order_items')
+    shipments_cols = table_columns(cursor, 'shipments')
+
+    status_col = _pick_existing_column(orders_cols, ['order_status', 'status']) or 'order_status'
+    created_col = _pick_existing_column(orders_cols, ['created_at', 'order_date', 'date_created']) or 'created_at'
+    updated_col = _pick_existing_column(orders_cols, ['updated_at', 'date_updated'])
+    order_number_col = _pick_existing_column(orders_cols, ['order_number', 'reference', 'order_ref'])
+
+    qty_col = _pick_existing_column(items_cols, ['quantity', 'qty']) or 'quantity'
+    subtotal_col = _pick_existing_column(items_cols, ['subtotal', 'total', 'total_price', 'line_total']) or 'subtotal'
+    product_name_col = _pick_existing_column(items_cols, ['product_name', 'name', 'title'])
+
+    if 'delivered_at' in shipments_cols:
+        completed_expr = f"COALESCE(sh.delivered_at, o.{updated_col}, o.{created_col})" if updated_col else f"COALESCE(sh.delivered_at, o.{created_col})"
+        shipments_join = "LEFT JOIN shipments sh ON sh.order_id = o.id"
+    else:
+        completed_expr = f"COALESCE(o.{updated_col}, o.{created_col})" if updated_col else f"o.{created_col}"
+        shipments_join = ""
+
+    order_number_select = f"o.{order_number_col} AS order_number" if order_number_col else "CAST(o.id AS CHAR) AS order_number"
+    product_name_select = f"oi.{product_name_col} AS product_name" if product_name_col else "NULL AS product_name"
+    # Catch-up windows filter on the last-touched column, which a status change always moves.
+    touched_col = updated_col or created_col
+
+    sql = f'''
+        INSERT INTO admin_commission_ledger (
+            order_id, order_number, order_created_at, order_completed_at, order_status, seller_id,
+            order_item_id, product_name, quantity, item_subtotal, commission_rate, commission_amount
+        )
+        SELECT
+            o.id AS order_id,
+            {order_number_select},
+            o.{created_col} AS order_created_at,
+            {completed_expr} AS order_completed_at,
+            o.{status_col} AS order_status,
+            o.seller_id AS seller_id,
+            oi.id AS order_item_id,
+            {product_name_select},
+            COALESCE(oi.{qty_col}, 0) AS quantity,
+            COALESCE(oi.{subtotal_col}, 0) AS item_subtotal,
+            COALESCE(s.commission_rate, 0) AS commission_rate,
+            (COALESCE(oi.{subtotal_col}, 0) * COALESCE(s.commission_rate, 0)) / 100.0 AS commission_amount
+        FROM orders o
+        {shipments_join}
+        JOIN order_items oi ON oi.order_id = o.id
+        JOIN sellers s ON s.id = o.seller_id
+        WHERE o.{status_col}::text IN %(finalized)s
+          AND {{where}}
+          AND NOT EXISTS (SELECT 1 FROM admin_commission_ledger l WHERE l.order_item_id = oi.id)
+    '''
+    _LEDGER_INSERT_SQL = (sql, f'o.{touched_col}')
+    return _LEDGER_INSERT_SQL
+
+
+def record_order_commission(cursor, order_id):
+    """Write ledger rows for ``order_id`` if it is delivered/completed. Returns rows inserted."""
+    sql, _ = _ledger_insert_sql(cursor)
+    cursor.execute(sql.format(where='o.id = %(order_id)s'),
+                   {'finalized': FINALIZED_STATUSES, 'order_id': order_id})
+    return max(int(cursor.rowcount or 0), 0)
+
+
+def catch_up_commission_ledger(cursor, since=None):
+    """Insert missing rows for orders finalized (last updated) since ``since``; all orders when None.
+
+    Idempotent: items already in the ledger are skipped. Returns rows inserted.
+    """
+    sql, touched = _ledger_insert_sql(cursor)
+    if since is None:
+        cursor.execute(sql.format(where='TRUE'), {'finalized': FINALIZED_STATUSES})
+    else:
+        cursor.execute(sql.format(where=f'{touched} >= %(since)s'),
+                       {'finalized': FINALIZED_STATUSES, 'since': since})
+    return max(int(cursor.rowcount or 0), 0)
+
+
+def mark_commission_ledger_complete(cursor):
+    """Record that every finalized order is in the ledger (after a full catch-up)."""
+    cursor.execute(f"COMMENT ON TABLE admin_commission_ledger IS '{COMMISSION_LEDGER_VERSION}'")
+
+
+def catch_up_commission_ledger_on_start(cursor, since):
+    """Catch up since ``since``, or over every order if this ledger version never had a full scan.
+
+    Returns ``(rows inserted, whether every order was scanned)``.
+    """
+    cursor.execute("SELECT obj_description('admin_commission_ledger'::regclass, 'pg_class') AS version")
+    row = cursor.fetchone()
+    version = row['version'] if isinstance(row, dict) else row[0]
+    if version == COMMISSION_LEDGER_VERSION:
+        return catch_up_commission_ledger(cursor, since), False
+    inserted = catch_up_commission_ledger(cursor)
+    mark_commission_ledger_complete(cursor)
+    return inserted, True
+
+
+def load_commission_items(cursor, start_date, end_date):
+    """Ledger rows whose report date falls in [start_date, end_date], newest first."""
+    cursor.execute(f'''
+        SELECT
+            l.order_id,
+            l.order_number,
+            l.order_created_at,
+            l.order_completed_at,
+            l.order_status,
+            l.order_item_id,
+            l.product_name,
+            l.quantity,
+            l.item_subtotal,
+            l.commission_rate,
+            l.commission_amount
+        FROM admin_commission_ledger l
+        WHERE {REPORT_DATE_SQL} >= %s::date AND {REPORT_DATE_SQL} < %s::date + 1
+          AND l.order_status IN ('delivered', 'completed')
+        ORDER BY {REPORT_DATE_SQL} DESC, l.order_id DESC, l.order_item_id ASC
+    ''', (start_date, end_date))
+    return cursor.fetchall() or []
+
+
+def load_order_claims(cursor, order_ids):
+    """{order_id: claimed_at} for the given orders that a withdrawal already claimed."""
+    if not order_ids:
+        return {}
+    cursor.execute('''
+        SELECT wo.order_id, w.claimed_at
+        FROM admin_commission_withdrawal_orders wo
+        JOIN admin_commission_withdrawals w ON w.id = wo.withdrawal_id
+        WHERE wo.order_id = ANY(%s)
+    ''', (list(order_ids),))
+    return {row['order_id']: row['claimed_at'] for row in cursor.fetchall() or [] if row.get('order_id')}
+
+
+def load_unclaimed_order_commissions(cursor, start_date, end_date):
+    """Per-order commission of ledger orders in the range that no withdrawal has claimed."""
+    cursor.execute(f'''
+        SELECT l.order_id,
+               COALESCE(SUM(l.commission_amount), 0) AS order_commission
+        FROM admin_commission_ledger l
+        WHERE {REPORT_DATE_SQL} >= %s::date AND {REPORT_DATE_SQL} < %s::date + 1
+          AND l.order_status IN ('delivered', 'completed')
+          AND NOT EXISTS (SELECT 1 FROM admin_commission_withdrawal_orders wo WHERE wo.order_id = l.order_id)
+        GROUP BY l.order_id
+        HAVING COALESCE(SUM(l.commission_amount), 0) > 0
+    ''', (start_date, end_date))
+    return cursor.fetchall() or []
+
+
+def start_commission_ledger_sync(connect, interval_seconds, lookback_seconds):
+    """Run ``catch_up_commission_ledger`` every ``interval_seconds`` on a daemon thread.
+
+    Each pass looks back ``lookback_seconds`` from its start, so a pass that
+    fails or is skipped is covered by the next ones.
+    """
+    def run():
+        while True:
+            time.sleep(interval_seconds)
+            conn = None
+            try:
+                conn = connect()
+                if not conn:
+                    continue
+                cursor = conn.cursor()
+                cursor.execute("SELECT NOW() - make_interval(secs => %s)", (lookback_seconds,))
+                since = cursor.fetchone()[0]
+                inserted = catch_up_commission_ledger(cursor, since)
+                conn.commit()
+                cursor.close()
+                if inserted:
+                    print(f"[COMMISSION LEDGER] Caught up {inserted} missing ledger rows")
+            except Exception as err:
+                print(f"[COMMISSION LEDGER] Catch-up failed: {err}")
+                if conn:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+            finally:
+                if conn:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    thread = threading.Thread(target=run, name='commission-ledger-sync', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,395 @@
+"""
+Transactional email outbox.
+
+Request handlers never talk to SMTP. They insert rows into ``email_outbox``
+(inside their own transaction when they have one) and return; background
+workers claim due rows in batches with ``FOR UPDATE SKIP LOCKED`` and deliver
+them over one long-lived SMTP connection per worker.
+
+Failed deliveries are retried with exponential backoff until
+``max_attempts``; recipients the server refuses outright are failed at once.
+Rows stuck in ``sending`` (a worker died mid-batch) are picked up again after
+``STALE_SENDING_SECONDS``.
+
+Workers run as daemon threads in every app process (``EmailOutbox.start``) or
+as a separate process via ``scripts/email_worker.py``; both are safe to run at
+the same time.
+"""
+import os
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+EMAIL_OUTBOX_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS email_outbox (
+        id BIGSERIAL PRIMARY KEY,
+        to_email VARCHAR(255) NOT NULL,
+        subject VARCHAR(500) NOT NULL,
+        html_body TEXT NOT NULL,
+        sender VARCHAR(255),
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        locked_at TIMESTAMP,
+        last_error TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        sent_at TIMESTAMP
+    )
+"""
+
+EMAIL_OUTBOX_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (next_attempt_at) WHERE status = 'pending'",
+    "CREATE INDEX IF NOT EXISTS idx_email_outbox_sending ON email_outbox (locked_at) WHERE status = 'sending'",
+)
+
+STALE_SENDING_SECONDS = 600
+MAX_BACKOFF_SECONDS = 3600
+
+_default_outbox = None
+
+
+def ensure_email_outbox_table(cursor):
+    cursor.execute(EMAIL_OUTBOX_TABLE_SQL)
+    for statement in EMAIL_OUTBOX_INDEX_SQL:
+        cursor.execute(statement)
+
+
+def set_default_outbox(outbox):
+    """Register the process-wide outbox used by ``OTPService`` and friends."""
+    global _default_outbox
+    _default_outbox = outbox
+
+
+def get_default_outbox():
+    return _default_outbox
+
+
+class SMTPSettings:
+    """SMTP configuration resolved from the same env vars ``send_email`` always read."""
+
+    def __init__(self, server, port, sender, username, password, use_tls, log_only, timeout=20):
+        self.server = server
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.log_only = log_only
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls):
+        password = (
+            os.getenv('SENDER_PASSWORD')
+            or os.getenv('SMTP_PASSWORD')
+            or os.getenv('MAIL_PASSWORD')
+            or ''
+        )
+        # OTPService used to default to Gmail when only MAIL_USERNAME/MAIL_PASSWORD were set.
+        default_server = 'smtp.gmail.com' if os.getenv('MAIL_USERNAME') and password else 'localhost'
+        server = os.getenv('SMTP_SERVER') or os.getenv('MAIL_SERVER') or default_server
+        sender = (
+            os.getenv('SENDER_EMAIL')
+            or os.getenv('SMTP_USERNAME')
+            or os.getenv('MAIL_USERNAME')
+            or os.getenv('MAIL_DEFAULT_SENDER')
+            or 'noreply@varon.com'
+        )
+        use_tls_setting = os.getenv('SMTP_USE_TLS', os.getenv('MAIL_USE_TLS', 'true'))
+        # EMAIL_LOG_ONLY=false forces delivery to an unauthenticated local server (e.g. scripts/smtp_stub.py).
+        log_only_setting = os.getenv('EMAIL_LOG_ONLY', '').strip().lower()
+        log_only = log_only_setting == 'true' or (
+            log_only_setting != 'false'
+            and server in ('localhost', '127.0.0.1') and not password and not os.getenv('MAIL_USERNAME')
+        )
+        return cls(
+            server=server,
+            port=int(os.getenv('SMTP_PORT') or os.getenv('MAIL_PORT') or '587'),
+            sender=sender,
+            username=os.getenv('SMTP_USERNAME') or os.getenv('MAIL_USERNAME') or sender,
+            password=password,
+            use_tls=str(use_tls_setting).strip().lower() not in ('false', '0', 'no'),
+            log_only=log_only,
+            timeout=int(os.getenv('SMTP_TIMEOUT_SECONDS', '20') or 20),
+        )
+
+
+class SMTPSession:
+    """One reusable SMTP connection; reconnects lazily when the server drops it."""
+
+    # ``observer(seconds, ok)`` is told how long each ``send`` took (app.py feeds /metrics).
+    observer = None
+
+    def __init__(self, settings, idle_seconds=60):
+        self.settings = settings
+        self.idle_seconds = idle_seconds
+        self._server = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def _open(self):
+        settings = self.settings
+        server = smtplib.SMTP(settings.server, settings.port, timeout=settings.timeout)
+        if settings.password:
+            if settings.use_tls:
+                server.starttls()
+            server.login(settings.username, settings.password)
+        self._server = server
+        self.connects += 1
+
+    def send(self, sender, to_email, message):
+        started = time.perf_counter()
+        ok = False
+        try:
+            self._send(sender, to_email, message)
+            ok = True
+        finally:
+            if SMTPSession.observer is not None:
+                SMTPSession.observer(time.perf_counter() - started, ok)
+
+    def _send(self, sender, to_email, message):
+        if self._server is not None and time.time() - self._last_used > self.idle_seconds:
+            # Most providers drop idle sessions; don't find out mid-send.
+            self.close()
+        for attempt in (1, 2):
+            if self._server is None:
+                self._open()
+            try:
+                self._server.sendmail(sender, to_email, message)
+                self._last_used = time.time()
+                return
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
+def build_message(sender, to_email, subject, html_body):
+    message = MIMEMultipart('alternative')
+    message['Subject'] = subject
+    message['From'] = sender
+    message['To'] = to_email
+    message.attach(MIMEText(html_body, 'html'))
+    return message.as_string()
+
+
+def queue_emails(cursor, messages, sender=None):
+    """Insert ``(to_email, subject, html_body)`` tuples with one multi-row INSERT.
+
+    Runs in the caller's transaction; nothing is sent until it commits.
+    """
+    messages = [message for message in messages if message and message[0]]
+    if not messages:
+        return 0
+    cursor.execute('''
+        INSERT INTO email_outbox (to_email, subject, html_body, sender)
+        SELECT queued.to_email, queued.subject, queued.html_body, %s
+        FROM unnest(%s::text[], %s::text[], %s::text[]) AS queued(to_email, subject, html_body)
+    ''', (
+        sender,
+        [message[0] for message in messages],
+        [message[1] for message in messages],
+        [message[2] for message in messages],
+    ))
+    return len(messages)
+
+
+class EmailOutbox:
+    """Queue facade for request handlers plus the delivery loop for workers."""
+
+    def __init__(self, connect, settings, batch_size=50, max_attempts=6, poll_seconds=5, backoff_seconds=30):
+        self.connect = connect
+        self.settings = settings
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.backoff_seconds = backoff_seconds
+        self._wakeup = threading.Event()
+        self._threads = []
+        self.stats = {'queued': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'batches': 0}
+
+    # --- producer side -------------------------------------------------
+
+    def enqueue_many(self, messages, cursor=None, sender=None):
+        """Queue several emails; returns how many were queued (0 on failure).
+
+        With ``cursor`` the rows join the caller's transaction under a
+        savepoint, so an outbox problem never aborts the caller's work.
+        Without it a pooled connection is used and committed immediately.
+        """
+        conn = None
+        try:
+            if cursor is None:
+                conn = self.connect()
+                if not conn:
+                    print("[EMAIL OUTBOX] Could not queue email: DB connection failed")
+                    return 0
+                own_cursor = conn.cursor()
+                queued = queue_emails(own_cursor, messages, sender)
+                conn.commit()
+                own_cursor.close()
+            else:
+                cursor.execute('SAVEPOINT email_outbox')
+                try:
+                    queued = queue_emails(cursor, messages, sender)
+                except Exception:
+                    cursor.execute('ROLLBACK TO SAVEPOINT email_outbox')
+                    raise
+                cursor.execute('RELEASE SAVEPOINT email_outbox')
+        except Exception as err:
+            print(f"[EMAIL OUTBOX] Could not queue email: {err}")
+            return 0
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        self.stats['queued'] += queued
+        if cursor is None:
+            self.wake()
+        return queued
+
+    def enqueue(self, to_email, subject, html_body, cursor=None, sender=None):
+        return self.enqueue_many([(to_email, subject, html_body)], cursor=cursor, sender=sender) > 0
+
+    def wake(self):
+        """Nudge this process's workers (e.g. after the caller commits)."""
+        self._wakeup.set()
+
+    # --- consumer side -------------------------------------------------
+
+    def _claim_batch(self, cursor):
+        cursor.execute('''
+            WITH due AS (
+                SELECT id FROM email_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                   OR (status = 'sending' AND locked_at < NOW() - make_interval(secs => %s))
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE email_outbox o
+            SET status = 'sending', locked_at = NOW(), attempts = o.attempts + 1
+            FROM due
+            WHERE o.id = due.id
+            RETURNING o.id, o.to_email, o.subject, o.html_body, o.sender, o.attempts
+        ''', (STALE_SENDING_SECONDS, self.batch_size))
+        return cursor.fetchall()
+
+    def _backoff(self, attempts):
+        return min(MAX_BACKOFF_SECONDS, self.backoff_seconds * (2 ** max(0, attempts - 1)))
+
+    def drain_once(self, session):
+        """Claim and deliver one batch; returns the number of rows handled."""
+        conn = self.connect()
+        if not conn:
+            return 0
+        try:
+            cursor = conn.cursor()
+            rows = self._claim_batch(cursor)
+            conn.commit()
+            if not rows:
+                cursor.close()
+                return 0
+
+            sent_ids = []
+            retries = []
+            failures = []
+            for row_id, to_email, subject, html_body, sender, attempts in rows:
+                sender = sender or self.settings.sender
+                try:
+                    if self.settings.log_only:
+                        print(f"[📧 EMAIL LOG] To: {to_email}")
+                        print(f"[📧 EMAIL LOG] Subject: {subject}")
+                        print(f"[📧 EMAIL LOG] Body: {html_body[:400]}...")
+                    else:
+                        session.send(sender, to_email, build_message(sender, to_email, subject, html_body))
+                    sent_ids.append(row_id)
+                except smtplib.SMTPRecipientsRefused as err:
+                    failures.append((row_id, str(err)[:1000]))
+                except Exception as err:
+                    session.close()
+                    if attempts >= self.max_attempts:
+                        failures.append((row_id, str(err)[:1000]))
+                    else:
+                        retries.append((row_id, self._backoff(attempts), str(err)[:1000]))
+
+            if sent_ids:
+                cursor.execute('''
+                    UPDATE email_outbox
+                    SET status = 'sent', sent_at = NOW(), locked_at = NULL, last_error = NULL
+                    WHERE id = ANY(%s)
+                ''', (sent_ids,))
+            if retries:
+                cursor.execute('''
+                    UPDATE email_outbox o
+                    SET status = 'pending', locked_at = NULL,
+                        next_attempt_at = NOW() + make_interval(secs => retry.delay),
+                        last_error = retry.error
+                    FROM unnest(%s::bigint[], %s::int[], %s::text[]) AS retry(id, delay, error)
+                    WHERE o.id = retry.id
+                ''', ([r[0] for r in retries], [r[1] for r in retries], [r[2] for r in retries]))
+            if failures:
+                cursor.execute('''
+                    UPDATE email_outbox o
+                    SET status = 'failed', locked_at = NULL, last_error = failure.error
+                    FROM unnest(%s::bigint[], %s::text[]) AS failure(id, error)
+                    WHERE o.id = failure.id
+                ''', ([f[0] for f in failures], [f[1] for f in failures]))
+            conn.commit()
+            cursor.close()
+
+            self.stats['batches'] += 1
+            self.stats['sent'] += len(sent_ids)
+            self.stats['retried'] += len(retries)
+            self.stats['failed'] += len(failures)
+            if retries or failures:
+                print(f"[EMAIL OUTBOX] batch: {len(sent_ids)} sent, {len(retries)} to retry, {len(failures)} failed")
+            return len(rows)
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def run_worker(self, stop_event=None):
+        """Deliver until ``stop_event`` is set, sleeping while the queue is empty."""
+        session = SMTPSession(self.settings)
+        try:
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    handled = self.drain_once(session)
+                except Exception as err:
+                    print(f"[EMAIL OUTBOX] Worker error: {err}")
+                    handled = 0
+                if handled >= self.batch_size:
+                    continue
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+        finally:
+            session.close()
+
+    def start(self, workers=1):
+        for index in range(workers):
+            thread = threading.Thread(target=self.run_worker, name=f"email-outbox-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self._threads
@@ -0,0 +1,325 @@
+"""
+Resized, metadata-free copies of uploaded images.
+
+Product, profile and rider document uploads are written to ``static/`` as
+the seller's phone or camera produced them (``static/images/products`` is
+26 MB for 250 files), and product grids download those originals for
+280px-wide cards.
+
+After an upload is saved, ``ImagePipeline.submit`` queues it on a small
+thread pool, so the request returns right away. The pool writes fixed-width
+derivatives next to the original:
+
+    static/images/products/derived/<file>.<variant>.<format>
+
+Variants are thumb/card/detail (``VARIANTS``). Formats are WebP, plus AVIF
+when the installed Pillow can encode it. Derivatives are never wider than
+the source. They carry no EXIF/XMP (GPS, camera serials) and keep only the
+colour profile.
+
+A JSON manifest (``<file>.json``) is written last, so a manifest means every
+derivative exists. ``image_derivatives`` rows record the variants, keyed by
+the same URL as ``product_images.image_url``.
+
+Templates call ``ImagePipeline.sources(url)`` and get ``<source>`` srcsets.
+A URL without a manifest renders the original, as before. Manifests are read
+from disk once per process; misses are rechecked after ``miss_ttl_seconds``.
+
+scripts/build_image_derivatives.py backfills existing uploads and reports
+the bytes saved. Processing needs Pillow. Without it uploads are kept as-is
+and the templates fall back to the originals.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is only needed to process; reading manifests works without it.
+    Image = None
+
+VARIANTS = (('thumb', 240), ('card', 480), ('detail', 1080))
+DERIVED_DIRNAME = 'derived'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+
+_MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+_SAVE_OPTIONS = {
+    'webp': {'quality': 80, 'method': 5},
+    'avif': {'quality': 55, 'speed': 6},
+}
+
+IMAGE_DERIVATIVES_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS image_derivatives (
+        source_url VARCHAR(500) NOT NULL,
+        variant VARCHAR(16) NOT NULL,
+        format VARCHAR(8) NOT NULL,
+        width INTEGER NOT NULL,
+        height INTEGER NOT NULL,
+        url VARCHAR(500) NOT NULL,
+        bytes INTEGER NOT NULL,
+        source_bytes INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source_url, variant, format)
+    )
+'''
+
+
+def available_formats():
+    """Formats this process can encode, preferred first."""
+    if Image is None:
+        return ()
+    return tuple(fmt for fmt in ('avif', 'webp') if features.check(fmt))
+
+
+def source_path(static_folder, source_url, static_url_path='/static'):
+    """Filesystem path of a ``/static/...`` upload URL, or None for anything else."""
+    prefix = static_url_path.rstrip('/') + '/'
+    if not source_url or not source_url.startswith(prefix):
+        return None
+    relative = source_url[len(prefix):].split('?', 1)[0]
+    if not relative.lower().endswith(SOURCE_EXTENSIONS) or '..' in relative.split('/'):
+        return None
+    return os.path.join(static_folder, *relative.split('/'))
+
+
+def _derived_url(source_url, suffix):
+    directory, filename = source_url.split('?', 1)[0].rsplit('/', 1)
+    return f"{directory}/{DERIVED_DIRNAME}/{filename}.{suffix}"
+
+
+def _derived_path(path, suffix):
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, DERIVED_DIRNAME, f"{filename}.{suffix}")
+
+
+def load_manifest(static_folder, source_url, static_url_path='/static'):
+    """The manifest written for ``source_url``, or None if it has not been processed."""
+    path = source_path(static_folder, source_url, static_url_path)
+    if path is None:
+        return None
+    try:
+        with open(_derived_path(path, 'json'), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _clean_copy(image):
+    """Upright RGB(A) copy with no metadata besides the colour profile."""
+    image = ImageOps.exif_transpose(image)
+    icc_profile = image.info.get('icc_profile')
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    image.info = {'icc_profile': icc_profile} if icc_profile else {}
+    return image
+
+
+def build_derivatives(static_folder, source_url, static_url_path='/static', force=False):
+    """Write every variant of ``source_url`` and its manifest; return the manifest.
+
+    Returns None when the URL is not a local image upload or Pillow is
+    missing. An existing manifest is returned as is unless ``force``.
+    """
+    path = source_path(static_folder, source_url, static_url_path)
+    formats = available_formats()
+    if path is None or not formats:
+        return None
+    if not force:
+        existing = load_manifest(static_folder, source_url, static_url_path)
+        if existing is not None:
+            return existing
+
+    os.makedirs(os.path.join(os.path.dirname(path), DERIVED_DIRNAME), exist_ok=True)
+    with Image.open(path) as opened:
+        image = _clean_copy(opened)
+    variants = []
+    previous_width = None
+    for variant, target_width in VARIANTS:
+        width = min(target_width, image.width)
+        if width == previous_width:
+            break  # the source is narrower than this variant; the previous one already covers it
+        previous_width = width
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        resized.info = dict(image.info)
+        for fmt in formats:
+            suffix = f"{variant}.{fmt}"
+            out_path = _derived_path(path, suffix)
+            options = dict(_SAVE_OPTIONS[fmt])
+            if resized.info.get('icc_profile'):
+                options['icc_profile'] = resized.info['icc_profile']
+            resized.save(out_path, format=fmt.upper(), **options)
+            variants.append({
+                'variant': variant,
+                'format': fmt,
+                'width': width,
+                'height': height,
+                'url': _derived_url(source_url, suffix),
+                'bytes': os.path.getsize(out_path),
+            })
+
+    manifest = {'source_url': source_url, 'source_bytes': os.path.getsize(path), 'variants': variants}
+    manifest_path = _derived_path(path, 'json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def ensure_image_derivatives_table(cursor):
+    """Create ``image_derivatives`` if missing."""
+    cursor.execute(IMAGE_DERIVATIVES_TABLE_SQL)
+
+
+def record_derivatives(cursor, manifest):
+    """Upsert one ``image_derivatives`` row per variant and format in ``manifest``."""
+    cursor.executemany('''
+        INSERT INTO image_derivatives (source_url, variant, format, width, height, url, bytes, source_bytes)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (source_url, variant, format) DO UPDATE SET
+            width = EXCLUDED.width, height = EXCLUDED.height, url = EXCLUDED.url,
+            bytes = EXCLUDED.bytes, source_bytes = EXCLUDED.source_bytes, created_at = NOW()
+    ''', [
+        (manifest['source_url'], row['variant'], row['format'], row['width'], row['height'],
+         row['url'], row['bytes'], manifest['source_bytes'])
+        for row in manifest['variants']
+    ])
+
+
+def load_derivative_savings(cursor):
+    """Per variant and format: images, original bytes and derivative bytes."""
+    cursor.execute('''
+        SELECT variant, format, COUNT(*) AS images,
+               SUM(source_bytes) AS source_bytes, SUM(bytes) AS derivative_bytes
+        FROM image_derivatives
+        GROUP BY variant, format
+        ORDER BY MIN(width), format
+    ''')
+    return cursor.fetchall()
+
+
+def srcset(manifest, fmt):
+    """``url 240w, url 480w, ...`` for one format of a manifest ('' when absent)."""
+    return ', '.join(f"{row['url']} {row['width']}w" for row in manifest['variants'] if row['format'] == fmt)
+
+
+class ImagePipeline:
+    """Background derivative builder plus the per-process manifest lookup used by templates."""
+
+    def __init__(self, static_folder, static_url_path='/static', connect=None, workers=2,
+                 miss_ttl_seconds=30, max_entries=20000):
+        self.static_folder = static_folder
+        self.static_url_path = static_url_path
+        self.connect = connect
+        self.workers = workers
+        self.miss_ttl_seconds = miss_ttl_seconds
+        self.max_entries = max_entries
+        self._executor = None
+        self._manifests = {}
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'processed': 0, 'failed': 0, 'lookups': 0, 'misses': 0}
+        if workers > 0 and not available_formats():
+            print("[IMAGES] Pillow with WebP support not installed; uploads are served as-is")
+
+    @property
+    def enabled(self):
+        return self.workers > 0 and bool(available_formats())
+
+    def submit(self, source_url):
+        """Queue derivatives for a freshly saved upload. Returns False when it won't be processed."""
+        if not self.enabled or source_path(self.static_folder, source_url, self.static_url_path) is None:
+            return False
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-derivatives')
+            self.stats['submitted'] += 1
+        self._executor.submit(self._process, source_url)
+        return True
+
+    def _process(self, source_url):
+        try:
+            manifest = build_derivatives(self.static_folder, source_url, self.static_url_path, force=True)
+        except Exception as err:
+            with self._lock:
+                self.stats['failed'] += 1
+            print(f"[IMAGES] Derivatives failed for {source_url}: {err}")
+            return
+        if manifest is None:
+            return
+        self._remember(source_url, manifest)
+        with self._lock:
+            self.stats['processed'] += 1
+        if self.connect is None:
+            return
+        conn = None
+        try:
+            conn = self.connect()
+            if not conn:
+                return
+            cursor = conn.cursor()
+            record_derivatives(cursor, manifest)
+            conn.commit()
+            cursor.close()
+        except Exception as err:
+            print(f"[IMAGES] Could not record derivatives for {source_url}: {err}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _remember(self, source_url, manifest):
+        with self._lock:
+            if len(self._manifests) >= self.max_entries:
+                self._manifests.clear()
+            self._manifests[source_url] = (manifest, None if manifest else time.time() + self.miss_ttl_seconds)
+
+    def manifest(self, source_url):
+        """Cached ``load_manifest``; a miss is remembered for ``miss_ttl_seconds``."""
+        if not source_url:
+            return None
+        with self._lock:
+            self.stats['lookups'] += 1
+            cached = self._manifests.get(source_url)
+        if cached is not None:
+            manifest, retry_at = cached
+            if manifest is not None or retry_at > time.time():
+                return manifest
+        with self._lock:
+            self.stats['misses'] += 1
+        manifest = load_manifest(self.static_folder, source_url, self.static_url_path)
+        self._remember(source_url, manifest)
+        return manifest
+
+    def sources(self, source_url):
+        """``[{'type': 'image/avif', 'srcset': ...}, ...]`` for a ``<picture>``; empty when unprocessed."""
+        manifest = self.manifest(source_url)
+        if not manifest:
+            return []
+        formats = []
+        for row in manifest['variants']:
+            if row['format'] not in formats:
+                formats.append(row['format'])
+        return [{'type': _MIME_TYPES[fmt], 'srcset': srcset(manifest, fmt)}
+                for fmt in sorted(formats, key=('avif', 'webp').index)]
+
+    def variant_url(self, source_url, variant, fmt='webp'):
+        """URL of one derivative (e.g. the WebP card for JS-rendered grids), else ``source_url``."""
+        manifest = self.manifest(source_url)
+        for row in (manifest or {}).get('variants', ()):
+            if row['format'] == fmt and row['variant'] == variant:
+                return row['url']
+        if manifest and manifest['variants']:
+            # Narrow sources stop before the larger variants; use the widest one written.
+            widest = [row for row in manifest['variants'] if row['format'] == fmt]
+            if widest:
+                return widest[-1]['url']
+        return source_url
@@ -0,0 +1,263 @@
+"""
+Bounded lookup cache with an optional cross-process tier.
+
+Used for slow-changing reference lookups (PSGC lists, postal codes) that were
+previously kept in unbounded per-process dicts. Each ``LookupCache`` has:
+
+  - an in-process LRU capped at ``max_entries``
+  - an optional ``SQLiteCacheStore`` shared by every gunicorn worker on the host
+  - stale-while-revalidate: an entry past its TTL but inside ``stale_seconds``
+    is returned immediately while a single background thread refreshes it;
+    ``refresh_context`` (e.g. ``app.app_context``) is entered around that
+    thread's ``loader()`` call only, never around a caller's own load
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SQLiteCacheStore:
+    """Tiny key/value store in a local SQLite file that all workers can read."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookup_cache (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        """)
+        conn.commit()
+
+    def _connection(self):
+        # Connections are per thread and never reused across a gunicorn fork.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace, key):
+        """Return ``(expires_at, value)`` or None."""
+        row = self._connection().execute(
+            'SELECT expires_at, payload FROM lookup_cache WHERE namespace = ? AND cache_key = ?',
+            (namespace, key)
+        ).fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, namespace, key, expires_at, value):
+        self._connection().execute(
+            'INSERT OR REPLACE INTO lookup_cache (namespace, cache_key, expires_at, payload) VALUES (?, ?, ?, ?)',
+            (namespace, key, expires_at, json.dumps(value))
+        )
+
+    def delete(self, namespace, key):
+        self._connection().execute(
+            'DELETE FROM lookup_cache WHERE namespace = ? AND cache_key = ?',
+            (namespace, key)
+        )
+
+    def entries_after(self, namespace, after_key):
+        """Unexpired ``(key, value)`` pairs with keys sorting after ``after_key``, in key order."""
+        rows = self._connection().execute(
+            'SELECT cache_key, payload FROM lookup_cache'
+            ' WHERE namespace = ? AND cache_key > ? AND expires_at > ? ORDER BY cache_key',
+            (namespace, after_key, time.time())
+        ).fetchall()
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def purge_expired(self, namespace):
+        self._connection().execute(
+            'DELETE FROM lookup_cache WHERE namespace = ? AND expires_at <= ?',
+            (namespace, time.time())
+        )
+
+
+class LookupCache:
+    """LRU + shared-tier cache with stale-while-revalidate."""
+
+    def __init__(self, namespace, ttl_seconds, max_entries=1024, stale_seconds=0, shared_store=None,
+                 refresh_context=None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.shared_store = shared_store
+        self.refresh_context = refresh_context or contextlib.nullcontext
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = {'hits': 0, 'shared_hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+
+    def _remember(self, key, expires_at, value):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _lookup(self, key):
+        """Return ``(expires_at, value)`` from memory, then the shared tier."""
+        with self._lock:
+            local = self._entries.get(key)
+            if local is not None:
+                self._entries.move_to_end(key)
+
+        # A locally expired entry may already have been refreshed by another worker.
+        if self.shared_store is None or (local is not None and local[0] >= time.time()):
+            return local, False
+        try:
+            shared = self.shared_store.get(self.namespace, key)
+        except sqlite3.Error as err:
+            print(f"[CACHE] shared tier read failed for {self.namespace}: {err}")
+            return local, False
+        if shared is None or (local is not None and shared[0] <= local[0]):
+            return local, False
+        self._remember(key, shared[0], shared[1])
+        return shared, True
+
+    def get(self, key):
+        """Return a fresh cached value or None."""
+        entry, from_shared = self._lookup(key)
+        if entry is None or entry[0] < time.time():
+            return None
+        self.stats['shared_hits' if from_shared else 'hits'] += 1
+        return entry[1]
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, value)
+        if self.shared_store is not None:
+            try:
+                self.shared_store.set(self.namespace, key, expires_at, value)
+            except sqlite3.Error as err:
+                print(f"[CACHE] shared tier write failed for {self.namespace}: {err}")
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.shared_store is not None:
+            try:
+                self.shared_store.delete(self.namespace, key)
+            except sqlite3.Error:
+                pass
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        Expired entries still inside the stale window are returned as-is while
+        one background thread reloads them. ``loader`` returning None means
+        "do not cache"; exceptions from ``loader`` propagate on a hard miss.
+        """
+        entry, from_shared = self._lookup(key)
+        now = time.time()
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at >= now:
+                self.stats['shared_hits' if from_shared else 'hits'] += 1
+                return value
+            if expires_at + self.stale_seconds >= now:
+                self.stats['stale_hits'] += 1
+                self._refresh_in_background(key, loader)
+                return value
+
+        self.stats['misses'] += 1
+        value = loader()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                with self.refresh_context():
+                    value = loader()
+                if value is not None:
+                    self.set(key, value)
+                    self.stats['refreshes'] += 1
+            except Exception as err:
+                print(f"[CACHE] background refresh failed for {self.namespace}:{key}: {err}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"cache-refresh-{self.namespace}", daemon=True).start()
+
+
+class VersionStamps:
+    """Per-key version counters that every worker sees through the shared store.
+
+    Caches remember the stamp an entry was built under and treat the entry as
+    stale once the stamp moves, so ``bump`` invalidates it in every process
+    on the host. Without a shared store the counters are process-local.
+    """
+
+    # Stamps only need to outlive the entries they guard; the store never expires them anyway.
+    TTL_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, namespace, shared_store=None):
+        self.namespace = namespace
+        self.shared_store = shared_store
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Current stamp for ``key``; None when the shared tier can't be read."""
+        key = str(key)
+        if self.shared_store is None:
+            with self._lock:
+                return self._local.get(key, 0)
+        try:
+            stored = self.shared_store.get(self.namespace, key)
+        except sqlite3.Error as err:
+            print(f"[CACHE] version read failed for {self.namespace}:{key}: {err}")
+            return None
+        return stored[1] if stored else 0
+
+    def bump(self, key):
+        key = str(key)
+        with self._lock:
+            self._local[key] = self._local.get(key, 0) + 1
+        if self.shared_store is None:
+            return
+        try:
+            stored = self.shared_store.get(self.namespace, key)
+            # time_ns keeps stamps moving forward even if two workers bump at once.
+            version = max(time.time_ns(), (stored[1] + 1) if stored else 0)
+            self.shared_store.set(self.namespace, key, time.time() + self.TTL_SECONDS, version)
+        except sqlite3.Error as err:
+            print(f"[CACHE] version bump failed for {self.namespace}:{key}: {err}")
+
+
+def build_shared_store(path):
+    """Return a ``SQLiteCacheStore`` for ``path`` or None when disabled/unavailable."""
+    if not path or path.strip().lower() in {'off', 'none', 'false', '0'}:
+        return None
+    try:
+        return SQLiteCacheStore(path)
+    except (sqlite3.Error, OSError) as err:
+        print(f"[CACHE] shared lookup cache disabled ({path}): {err}")
+        return None
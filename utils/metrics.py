@@ -0,0 +1,292 @@
+"""
+Prometheus text-format metrics shared across gunicorn workers.
+
+We run several gunicorn workers with no view of per-route latency, error
+rates, pool saturation (``pool_size=3``, ``max_overflow=5``) or how often
+``get_db()`` sleeps in its retry loop. The caches and background pools
+each kept counters, but only ``/admin/cache-stats`` read them, and only for
+the worker that answered.
+
+``MetricsRegistry`` keeps counters and histograms in memory; updating one is
+a dict update under a lock. Each worker writes its values to
+``<directory>/<pid>-<token>.json`` every ``flush_seconds`` and again just
+before it serves a scrape. ``render()`` merges every worker's file and
+prints the Prometheus text format (0.0.4):
+
+* counters and histograms are summed over all files. A worker whose file
+  has not been rewritten within ``3 * flush_seconds`` is gone (restart,
+  crash). Its totals are folded into ``retired.json`` so counters keep
+  rising across restarts;
+* gauges (pool in use, queue depth) are summed over live workers only.
+
+Values that other objects already count (cache ``stats`` dicts, pool
+status) are read when a snapshot is taken, through ``add_collector``
+callbacks. That keeps every hot path free of metrics code.
+With ``directory=None`` the registry only reports its own process.
+"""
+import fcntl
+import json
+import math
+import os
+import threading
+import time
+import uuid
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RETIRED_FILE = 'retired.json'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _label_key(labels):
+    return json.dumps(sorted((labels or {}).items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Counters, histograms and collector-fed values for one worker, plus the cross-worker merge."""
+
+    def __init__(self, namespace, directory=None, flush_seconds=15):
+        self.namespace = namespace
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._meta = {}  # name -> (type, help, buckets)
+        self._collectors = []
+        self._pid = None
+        self._token = None
+        self._reset_values()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _reset_values(self):
+        self._counters = {}
+        self._histograms = {}
+
+    # --- definitions -------------------------------------------------
+
+    def counter(self, name, help_text):
+        self._meta[f'{self.namespace}_{name}'] = ('counter', help_text, None)
+
+    def gauge(self, name, help_text):
+        self._meta[f'{self.namespace}_{name}'] = ('gauge', help_text, None)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self._meta[f'{self.namespace}_{name}'] = ('histogram', help_text, tuple(buckets))
+
+    def add_collector(self, collect):
+        """``collect()`` returns ``[(name, kind, labels, value), ...]`` read at snapshot time.
+
+        ``kind`` is 'counter' (a running total this process keeps) or 'gauge'.
+        """
+        self._collectors.append(collect)
+
+    # --- updates -----------------------------------------------------
+
+    def inc(self, name, labels=None, amount=1):
+        key = (f'{self.namespace}_{name}', _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=None):
+        full_name = f'{self.namespace}_{name}'
+        buckets = self._meta[full_name][2]
+        key = (full_name, _label_key(labels))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    entry['buckets'][index] += 1
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def ensure_worker(self):
+        """Call at the start of each request. After a fork, starts this worker's flush thread."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                self._reset_values()  # inherited from the preloading parent
+            self._pid = pid
+            self._token = uuid.uuid4().hex[:8]
+        if self.directory and self.flush_seconds > 0:
+            thread = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+            thread.start()
+
+    # --- snapshots and merge ------------------------------------------
+
+    def snapshot(self):
+        """This worker's counters, histograms and collected values as JSON-ready dicts."""
+        counters = {}
+        gauges = {}
+        with self._lock:
+            for (name, key), value in self._counters.items():
+                counters.setdefault(name, {})[key] = value
+            histograms = {}
+            for (name, key), entry in self._histograms.items():
+                histograms.setdefault(name, {})[key] = dict(entry, buckets=list(entry['buckets']))
+        for collect in self._collectors:
+            try:
+                rows = collect()
+            except Exception as err:
+                print(f"[METRICS] Collector {getattr(collect, '__name__', collect)} failed: {err}")
+                continue
+            for name, kind, labels, value in rows:
+                target = counters if kind == 'counter' else gauges
+                target.setdefault(f'{self.namespace}_{name}', {})[_label_key(labels)] = value
+        return {'counters': counters, 'histograms': histograms, 'gauges': gauges, 'written_at': time.time()}
+
+    def _own_path(self):
+        return os.path.join(self.directory, f'{self._pid or os.getpid()}-{self._token or "main"}.json')
+
+    def flush(self):
+        if not self.directory:
+            return
+        path = self._own_path()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(tmp_path, path)
+
+    def _flush_loop(self):
+        pid = self._pid
+        while self._pid == pid:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as err:
+                print(f"[METRICS] Could not write worker metrics: {err}")
+
+    @staticmethod
+    def _merge(total, snapshot, include_gauges):
+        for section in ('counters', 'gauges') if include_gauges else ('counters',):
+            for name, series in snapshot.get(section, {}).items():
+                merged = total[section].setdefault(name, {})
+                for key, value in series.items():
+                    merged[key] = merged.get(key, 0) + value
+        for name, series in snapshot.get('histograms', {}).items():
+            merged = total['histograms'].setdefault(name, {})
+            for key, entry in series.items():
+                current = merged.get(key)
+                if current is None or len(current['buckets']) != len(entry['buckets']):
+                    merged[key] = dict(entry, buckets=list(entry['buckets']))
+                    continue
+                current['buckets'] = [a + b for a, b in zip(current['buckets'], entry['buckets'])]
+                current['sum'] += entry['sum']
+                current['count'] += entry['count']
+
+    def collect_all(self):
+        """Merged values of every worker (or just this one without a directory)."""
+        total = {'counters': {}, 'histograms': {}, 'gauges': {}}
+        if not self.directory:
+            self._merge(total, self.snapshot(), include_gauges=True)
+            return total
+        self.flush()
+        own = os.path.basename(self._own_path())
+        stale_before = time.time() - 3 * max(self.flush_seconds, 1)
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_handle:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                retired_path = os.path.join(self.directory, RETIRED_FILE)
+                retired = self._read(retired_path) or {'counters': {}, 'histograms': {}, 'gauges': {}}
+                retired_changed = False
+                for name in sorted(os.listdir(self.directory)):
+                    if not name.endswith('.json') or name == RETIRED_FILE:
+                        continue
+                    path = os.path.join(self.directory, name)
+                    snapshot = self._read(path)
+                    if snapshot is None:
+                        continue
+                    if name != own and snapshot.get('written_at', 0) < stale_before:
+                        self._merge(retired, snapshot, include_gauges=False)
+                        retired_changed = True
+                        os.remove(path)
+                        continue
+                    self._merge(total, snapshot, include_gauges=True)
+                if retired_changed:
+                    with open(retired_path + '.tmp', 'w', encoding='utf-8') as handle:
+                        json.dump(retired, handle)
+                    os.replace(retired_path + '.tmp', retired_path)
+                self._merge(total, retired, include_gauges=False)
+            finally:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+        return total
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def render(self):
+        """Prometheus text exposition of ``collect_all()``."""
+        total = self.collect_all()
+        lines = []
+        names = sorted(set(self._meta) | set(total['counters']) | set(total['gauges']) | set(total['histograms']))
+        for name in names:
+            kind, help_text, buckets = self._meta.get(name, (None, '', None))
+            if kind is None:
+                kind = 'gauge' if name in total['gauges'] else 'counter'
+            series = total['histograms' if kind == 'histogram' else 'gauges' if kind == 'gauge' else 'counters'].get(name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key in sorted(series):
+                labels = [tuple(pair) for pair in json.loads(key)]
+                value = series[key]
+                if kind != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+                bounds = buckets or ()
+                for bound, count in zip(bounds, value['buckets']):
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", _format_value(bound))])} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value["count"]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def timed(registry, name, labels=None):
+    """Context manager observing the block's duration; adds ``outcome="ok|error"`` to ``labels``."""
+    return _Timer(registry, name, labels)
+
+
+class _Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = dict(labels or {})
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.labels['outcome'] = 'ok' if exc_type is None else 'error'
+        self.registry.observe(self.name, time.perf_counter() - self.started, self.labels)
+        return False
@@ -0,0 +1,131 @@
+"""
+Paginated order history for /api/my-orders.
+
+The buyer's order list used to load every order they ever placed and then
+run an order_items query, a reviews check and a rider_ratings check per
+order. ``load_order_history`` reads one page of orders and fills in the
+items, review flags and rating flags for the whole page with ``= ANY(%s)``
+batch queries, so a page costs the same handful of statements whether the
+buyer has 5 orders or 5,000.
+
+Pages are keyed on ``(created_at, id)`` of the last order shown; the cursor
+handed back to the client is that order's id.
+"""
+
+ORDER_HISTORY_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_orders_user_history
+    ON orders (user_id, created_at DESC, id DESC)
+'''
+
+
+def ensure_order_history_index(cursor):
+    """Create the (user_id, created_at, id) index the history pages walk."""
+    cursor.execute(ORDER_HISTORY_INDEX_SQL)
+
+
+def load_order_history(cursor, user_id, limit, before_id=None):
+    """Return ``(orders, has_more)`` for one page of ``user_id``'s orders, newest first.
+
+    ``before_id`` is the id of the last order of the previous page. Every
+    order carries ``items``, ``has_product_review`` and ``has_rider_rating``.
+    """
+    keyset = ''
+    params = [user_id]
+    if before_id is not None:
+        keyset = '''
+            AND (o.created_at, o.id) < (
+                SELECT created_at, id FROM orders WHERE id = %s AND user_id = %s
+            )
+        '''
+        params.extend([before_id, user_id])
+    params.append(limit + 1)
+
+    cursor.execute(f'''
+        SELECT o.id, o.order_number, o.total_amount, o.order_status, o.payment_status, o.created_at,
+               COALESCE(s.rider_id, o.rider_id) as rider_id,
+               u.first_name, u.email,
+               s.id as shipment_id, s.status as shipment_status, s.delivered_at
+        FROM orders o
+        JOIN users u ON o.user_id = u.id
+        LEFT JOIN LATERAL (
+            SELECT sh.id, sh.rider_id, sh.status, sh.delivered_at
+            FROM shipments sh
+            WHERE sh.order_id = o.id
+            ORDER BY sh.id DESC
+            LIMIT 1
+        ) s ON TRUE
+        WHERE o.user_id = %s
+        {keyset}
+        ORDER BY o.created_at DESC, o.id DESC
+        LIMIT %s
+    ''', params)
+    orders = cursor.fetchall()
+
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+    attach_order_details(cursor, user_id, orders)
+    return orders, has_more
+
+
+def attach_order_details(cursor, user_id, orders):
+    """Fill ``items`` and the review/rating flags for ``orders`` in three queries."""
+    if not orders:
+        return orders
+
+    order_ids = [order['id'] for order in orders]
+    for order in orders:
+        order['items'] = []
+        order['has_product_review'] = False
+        order['has_rider_rating'] = False
+    by_id = {order['id']: order for order in orders}
+
+    cursor.execute('''
+        SELECT oi.id, oi.order_id, oi.product_id, oi.quantity, oi.unit_price, oi.subtotal,
+               p.name as product_name, img.image_url
+        FROM order_items oi
+        LEFT JOIN products p ON oi.product_id = p.id
+        LEFT JOIN LATERAL (
+            SELECT pi.image_url
+            FROM product_images pi
+            WHERE pi.product_id = oi.product_id
+            ORDER BY (pi.is_primary::int = 1) DESC, pi.id
+            LIMIT 1
+        ) img ON TRUE
+        WHERE oi.order_id = ANY(%s)
+        ORDER BY oi.order_id, oi.id
+    ''', (order_ids,))
+    for item in cursor.fetchall():
+        by_id[item.pop('order_id')]['items'].append(item)
+
+    # The buyer reviews an order through its first product.
+    cursor.execute('''
+        SELECT DISTINCT order_id, product_id
+        FROM reviews
+        WHERE user_id = %s AND order_id = ANY(%s)
+    ''', (user_id, order_ids))
+    reviewed = {(row['order_id'], row['product_id']) for row in cursor.fetchall()}
+
+    cursor.execute('''
+        SELECT DISTINCT order_id, rider_id
+        FROM rider_ratings
+        WHERE user_id = %s AND order_id = ANY(%s)
+    ''', (user_id, order_ids))
+    rated = {(row['order_id'], row['rider_id']) for row in cursor.fetchall()}
+
+    for order in orders:
+        if order['items']:
+            order['has_product_review'] = (order['id'], order['items'][0]['product_id']) in reviewed
+        if order.get('rider_id'):
+            order['has_rider_rating'] = (order['id'], order['rider_id']) in rated
+    return orders
+
+
+def count_orders_by_status(cursor, user_id):
+    """Return ``{order_status: count}`` over all of ``user_id``'s orders."""
+    cursor.execute('''
+        SELECT order_status, COUNT(*) as order_count
+        FROM orders
+        WHERE user_id = %s
+        GROUP BY order_status
+    ''', (user_id,))
+    return {row['order_status']: int(row['order_count']) for row in cursor.fetchall()}
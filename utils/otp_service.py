@@ -7,6 +7,7 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 import requests
 from dotenv import load_dotenv
+from utils.email_outbox import get_default_outbox
 
 
 load_dotenv()
@@ -150,6 +151,14 @@ class OTPService:
             </html>
             """
 
+            # Queued for the outbox workers when the app runs one; inline SMTP otherwise.
+            outbox = get_default_outbox()
+            if outbox is not None:
+                queued = outbox.enqueue(email, msg['Subject'], body, sender=OTPService.MAIL_DEFAULT_SENDER)
+                if queued:
+                    print(f"✓ OTP email queued for {email}")
+                return queued
+
             msg.attach(MIMEText(body, 'html'))
 
             # Send email with proper resource management
@@ -434,7 +443,7 @@ class OTPService:
             return False
 
     @staticmethod
-    def send_order_confirmation_email(email, order_number, order_data):
+    def send_order_confirmation_email(email, order_number, order_data, cursor=None):
         """
         Send order confirmation email to buyer
 
@@ -442,6 +451,8 @@ class OTPService:
             email: Buyer's email address
             order_number: Order number
             order_data: Dictionary containing order details (items, total, shipping_address, etc.)
+            cursor: Optional cursor of the checkout transaction; the email is
+                queued inside it so it only goes out if the order commits
 
         Returns:
             bool: True if sent successfully, False otherwise
@@ -559,10 +570,18 @@ class OTPService:
             </html>
             """
 
+            outbox = get_default_outbox()
+            if outbox is not None:
+                queued = outbox.enqueue(email, msg['Subject'], body, cursor=cursor,
+                                        sender=OTPService.MAIL_DEFAULT_SENDER)
+                if queued:
+                    print(f"✅ Order confirmation email queued for {email} for order {order_number}")
+                return queued
+
             msg.attach(MIMEText(body, 'html'))
 
 
-            server = smtplib.SMTP(OTPService.MAIL_SERVER, OTPService.MAIL_PORT)
+            server = smtplib.SMTP(OTPService.MAIL_SERVER, OTPService.MAIL_PORT, timeout=10)
             if OTPService.MAIL_USE_TLS:
                 server.starttls()
             server.login(OTPService.MAIL_USERNAME, OTPService.MAIL_PASSWORD)
@@ -0,0 +1,115 @@
+"""
+Rendered-page and fragment cache for the public storefront pages.
+
+``index``, ``product_page`` and ``brand_store_page`` rebuild the same public
+content from several queries on every hit. Two ``PageCache`` instances sit in
+front of them:
+
+  - a fragment cache holding the query results each page is rendered from,
+    shared by every viewer (logged-in pages still render per request, since
+    the navbar and buttons depend on the session)
+  - a response cache holding the fully rendered HTML for anonymous viewers,
+    who all see the same page
+
+Entries are tagged with content scopes (``product:<id>``, ``brand:<seller_id>``,
+``home``, and ``brands`` for the store-slug lookup). Writes that change what a
+page shows call ``invalidate(scope)``, which bumps the scope's
+``VersionStamps`` entry; every worker compares the stamps before serving an
+entry. The TTL only has to cover changes that have
+no hook, such as sold counts moving with every order.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from utils.lookup_cache import VersionStamps
+
+
+class PageCache:
+    """LRU of rendered pages or page data, validated against scope versions."""
+
+    def __init__(self, name, ttl_seconds, max_entries, versions):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.versions = versions
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _stamp(self, scopes):
+        stamp = tuple(self.versions.get(scope) for scope in scopes)
+        return None if None in stamp else stamp
+
+    def get_or_render(self, key, scopes, render):
+        """Return ``(value, hit)`` for ``key``, calling ``render()`` on a miss.
+
+        The entry is reused while every scope in ``scopes`` keeps the version
+        it had before ``render`` ran. ``render`` returning None (not found,
+        DB down) is never cached.
+        """
+        stamp = self._stamp(scopes)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now and stamp is not None and entry[1] == stamp:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[2], True
+            self.stats['misses'] += 1
+
+        value = render()
+        if value is None or stamp is None:
+            return value, False
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return value, False
+
+    def hit_ratio(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / float(lookups) if lookups else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            entries = len(self._entries)
+        return dict(self.stats, entries=entries, hit_ratio=round(self.hit_ratio(), 4))
+
+
+class PageCacheSet:
+    """The fragment and response caches plus the scope versions they share."""
+
+    def __init__(self, ttl_seconds, fragment_entries=4096, response_entries=256, shared_store=None):
+        self.versions = VersionStamps('page_version', shared_store)
+        self.fragments = PageCache('fragments', ttl_seconds, fragment_entries, self.versions)
+        self.responses = PageCache('responses', ttl_seconds, response_entries, self.versions)
+        self.invalidations = 0
+
+    def invalidate(self, *scopes):
+        """Make every worker rebuild pages tagged with any of ``scopes``."""
+        for scope in scopes:
+            if scope:
+                self.versions.bump(scope)
+                self.invalidations += 1
+
+    def snapshot(self):
+        return {
+            'fragments': self.fragments.snapshot(),
+            'responses': self.responses.snapshot(),
+            'invalidations': self.invalidations,
+        }
+
+
+def product_scope(product_id):
+    return f'product:{int(product_id)}'
+
+
+def brand_scope(seller_id):
+    return f'brand:{int(seller_id)}'
+
+
+HOME_SCOPE = 'home'
+BRANDS_SCOPE = 'brands'
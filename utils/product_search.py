@@ -0,0 +1,366 @@
+"""
+Ranked product search with facets and keyset pagination.
+
+``/api/products?search=`` used ``p.name LIKE '%term%' OR p.description LIKE
+... OR p.brand LIKE ...``. That was case-sensitive, could not use an index,
+and returned matches newest first with no notion of relevance. The brand
+strip ran the same kind of pattern over ``sellers`` joined to every product.
+
+Each product now carries a ``search_vector`` tsvector, kept current by a
+trigger and indexed with GIN. The terms are weighted:
+
+    A  name     B  brand     C  category name     D  description
+
+Both the documents and the queries use the ``simple`` configuration: the
+catalog mixes English and Filipino, and English stemming would mangle the
+Filipino words. Every query term is matched as a prefix (``shoe:*`` also
+matches ``shoes``), so plural and partial words still hit.
+
+Where the ``pg_trgm`` extension can be created, a trigram GIN index on
+name + brand adds typo tolerance: a product matches when the query is
+word-similar to its name (``<%``), even if no term matches, and the
+similarity is added to the ``ts_rank_cd`` score.
+``ensure_product_search`` skips the trigram part when the extension is
+unavailable, and search then works without typo tolerance.
+
+Results are ordered by relevance, then id. The browse grid (no search term)
+is newest first by id: ids follow insert order, and ``created_at`` is NULL
+for products inserted through raw SQL, so it cannot be the sort key. Pages are addressed by keyset cursors
+holding the last row's sort key, so page N costs the same as page 1 and
+rows do not shift when products are added. Only ids are fetched in sort
+order. The page is then decorated by ``utils.catalog``, with one query each
+for colors and promotions. The first page of a search also returns facet
+counts by category and price band. Each facet ignores its own filter, so
+the other options stay visible once one is picked.
+"""
+import base64
+import json
+import re
+from decimal import Decimal
+
+from utils.catalog import LISTING_PAGE_QUERY, decorate_listing
+
+SEARCH_CONFIG = 'simple'
+MAX_TERMS = 8
+MAX_PAGE_SIZE = 200
+TRIGRAM_MIN_LENGTH = 3
+TRIGRAM_RANK_WEIGHT = 0.5
+
+# (label, lower bound inclusive, upper bound exclusive or None); the index is the ``price_band`` key.
+PRICE_BANDS = (
+    ('Under ₱500', 0, 500),
+    ('₱500 – ₱999', 500, 1000),
+    ('₱1,000 – ₱2,499', 1000, 2500),
+    ('₱2,500 – ₱4,999', 2500, 5000),
+    ('₱5,000 and up', 5000, None),
+)
+
+_TERM = re.compile(r'[^\W_]+')
+
+SEARCH_DOCUMENT_FUNCTION_SQL = f"""
+    CREATE OR REPLACE FUNCTION product_search_document(p_name TEXT, p_brand TEXT, p_category_id INTEGER, p_description TEXT)
+    RETURNS tsvector LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p_name, '')), 'A')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p_brand, '')), 'B')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce((SELECT name FROM categories WHERE id = p_category_id), '')), 'C')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p_description, '')), 'D')
+    $$
+"""
+
+PRODUCTS_TRIGGER_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION products_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := product_search_document(NEW.name, NEW.brand, NEW.category_id, NEW.description);
+        RETURN NEW;
+    END
+    $$
+"""
+
+CATEGORIES_TRIGGER_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION categories_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NEW.name IS DISTINCT FROM OLD.name THEN
+            UPDATE products
+            SET search_vector = product_search_document(name, brand, category_id, description)
+            WHERE category_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+"""
+
+TRIGGERS = (
+    ('products_search_vector', 'products',
+     'BEFORE INSERT OR UPDATE OF name, brand, category_id, description ON products '
+     'FOR EACH ROW EXECUTE FUNCTION products_search_vector_refresh()'),
+    ('categories_search_vector', 'categories',
+     'AFTER UPDATE OF name ON categories FOR EACH ROW EXECUTE FUNCTION categories_search_vector_refresh()'),
+)
+
+# Must match the trigram index expression exactly for the planner to use it.
+SEARCH_NAME_SQL = "lower(coalesce(p.name, '') || ' ' || coalesce(p.brand, ''))"
+TRIGRAM_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_products_search_trgm
+    ON products USING GIN ((lower(coalesce(name, '') || ' ' || coalesce(brand, ''))) gin_trgm_ops)
+"""
+
+_ACTIVE_SQL = "p.is_active::int = 1 AND (p.archive_status IS NULL OR p.archive_status = 'active')"
+
+
+def ensure_product_search(cursor, backfill=True):
+    """Create the search column, triggers and indexes; return True if the trigram index is usable.
+
+    ``backfill`` fills ``search_vector`` for rows written before the trigger existed.
+    """
+    cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    cursor.execute(SEARCH_DOCUMENT_FUNCTION_SQL)
+    cursor.execute(PRODUCTS_TRIGGER_FUNCTION_SQL)
+    cursor.execute(CATEGORIES_TRIGGER_FUNCTION_SQL)
+    for name, table, definition in TRIGGERS:
+        # Only create missing triggers: DROP/CREATE on every start would lock products each time.
+        cursor.execute(
+            "SELECT 1 FROM pg_trigger WHERE tgname = %s AND tgrelid = %s::regclass", (name, table)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(f"CREATE TRIGGER {name} {definition}")
+    if backfill:
+        cursor.execute("""
+            UPDATE products
+            SET search_vector = product_search_document(name, brand, category_id, description)
+            WHERE search_vector IS NULL
+        """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_search_vector ON products USING GIN (search_vector)")
+
+    cursor.execute("SAVEPOINT product_search_trgm")
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(TRIGRAM_INDEX_SQL)
+    except Exception as err:
+        cursor.execute("ROLLBACK TO SAVEPOINT product_search_trgm")
+        print(f"[SEARCH] pg_trgm unavailable, searching without typo tolerance: {err}")
+        return False
+    finally:
+        cursor.execute("RELEASE SAVEPOINT product_search_trgm")
+    return True
+
+
+def parse_terms(text):
+    """Lowercased word tokens of a search box value, at most ``MAX_TERMS``."""
+    return _TERM.findall((text or '').lower())[:MAX_TERMS]
+
+
+def prefix_tsquery(terms, weights=''):
+    """``to_tsquery`` text matching every term as a prefix, e.g. ``red:* & shoe:*``."""
+    return ' & '.join(f'{term}:*{weights}' for term in terms)
+
+
+def encode_cursor(sort_value, product_id):
+    raw = json.dumps([str(sort_value), int(product_id)]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """``(sort_value, product_id)`` from ``encode_cursor``; ValueError if it was tampered with."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, product_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return Decimal(sort_value), int(product_id)
+    except (TypeError, ValueError, UnicodeError, ArithmeticError):
+        raise ValueError('Invalid cursor') from None
+
+
+def _like_pattern(text):
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+class ProductSearch:
+    """Builds and runs the search, browse and facet statements.
+
+    ``trigram`` is None until the first search checks for ``pg_trgm``;
+    pass False to turn typo tolerance off.
+    """
+
+    def __init__(self, trigram=None):
+        self.trigram = trigram
+
+    def _trigram_enabled(self, cursor):
+        if self.trigram is None:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            row = cursor.fetchone()
+            self.trigram = bool(row['exists'] if isinstance(row, dict) else row[0])
+        return self.trigram
+
+    def _match_clause(self, cursor, terms, params):
+        """WHERE fragment and rank expression for ``terms``; adds their parameters to ``params``."""
+        params['tsquery'] = prefix_tsquery(terms)
+        match = f"p.search_vector @@ to_tsquery('{SEARCH_CONFIG}', %(tsquery)s)"
+        rank = f"ts_rank_cd(p.search_vector, to_tsquery('{SEARCH_CONFIG}', %(tsquery)s), 1)"
+        raw = ' '.join(terms)
+        if len(raw) >= TRIGRAM_MIN_LENGTH and self._trigram_enabled(cursor):
+            params['raw'] = raw
+            match = f"({match} OR %(raw)s <%% {SEARCH_NAME_SQL})"
+            rank = f"{rank} + {TRIGRAM_RANK_WEIGHT} * word_similarity(%(raw)s, {SEARCH_NAME_SQL})"
+        return match, f"round(({rank})::numeric, 6)"
+
+    @staticmethod
+    def _filter_clauses(params, category_ids, price_band):
+        """``(category_sql, price_sql)``; either is '' when that filter is not set."""
+        category_sql = price_sql = ''
+        if category_ids:
+            params['category_ids'] = list(category_ids)
+            category_sql = " AND p.category_id = ANY(%(category_ids)s)"
+        if price_band is not None:
+            _, low, high = PRICE_BANDS[price_band]
+            params['price_low'] = low
+            price_sql = " AND p.price >= %(price_low)s"
+            if high is not None:
+                params['price_high'] = high
+                price_sql += " AND p.price < %(price_high)s"
+        return category_sql, price_sql
+
+    def search(self, cursor, text='', limit=50, category_ids=None, price_band=None, after=None):
+        """One page of decorated listing rows.
+
+        Args:
+            cursor: RealDictCursor on an open connection
+            text: Search box value; empty means browse, newest first
+            limit: Page size, capped at ``MAX_PAGE_SIZE``
+            category_ids: Optional list of already-expanded category ids
+            price_band: Optional index into ``PRICE_BANDS``
+            after: ``next_cursor`` of the previous page
+
+        Returns:
+            dict: ``products``, ``next_cursor`` (None on the last page) and
+            ``facets`` (first page of a search only, else None)
+
+        Raises:
+            ValueError: ``after`` or ``price_band`` is invalid
+        """
+        limit = max(1, min(int(limit or 50), MAX_PAGE_SIZE))
+        if price_band is not None and not 0 <= price_band < len(PRICE_BANDS):
+            raise ValueError('Invalid price band')
+        terms = parse_terms(text)
+        params = {'limit': limit + 1}
+        category_sql, price_sql = self._filter_clauses(params, category_ids, price_band)
+
+        if terms:
+            match_sql, rank_sql = self._match_clause(cursor, terms, params)
+            sort_sql, order_sql = rank_sql, 'sort_key DESC, id DESC'
+            where_sql = f"{_ACTIVE_SQL} AND {match_sql}{category_sql}{price_sql}"
+            keyset_sql = "(sort_key, id) < (%(after_key)s, %(after_id)s)"
+        else:
+            sort_sql, order_sql = 'p.id', 'id DESC'
+            where_sql = f"{_ACTIVE_SQL}{category_sql}{price_sql}"
+            keyset_sql = "id < %(after_id)s"
+
+        page_sql = f"SELECT p.id, {sort_sql} AS sort_key FROM products p WHERE {where_sql}"
+        if after:
+            params['after_key'], params['after_id'] = decode_cursor(after)
+            page_sql = f"SELECT * FROM ({page_sql}) ranked WHERE {keyset_sql}"
+        cursor.execute(f"{page_sql} ORDER BY {order_sql} LIMIT %(limit)s", params)
+        page = cursor.fetchall()
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1]['sort_key'], page[-1]['id'])
+
+        facets = None
+        if terms and not after:
+            facets = self.facets(cursor, terms, category_ids, price_band)
+        # Last: decorate_listing tolerates a failing promotions query, which aborts the transaction.
+        products = self._load_listing(cursor, [row['id'] for row in page])
+        return {'products': products, 'next_cursor': next_cursor, 'facets': facets}
+
+    @staticmethod
+    def _load_listing(cursor, product_ids):
+        if not product_ids:
+            return []
+        cursor.execute(LISTING_PAGE_QUERY + " AND p.id = ANY(%s)", (product_ids,))
+        by_id = {row['id']: row for row in cursor.fetchall()}
+        products = [by_id[product_id] for product_id in product_ids if product_id in by_id]
+        for product in products:
+            product['price'] = float(product['price']) if product['price'] else 0
+            product['id'] = int(product['id'])
+            product['category_id'] = int(product['category_id']) if product['category_id'] else None
+        decorate_listing(cursor, products)
+        return products
+
+    def facets(self, cursor, terms, category_ids=None, price_band=None):
+        """Match counts by category (ignoring the category filter) and by price band (ignoring the band)."""
+        params = {'band_edges': [low for _, low, _ in PRICE_BANDS[1:]]}
+        match_sql, _ = self._match_clause(cursor, terms, params)
+        category_sql, price_sql = self._filter_clauses(params, category_ids, price_band)
+        cursor.execute(f"""
+            WITH matches AS (
+                SELECT p.category_id, p.price,
+                       TRUE{category_sql} AS in_category,
+                       TRUE{price_sql} AS in_band
+                FROM products p
+                WHERE {_ACTIVE_SQL} AND {match_sql}
+            )
+            SELECT 'category' AS facet, m.category_id AS key, c.name, COUNT(*) AS count
+            FROM matches m LEFT JOIN categories c ON c.id = m.category_id
+            WHERE m.in_band
+            GROUP BY m.category_id, c.name
+            UNION ALL
+            SELECT 'price', width_bucket(m.price, %(band_edges)s::numeric[]), NULL, COUNT(*)
+            FROM matches m
+            WHERE m.in_category AND m.price IS NOT NULL
+            GROUP BY 2
+        """, params)
+        categories = []
+        bands = {}
+        for row in cursor.fetchall():
+            if row['facet'] == 'category':
+                categories.append({'id': row['key'], 'name': row['name'], 'count': int(row['count'])})
+            else:
+                bands[row['key']] = int(row['count'])
+        categories.sort(key=lambda entry: (-entry['count'], entry['name'] or ''))
+        price_bands = [
+            {'key': index, 'label': label, 'min': low, 'max': high, 'count': bands.get(index, 0)}
+            for index, (label, low, high) in enumerate(PRICE_BANDS)
+        ]
+        return {'categories': categories, 'price_bands': price_bands}
+
+    def brand_matches(self, cursor, text, limit=4):
+        """Approved stores whose name contains the search text or whose products carry a matching brand."""
+        terms = parse_terms(text)
+        if not terms:
+            return []
+        # MATERIALIZED: otherwise the planner counts products for every seller before joining.
+        cursor.execute(f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT s.id FROM sellers s
+                WHERE s.status = 'approved' AND s.store_name ILIKE %(pattern)s
+                UNION
+                SELECT p.seller_id FROM products p
+                WHERE p.search_vector @@ to_tsquery('{SEARCH_CONFIG}', %(brand_query)s)
+            )
+            SELECT
+                s.id,
+                s.store_name,
+                s.store_slug,
+                s.description,
+                s.logo_url,
+                s.island_group,
+                s.rating,
+                s.total_sales,
+                counts.product_count,
+                counts.primary_brand
+            FROM candidates
+            JOIN sellers s ON s.id = candidates.id AND s.status = 'approved'
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) FILTER (WHERE {_ACTIVE_SQL}) AS product_count, MAX(p.brand) AS primary_brand
+                FROM products p
+                WHERE p.seller_id = s.id
+            ) counts
+            ORDER BY counts.product_count DESC, s.store_name ASC
+            LIMIT %(limit)s
+        """, {
+            'pattern': _like_pattern((text or '').strip()),
+            'brand_query': prefix_tsquery(terms, weights='B'),
+            'limit': limit,
+        })
+        return cursor.fetchall()
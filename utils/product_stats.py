@@ -0,0 +1,134 @@
+"""
+Materialized per-product rating and sales counters.
+
+``product_stats`` holds one row per product with the approved-review average,
+approved-review count and the quantity sold through delivered/completed
+orders. Storefront pages read it with a primary-key join instead of
+aggregating ``reviews`` and ``order_items`` on every request.
+
+The table is kept current incrementally:
+  - review events call ``refresh_product_review_stats`` for the one product
+  - order status changes call ``sync_order_product_stats``; ``orders.stats_counted``
+    records whether an order's lines are currently included in ``sold_count``
+    so repeated or out-of-order calls never double count
+``rebuild_product_stats`` recomputes everything from scratch.
+"""
+
+PRODUCT_STATS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS product_stats (
+        product_id INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+        avg_rating NUMERIC(3, 2) NOT NULL DEFAULT 0,
+        review_count INTEGER NOT NULL DEFAULT 0,
+        sold_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+"""
+
+ORDERS_STATS_COLUMN_SQL = """
+    ALTER TABLE orders ADD COLUMN IF NOT EXISTS stats_counted BOOLEAN NOT NULL DEFAULT FALSE
+"""
+
+_SOLD_PREDICATE = "order_status IN ('delivered', 'completed')"
+
+
+def ensure_product_stats_table(cursor):
+    """Create ``product_stats`` and the ``orders.stats_counted`` marker if missing."""
+    cursor.execute(PRODUCT_STATS_TABLE_SQL)
+    cursor.execute(ORDERS_STATS_COLUMN_SQL)
+
+
+def refresh_product_review_stats(cursor, product_id):
+    """Recompute the review columns of one product after a review changes."""
+    if not product_id:
+        return
+    cursor.execute("""
+        INSERT INTO product_stats (product_id, avg_rating, review_count, updated_at)
+        SELECT %s, COALESCE(AVG(rating), 0), COUNT(*), NOW()
+        FROM reviews
+        WHERE product_id = %s AND is_approved::int = 1
+        ON CONFLICT (product_id) DO UPDATE
+        SET avg_rating = EXCLUDED.avg_rating,
+            review_count = EXCLUDED.review_count,
+            updated_at = NOW()
+    """, (product_id, product_id))
+
+
+def sync_order_product_stats(cursor, order_id):
+    """Add or remove an order's quantities from ``sold_count`` after a status change.
+
+    Safe to call after any ``orders.order_status`` update; it is a no-op when the
+    order's inclusion in ``sold_count`` has not changed.
+
+    Returns:
+        int: +1 if the order was added, -1 if removed, 0 if nothing changed
+    """
+    if not order_id:
+        return 0
+
+    cursor.execute(f"""
+        UPDATE orders
+        SET stats_counted = ({_SOLD_PREDICATE})
+        WHERE id = %s
+          AND stats_counted IS DISTINCT FROM ({_SOLD_PREDICATE})
+        RETURNING stats_counted
+    """, (order_id,))
+    row = cursor.fetchone()
+    if not row:
+        return 0
+
+    counted = row['stats_counted'] if isinstance(row, dict) else row[0]
+    sign = 1 if counted else -1
+    cursor.execute("""
+        INSERT INTO product_stats (product_id, sold_count, updated_at)
+        SELECT oi.product_id, %s * SUM(oi.quantity), NOW()
+        FROM order_items oi
+        WHERE oi.order_id = %s
+        GROUP BY oi.product_id
+        ON CONFLICT (product_id) DO UPDATE
+        SET sold_count = GREATEST(product_stats.sold_count + EXCLUDED.sold_count, 0),
+            updated_at = NOW()
+    """, (sign, order_id))
+    return sign
+
+
+def rebuild_product_stats(cursor):
+    """Recompute ``product_stats`` for every product from the source tables.
+
+    Returns:
+        int: Number of product rows written
+    """
+    cursor.execute("LOCK TABLE product_stats IN EXCLUSIVE MODE")
+    cursor.execute(f"""
+        UPDATE orders
+        SET stats_counted = ({_SOLD_PREDICATE})
+        WHERE stats_counted IS DISTINCT FROM ({_SOLD_PREDICATE})
+    """)
+    cursor.execute(f"""
+        INSERT INTO product_stats (product_id, avg_rating, review_count, sold_count, updated_at)
+        SELECT
+            p.id,
+            COALESCE(r.avg_rating, 0),
+            COALESCE(r.review_count, 0),
+            COALESCE(s.sold_count, 0),
+            NOW()
+        FROM products p
+        LEFT JOIN (
+            SELECT product_id, AVG(rating) AS avg_rating, COUNT(*) AS review_count
+            FROM reviews
+            WHERE is_approved::int = 1
+            GROUP BY product_id
+        ) r ON r.product_id = p.id
+        LEFT JOIN (
+            SELECT oi.product_id, SUM(oi.quantity) AS sold_count
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            WHERE o.{_SOLD_PREDICATE}
+            GROUP BY oi.product_id
+        ) s ON s.product_id = p.id
+        ON CONFLICT (product_id) DO UPDATE
+        SET avg_rating = EXCLUDED.avg_rating,
+            review_count = EXCLUDED.review_count,
+            sold_count = EXCLUDED.sold_count,
+            updated_at = NOW()
+    """)
+    return cursor.rowcount
@@ -0,0 +1,179 @@
+"""
+Offline PSGC (Philippine Standard Geographic Code) dataset.
+
+A snapshot of regions, provinces, cities/municipalities and barangays is stored
+as a gzipped JSON artifact (see scripts/import_psgc_snapshot.py) and loaded once
+at startup into two indexes:
+
+  - ``nodes``: code -> (level, name, region_code, province_code, city_code)
+  - ``children``: (relation, parent_code) -> [{code, name}, ...]
+
+Every lookup the PSGC routes and ``resolve_psgc_selection`` need is then a dict
+access with no network I/O.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+LEVEL_REGION = 'region'
+LEVEL_PROVINCE = 'province'
+LEVEL_CITY = 'city'
+LEVEL_BARANGAY = 'barangay'
+
+
+def _code(value):
+    """PSGC JSON uses ``false`` for missing parents; normalize to ''."""
+    if not value:
+        return ''
+    return str(value).strip()
+
+
+def build_snapshot(regions, provinces, cities, barangays, source=''):
+    """Compact the raw PSGC API lists into the artifact layout."""
+    return {
+        'format': SNAPSHOT_FORMAT_VERSION,
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'source': source,
+        'regions': [[_code(r.get('code')), str(r.get('name') or '').strip()] for r in regions],
+        'provinces': [
+            [_code(p.get('code')), str(p.get('name') or '').strip(), _code(p.get('regionCode'))]
+            for p in provinces
+        ],
+        'cities': [
+            [_code(c.get('code')), str(c.get('name') or '').strip(), _code(c.get('regionCode')), _code(c.get('provinceCode'))]
+            for c in cities
+        ],
+        'barangays': [
+            [_code(b.get('code')), str(b.get('name') or '').strip(), _code(b.get('cityCode') or b.get('municipalityCode'))]
+            for b in barangays
+        ],
+    }
+
+
+def write_snapshot(path, snapshot):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as handle:
+        json.dump(snapshot, handle, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class PSGCDataset:
+    """In-memory PSGC indexes built from a snapshot."""
+
+    def __init__(self, snapshot):
+        self.generated_at = snapshot.get('generated_at')
+        self.nodes = {}
+        self.children = {}
+
+        def add_child(relation, parent_code, code, name):
+            if parent_code:
+                self.children.setdefault((relation, parent_code), []).append({'code': code, 'name': name})
+
+        regions = []
+        for code, name in snapshot.get('regions', []):
+            if code and name:
+                self.nodes[code] = (LEVEL_REGION, name, code, '', '')
+                regions.append({'code': code, 'name': name})
+        self.children[('regions', '')] = regions
+
+        for code, name, region_code in snapshot.get('provinces', []):
+            if code and name:
+                self.nodes[code] = (LEVEL_PROVINCE, name, region_code, code, '')
+                add_child('region-provinces', region_code, code, name)
+
+        for code, name, region_code, province_code in snapshot.get('cities', []):
+            if code and name:
+                self.nodes[code] = (LEVEL_CITY, name, region_code, province_code, code)
+                add_child('region-cities', region_code, code, name)
+                add_child('province-cities', province_code, code, name)
+
+        for code, name, city_code in snapshot.get('barangays', []):
+            if code and name:
+                self.nodes[code] = (LEVEL_BARANGAY, name, '', '', city_code)
+                add_child('city-barangays', city_code, code, name)
+
+    def list_for_path(self, path):
+        """Answer a PSGC API list path (e.g. ``regions/13/provinces.json``) from the index.
+
+        Returns None when the path shape or parent code is not covered by the snapshot.
+        """
+        parts = path.strip('/').split('/')
+        if parts == ['regions.json']:
+            key = ('regions', '')
+        elif len(parts) == 3 and parts[0] == 'regions' and parts[2] == 'provinces.json':
+            key = ('region-provinces', parts[1])
+        elif len(parts) == 3 and parts[0] == 'regions' and parts[2] == 'cities-municipalities.json':
+            key = ('region-cities', parts[1])
+        elif len(parts) == 3 and parts[0] == 'provinces' and parts[2] == 'cities-municipalities.json':
+            key = ('province-cities', parts[1])
+        elif len(parts) == 3 and parts[0] == 'cities-municipalities' and parts[2] == 'barangays.json':
+            key = ('city-barangays', parts[1])
+        else:
+            return None
+
+        items = self.children.get(key)
+        if items is None and key[1] in self.nodes:
+            # Known parent without children (e.g. a region with no provinces).
+            return []
+        return items
+
+    def _node(self, code, level):
+        node = self.nodes.get(code)
+        if node is None or node[0] != level:
+            raise KeyError(code)
+        return node
+
+    def resolve(self, region_code, province_code, city_code, barangay_code):
+        """Validate a PSGC chain; same contract as ``resolve_psgc_selection``.
+
+        Raises:
+            KeyError: a code is not in the snapshot (caller may fall back to the live API)
+            ValueError: the codes exist but do not form a valid chain
+        """
+        region = self._node(region_code, LEVEL_REGION)
+
+        province_name = ''
+        if province_code:
+            province = self._node(province_code, LEVEL_PROVINCE)
+            if province[2] != region_code:
+                raise ValueError('Invalid province selection for the chosen region.')
+            province_name = province[1]
+
+        city = self._node(city_code, LEVEL_CITY)
+        if province_code and city[3] != province_code:
+            raise ValueError('Invalid city/municipality selection for the chosen parent area.')
+        if not province_code and city[2] != region_code:
+            raise ValueError('Invalid city/municipality selection for the chosen parent area.')
+
+        barangay = self._node(barangay_code, LEVEL_BARANGAY)
+        if barangay[4] != city_code:
+            raise ValueError('Invalid barangay selection for the chosen city/municipality.')
+
+        return {
+            'region_name': region[1],
+            'province_name': province_name,
+            'city_name': city[1],
+            'barangay_name': barangay[1],
+        }
+
+
+def load_psgc_dataset(path):
+    """Load the snapshot at ``path``; returns None if it is missing or unreadable."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            snapshot = json.load(handle)
+    except (OSError, ValueError) as err:
+        print(f"[PSGC] Could not load dataset {path}: {err}")
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT_VERSION:
+        print(f"[PSGC] Ignoring dataset {path}: unsupported format {snapshot.get('format')}")
+        return None
+    return PSGCDataset(snapshot)
@@ -0,0 +1,244 @@
+"""
+Opt-in per-request SQL profiling.
+
+Nothing recorded how many statements a route ran or how long they took, so
+slow pages were chased with ``print()`` calls. When ``QUERY_PROFILER_ENABLED``
+is set, each sampled request gets a ``RequestProfile``, and cursors handed out
+through ``get_db()`` leases are created from a timed subclass of whatever
+``cursor_factory`` the caller asked for. Each ``execute``/``executemany``
+records its normalized SQL (whitespace collapsed, literals and ``IN`` lists
+replaced with ``?``) and its duration. The profile also records how long
+checking out the request connection took.
+
+When the request ends, ``QueryProfiler.finish`` does three things:
+
+* folds the profile into per-route totals (requests, statements, DB time,
+  pool wait) for the admin page;
+* flags N+1 patterns: the same normalized statement run at least
+  ``n_plus_one_threshold`` times in one request;
+* returns a ``Server-Timing`` header value (``db``, ``db-pool``, ``app``),
+  so browser dev tools show the split.
+
+A statement slower than ``slow_ms`` is printed as ``[SLOW SQL]`` and kept in
+a bounded list. For a ``explain_sample`` fraction of them, ``EXPLAIN`` runs on
+the same connection, under a savepoint so a failure cannot abort the
+request's transaction, and the plan is kept alongside. Everything is
+per process; each gunicorn worker reports its own traffic.
+"""
+import random
+import re
+import threading
+import time
+from collections import deque
+
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR, cursor as base_cursor
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w$.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s')
+_WHITESPACE = re.compile(r'\s+')
+_EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+
+
+def normalize_sql(sql):
+    """One line per statement shape: ``SELECT ... WHERE id = ? AND status IN (?)``."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(?)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _sql_text(query, connection):
+    if hasattr(query, 'as_string'):  # psycopg2.sql.Composable
+        return query.as_string(connection)
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    return str(query)
+
+
+class _ProfiledCursor:
+    """Mixed in front of a cursor class; ``_profile`` is set right after creation."""
+
+    _profile = None
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._profile.record(self, query, vars, time.perf_counter() - started, many=False)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._profile.record(self, query, None, time.perf_counter() - started, many=True)
+
+
+class RequestProfile:
+    """Statements run by one request."""
+
+    def __init__(self, profiler, method, path):
+        self.profiler = profiler
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.by_statement = {}  # normalized sql -> [count, seconds]
+
+    def cursor(self, connection, *args, **kwargs):
+        """``connection.cursor(...)`` whose statements are recorded here."""
+        factory = kwargs.pop('cursor_factory', None) or connection.cursor_factory or base_cursor
+        kwargs['cursor_factory'] = self.profiler.profiled_factory(factory)
+        cursor = connection.cursor(*args, **kwargs)
+        cursor._profile = self
+        return cursor
+
+    def record(self, cursor, query, vars, seconds, many):
+        try:
+            sql = normalize_sql(_sql_text(query, cursor.connection))
+        except Exception:
+            sql = '<unprintable statement>'
+        self.statements += 1
+        self.db_seconds += seconds
+        entry = self.by_statement.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds * 1000.0 >= self.profiler.slow_ms:
+            self.profiler.record_slow(self, cursor, query, vars, sql, seconds, many)
+
+
+class QueryProfiler:
+    """Process-wide settings, per-route totals, N+1 findings and the slow-query list."""
+
+    def __init__(self, enabled=False, sample_rate=1.0, slow_ms=200.0, explain_sample=0.1,
+                 n_plus_one_threshold=5, max_slow_queries=200, max_routes=500):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.explain_sample = explain_sample
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_routes = max_routes
+        self.started_at = time.time()
+        self._factories = {}
+        self._lock = threading.Lock()
+        self.routes = {}
+        self.n_plus_one = {}
+        self.slow_queries = deque(maxlen=max_slow_queries)
+
+    def start(self, method, path):
+        """A profile for a new request, or None when disabled or not sampled."""
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return None
+        return RequestProfile(self, method, path)
+
+    def profiled_factory(self, factory):
+        with self._lock:
+            profiled = self._factories.get(factory)
+            if profiled is None:
+                profiled = type(f'Profiled{factory.__name__}', (_ProfiledCursor, factory), {})
+                self._factories[factory] = profiled
+            return profiled
+
+    def record_slow(self, profile, cursor, query, vars, sql, seconds, many):
+        print(f"[SLOW SQL] {seconds * 1000.0:.1f}ms {profile.method} {profile.path}: {sql[:300]}")
+        plan = None
+        if not many and self.explain_sample > 0 and random.random() < self.explain_sample:
+            plan = self._explain(cursor.connection, query, vars)
+        with self._lock:
+            self.slow_queries.appendleft({
+                'at': time.time(), 'route': f'{profile.method} {profile.path}', 'sql': sql,
+                'ms': round(seconds * 1000.0, 1), 'plan': plan,
+            })
+
+    def _explain(self, connection, query, vars):
+        """``EXPLAIN`` text for a statement, run under a savepoint; None if it can't be explained."""
+        try:
+            text = _sql_text(query, connection)
+        except Exception:
+            return None
+        if not text.lstrip().lower().startswith(_EXPLAINABLE):
+            return None
+        if connection.get_transaction_status() == TRANSACTION_STATUS_INERROR:
+            return None
+        try:
+            with connection.cursor(cursor_factory=base_cursor) as cursor:
+                cursor.execute('SAVEPOINT query_profiler_explain')
+                try:
+                    cursor.execute('EXPLAIN ' + text, vars)
+                    plan = '\n'.join(row[0] for row in cursor.fetchall())
+                    cursor.execute('RELEASE SAVEPOINT query_profiler_explain')
+                    return plan
+                except Exception as err:
+                    cursor.execute('ROLLBACK TO SAVEPOINT query_profiler_explain')
+                    cursor.execute('RELEASE SAVEPOINT query_profiler_explain')
+                    return f'EXPLAIN failed: {err}'
+        except Exception as err:
+            print(f"[SLOW SQL] Could not explain statement: {err}")
+            return None
+
+    def finish(self, profile, route):
+        """Fold a finished request into the route totals; return its ``Server-Timing`` value."""
+        total_seconds = time.perf_counter() - profile.started
+        repeated = [
+            (sql, count, seconds) for sql, (count, seconds) in profile.by_statement.items()
+            if count >= self.n_plus_one_threshold
+        ]
+        with self._lock:
+            totals = self.routes.get(route)
+            if totals is None:
+                if len(self.routes) >= self.max_routes:
+                    self.routes.pop(min(self.routes, key=lambda key: self.routes[key]['db_seconds']))
+                totals = self.routes[route] = {
+                    'requests': 0, 'statements': 0, 'db_seconds': 0.0, 'pool_wait_seconds': 0.0,
+                    'total_seconds': 0.0, 'max_db_seconds': 0.0, 'max_statements': 0,
+                }
+            totals['requests'] += 1
+            totals['statements'] += profile.statements
+            totals['db_seconds'] += profile.db_seconds
+            totals['pool_wait_seconds'] += profile.pool_wait_seconds
+            totals['total_seconds'] += total_seconds
+            totals['max_db_seconds'] = max(totals['max_db_seconds'], profile.db_seconds)
+            totals['max_statements'] = max(totals['max_statements'], profile.statements)
+            for sql, count, seconds in repeated:
+                finding = self.n_plus_one.get((route, sql))
+                if finding is None:
+                    if len(self.n_plus_one) >= self.max_routes:
+                        continue
+                    finding = self.n_plus_one[(route, sql)] = {'requests': 0, 'max_repeats': 0, 'seconds': 0.0}
+                finding['requests'] += 1
+                finding['max_repeats'] = max(finding['max_repeats'], count)
+                finding['seconds'] += seconds
+        return (
+            f'db;dur={profile.db_seconds * 1000.0:.1f};desc="{profile.statements} queries", '
+            f'db-pool;dur={profile.pool_wait_seconds * 1000.0:.1f}, '
+            f'app;dur={total_seconds * 1000.0:.1f}'
+        )
+
+    def report(self, limit=25):
+        """Worst routes by DB time, N+1 findings and recent slow statements, for the admin page."""
+        with self._lock:
+            routes = [dict(totals, route=route) for route, totals in self.routes.items()]
+            findings = [dict(finding, route=route, sql=sql) for (route, sql), finding in self.n_plus_one.items()]
+            slow = [dict(row) for row in self.slow_queries]
+        for row in routes:
+            row['avg_db_ms'] = row['db_seconds'] * 1000.0 / row['requests']
+            row['avg_statements'] = row['statements'] / row['requests']
+            row['avg_pool_wait_ms'] = row['pool_wait_seconds'] * 1000.0 / row['requests']
+            row['avg_total_ms'] = row['total_seconds'] * 1000.0 / row['requests']
+            row['db_share'] = row['db_seconds'] / row['total_seconds'] if row['total_seconds'] else 0.0
+        routes.sort(key=lambda row: row['db_seconds'], reverse=True)
+        findings.sort(key=lambda row: (row['requests'] * row['max_repeats'], row['seconds']), reverse=True)
+        return {'routes': routes[:limit], 'n_plus_one': findings[:limit], 'slow_queries': slow[:limit]}
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+            self.n_plus_one.clear()
+            self.slow_queries.clear()
+            self.started_at = time.time()
@@ -0,0 +1,251 @@
+"""
+One pooled connection per request, shared by every ``get_db()`` in it.
+
+Each ``get_db()`` checked out its own connection from a pool of 3 (+5
+overflow). ``product_page`` took one for the navbar and another for the
+product, and the ``before_request`` access gate took one more. Notification
+and status-history helpers each took their own while the caller still held
+its connection. Error paths that returned without ``conn.close()`` left the
+connection checked out until garbage collection.
+
+``RequestConnection`` checks out a connection on first use and keeps it on
+``flask.g`` until ``teardown_appcontext``. ``get_db()`` hands out a
+``ConnectionLease`` over it. A lease behaves like the psycopg2 connection
+existing code expects (``cursor``, ``commit``, ``rollback``, ``close``):
+
+* The first lease, or any lease taken when no transaction is open, owns
+  the transaction. ``commit``/``rollback`` are the real ones. ``close``
+  rolls back anything uncommitted, which is what returning a connection to
+  the pool did before.
+* A lease taken while another lease has a transaction open (a helper
+  called mid-transaction) runs under a SAVEPOINT. Its ``commit`` releases
+  the savepoint and its ``rollback``/``close`` roll back to it, so a
+  failing helper never aborts the caller. Work it committed becomes part of
+  the outer transaction and is durable only once the owning lease commits;
+  an owning lease that just closes rolls it back with everything else. A
+  helper whose write must stand on its own is called after the caller has
+  committed (``create_seller_notification`` and ``record_order_status_change``
+  are, or they run on the caller's cursor as in ``place_order``).
+
+At teardown anything still uncommitted is rolled back and the connection
+goes back to the pool. A missing ``close()`` therefore no longer leaks a
+connection. Handlers that then wait for a long time (long-poll,
+SSE) call ``release()`` first so the connection is not held idle.
+
+``transaction_cursor`` is the ``with`` form: it commits when the block exits
+cleanly, rolls back when it raises, and closes the cursor and lease either
+way. ``RequestConnectionStats`` counts checkouts, leases and teardown
+outcomes across requests. When the request is being profiled
+(utils/query_profiler.py), leases hand out timed cursors.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+
+
+class RequestConnectionStats:
+    """Process-wide counters; ``record_request`` is fed each DB-using request's checkouts at teardown."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.values = {
+            'db_requests': 0, 'checkouts': 0, 'leases': 0, 'nested_leases': 0,
+            'multi_checkout_requests': 0, 'max_checkouts': 0, 'unclosed_leases': 0,
+            'teardown_rollbacks': 0, 'early_releases': 0,
+        }
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self.values[key] += amount
+
+    def record_request(self, checkouts):
+        with self._lock:
+            self.values['db_requests'] += 1
+            if checkouts > 1:
+                self.values['multi_checkout_requests'] += 1
+            self.values['max_checkouts'] = max(self.values['max_checkouts'], checkouts)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.values)
+
+
+class ConnectionLease:
+    """What ``get_db()`` returns inside a request; see the module docstring."""
+
+    def __init__(self, owner, savepoint=None):
+        self._owner = owner
+        self._savepoint = savepoint
+        self._generation = owner.generation
+        self.closed = False
+
+    @property
+    def connection(self):
+        return self._owner.connection
+
+    def __getattr__(self, name):
+        # Anything else (encoding, notices, get_transaction_status, ...) comes from the connection.
+        return getattr(self._owner.connection, name)
+
+    def cursor(self, *args, **kwargs):
+        if self._owner.profile is not None:
+            return self._owner.profile.cursor(self._owner.connection, *args, **kwargs)
+        return self._owner.connection.cursor(*args, **kwargs)
+
+    @property
+    def _nested(self):
+        """True while this lease's savepoint still exists (the outer transaction has not ended)."""
+        return self._savepoint is not None and self._generation == self._owner.generation
+
+    def _savepoint_sql(self, statement):
+        try:
+            with self._owner.connection.cursor() as cursor:
+                cursor.execute(f'{statement} {self._savepoint}')
+            return True
+        except Exception as err:
+            # The failed statement aborted the transaction, so it has to end here.
+            print(f"[DB] {statement} {self._savepoint} failed ({err}); rolling back the request transaction")
+            self._owner.end_transaction(commit=False)
+            return False
+
+    def commit(self):
+        if not self._nested:
+            self._owner.end_transaction(commit=True)
+        elif self._savepoint_sql('RELEASE SAVEPOINT'):
+            # Keep the lease usable; its work now waits on the owning lease's commit.
+            self._savepoint_sql('SAVEPOINT')
+
+    def rollback(self):
+        if not self._nested:
+            self._owner.end_transaction(commit=False)
+        else:
+            self._savepoint_sql('ROLLBACK TO SAVEPOINT')
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._owner.open_leases = max(0, self._owner.open_leases - 1)
+        try:
+            if self._nested:
+                if self._savepoint_sql('ROLLBACK TO SAVEPOINT'):
+                    self._savepoint_sql('RELEASE SAVEPOINT')
+            else:
+                # Returning a connection to the pool used to discard uncommitted work.
+                self._owner.end_transaction(commit=False)
+        except Exception as err:
+            print(f"[DB] Could not reset request connection on close: {err}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Same as ``with psycopg2_connection:``: end the transaction, keep the connection.
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+class RequestConnection:
+    """The request's pooled connection; lives on ``flask.g`` until teardown."""
+
+    def __init__(self, checkout, stats=None, profile=None):
+        self._checkout = checkout
+        self.stats = stats
+        self.profile = profile  # utils.query_profiler.RequestProfile when this request is profiled
+        self.connection = None
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.leases = 0
+        self.open_leases = 0
+        self.generation = 0  # bumped whenever the transaction ends; older savepoints are gone
+        self._savepoints = 0
+
+    def lease(self):
+        """A lease on the request connection, checking one out first if needed. None if that fails."""
+        if self.connection is None:
+            started = time.perf_counter()
+            self.connection = self._checkout()
+            self.checkout_seconds += time.perf_counter() - started
+            if self.profile is not None:
+                self.profile.pool_wait_seconds = self.checkout_seconds
+            if self.connection is None:
+                return None
+            self.checkouts += 1
+            if self.stats is not None:
+                self.stats.add('checkouts')
+        self.leases += 1
+        self.open_leases += 1
+        if self.stats is not None:
+            self.stats.add('leases')
+        status = self.connection.get_transaction_status()
+        if status == TRANSACTION_STATUS_INERROR:
+            # The previous holder's transaction is already aborted; a fresh connection would have started clean.
+            self.end_transaction(commit=False)
+        elif status != TRANSACTION_STATUS_IDLE and self.open_leases > 1:
+            self._savepoints += 1
+            lease = ConnectionLease(self, f'request_lease_{self._savepoints}')
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'SAVEPOINT {lease._savepoint}')
+            if self.stats is not None:
+                self.stats.add('nested_leases')
+            return lease
+        return ConnectionLease(self)
+
+    def end_transaction(self, commit):
+        """Commit or roll back whatever is open. A commit of an aborted transaction rolls back."""
+        connection = self.connection
+        self.generation += 1
+        if connection is None:
+            return
+        status = connection.get_transaction_status()
+        if status == TRANSACTION_STATUS_IDLE:
+            return
+        if commit and status != TRANSACTION_STATUS_INERROR:
+            connection.commit()
+        else:
+            connection.rollback()
+
+    def release(self, error=None):
+        """Roll back anything uncommitted and return the connection to the pool (teardown, or before a long wait)."""
+        connection = self.connection
+        if connection is None:
+            return
+        try:
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                self.end_transaction(commit=False)
+                if self.stats is not None:
+                    self.stats.add('teardown_rollbacks')
+        except Exception as err:
+            print(f"[DB] Could not reset request connection: {err}")
+        finally:
+            if self.stats is not None and self.open_leases > 0:
+                self.stats.add('unclosed_leases', self.open_leases)
+            self.connection = None
+            self.open_leases = 0
+            self.generation += 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+@contextmanager
+def transaction_cursor(conn, cursor_factory=None):
+    """``with transaction_cursor(get_db()) as cursor:`` commits on success and rolls back on error."""
+    if conn is None:
+        raise ConnectionError('Database connection failed')
+    cursor = conn.cursor(cursor_factory=cursor_factory) if cursor_factory else conn.cursor()
+    try:
+        yield cursor
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
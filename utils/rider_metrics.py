@@ -0,0 +1,166 @@
+"""
+Rider earnings and rating metrics for the rider dashboard.
+
+/api/rider/earnings ran three aggregates over ``rider_transactions`` (today,
+last 7 days, this month) with ``DATE()`` / ``EXTRACT()`` predicates no index
+could use, and /api/rider/rating-stats, /api/rider/ratings and the rating
+submission re-aggregated every ``rider_ratings`` row of the rider per call.
+
+  - ``load_rider_earnings`` computes every window in one conditional
+    aggregation over a sargable ``completed_at`` range, read through the
+    ``(rider_id, completed_at)`` index, so it only touches this month's and
+    this week's transactions.
+  - ``rider_daily_metrics`` holds one row per (rider, day) with deliveries,
+    earnings and the rating histogram. Inserting a completed transaction or a
+    rating calls ``record_rider_transaction`` / ``record_rider_rating`` in the
+    same transaction; ``rebuild_rider_metrics`` recomputes it from scratch.
+    Rating totals and the daily history read this table.
+
+Days are ``DATE(completed_at)`` for deliveries and ``DATE(created_at)`` for
+ratings, in the database time zone, like the old queries.
+"""
+
+RIDER_DAILY_METRICS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS rider_daily_metrics (
+        rider_id INTEGER NOT NULL,
+        metrics_date DATE NOT NULL,
+        deliveries INTEGER NOT NULL DEFAULT 0,
+        earnings NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        ratings_count INTEGER NOT NULL DEFAULT 0,
+        rating_sum INTEGER NOT NULL DEFAULT 0,
+        five_star INTEGER NOT NULL DEFAULT 0,
+        four_star INTEGER NOT NULL DEFAULT 0,
+        three_star INTEGER NOT NULL DEFAULT 0,
+        two_star INTEGER NOT NULL DEFAULT 0,
+        one_star INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (rider_id, metrics_date)
+    )
+"""
+
+RIDER_METRICS_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_rider_transactions_rider_completed ON rider_transactions (rider_id, completed_at)",
+    # Latest reviews first on the ratings panels.
+    "CREATE INDEX IF NOT EXISTS idx_rider_ratings_rider_created ON rider_ratings (rider_id, created_at DESC)",
+)
+
+_STAR_COLUMNS = ('one_star', 'two_star', 'three_star', 'four_star', 'five_star')
+
+_UPSERT_SQL = f"""
+    INSERT INTO rider_daily_metrics (rider_id, metrics_date, deliveries, earnings, ratings_count, rating_sum,
+                                     {', '.join(_STAR_COLUMNS)})
+    {{select}}
+    ON CONFLICT (rider_id, metrics_date) DO UPDATE SET
+        deliveries = rider_daily_metrics.deliveries + EXCLUDED.deliveries,
+        earnings = rider_daily_metrics.earnings + EXCLUDED.earnings,
+        ratings_count = rider_daily_metrics.ratings_count + EXCLUDED.ratings_count,
+        rating_sum = rider_daily_metrics.rating_sum + EXCLUDED.rating_sum,
+        {', '.join(f'{column} = rider_daily_metrics.{column} + EXCLUDED.{column}' for column in _STAR_COLUMNS)}
+"""
+
+_STAR_COUNTS = ', '.join(f'(rating = {stars})::int' for stars in range(1, 6))
+
+
+def ensure_rider_metrics_tables(cursor):
+    """Create ``rider_daily_metrics`` and the rider_id/date indexes the panels read through."""
+    cursor.execute(RIDER_DAILY_METRICS_TABLE_SQL)
+    for statement in RIDER_METRICS_INDEXES_SQL:
+        cursor.execute(statement)
+
+
+def record_rider_transaction(cursor, transaction_id):
+    """Add one completed ``rider_transactions`` row to its rider's day."""
+    cursor.execute(_UPSERT_SQL.format(select='''
+        SELECT rider_id, completed_at::date, 1, COALESCE(earning_amount, 0), 0, 0, 0, 0, 0, 0, 0
+        FROM rider_transactions
+        WHERE id = %s AND status = 'completed' AND completed_at IS NOT NULL
+    '''), (transaction_id,))
+
+
+def record_rider_rating(cursor, rating_id):
+    """Add one ``rider_ratings`` row to its rider's day."""
+    cursor.execute(_UPSERT_SQL.format(select=f'''
+        SELECT rider_id, created_at::date, 0, 0, 1, rating, {_STAR_COUNTS}
+        FROM rider_ratings
+        WHERE id = %s
+    '''), (rating_id,))
+
+
+def rebuild_rider_metrics(cursor):
+    """Recompute ``rider_daily_metrics`` from the source tables. Returns the row count."""
+    cursor.execute("DELETE FROM rider_daily_metrics")
+    cursor.execute(_UPSERT_SQL.format(select=f'''
+        SELECT rider_id, day, SUM(deliveries), SUM(earnings), SUM(ratings_count), SUM(rating_sum),
+               {', '.join(f'SUM({column})' for column in _STAR_COLUMNS)}
+        FROM (
+            SELECT rider_id, completed_at::date AS day, COUNT(*) AS deliveries,
+                   COALESCE(SUM(earning_amount), 0) AS earnings, 0 AS ratings_count, 0 AS rating_sum,
+                   {', '.join(f'0 AS {column}' for column in _STAR_COLUMNS)}
+            FROM rider_transactions
+            WHERE status = 'completed' AND completed_at IS NOT NULL
+            GROUP BY rider_id, completed_at::date
+            UNION ALL
+            SELECT rider_id, created_at::date, 0, 0, COUNT(*), SUM(rating),
+                   {', '.join(f'COUNT(*) FILTER (WHERE rating = {stars})' for stars in range(1, 6))}
+            FROM rider_ratings
+            WHERE created_at IS NOT NULL
+            GROUP BY rider_id, created_at::date
+        ) per_day
+        GROUP BY rider_id, day
+    '''))
+    cursor.execute("SELECT COUNT(*) AS count FROM rider_daily_metrics")
+    row = cursor.fetchone()
+    return row['count'] if isinstance(row, dict) else row[0]
+
+
+def load_rider_earnings(cursor, rider_id):
+    """Today's, last-7-days' and this month's completed earnings in one pass.
+
+    The windows match the old queries: today is ``DATE(completed_at) =
+    CURRENT_DATE``, the week starts ``CURRENT_DATE - 7 days`` and the month
+    is the calendar month.
+    """
+    cursor.execute('''
+        SELECT
+            COALESCE(SUM(earning_amount) FILTER (
+                WHERE completed_at >= CURRENT_DATE AND completed_at < CURRENT_DATE + 1), 0) AS today_earnings,
+            COALESCE(SUM(earning_amount) FILTER (
+                WHERE completed_at >= CURRENT_DATE - INTERVAL '7 days'), 0) AS weekly_earnings,
+            COALESCE(SUM(earning_amount) FILTER (
+                WHERE completed_at >= date_trunc('month', CURRENT_DATE)
+                  AND completed_at < date_trunc('month', CURRENT_DATE) + INTERVAL '1 month'), 0) AS monthly_earnings
+        FROM rider_transactions
+        WHERE rider_id = %s AND status = 'completed'
+          AND completed_at >= LEAST(CURRENT_DATE - INTERVAL '7 days', date_trunc('month', CURRENT_DATE))
+    ''', (rider_id,))
+    row = cursor.fetchone()
+    return {key: float(value or 0) for key, value in row.items()}
+
+
+def load_rider_rating_summary(cursor, rider_id):
+    """Lifetime average, count and 1-5 star histogram from ``rider_daily_metrics``."""
+    cursor.execute(f'''
+        SELECT COALESCE(SUM(ratings_count), 0) AS total_ratings,
+               COALESCE(SUM(rating_sum), 0) AS rating_sum,
+               {', '.join(f'COALESCE(SUM({column}), 0) AS {column}' for column in _STAR_COLUMNS)}
+        FROM rider_daily_metrics
+        WHERE rider_id = %s
+    ''', (rider_id,))
+    row = cursor.fetchone()
+    total = int(row['total_ratings'])
+    return {
+        'avg_rating': float(row['rating_sum']) / total if total else 0.0,
+        'total_ratings': total,
+        'breakdown': {str(stars): int(row[column]) for stars, column in enumerate(_STAR_COLUMNS, start=1)},
+    }
+
+
+def load_rider_daily_history(cursor, rider_id, days):
+    """Per-day deliveries, earnings and ratings for the last ``days`` days (today included), oldest first."""
+    cursor.execute('''
+        SELECT metrics_date, deliveries, earnings, ratings_count,
+               CASE WHEN ratings_count > 0 THEN rating_sum::numeric / ratings_count END AS avg_rating
+        FROM rider_daily_metrics
+        WHERE rider_id = %s AND metrics_date > CURRENT_DATE - %s
+        ORDER BY metrics_date
+    ''', (rider_id, days))
+    return cursor.fetchall()
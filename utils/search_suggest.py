@@ -0,0 +1,491 @@
+"""
+Search-as-you-type suggestions from an in-memory prefix index.
+
+The browse page's search box called ``/api/products`` on every pause in
+typing. That meant a ranked search, facets, the brand strip, colors and
+promotions just to show a handful of names. ``/api/search/suggest``
+answers from memory instead.
+
+Each worker keeps a ``SuggestionIndex`` of visible products, approved
+stores, product brands and active categories. Every name is indexed under
+each of its word starts ("red cotton shirt", "cotton shirt", "shirt") in a
+sorted key list, so the names matching a typed prefix form one ``bisect``
+range. Suggestions are ranked by ``sales_count``. A store, brand or
+category ranks by its best-selling product, so it competes with single
+products instead of swamping them with its total. The best ``MEMO_DEPTH``
+entries of each prefix are memoized after its first lookup. Prefixes of
+up to three letters, which have the widest ranges, are filled in one pass
+when the index is built, so most lookups are a dict hit. A change moves
+the changed entry within the memoized lists; a list is only rescanned
+once removals leave it shorter than ``MAX_SUGGESTIONS``.
+
+Changes are applied one row at a time. After committing, handlers that
+approve, edit or archive a product, or change a store or the categories,
+call ``publish()`` with the row's new state (``load_*_change``). The
+writing worker applies it at once. The change is also appended to a
+journal in the shared lookup store (utils/lookup_cache.py), and the other
+workers apply it on their next suggestion request. The record carries the
+row, so they never touch the database. Every ``rebuild_seconds`` the
+whole index is rebuilt in the background, which picks up ``sales_count``
+drift and anything no handler published.
+
+Until the first build finishes, ``suggest()`` returns None. The route then
+falls back to ``load_db_suggestions``, a prefix tsquery over
+``products.search_vector`` (utils/product_search.py).
+"""
+import bisect
+import heapq
+import os
+import sqlite3
+import threading
+import time
+
+import psycopg2.extras
+
+from utils.product_search import SEARCH_CONFIG, parse_terms, prefix_tsquery
+
+JOURNAL_NAMESPACE = 'suggest_journal'
+MAX_SUGGESTIONS = 20  # largest ``limit`` a caller gets
+MEMO_DEPTH = 2 * MAX_SUGGESTIONS  # kept per prefix, so most removals don't force a rescan
+SHORT_PREFIX_LENGTH = 3
+MAX_WORD_STARTS = 6
+MEMO_LIMIT = 50000
+SYNC_OVERLAP_NS = 5 * 10**9  # journal keys are write times; re-read this far back in case of skew
+KIND_ORDER = {'store': 0, 'brand': 1, 'category': 2, 'product': 3}
+_RANGE_END = '\U0010ffff'
+
+_VISIBLE_SQL = "p.is_active::int = 1 AND (p.archive_status IS NULL OR p.archive_status = 'active')"
+_PRODUCT_COLUMNS = "p.id, p.name, p.brand, p.seller_id, p.category_id, COALESCE(p.sales_count, 0) AS sales_count"
+
+
+def normalize(text):
+    """Lowercase with single spaces: the form both keys and typed prefixes take."""
+    return ' '.join((text or '').lower().split())
+
+
+def index_keys(text):
+    """Keys for ``text``: the whole name from each of its first ``MAX_WORD_STARTS`` word starts."""
+    words = normalize(text).split(' ')
+    return tuple(sorted({' '.join(words[start:]) for start in range(min(len(words), MAX_WORD_STARTS))} - {''}))
+
+
+def load_snapshot(cursor):
+    """Everything the index holds, read with three statements (RealDictCursor)."""
+    cursor.execute(f"SELECT {_PRODUCT_COLUMNS} FROM products p WHERE {_VISIBLE_SQL}")
+    products = cursor.fetchall()
+    cursor.execute("SELECT id, store_name, store_slug FROM sellers WHERE status = 'approved'")
+    stores = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM categories WHERE is_active::int = 1")
+    categories = cursor.fetchall()
+    return {'products': products, 'stores': stores, 'categories': categories}
+
+
+def load_product_change(cursor, product_id):
+    """``publish()`` record for one product: its row, or None when it is no longer listed."""
+    cursor.execute(f"SELECT {_PRODUCT_COLUMNS} FROM products p WHERE p.id = %s AND {_VISIBLE_SQL}", (product_id,))
+    row = cursor.fetchone()
+    return {'kind': 'product', 'id': int(product_id), 'row': dict(row) if row else None}
+
+
+def load_store_change(cursor, seller_id):
+    """``publish()`` record for one store: its row, or None unless it is approved."""
+    cursor.execute(
+        "SELECT id, store_name, store_slug FROM sellers WHERE id = %s AND status = 'approved'", (seller_id,)
+    )
+    row = cursor.fetchone()
+    return {'kind': 'store', 'id': int(seller_id), 'row': dict(row) if row else None}
+
+
+def load_categories_change(cursor):
+    """``publish()`` record replacing the active categories."""
+    cursor.execute("SELECT id, name FROM categories WHERE is_active::int = 1")
+    return {'kind': 'categories', 'rows': [dict(row) for row in cursor.fetchall()]}
+
+
+def load_db_suggestions(cursor, text, limit):
+    """Suggestions straight from the database, for a worker whose index is not built yet."""
+    terms = parse_terms(text)
+    prefix = normalize(text)
+    if not terms:
+        return []
+    cursor.execute(f"""
+        SELECT 'product' AS kind, p.id, p.name AS text, COALESCE(p.sales_count, 0) AS score, NULL AS slug
+        FROM products p
+        WHERE {_VISIBLE_SQL}
+          AND p.search_vector @@ to_tsquery('{SEARCH_CONFIG}', %(name_query)s)
+        ORDER BY score DESC, p.id DESC
+        LIMIT %(limit)s
+    """, {'name_query': prefix_tsquery(terms, weights='A'), 'limit': limit})
+    suggestions = [dict(row) for row in cursor.fetchall()]
+    cursor.execute("""
+        SELECT 'store' AS kind, s.id, s.store_name AS text, 0 AS score, s.store_slug AS slug
+        FROM sellers s
+        WHERE s.status = 'approved' AND lower(s.store_name) LIKE %(pattern)s
+        ORDER BY s.store_name
+        LIMIT %(limit)s
+    """, {'pattern': prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%', 'limit': limit})
+    # Stores first: without the index there are no per-store sales to rank them by.
+    return (cursor.fetchall() + suggestions)[:limit]
+
+
+def _rank(kind, ref, text, score):
+    return (-score, KIND_ORDER[kind], text.lower(), str(ref))
+
+
+def _prefixes(keys):
+    return {key[:length] for key in keys for length in range(1, len(key) + 1)}
+
+
+class _IndexState:
+    """One generation of the index; only touched under ``SuggestionIndex._lock``."""
+
+    def __init__(self):
+        self.keys = []  # sorted (key, kind, ref)
+        self.entries = {}  # (kind, ref) -> {'kind', 'id', 'text', 'score', 'slug', 'keys', 'rank'}
+        self.memo = {}  # prefix -> best MEMO_DEPTH (kind, ref) of its range, best first
+        self.complete = set()  # memoized prefixes whose list is their whole range
+        self.products = {}  # product id -> row
+        self.stores = {}  # seller id -> row
+        self.categories = {}  # category id -> name
+        self.members = {}  # ('store'|'brand'|'category', ref) -> {product id: sales_count}
+        self.brand_text = {}  # normalized brand -> brand as written
+        self._bulk = False
+        self._dirty_short = set()
+
+    def _rank_of(self, entry_key):
+        return self.entries[entry_key]['rank']
+
+    # --- building ------------------------------------------------------
+
+    def load(self, snapshot):
+        self._bulk = True
+        for row in snapshot['stores']:
+            self.stores[row['id']] = dict(row)
+        for row in snapshot['categories']:
+            self.categories[row['id']] = row['name']
+        for row in snapshot['products']:
+            row = dict(row)
+            self.products[row['id']] = row
+            self._put('product', row['id'], row['name'], row['sales_count'])
+            for aggregate in self._aggregates_of(row):
+                self.members.setdefault(aggregate, {})[row['id']] = row['sales_count']
+        for seller_id in self.stores:
+            self._refresh_aggregate(('store', seller_id))
+        for category_id in self.categories:
+            self._refresh_aggregate(('category', category_id))
+        for aggregate in list(self.members):
+            if aggregate[0] == 'brand':
+                self._refresh_aggregate(aggregate)
+        self.keys.sort()
+        self._bulk = False
+        # Short prefixes in one pass over the entries, best first, instead of a scan each.
+        overflow = set()
+        for entry_key in sorted(self.entries, key=self._rank_of):
+            keys = self.entries[entry_key]['keys']
+            for prefix in {key[:length] for key in keys for length in range(1, SHORT_PREFIX_LENGTH + 1)}:
+                ranked = self.memo.setdefault(prefix, [])
+                if len(ranked) < MEMO_DEPTH:
+                    ranked.append(entry_key)
+                else:
+                    overflow.add(prefix)
+        self.complete = set(self.memo) - overflow
+
+    # --- lookups ---------------------------------------------------------
+
+    def scan(self, prefix):
+        """Memoize and return the best ``MEMO_DEPTH`` entries whose keys start with ``prefix``."""
+        parent = prefix[:-1]
+        if parent in self.complete:
+            ranked = [
+                entry_key for entry_key in self.memo[parent]
+                if any(key.startswith(prefix) for key in self.entries[entry_key]['keys'])
+            ]
+            self.complete.add(prefix)
+        else:
+            low = bisect.bisect_left(self.keys, (prefix,))
+            high = bisect.bisect_left(self.keys, (prefix + _RANGE_END,), low)
+            matched = {(kind, ref) for _, kind, ref in self.keys[low:high]}
+            ranked = heapq.nsmallest(MEMO_DEPTH, matched, key=self._rank_of)
+            if len(matched) <= MEMO_DEPTH:
+                self.complete.add(prefix)
+            else:
+                self.complete.discard(prefix)
+        if len(self.memo) >= MEMO_LIMIT:
+            self.memo = {key: value for key, value in self.memo.items() if len(key) <= SHORT_PREFIX_LENGTH}
+            self.complete &= set(self.memo)
+        self.memo[prefix] = ranked
+        return ranked
+
+    # --- changes ---------------------------------------------------------
+
+    def _reposition(self, entry_key, old_keys, new_keys):
+        """Move one changed entry within the memoized lists instead of rescanning them."""
+        matching = _prefixes(new_keys)
+        entry = self.entries.get(entry_key)
+        for prefix in _prefixes(old_keys) | matching:
+            ranked = self.memo.get(prefix)
+            if ranked is None:
+                continue
+            if entry_key in ranked:
+                ranked.remove(entry_key)
+            complete = prefix in self.complete
+            if prefix in matching and (complete or (ranked and entry['rank'] < self._rank_of(ranked[-1]))):
+                bisect.insort(ranked, entry_key, key=self._rank_of)
+                if len(ranked) > MEMO_DEPTH:
+                    ranked.pop()
+                    self.complete.discard(prefix)
+            elif not complete and len(ranked) < MAX_SUGGESTIONS:
+                # Whatever ranks next is outside the list; rescan (now, if it is a short prefix).
+                del self.memo[prefix]
+                if len(prefix) <= SHORT_PREFIX_LENGTH:
+                    self._dirty_short.add(prefix)
+
+    def _put(self, kind, ref, text, score, slug=None):
+        """Add or update one entry; False when it was already exactly this."""
+        current = self.entries.get((kind, ref))
+        if current is not None and (current['text'], current['score'], current['slug']) == (text, score, slug):
+            return False
+        keys = index_keys(text)
+        if not keys:
+            return self._drop(kind, ref)
+        old_keys = current['keys'] if current is not None else ()
+        if old_keys != keys:
+            for key in old_keys:
+                self._remove_key(key, kind, ref)
+            for key in keys:
+                if self._bulk:
+                    self.keys.append((key, kind, ref))
+                else:
+                    bisect.insort(self.keys, (key, kind, ref))
+        self.entries[(kind, ref)] = {
+            'kind': kind, 'id': ref, 'text': text, 'score': score, 'slug': slug, 'keys': keys,
+            'rank': _rank(kind, ref, text, score),
+        }
+        if not self._bulk:
+            self._reposition((kind, ref), old_keys, keys)
+        return True
+
+    def _drop(self, kind, ref):
+        entry = self.entries.pop((kind, ref), None)
+        if entry is None:
+            return False
+        for key in entry['keys']:
+            self._remove_key(key, kind, ref)
+        self._reposition((kind, ref), entry['keys'], ())
+        return True
+
+    def _remove_key(self, key, kind, ref):
+        position = bisect.bisect_left(self.keys, (key, kind, ref))
+        if position < len(self.keys) and self.keys[position] == (key, kind, ref):
+            del self.keys[position]
+
+    def _aggregates_of(self, row):
+        aggregates = []
+        if row.get('seller_id'):
+            aggregates.append(('store', row['seller_id']))
+        if row.get('category_id'):
+            aggregates.append(('category', row['category_id']))
+        brand = normalize(row.get('brand'))
+        if brand:
+            self.brand_text.setdefault(brand, row['brand'].strip())
+            aggregates.append(('brand', brand))
+        return aggregates
+
+    def _refresh_aggregate(self, aggregate):
+        kind, ref = aggregate
+        members = self.members.get(aggregate) or {}
+        score = max(members.values(), default=0)
+        if kind == 'store':
+            store = self.stores.get(ref)
+            if store is None:
+                return self._drop(kind, ref)
+            return self._put(kind, ref, store['store_name'], score, slug=store['store_slug'])
+        if kind == 'category':
+            if ref not in self.categories:
+                return self._drop(kind, ref)
+            return self._put(kind, ref, self.categories[ref], score)
+        if not members:
+            self.members.pop(aggregate, None)
+            self.brand_text.pop(ref, None)
+            return self._drop(kind, ref)
+        return self._put(kind, ref, self.brand_text[ref], score)
+
+    def apply(self, change):
+        """Apply one ``load_*_change`` record; False when it changed nothing."""
+        changed = False
+        kind = change.get('kind')
+        if kind == 'product':
+            product_id, row = change['id'], change.get('row')
+            old = self.products.pop(product_id, None)
+            touched = set()
+            if old is not None:
+                for aggregate in self._aggregates_of(old):
+                    self.members.get(aggregate, {}).pop(product_id, None)
+                    touched.add(aggregate)
+            if row is None:
+                changed = self._drop('product', product_id)
+            else:
+                self.products[product_id] = row
+                changed = self._put('product', product_id, row['name'], row['sales_count'])
+                for aggregate in self._aggregates_of(row):
+                    self.members.setdefault(aggregate, {})[product_id] = row['sales_count']
+                    touched.add(aggregate)
+            for aggregate in touched:
+                changed = self._refresh_aggregate(aggregate) or changed
+        elif kind == 'store':
+            if change.get('row') is None:
+                self.stores.pop(change['id'], None)
+            else:
+                self.stores[change['id']] = change['row']
+            changed = self._refresh_aggregate(('store', change['id']))
+        elif kind == 'categories':
+            active = {row['id']: row['name'] for row in change['rows']}
+            stale = set(self.categories) | set(active)
+            self.categories = active
+            for category_id in stale:
+                changed = self._refresh_aggregate(('category', category_id)) or changed
+        for prefix in self._dirty_short:
+            self.scan(prefix)
+        self._dirty_short.clear()
+        return changed
+
+
+class SuggestionIndex:
+    """The worker's current ``_IndexState`` plus its rebuild thread and journal cursor."""
+
+    def __init__(self, rebuild_seconds=900, shared_store=None, journal_seconds=3600, sync_seconds=1.0):
+        self.rebuild_seconds = rebuild_seconds
+        self.shared_store = shared_store
+        self.journal_seconds = journal_seconds
+        self.sync_seconds = sync_seconds
+        self._lock = threading.RLock()
+        self._state = None
+        self._journal_cursor = 0
+        self._next_sync = 0.0
+        self._next_purge = 0.0
+        self.built_at = None
+        self.stats = {'queries': 0, 'memo_hits': 0, 'scans': 0, 'cold': 0, 'builds': 0, 'changes': 0}
+
+    @property
+    def ready(self):
+        return self._state is not None
+
+    def start(self, connect, retry_seconds=30):
+        """Build now and every ``rebuild_seconds`` on a daemon thread; ``connect`` returns a DB connection."""
+        def run():
+            while True:
+                try:
+                    self.rebuild(connect)
+                    time.sleep(self.rebuild_seconds)
+                except Exception as err:
+                    print(f"[SUGGEST] Index build failed: {err}; retrying in {retry_seconds}s")
+                    time.sleep(retry_seconds)
+
+        thread = threading.Thread(target=run, name='search-suggest-index', daemon=True)
+        thread.start()
+        return thread
+
+    def rebuild(self, connect):
+        started_ns = time.time_ns()
+        conn = connect()
+        if conn is None:
+            raise RuntimeError('DB connection failed')
+        try:
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            snapshot = load_snapshot(cursor)
+            cursor.close()
+            conn.rollback()
+        finally:
+            conn.close()
+        state = _IndexState()
+        state.load(snapshot)
+        with self._lock:
+            self._state = state
+            # Replay what other workers published while the snapshot was being read.
+            self._journal_cursor = started_ns
+            self._next_sync = 0.0
+            self.built_at = time.time()
+            self.stats['builds'] += 1
+        self.sync()
+        return len(state.entries)
+
+    def apply(self, change):
+        with self._lock:
+            if self._state is not None and self._state.apply(change):
+                self.stats['changes'] += 1
+
+    def publish(self, change):
+        """Apply a change here and journal it for the other workers."""
+        self.apply(change)
+        if self.shared_store is None:
+            return
+        now = time.time()
+        try:
+            self.shared_store.set(
+                JOURNAL_NAMESPACE, f'{time.time_ns():020d}.{os.getpid()}', now + self.journal_seconds, change
+            )
+            if now >= self._next_purge:
+                self._next_purge = now + self.journal_seconds
+                self.shared_store.purge_expired(JOURNAL_NAMESPACE)
+        except sqlite3.Error as err:
+            print(f"[SUGGEST] Could not journal {change.get('kind')} change: {err}")
+
+    def sync(self):
+        """Apply changes other workers journaled since the last sync (at most every ``sync_seconds``)."""
+        if self.shared_store is None or self._state is None:
+            return
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_seconds
+        since = max(0, self._journal_cursor - SYNC_OVERLAP_NS)
+        try:
+            entries = self.shared_store.entries_after(JOURNAL_NAMESPACE, f'{since:020d}')
+        except sqlite3.Error as err:
+            print(f"[SUGGEST] Could not read the change journal: {err}")
+            return
+        with self._lock:
+            # Records hold absolute state, so replaying the overlap window is harmless.
+            for key, change in entries:
+                if self._state.apply(change):
+                    self.stats['changes'] += 1
+                self._journal_cursor = max(self._journal_cursor, int(key.split('.', 1)[0]))
+
+    def suggest(self, text, limit=8):
+        """Top ``limit`` suggestions for a typed prefix, or None while the index is cold."""
+        if self._state is None:
+            self.stats['cold'] += 1
+            return None
+        self.sync()
+        prefix = normalize(text)
+        limit = max(1, min(int(limit), MAX_SUGGESTIONS))
+        with self._lock:
+            state = self._state
+            self.stats['queries'] += 1
+            if not prefix:
+                return []
+            ranked = state.memo.get(prefix)
+            if ranked is None:
+                self.stats['scans'] += 1
+                ranked = state.scan(prefix)
+            else:
+                self.stats['memo_hits'] += 1
+            suggestions = []
+            seen = set()
+            for entry_key in ranked:
+                entry = state.entries[entry_key]
+                text_key = entry['text'].lower()
+                if text_key in seen:
+                    continue
+                seen.add(text_key)
+                suggestions.append({
+                    'kind': entry['kind'], 'id': entry['id'], 'text': entry['text'],
+                    'score': entry['score'], 'slug': entry['slug'],
+                })
+                if len(suggestions) == limit:
+                    break
+            return suggestions
+
+    def size(self):
+        state = self._state
+        return {'entries': len(state.entries), 'keys': len(state.keys), 'memo': len(state.memo)} if state else None
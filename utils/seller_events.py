@@ -0,0 +1,171 @@
+"""
+Push channel for seller dashboards.
+
+``create_seller_notification`` and ``record_order_status_change`` publish a
+small JSON payload with ``pg_notify`` in the same statement as their INSERT,
+so Postgres delivers it only when the writing transaction commits. Each app
+process keeps one dedicated ``LISTEN`` connection (``SellerEventHub``) and
+fans the payloads out to the dashboards connected to it over Server-Sent
+Events or long-poll. An idle dashboard therefore costs no queries at all.
+
+Event ids are ``<boot id>-<sequence>``: the sequence only means something to
+the hub that issued it, and a reconnect usually lands on another gunicorn
+worker (or on a restarted one). A dashboard that comes back with an id from
+another hub, or with an older cursor than this hub still remembers, gets a
+``resync`` event and refetches its counts once.
+"""
+import collections
+import json
+import secrets
+import select
+import threading
+import time
+
+SELLER_EVENTS_CHANNEL = 'seller_events'
+RECENT_EVENTS_PER_SELLER = 50
+
+# ``since`` value for a cursor this hub did not issue: the next wait answers with a resync.
+FOREIGN_CURSOR = -1
+
+
+def notify_sql(insert_sql, event_sql):
+    """Wrap an ``INSERT ... RETURNING`` so it also publishes a seller event.
+
+    ``event_sql`` is a SQL expression over the ``inserted`` row that yields the
+    JSON payload. The notify only fires if the row was written, and only once
+    the surrounding transaction commits.
+    """
+    return f'''
+        WITH inserted AS ({insert_sql.strip()})
+        SELECT pg_notify('{SELLER_EVENTS_CHANNEL}', ({event_sql})::text) FROM inserted
+    '''
+
+
+class SellerEventHub:
+    """One LISTEN connection per process, fanned out to waiting requests."""
+
+    def __init__(self, connect, reconnect_seconds=5):
+        self.connect = connect
+        self.reconnect_seconds = reconnect_seconds
+        self.boot_id = secrets.token_hex(4)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._resync_seq = 0
+        self._recent = {}
+        self._evicted = {}
+        self.listening = False
+        self.stats = {'received': 0, 'reconnects': 0}
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name='seller-event-listener', daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = self.connect()
+                if conn is None:
+                    raise RuntimeError('DB connection failed')
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f'LISTEN {SELLER_EVENTS_CHANNEL}')
+                cursor.close()
+                if self.stats['reconnects']:
+                    # Anything published while we were disconnected is lost; make dashboards refetch.
+                    self._publish_resync()
+                self.listening = True
+                while True:
+                    if select.select([conn], [], [], 60)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self.publish(conn.notifies.pop(0).payload)
+            except Exception as err:
+                self.listening = False
+                self.stats['reconnects'] += 1
+                print(f"[SELLER EVENTS] Listener disconnected: {err}; retrying in {self.reconnect_seconds}s")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                time.sleep(self.reconnect_seconds)
+
+    def publish(self, payload):
+        """Record one NOTIFY payload and wake the dashboards of its seller."""
+        try:
+            event = json.loads(payload)
+            seller_id = int(event['seller_id'])
+        except (TypeError, ValueError, KeyError):
+            print(f"[SELLER EVENTS] Ignoring malformed payload: {payload!r}")
+            return
+        with self._cond:
+            self._seq += 1
+            recent = self._recent.get(seller_id)
+            if recent is None:
+                recent = self._recent[seller_id] = collections.deque(maxlen=RECENT_EVENTS_PER_SELLER)
+            if len(recent) == recent.maxlen:
+                self._evicted[seller_id] = recent[0][0]
+            recent.append((self._seq, event))
+            self.stats['received'] += 1
+            self._cond.notify_all()
+
+    def _publish_resync(self):
+        with self._cond:
+            self._seq += 1
+            self._resync_seq = self._seq
+            self._cond.notify_all()
+
+    def cursor(self):
+        """Sequence number a newly connected dashboard should start from."""
+        with self._cond:
+            return self._seq
+
+    def event_id(self, seq):
+        """Client-facing id (SSE ``id:`` / long-poll ``cursor``) for ``seq``."""
+        return f'{self.boot_id}-{seq}'
+
+    def resume_from(self, event_id):
+        """Sequence to resume from for a client's ``Last-Event-ID`` / ``since``.
+
+        No id starts at the current end; an id issued by another process or an
+        earlier boot (or one that doesn't parse) returns ``FOREIGN_CURSOR``.
+        """
+        if not event_id:
+            return self.cursor()
+        boot_id, _, seq = str(event_id).rpartition('-')
+        if boot_id != self.boot_id or not seq.isdigit():
+            return FOREIGN_CURSOR
+        return int(seq)
+
+    def _pending(self, seller_id, since):
+        if self._resync_seq > since:
+            return [(self._resync_seq, {'kind': 'resync', 'seller_id': seller_id})]
+        recent = self._recent.get(seller_id)
+        if not recent or recent[-1][0] <= since:
+            return []
+        if self._evicted.get(seller_id, 0) > since:
+            # Events this dashboard never saw were already dropped; it has to refetch.
+            return [(recent[-1][0], {'kind': 'resync', 'seller_id': seller_id})]
+        return [(seq, event) for seq, event in recent if seq > since]
+
+    def wait(self, seller_id, since, timeout):
+        """Block up to ``timeout`` seconds for events newer than ``since``.
+
+        Returns ``(cursor, [(seq, event), ...])``; an empty list means the
+        wait timed out and ``cursor`` is where the next wait should resume.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if since == FOREIGN_CURSOR or since > self._seq:
+                # Whatever this dashboard missed was published to another hub; it has to refetch.
+                return self._seq, [(self._seq, {'kind': 'resync', 'seller_id': seller_id})]
+            while True:
+                events = self._pending(seller_id, since)
+                if events:
+                    return events[-1][0], events
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return self._seq, []
+                self._cond.wait(remaining)
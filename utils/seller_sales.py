@@ -0,0 +1,269 @@
+"""
+Daily per-seller sales rollup for the seller dashboard and reports.
+
+The seller dashboard, /seller/sales-analytics and /seller/performance used
+to aggregate ``orders`` joined to ``order_items`` and ``products`` on every load, filtering on ``DATE(created_at)`` or
+``NOW() - INTERVAL`` so no index applied and the cost grew with the
+seller's whole order history. They now read two small tables:
+
+  - ``seller_daily_sales``: one row per (seller, day, product) with the
+    orders, units and revenue of live orders (not cancelled/failed) and the
+    units and revenue of delivered/completed ones. Orders count towards
+    ``orders.seller_id``, like the dashboard and the sales report always did.
+    ``order_count`` counts each order once, on its first line, so it sums
+    across products.
+  - ``seller_customers``: live orders per (seller, buyer), for repeat-customer
+    counts.
+
+Both are kept current incrementally: order status changes call
+``sync_order_sales_rollup``, and ``orders.sales_rollup_state`` records which
+buckets an order is currently counted in (0 none, 1 live, 2 delivered), so
+repeated or out-of-order calls never double count. ``rebuild_seller_sales``
+recomputes everything from scratch. Days are ``DATE(orders.created_at)``,
+the same day the old queries grouped by.
+"""
+
+SELLER_DAILY_SALES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS seller_daily_sales (
+        seller_id INTEGER NOT NULL,
+        sales_date DATE NOT NULL,
+        product_id INTEGER NOT NULL,
+        order_count INTEGER NOT NULL DEFAULT 0,
+        units_sold INTEGER NOT NULL DEFAULT 0,
+        revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        delivered_units INTEGER NOT NULL DEFAULT 0,
+        delivered_revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT NOW(),
+        PRIMARY KEY (seller_id, sales_date, product_id)
+    )
+"""
+
+SELLER_CUSTOMERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS seller_customers (
+        seller_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        order_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (seller_id, user_id)
+    )
+"""
+
+ORDERS_ROLLUP_COLUMN_SQL = """
+    ALTER TABLE orders ADD COLUMN IF NOT EXISTS sales_rollup_state SMALLINT NOT NULL DEFAULT 0
+"""
+
+# The sales report lists individual delivered lines for its date range and totals those same lines.
+ORDERS_SELLER_CREATED_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_orders_seller_created ON orders (seller_id, created_at DESC)
+"""
+
+# Compared as text: databases created from models.py have an order_status enum
+# without every status the app writes.
+_ROLLUP_STATE = """
+    CASE
+        WHEN order_status::text IN ('delivered', 'completed') THEN 2
+        WHEN order_status::text IN ('cancelled', 'failed') THEN 0
+        ELSE 1
+    END
+"""
+
+# One row per product of an order; first_line marks the row that carries the order count.
+_ORDER_LINES_SQL = """
+    SELECT
+        o.seller_id,
+        oi.product_id,
+        SUM(oi.quantity) AS units,
+        SUM(COALESCE(oi.subtotal, oi.quantity * oi.unit_price)) AS revenue,
+        (MIN(oi.id) = MIN(MIN(oi.id)) OVER ())::int AS first_line
+    FROM orders o
+    JOIN order_items oi ON oi.order_id = o.id
+    WHERE o.id = %(order_id)s AND o.seller_id IS NOT NULL AND oi.product_id IS NOT NULL
+    GROUP BY o.seller_id, oi.product_id
+"""
+
+
+def ensure_seller_sales_tables(cursor):
+    """Create the rollup tables, the ``orders.sales_rollup_state`` marker and the report index."""
+    cursor.execute(SELLER_DAILY_SALES_TABLE_SQL)
+    cursor.execute(SELLER_CUSTOMERS_TABLE_SQL)
+    cursor.execute(ORDERS_ROLLUP_COLUMN_SQL)
+    cursor.execute(ORDERS_SELLER_CREATED_INDEX_SQL)
+
+
+def sync_order_sales_rollup(cursor, order_id):
+    """Move an order's lines between rollup buckets after it is placed or changes status.
+
+    Safe to call after any ``orders.order_status`` update; it is a no-op when
+    the order's buckets have not changed.
+
+    Returns:
+        bool: True if the rollup changed
+    """
+    if not order_id:
+        return False
+
+    cursor.execute(f"""
+        WITH previous AS (
+            SELECT id, sales_rollup_state FROM orders WHERE id = %s FOR UPDATE
+        )
+        UPDATE orders o
+        SET sales_rollup_state = ({_ROLLUP_STATE})
+        FROM previous
+        WHERE o.id = previous.id
+          AND o.sales_rollup_state IS DISTINCT FROM ({_ROLLUP_STATE})
+        RETURNING previous.sales_rollup_state AS old_state, o.sales_rollup_state AS new_state,
+                  DATE(o.created_at) AS sales_date, o.user_id
+    """, (order_id,))
+    row = cursor.fetchone()
+    if not row:
+        return False
+
+    if not isinstance(row, dict):
+        row = dict(zip(('old_state', 'new_state', 'sales_date', 'user_id'), row))
+    old_state, new_state = row['old_state'] or 0, row['new_state']
+    params = {
+        'order_id': order_id,
+        'sales_date': row['sales_date'],
+        'user_id': row['user_id'],
+        'live': int(new_state >= 1) - int(old_state >= 1),
+        'delivered': int(new_state == 2) - int(old_state == 2),
+    }
+
+    cursor.execute(f"""
+        INSERT INTO seller_daily_sales (
+            seller_id, sales_date, product_id, order_count, units_sold, revenue,
+            delivered_units, delivered_revenue, updated_at
+        )
+        SELECT seller_id, %(sales_date)s, product_id,
+               %(live)s * first_line, %(live)s * units, %(live)s * revenue,
+               %(delivered)s * units, %(delivered)s * revenue, NOW()
+        FROM ({_ORDER_LINES_SQL}) lines
+        ON CONFLICT (seller_id, sales_date, product_id) DO UPDATE
+        SET order_count = GREATEST(seller_daily_sales.order_count + EXCLUDED.order_count, 0),
+            units_sold = GREATEST(seller_daily_sales.units_sold + EXCLUDED.units_sold, 0),
+            revenue = GREATEST(seller_daily_sales.revenue + EXCLUDED.revenue, 0),
+            delivered_units = GREATEST(seller_daily_sales.delivered_units + EXCLUDED.delivered_units, 0),
+            delivered_revenue = GREATEST(seller_daily_sales.delivered_revenue + EXCLUDED.delivered_revenue, 0),
+            updated_at = NOW()
+    """, params)
+
+    if params['live'] and params['user_id']:
+        cursor.execute("""
+            INSERT INTO seller_customers (seller_id, user_id, order_count)
+            SELECT seller_id, %(user_id)s, %(live)s
+            FROM orders
+            WHERE id = %(order_id)s AND seller_id IS NOT NULL
+            ON CONFLICT (seller_id, user_id) DO UPDATE
+            SET order_count = GREATEST(seller_customers.order_count + EXCLUDED.order_count, 0)
+        """, params)
+    return True
+
+
+def rebuild_seller_sales(cursor):
+    """Recompute both rollup tables from orders and resync ``orders.sales_rollup_state``.
+
+    Returns:
+        int: Number of seller_daily_sales rows written
+    """
+    cursor.execute("LOCK TABLE seller_daily_sales, seller_customers IN EXCLUSIVE MODE")
+    cursor.execute(f"""
+        UPDATE orders
+        SET sales_rollup_state = ({_ROLLUP_STATE})
+        WHERE sales_rollup_state IS DISTINCT FROM ({_ROLLUP_STATE})
+    """)
+    cursor.execute("DELETE FROM seller_daily_sales")
+    cursor.execute("DELETE FROM seller_customers")
+    cursor.execute("""
+        INSERT INTO seller_daily_sales (
+            seller_id, sales_date, product_id, order_count, units_sold, revenue,
+            delivered_units, delivered_revenue, updated_at
+        )
+        SELECT
+            seller_id, sales_date, product_id,
+            COALESCE(SUM(first_line) FILTER (WHERE state >= 1), 0),
+            COALESCE(SUM(units) FILTER (WHERE state >= 1), 0),
+            COALESCE(SUM(revenue) FILTER (WHERE state >= 1), 0),
+            COALESCE(SUM(units) FILTER (WHERE state = 2), 0),
+            COALESCE(SUM(revenue) FILTER (WHERE state = 2), 0),
+            NOW()
+        FROM (
+            SELECT
+                o.seller_id,
+                DATE(o.created_at) AS sales_date,
+                oi.product_id,
+                o.sales_rollup_state AS state,
+                SUM(oi.quantity) AS units,
+                SUM(COALESCE(oi.subtotal, oi.quantity * oi.unit_price)) AS revenue,
+                (MIN(oi.id) = MIN(MIN(oi.id)) OVER (PARTITION BY o.id))::int AS first_line
+            FROM orders o
+            JOIN order_items oi ON oi.order_id = o.id
+            WHERE o.sales_rollup_state >= 1 AND o.seller_id IS NOT NULL AND oi.product_id IS NOT NULL
+            GROUP BY o.id, o.seller_id, oi.product_id
+        ) lines
+        GROUP BY seller_id, sales_date, product_id
+    """)
+    rows = cursor.rowcount
+    cursor.execute("""
+        INSERT INTO seller_customers (seller_id, user_id, order_count)
+        SELECT seller_id, user_id, COUNT(*)
+        FROM orders
+        WHERE sales_rollup_state >= 1 AND seller_id IS NOT NULL AND user_id IS NOT NULL
+        GROUP BY seller_id, user_id
+    """)
+    return rows
+
+
+def load_seller_sales_summary(cursor, seller_id, since):
+    """Live orders, units and revenue of ``seller_id`` from ``since`` (a date) through today."""
+    cursor.execute("""
+        SELECT
+            COALESCE(SUM(order_count), 0) AS total_orders,
+            COALESCE(SUM(units_sold), 0) AS units_sold,
+            COALESCE(SUM(revenue), 0) AS total_revenue
+        FROM seller_daily_sales
+        WHERE seller_id = %s AND sales_date >= %s
+    """, (seller_id, since))
+    return cursor.fetchone()
+
+
+def load_seller_daily_revenue(cursor, seller_id, since):
+    """``{date: revenue}`` of live orders for each day since ``since`` that had sales."""
+    cursor.execute("""
+        SELECT sales_date, SUM(revenue) AS revenue
+        FROM seller_daily_sales
+        WHERE seller_id = %s AND sales_date >= %s
+        GROUP BY sales_date
+    """, (seller_id, since))
+    rows = cursor.fetchall()
+    if rows and not isinstance(rows[0], dict):
+        return {row[0]: row[1] for row in rows}
+    return {row['sales_date']: row['revenue'] for row in rows}
+
+
+def load_seller_top_products(cursor, seller_id, since, limit=10):
+    """Best sellers of ``seller_id`` by units since ``since``, with product names."""
+    cursor.execute("""
+        SELECT
+            s.product_id AS id,
+            p.name AS product_name,
+            SUM(s.units_sold) AS quantity_sold,
+            SUM(s.revenue) AS product_revenue
+        FROM seller_daily_sales s
+        JOIN products p ON p.id = s.product_id
+        WHERE s.seller_id = %s AND s.sales_date >= %s
+        GROUP BY s.product_id, p.name
+        HAVING SUM(s.units_sold) > 0
+        ORDER BY quantity_sold DESC
+        LIMIT %s
+    """, (seller_id, since, limit))
+    return cursor.fetchall()
+
+
+def count_repeat_customers(cursor, seller_id):
+    """Buyers with more than one live order from ``seller_id``."""
+    cursor.execute("""
+        SELECT COUNT(*) AS repeat_customers
+        FROM seller_customers
+        WHERE seller_id = %s AND order_count > 1
+    """, (seller_id,))
+    row = cursor.fetchone()
+    return int((row['repeat_customers'] if isinstance(row, dict) else row[0]) or 0)
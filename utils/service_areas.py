@@ -0,0 +1,229 @@
+"""
+Service-area matching for rider order discovery.
+
+A rider's ``service_area`` is free text: comma-separated city, province or
+region names ("Cebu, Bohol" or "Metro Manila"). /api/rider/available-orders
+used to load every order waiting for pickup and compare each address against
+those names with substring checks in Python, rebuilding the region table on
+every call.
+
+Instead:
+  - ``area_key`` normalizes a place name (case, ñ, punctuation, "City of X" /
+    "X City"). "X City" keeps its suffix when X is also a province, so Quezon
+    City and Quezon province stay apart. ``addresses.city_key`` and
+    ``addresses.province_key`` are generated columns holding the same
+    normalization, computed by Postgres on every insert and update, with an
+    index each.
+  - ``compile_service_area`` turns a rider's service area into the keys it
+    covers, expanding region names through ``REGION_AREAS``. It is memoized
+    per service-area string, so it runs once per distinct value.
+  - ``fetch_available_orders`` sends those keys to Postgres, so only matching
+    orders are read.
+
+An address matches when its city key or province key equals one of the
+``exact`` keys, or when one of the ``words`` keys appears as whole words in
+its province key. That is how 'Mindanao' covers Davao del Norte and
+'Mindoro' covers Oriental Mindoro. Names written with "City" are only
+matched exactly, so a 'Davao City' rider does not get all of Davao del Sur.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Region names riders use, mapped to the provinces and cities they cover.
+REGION_AREAS = {
+    'north luzon': [
+        'baguio', 'la union', 'benguet', 'ifugao', 'mountain province', 'nueva vizcaya', 'nueva ecija', 'tarlac',
+        'pangasinan', 'quirino', 'aurora', 'ilocos norte', 'ilocos sur', 'abra', 'apayao', 'kalinga', 'cagayan',
+        'isabela', 'batanes', 'zambales', 'bataan', 'pampanga', 'bulacan',
+    ],
+    'south luzon': ['cavite', 'laguna', 'quezon', 'batangas', 'rizal', 'marinduque', 'mindoro', 'oriental mindoro', 'occidental mindoro', 'romblon', 'tayabas'],
+    'metro manila': ['ncr', 'manila', 'makati', 'quezon city', 'pasig', 'taguig', 'mandaluyong', 'san juan', 'marikina', 'parañaque', 'muntinlupa', 'las piñas', 'pasay', 'caloocan', 'malabon', 'navotas', 'valenzuela'],
+    'visayas': [
+        'cebu', 'bohol', 'negros', 'negros occidental', 'negros oriental', 'antique', 'capiz', 'iloilo', 'guimaras',
+        'siquijor', 'aklan', 'leyte', 'southern leyte', 'biliran', 'samar', 'eastern samar', 'northern samar',
+    ],
+    'mindanao': [
+        'davao', 'davao del sur', 'davao del norte', 'davao oriental', 'davao occidental', 'davao de oro',
+        'cagayan de oro', 'misamis oriental', 'misamis occidental', 'bukidnon', 'camiguin',
+        'zamboanga', 'zamboanga del sur', 'zamboanga del norte', 'zamboanga sibugay', 'basilan', 'sulu', 'tawi tawi',
+        'butuan', 'agusan del norte', 'agusan del sur', 'surigao', 'surigao del sur', 'surigao del norte',
+        'dinagat islands', 'general santos', 'koronadal', 'cotabato', 'cotabato city', 'south cotabato',
+        'north cotabato', 'sarangani', 'sultan kudarat', 'maguindanao', 'iligan', 'marawi', 'lanao del norte',
+        'lanao del sur',
+    ],
+    'bicol': ['albay', 'camarines norte', 'camarines sur', 'catanduanes', 'masbate', 'sorsogon'],
+    'calabarzon': ['cavite', 'laguna', 'batangas', 'rizal', 'quezon'],
+    'mimaropa': ['marinduque', 'mindoro', 'oriental mindoro', 'occidental mindoro', 'palawan', 'romblon'],
+    'calamansi': ['camarines norte', 'camarines sur', 'albay'],
+}
+
+# Provinces, for telling "Quezon City" (a city) from "Quezon" (a province) once "City" is dropped.
+PROVINCES = (
+    'abra', 'agusan del norte', 'agusan del sur', 'aklan', 'albay', 'antique', 'apayao', 'aurora', 'basilan',
+    'bataan', 'batanes', 'batangas', 'benguet', 'biliran', 'bohol', 'bukidnon', 'bulacan', 'cagayan',
+    'camarines norte', 'camarines sur', 'camiguin', 'capiz', 'catanduanes', 'cavite', 'cebu', 'cotabato',
+    'davao de oro', 'davao del norte', 'davao del sur', 'davao occidental', 'davao oriental', 'dinagat islands',
+    'eastern samar', 'guimaras', 'ifugao', 'ilocos norte', 'ilocos sur', 'iloilo', 'isabela', 'kalinga',
+    'la union', 'laguna', 'lanao del norte', 'lanao del sur', 'leyte', 'maguindanao', 'marinduque', 'masbate',
+    'misamis occidental', 'misamis oriental', 'mountain province', 'negros occidental', 'negros oriental',
+    'northern samar', 'nueva ecija', 'nueva vizcaya', 'occidental mindoro', 'oriental mindoro', 'palawan',
+    'pampanga', 'pangasinan', 'quezon', 'quirino', 'rizal', 'romblon', 'samar', 'sarangani', 'siquijor',
+    'sorsogon', 'south cotabato', 'southern leyte', 'sultan kudarat', 'sulu', 'surigao del norte',
+    'surigao del sur', 'tarlac', 'tawi tawi', 'zambales', 'zamboanga del norte', 'zamboanga del sur',
+    'zamboanga sibugay',
+)
+
+# Other names for the same area; the value is what addresses are stored as.
+AREA_ALIASES = {
+    'ncr': 'metro manila',
+    'national capital region': 'metro manila',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_CITY_AFFIX = re.compile(r'^ *city of | city *$')
+
+# _area_key_sql() must stay identical to area_key() below. Changing either (or PROVINCES)
+# means bumping AREA_KEY_VERSION so ensure_address_area_keys() regenerates the columns.
+AREA_KEY_VERSION = 2
+_PROVINCES_SQL = "'{" + ','.join(f'"{province}"' for province in PROVINCES) + "}'::text[]"
+
+
+def _area_key_sql(column):
+    spaced = f"regexp_replace(translate(lower(COALESCE({column}, '')), 'ñÑ', 'nn'), '[^a-z0-9]+', ' ', 'g')"
+    stripped = f"btrim(regexp_replace({spaced}, '^ *city of | city *$', '', 'g'))"
+    return (f"CASE WHEN {stripped} <> btrim({spaced}) AND {stripped} = ANY({_PROVINCES_SQL}) "
+            f"THEN {stripped} || ' city' ELSE {stripped} END")
+
+
+ADDRESS_AREA_KEY_COLUMNS_SQL = f"""
+    ALTER TABLE addresses
+        ADD COLUMN IF NOT EXISTS city_key TEXT GENERATED ALWAYS AS ({_area_key_sql('city')}) STORED,
+        ADD COLUMN IF NOT EXISTS province_key TEXT GENERATED ALWAYS AS ({_area_key_sql('province')}) STORED
+"""
+
+SERVICE_AREA_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_addresses_city_key ON addresses (city_key)",
+    "CREATE INDEX IF NOT EXISTS idx_addresses_province_key ON addresses (province_key)",
+    # Orders waiting for a rider are few; this lets the key match drive the join.
+    "CREATE INDEX IF NOT EXISTS idx_orders_waiting_pickup ON orders (shipping_address_id) "
+    "WHERE order_status = 'waiting_for_pickup'",
+)
+
+
+def ensure_address_area_keys(cursor):
+    """Add the generated ``city_key``/``province_key`` columns and the matching indexes.
+
+    Columns generated by an older ``area_key`` are dropped and added again, which
+    recomputes every row.
+    """
+    cursor.execute("""
+        SELECT col_description(attrelid, attnum) FROM pg_attribute
+        WHERE attrelid = 'addresses'::regclass AND attname = 'city_key' AND NOT attisdropped
+    """)
+    row = cursor.fetchone()
+    version = f'area_key v{AREA_KEY_VERSION}'
+    if row is not None and row[0] != version:
+        cursor.execute("ALTER TABLE addresses DROP COLUMN IF EXISTS city_key, DROP COLUMN IF EXISTS province_key")
+    cursor.execute(ADDRESS_AREA_KEY_COLUMNS_SQL)
+    for column in ('city_key', 'province_key'):
+        cursor.execute(f"COMMENT ON COLUMN addresses.{column} IS '{version}'")
+    for statement in SERVICE_AREA_INDEXES_SQL:
+        cursor.execute(statement)
+
+
+def _spaced(value):
+    return _NON_ALNUM.sub(' ', (value or '').lower().replace('ñ', 'n'))
+
+
+_PROVINCE_KEYS = frozenset(_spaced(province).strip() for province in PROVINCES)
+
+
+def area_key(value):
+    """Normalize a city, province or region name the way the address key columns do."""
+    spaced = _spaced(value)
+    key = _CITY_AFFIX.sub('', spaced).strip()
+    if key != spaced.strip() and key in _PROVINCE_KEYS:
+        return f'{key} city'
+    return key
+
+
+def _is_city_name(value):
+    return _CITY_AFFIX.search(_spaced(value)) is not None
+
+
+def _build_region_keys():
+    regions = {}
+    for region, areas in REGION_AREAS.items():
+        regions[area_key(region)] = [(area_key(area), _is_city_name(area)) for area in areas]
+    return regions
+
+
+_REGION_KEYS = _build_region_keys()
+
+
+class AreaKeys(NamedTuple):
+    exact: frozenset  # match city_key or province_key
+    words: frozenset  # also match as whole words inside province_key
+
+    def __bool__(self):
+        return bool(self.exact)
+
+
+@lru_cache(maxsize=4096)
+def compile_service_area(service_area):
+    """Return the ``AreaKeys`` a comma-separated service area covers."""
+    exact = set()
+    words = set()
+    for name in (service_area or '').split(','):
+        key = area_key(name)
+        if not key:
+            continue
+        key = AREA_ALIASES.get(key, key)
+        covered = [(key, _is_city_name(name))] + _REGION_KEYS.get(key, [])
+        for area, is_city in covered:
+            exact.add(area)
+            if not is_city:
+                words.add(area)
+    return AreaKeys(frozenset(exact), frozenset(words))
+
+
+def address_in_service_area(area_keys, city, province):
+    """Python-side check of one address against ``compile_service_area`` output."""
+    province = area_key(province)
+    if area_key(city) in area_keys.exact or province in area_keys.exact:
+        return True
+    padded = f' {province} '
+    return any(f' {key} ' in padded for key in area_keys.words)
+
+
+def fetch_available_orders(cursor, area_keys, limit):
+    """Newest orders waiting for pickup, unclaimed by any rider, delivering into ``area_keys``."""
+    if not area_keys:
+        return []
+    keys = sorted(area_keys.exact)
+    patterns = sorted(f'% {key} %' for key in area_keys.words)  # keys are [a-z0-9 ] only
+    cursor.execute('''
+        SELECT o.id, o.order_number, o.user_id, o.total_amount, o.order_status, o.created_at,
+               CONCAT(a.street_address, ', ', a.city, ', ', a.province, ' ', COALESCE(a.postal_code, '')) as delivery_address,
+               a.province as delivery_province,
+               a.postal_code as delivery_postal_code,
+               a.city as delivery_city,
+               CONCAT(u.first_name, ' ', u.last_name) as customer_name,
+               u.phone as customer_phone,
+               u.email,
+               COALESCE(s.id, 0) as shipment_id,
+               COALESCE(s.status, 'pending') as shipment_status,
+               COALESCE(s.seller_confirmed, FALSE) as seller_confirmed,
+               COALESCE(s.rider_id, 0) as assigned_rider_id
+        FROM addresses a
+        JOIN orders o ON o.shipping_address_id = a.id
+        JOIN users u ON o.user_id = u.id
+        LEFT JOIN shipments s ON s.order_id = o.id
+        WHERE (a.city_key = ANY(%s) OR a.province_key = ANY(%s) OR ' ' || a.province_key || ' ' LIKE ANY(%s))
+          AND o.order_status = 'waiting_for_pickup'
+          AND (s.rider_id IS NULL OR s.rider_id = 0)
+        ORDER BY o.created_at DESC
+        LIMIT %s
+    ''', (keys, keys, patterns, limit))
+    return cursor.fetchall()
@@ -0,0 +1,115 @@
+"""
+One shipment row per order.
+
+/api/rider/available-orders used to INSERT a shipment (and commit) for every
+matching order that had none, so a GET that many riders poll at once did
+serialized writes and could create duplicate shipments for the same order.
+
+Shipments are now created by the status transitions that hand an order to
+logistics (placement, seller confirmation, ``waiting_for_pickup``, release to
+a rider) through ``ensure_order_shipment``, and ``shipments.order_id`` is
+unique, so concurrent transitions converge on the same row. The rider read
+path only reads.
+"""
+import time
+
+# Duplicates left behind by the old read path are unassigned 'pending' rows. Keep the newest
+# rider-assigned row (or the oldest row when none is assigned) so the unique index can always
+# be built; assigned rows that lose out are returned for the migration to log.
+DEDUPE_SHIPMENTS_SQL = '''
+    DELETE FROM shipments s
+    USING (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY order_id
+            ORDER BY (COALESCE(rider_id, 0) <> 0) DESC,
+                     CASE WHEN COALESCE(rider_id, 0) <> 0 THEN -id ELSE id END
+        ) AS rank
+        FROM shipments
+        WHERE order_id IS NOT NULL
+    ) ranked
+    WHERE s.id = ranked.id AND ranked.rank > 1
+    RETURNING s.id, s.order_id, s.rider_id, s.status
+'''
+
+SHIPMENTS_ORDER_UNIQUE_SQL = 'CREATE UNIQUE INDEX IF NOT EXISTS uq_shipments_order_id ON shipments (order_id)'
+
+# Orders already waiting for a rider before this migration still need a row.
+BACKFILL_WAITING_SHIPMENTS_SQL = '''
+    INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
+    SELECT o.id, 'SHIP' || o.id || FLOOR(EXTRACT(EPOCH FROM NOW()))::bigint, 'pending', TRUE, NOW(), NOW()
+    FROM orders o
+    WHERE o.order_status = 'waiting_for_pickup'
+      AND NOT EXISTS (SELECT 1 FROM shipments s WHERE s.order_id = o.id)
+    ON CONFLICT (order_id) DO NOTHING
+'''
+
+
+# Set once uq_shipments_order_id is known to exist. Until then ensure_order_shipment checks the
+# catalog on each call and, if the index is missing, serializes on the order row instead.
+_order_unique_index = False
+
+
+def _values(row, keys):
+    return tuple(row[key] for key in keys) if isinstance(row, dict) else tuple(row)
+
+
+def _has_order_unique_index(cursor):
+    global _order_unique_index
+    if not _order_unique_index:
+        cursor.execute("SELECT to_regclass('uq_shipments_order_id') IS NOT NULL AS present")
+        _order_unique_index = _values(cursor.fetchone(), ('present',))[0]
+    return _order_unique_index
+
+
+def ensure_shipments_order_unique(cursor):
+    """Drop duplicate shipments, enforce one per order and backfill waiting orders.
+
+    Returns ``(removed, dropped_assigned)``: the number of duplicate rows
+    removed and the ``(id, order_id, rider_id, status)`` of those that had a
+    rider, which the caller should log.
+    """
+    cursor.execute(DEDUPE_SHIPMENTS_SQL)
+    dropped = [_values(row, ('id', 'order_id', 'rider_id', 'status')) for row in cursor.fetchall()]
+    cursor.execute(SHIPMENTS_ORDER_UNIQUE_SQL)
+    cursor.execute(BACKFILL_WAITING_SHIPMENTS_SQL)
+    return len(dropped), [row for row in dropped if row[2]]
+
+
+def ensure_order_shipment(cursor, order_id, status='pending', seller_confirmed=False):
+    """Return the id of ``order_id``'s shipment, creating it if the order has none.
+
+    Safe to call from concurrent requests: the unique ``order_id`` index makes
+    the losing INSERT a no-op and both callers get the same id. Without the
+    index (its migration failed) the order row is locked before looking for
+    a shipment, which gives the same result. An existing row is returned as
+    is; callers update its status themselves.
+    """
+    tracking_number = f"SHIP{order_id}{int(time.time())}"
+    if _has_order_unique_index(cursor):
+        cursor.execute('''
+            INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
+            VALUES (%s, %s, %s, %s, CASE WHEN %s THEN NOW() END, NOW())
+            ON CONFLICT (order_id) DO NOTHING
+            RETURNING id
+        ''', (order_id, tracking_number, status, seller_confirmed, seller_confirmed))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute('SELECT id FROM shipments WHERE order_id = %s', (order_id,))
+            row = cursor.fetchone()
+    else:
+        cursor.execute('SELECT id FROM orders WHERE id = %s FOR UPDATE', (order_id,))
+        cursor.execute('''
+            SELECT id FROM shipments WHERE order_id = %s
+            ORDER BY (COALESCE(rider_id, 0) <> 0) DESC, id LIMIT 1
+        ''', (order_id,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute('''
+                INSERT INTO shipments (order_id, tracking_number, status, seller_confirmed, seller_confirmed_at, created_at)
+                VALUES (%s, %s, %s, %s, CASE WHEN %s THEN NOW() END, NOW())
+                RETURNING id
+            ''', (order_id, tracking_number, status, seller_confirmed, seller_confirmed))
+            row = cursor.fetchone()
+    if row is None:
+        return None
+    return _values(row, ('id',))[0]
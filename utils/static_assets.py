@@ -0,0 +1,165 @@
+"""
+Content-hashed copies of the site's CSS and JavaScript.
+
+Templates linked ``static/js/*.js`` and ``static/css/style.css`` through
+Flask's static handler, which serves them with no max-age. Browsers either
+revalidate every script on every page or, with a cache lifetime, keep running
+old code after a deploy. The dashboards also inlined their scripts (the
+seller dashboard's was ~6k lines), so every render shipped them again.
+
+``build_static_assets`` hashes every file under ``SOURCE_DIRS`` and writes a
+copy named after its content, plus gzip and (when the ``brotli`` package is
+installed) brotli variants:
+
+    static/dist/js/script.<sha256[:12]>.js
+    static/dist/js/script.<sha256[:12]>.js.gz
+    static/dist/js/script.<sha256[:12]>.js.br
+
+A changed file gets a new name, so the copies never change and can be
+cached for a year as ``immutable``. A manifest (``dist/manifest.json``)
+maps ``js/script.js`` to its hashed name. Templates call ``static_url()``,
+which returns the hashed URL, or the plain ``/static/`` URL for files that
+are not in the manifest.
+
+The build runs at startup, which is quick for a couple hundred KB.
+scripts/build_static_assets.py runs it at deploy time and prints the
+sizes. Earlier builds are left in ``dist/``, so HTML cached before a deploy
+still finds the names it references.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # gzip alone is still served; brotli only saves another ~15%.
+    brotli = None
+
+SOURCE_DIRS = ('css', 'js')
+SOURCE_EXTENSIONS = ('.css', '.js')
+DIST_DIRNAME = 'dist'
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Preferred first; the first one the client accepts and we have on disk is served.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _hashed_name(relative, digest):
+    stem, extension = os.path.splitext(relative)
+    return f"{stem}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def _write_atomic(path, data, content_addressed=True):
+    if content_addressed and os.path.exists(path) and os.path.getsize(path) == len(data):
+        return  # the name carries the hash, so same name and size is the same file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+
+
+def _compressed_variants(data):
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    return variants
+
+
+def source_files(static_folder):
+    """``css/style.css``-style paths of every asset under ``SOURCE_DIRS``."""
+    for source_dir in SOURCE_DIRS:
+        root = os.path.join(static_folder, source_dir)
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = sorted(name for name in subdirs if name != '__pycache__')
+            relative = os.path.relpath(directory, static_folder).replace(os.sep, '/')
+            for name in sorted(files):
+                if name.endswith(SOURCE_EXTENSIONS):
+                    yield f"{relative}/{name}"
+
+
+def build_static_assets(static_folder):
+    """Write hashed and precompressed copies into ``dist/``; return ``(manifest, sizes)``.
+
+    ``sizes`` maps each source path to ``{'bytes', 'gzip', 'br'}`` (``br`` is None
+    without the brotli package).
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIRNAME)
+    manifest = {}
+    sizes = {}
+    for relative in source_files(static_folder):
+        with open(os.path.join(static_folder, *relative.split('/')), 'rb') as handle:
+            data = handle.read()
+        hashed = _hashed_name(relative, hashlib.sha256(data).hexdigest())
+        out_path = os.path.join(dist_folder, *hashed.split('/'))
+        _write_atomic(out_path, data)
+        entry = {'bytes': len(data), 'gzip': None, 'br': None}
+        for suffix, compressed in _compressed_variants(data):
+            if len(compressed) < len(data):
+                _write_atomic(out_path + suffix, compressed)
+                entry['gzip' if suffix == '.gz' else 'br'] = len(compressed)
+        manifest[relative] = hashed
+        sizes[relative] = entry
+    _write_atomic(os.path.join(dist_folder, MANIFEST_NAME),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'), content_addressed=False)
+    return manifest, sizes
+
+
+def load_static_manifest(static_folder):
+    """The manifest written by the last build, or {} if there is none."""
+    try:
+        with open(os.path.join(static_folder, DIST_DIRNAME, MANIFEST_NAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def choose_encoding(dist_folder, hashed, accept_encodings):
+    """``(filename, content_encoding)`` to send for ``hashed``.
+
+    ``accept_encodings`` is ``request.accept_encodings``; the plain file is
+    returned with ``None`` when no precompressed variant is acceptable.
+    """
+    for encoding, suffix in ENCODINGS:
+        if accept_encodings[encoding] and os.path.isfile(os.path.join(dist_folder, *(hashed + suffix).split('/'))):
+            return hashed + suffix, encoding
+    return hashed, None
+
+
+class StaticAssets:
+    """Per-process manifest lookup behind the ``static_url()`` template helper."""
+
+    def __init__(self, static_folder, enabled=True):
+        self.static_folder = static_folder
+        self.dist_folder = os.path.join(static_folder, DIST_DIRNAME)
+        self.enabled = enabled
+        self.manifest = {}
+        self._lock = threading.Lock()
+        self.stats = {'hashed_urls': 0, 'plain_urls': 0, 'served': 0, 'served_br': 0, 'served_gzip': 0}
+
+    def load(self, build=True):
+        """Build (or, if the static folder is read-only, read) the manifest."""
+        if not self.enabled:
+            return self
+        manifest = None
+        if build:
+            try:
+                manifest, _ = build_static_assets(self.static_folder)
+            except OSError as err:
+                print(f"[STATIC] Could not write {self.dist_folder}: {err}; using the last build")
+        if manifest is None:
+            manifest = load_static_manifest(self.static_folder)
+        self.manifest = manifest
+        return self
+
+    def hashed_name(self, filename):
+        """``js/script.<hash>.js`` for ``js/script.js``, or None when it is not hashed."""
+        return self.manifest.get(filename) if self.enabled else None
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
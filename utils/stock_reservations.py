@@ -0,0 +1,297 @@
+"""
+Checkout stock reservations.
+
+``place_order`` holds stock for every cart line the moment the order is
+written, instead of relying on the seller's later confirmation to notice the
+shelf is empty. Each hold is a row in ``stock_reservations`` pointing at the
+exact stock row it was taken from:
+
+  - ``variant``: ``product_variants.stock_quantity`` (lines with a variant)
+  - ``inventory``: the product-level ``inventory`` row (everything else)
+
+Stock is taken with a conditional decrement (``stock_quantity >= quantity``)
+so it can never go negative, and rows are always locked variants first, then
+inventory, each in ascending id order. Two carts that share SKUs therefore
+queue behind each other instead of deadlocking.
+
+A hold is ``held`` until the seller confirms the order (``committed``), the
+buyer cancels it, or it outlives its TTL (``released``; stock goes back).
+"""
+import threading
+import time
+
+STOCK_RESERVATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS stock_reservations (
+        id BIGSERIAL PRIMARY KEY,
+        order_id INTEGER REFERENCES orders(id) ON DELETE CASCADE,
+        user_id INTEGER,
+        product_id INTEGER NOT NULL,
+        variant_id INTEGER,
+        source VARCHAR(20) NOT NULL,
+        source_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL CHECK (quantity > 0),
+        status VARCHAR(20) NOT NULL DEFAULT 'held',
+        expires_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        released_at TIMESTAMP
+    )
+"""
+
+STOCK_RESERVATIONS_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_stock_reservations_held_expiry ON stock_reservations (expires_at) WHERE status = 'held'",
+    "CREATE INDEX IF NOT EXISTS idx_stock_reservations_order ON stock_reservations (order_id)",
+)
+
+SOURCE_VARIANT = 'variant'
+SOURCE_INVENTORY = 'inventory'
+
+# source -> (table, lock/update order). Variants are always locked before inventory.
+_SOURCE_TABLES = (
+    (SOURCE_VARIANT, 'product_variants'),
+    (SOURCE_INVENTORY, 'inventory'),
+)
+
+
+def _fetch_dicts(cursor):
+    """fetchall() as dicts for both plain and RealDict cursors."""
+    rows = cursor.fetchall()
+    if rows and not isinstance(rows[0], dict):
+        names = [column[0] for column in cursor.description]
+        rows = [dict(zip(names, row)) for row in rows]
+    return rows
+
+
+def ensure_stock_reservations_table(cursor):
+    cursor.execute(STOCK_RESERVATIONS_TABLE_SQL)
+    for statement in STOCK_RESERVATIONS_INDEX_SQL:
+        cursor.execute(statement)
+
+
+def _resolve_stock_rows(cursor, lines):
+    """Map every (product, variant) in ``lines`` to the stock row it draws from.
+
+    Variant lines use their ``product_variants`` row; lines without a variant
+    (or whose variant row is gone) fall back to the product-level inventory
+    row, the same precedence ``_deduct_inventory_row`` uses. Products with no
+    stock row at all are not stock-tracked and get no hold.
+    """
+    cursor.execute('''
+        WITH wanted AS (
+            SELECT line.product_id, line.variant_id, SUM(line.quantity)::int AS quantity
+            FROM unnest(%s::int[], %s::int[], %s::int[]) AS line(product_id, variant_id, quantity)
+            GROUP BY line.product_id, line.variant_id
+        )
+        SELECT w.product_id, w.variant_id, w.quantity,
+               CASE WHEN pv.id IS NOT NULL THEN %s ELSE %s END AS source,
+               COALESCE(pv.id, inv.id) AS source_id
+        FROM wanted w
+        LEFT JOIN product_variants pv
+            ON w.variant_id IS NOT NULL AND pv.id = w.variant_id AND pv.product_id = w.product_id
+        LEFT JOIN LATERAL (
+            SELECT i.id FROM inventory i
+            WHERE i.product_id = w.product_id AND i.variant_id IS NULL
+            ORDER BY i.id
+            LIMIT 1
+        ) inv ON pv.id IS NULL
+        WHERE pv.id IS NOT NULL OR inv.id IS NOT NULL
+    ''', (
+        [line['product_id'] for line in lines],
+        [line.get('variant_id') for line in lines],
+        [line['quantity'] for line in lines],
+        SOURCE_VARIANT,
+        SOURCE_INVENTORY,
+    ))
+    return _fetch_dicts(cursor)
+
+
+def _shift_stock(cursor, table, quantities, direction):
+    """Add (``direction=1``) or conditionally take (``-1``) stock on ``table`` rows.
+
+    ``quantities`` maps row id -> units. Rows are locked in id order before the
+    update. Returns the set of row ids that were changed; a take skips rows
+    that do not have enough stock left.
+
+    The lock is FOR NO KEY UPDATE: the caller's order_items insert already holds
+    FOR KEY SHARE on these rows through its foreign keys, and FOR UPDATE would
+    conflict with another checkout's share lock on the same SKU and deadlock.
+    """
+    if not quantities:
+        return set()
+
+    row_ids = sorted(quantities)
+    guard = 'AND t.stock_quantity >= delta.quantity' if direction < 0 else ''
+    cursor.execute(f'''
+        WITH locked AS (
+            SELECT id FROM {table}
+            WHERE id = ANY(%s)
+            ORDER BY id
+            FOR NO KEY UPDATE
+        ),
+        delta AS (
+            SELECT change.id, change.quantity
+            FROM unnest(%s::int[], %s::int[]) AS change(id, quantity)
+        )
+        UPDATE {table} t
+        SET stock_quantity = t.stock_quantity + (%s * delta.quantity)
+        FROM delta
+        JOIN locked ON locked.id = delta.id
+        WHERE t.id = delta.id {guard}
+        RETURNING t.id
+    ''', (row_ids, row_ids, [quantities[row_id] for row_id in row_ids], direction))
+    return {row['id'] for row in _fetch_dicts(cursor)}
+
+
+def _group_by_source(rows):
+    grouped = {source: {} for source, _ in _SOURCE_TABLES}
+    for row in rows:
+        bucket = grouped[row['source']]
+        bucket[row['source_id']] = bucket.get(row['source_id'], 0) + int(row['quantity'])
+    return grouped
+
+
+def reserve_stock(cursor, order_id, user_id, lines, ttl_seconds):
+    """Take stock for every line of ``order_id`` and record the holds.
+
+    Runs inside the caller's transaction. On a shortage nothing is recorded
+    but earlier decrements in this call have already been applied, so the
+    caller must roll back.
+
+    Returns:
+        tuple: (True, []) on success, (False, [product_id, ...]) for the
+        products that did not have enough stock
+    """
+    if not lines:
+        return True, []
+
+    rows = _resolve_stock_rows(cursor, lines)
+    if not rows:
+        return True, []
+
+    grouped = _group_by_source(rows)
+    for source, table in _SOURCE_TABLES:
+        wanted = grouped[source]
+        taken = _shift_stock(cursor, table, wanted, -1)
+        if len(taken) != len(wanted):
+            # Stop before locking the next table; the caller rolls back anyway.
+            return False, sorted({
+                row['product_id'] for row in rows
+                if row['source'] == source and row['source_id'] not in taken
+            })
+
+    cursor.execute('''
+        INSERT INTO stock_reservations (
+            order_id, user_id, product_id, variant_id,
+            source, source_id, quantity, status, expires_at
+        )
+        SELECT %s, %s, hold.product_id, hold.variant_id,
+               hold.source, hold.source_id, hold.quantity, 'held',
+               NOW() + make_interval(secs => %s)
+        FROM unnest(%s::int[], %s::int[], %s::text[], %s::int[], %s::int[])
+            AS hold(product_id, variant_id, source, source_id, quantity)
+    ''', (
+        order_id, user_id, ttl_seconds,
+        [row['product_id'] for row in rows],
+        [row['variant_id'] if row['source'] == SOURCE_VARIANT else None for row in rows],
+        [row['source'] for row in rows],
+        [row['source_id'] for row in rows],
+        [row['quantity'] for row in rows],
+    ))
+    return True, []
+
+
+def commit_order_reservations(cursor, order_id):
+    """Turn the live holds of ``order_id`` into a permanent deduction.
+
+    Returns the number of holds committed; 0 means the order has no live
+    holds (placed before reservations existed, or already expired) and the
+    caller must deduct stock itself.
+    """
+    cursor.execute('''
+        UPDATE stock_reservations
+        SET status = 'committed'
+        WHERE order_id = %s AND status = 'held'
+    ''', (order_id,))
+    return cursor.rowcount
+
+
+def _release(cursor, where_sql, params, limit=None):
+    """Release live holds matching ``where_sql`` and put their stock back."""
+    limit_sql = 'LIMIT %s' if limit else ''
+    cursor.execute(f'''
+        WITH target AS (
+            SELECT id FROM stock_reservations
+            WHERE status = 'held' AND {where_sql}
+            ORDER BY id
+            {limit_sql}
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE stock_reservations r
+        SET status = 'released', released_at = NOW()
+        FROM target
+        WHERE r.id = target.id
+        RETURNING r.source, r.source_id, r.quantity
+    ''', tuple(params) + ((limit,) if limit else ()))
+    rows = _fetch_dicts(cursor)
+    grouped = _group_by_source(rows)
+    for source, table in _SOURCE_TABLES:
+        _shift_stock(cursor, table, grouped[source], 1)
+    return len(rows)
+
+
+def release_order_reservations(cursor, order_id):
+    """Give the live holds of a cancelled order back to stock; returns holds released."""
+    return _release(cursor, 'order_id = %s', (order_id,))
+
+
+def release_expired_reservations(cursor, batch_size=500):
+    """Release up to ``batch_size`` holds past their TTL in one set-based pass.
+
+    Safe to run from several workers at once: rows another sweeper (or a
+    confirming seller) has locked are skipped.
+    """
+    return _release(cursor, 'expires_at < NOW()', (), limit=batch_size)
+
+
+def start_reservation_sweeper(connect, interval_seconds, batch_size=500):
+    """Release expired holds every ``interval_seconds`` on a daemon thread.
+
+    ``connect`` returns a fresh DB-API connection (or None when the database
+    is unreachable); each sweep commits on its own connection so it never
+    sits inside a checkout transaction.
+    """
+    def run():
+        while True:
+            time.sleep(interval_seconds)
+            conn = None
+            try:
+                conn = connect()
+                if not conn:
+                    continue
+                cursor = conn.cursor()
+                released = 0
+                while True:
+                    batch = release_expired_reservations(cursor, batch_size)
+                    conn.commit()
+                    released += batch
+                    if batch < batch_size:
+                        break
+                cursor.close()
+                if released:
+                    print(f"[RESERVATIONS] Released {released} expired stock holds")
+            except Exception as err:
+                print(f"[RESERVATIONS] Sweep failed: {err}")
+                if conn:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+            finally:
+                if conn:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    thread = threading.Thread(target=run, name='stock-reservation-sweeper', daemon=True)
+    thread.start()
+    return thread